@@ -0,0 +1,67 @@
+"""
+Overview: Create profitability_rollups table and backfill it from approved estimations.
+Architecture: Migration for precomputed profitability aggregates (Section 8)
+Dependencies: alembic, sqlalchemy
+Concepts: Monthly buckets per client/region/offering replace per-request aggregation over
+    service_estimations. NULLS NOT DISTINCT lets region-less buckets participate in upserts.
+"""
+
+revision = "111"
+down_revision = "110"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+def upgrade() -> None:
+    op.create_table(
+        "profitability_rollups",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("client_tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("delivery_region_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("service_offering_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("total_revenue", sa.Numeric(18, 4), server_default="0", nullable=False),
+        sa.Column("total_cost", sa.Numeric(18, 4), server_default="0", nullable=False),
+        sa.Column("total_margin", sa.Numeric(18, 4), server_default="0", nullable=False),
+        sa.Column("estimation_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+        sa.ForeignKeyConstraint(["client_tenant_id"], ["tenants.id"]),
+        sa.ForeignKeyConstraint(["delivery_region_id"], ["delivery_regions.id"]),
+        sa.ForeignKeyConstraint(["service_offering_id"], ["service_offerings.id"]),
+        sa.UniqueConstraint(
+            "tenant_id", "client_tenant_id", "delivery_region_id", "service_offering_id", "period_start",
+            name="uq_profitability_rollup_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    op.create_index("ix_profitability_rollups_tenant_period", "profitability_rollups", ["tenant_id", "period_start"])
+
+    op.execute("""
+        INSERT INTO profitability_rollups (
+            tenant_id, client_tenant_id, delivery_region_id, service_offering_id, period_start,
+            total_revenue, total_cost, total_margin, estimation_count
+        )
+        SELECT
+            tenant_id, client_tenant_id, delivery_region_id, service_offering_id,
+            date_trunc('month', COALESCE(approved_at, updated_at))::date,
+            COALESCE(SUM(total_sell_price), 0),
+            COALESCE(SUM(total_estimated_cost), 0),
+            COALESCE(SUM(margin_amount), 0),
+            COUNT(*)
+        FROM service_estimations
+        WHERE status = 'approved' AND deleted_at IS NULL
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_profitability_rollups_tenant_period")
+    op.drop_table("profitability_rollups")
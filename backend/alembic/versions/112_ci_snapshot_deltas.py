@@ -0,0 +1,50 @@
+"""
+Overview: Per-CI version counter and delta-encoded CI snapshots.
+Architecture: Migration for keyframe + JSON-patch snapshot storage (Section 8)
+Dependencies: alembic, sqlalchemy
+Concepts: configuration_items.current_version replaces COUNT(*) version numbering. Existing
+    snapshots become keyframes; new non-keyframe rows carry a JSON patch in delta instead of
+    the full snapshot_data document.
+"""
+
+revision = "112"
+down_revision = "111"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+def upgrade() -> None:
+    op.add_column(
+        "configuration_items",
+        sa.Column("current_version", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute("""
+        UPDATE configuration_items ci
+        SET current_version = s.max_version
+        FROM (
+            SELECT ci_id, MAX(version_number) AS max_version
+            FROM ci_snapshots
+            GROUP BY ci_id
+        ) s
+        WHERE s.ci_id = ci.id
+    """)
+
+    op.add_column(
+        "ci_snapshots",
+        sa.Column("is_keyframe", sa.Boolean(), server_default="true", nullable=False),
+    )
+    op.add_column("ci_snapshots", sa.Column("delta", postgresql.JSONB(), nullable=True))
+    op.alter_column("ci_snapshots", "snapshot_data", existing_type=postgresql.JSONB(), nullable=True)
+
+
+def downgrade() -> None:
+    # Delta rows cannot be represented without reconstruction; drop them before restoring NOT NULL.
+    op.execute("DELETE FROM ci_snapshots WHERE is_keyframe = false")
+    op.alter_column("ci_snapshots", "snapshot_data", existing_type=postgresql.JSONB(), nullable=False)
+    op.drop_column("ci_snapshots", "delta")
+    op.drop_column("ci_snapshots", "is_keyframe")
+    op.drop_column("configuration_items", "current_version")
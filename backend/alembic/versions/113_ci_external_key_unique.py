@@ -0,0 +1,61 @@
+"""
+Overview: Unique external keys for configuration items.
+Architecture: Migration for bulk CI upsert keyed on Pulumi URN / cloud resource ID (Section 8)
+Dependencies: alembic, sqlalchemy
+Concepts: Partial unique indexes on (tenant_id, pulumi_urn) and (tenant_id, cloud_resource_id)
+    over live rows give INSERT ... ON CONFLICT an arbiter index. Pre-existing duplicates abort
+    the upgrade with a listing of the clashing CIs, so the key can be fixed by hand rather than
+    silently dropped from all but one of them.
+"""
+
+revision = "113"
+down_revision = "112"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+_KEYS = ("pulumi_urn", "cloud_resource_id")
+_LISTED = 20
+
+
+def _duplicates(key: str) -> list[str]:
+    rows = op.get_bind().execute(sa.text(f"""
+        SELECT tenant_id, {key} AS value, COUNT(*) AS n, array_agg(id ORDER BY id) AS ids
+        FROM configuration_items
+        WHERE deleted_at IS NULL AND {key} IS NOT NULL
+        GROUP BY tenant_id, {key}
+        HAVING COUNT(*) > 1
+        ORDER BY tenant_id, {key}
+    """)).all()
+    return [
+        f"  tenant {r.tenant_id} {key}={r.value!r}: {r.n} CIs ({', '.join(map(str, r.ids))})"
+        for r in rows
+    ]
+
+
+def upgrade() -> None:
+    duplicates = [line for key in _KEYS for line in _duplicates(key)]
+    if duplicates:
+        shown = "\n".join(duplicates[:_LISTED])
+        more = len(duplicates) - _LISTED
+        raise RuntimeError(
+            "Live configuration items share an external key; clear or correct the key on all "
+            "but one CI per group, then re-run the migration:\n"
+            + shown
+            + (f"\n  ... and {more} more" if more > 0 else "")
+        )
+    for key in _KEYS:
+        op.create_index(
+            f"uq_ci_tenant_{key}",
+            "configuration_items",
+            ["tenant_id", key],
+            unique=True,
+            postgresql_where=sa.text(f"deleted_at IS NULL AND {key} IS NOT NULL"),
+        )
+
+
+def downgrade() -> None:
+    for key in reversed(_KEYS):
+        op.drop_index(f"uq_ci_tenant_{key}", table_name="configuration_items")
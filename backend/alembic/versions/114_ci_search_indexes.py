@@ -0,0 +1,73 @@
+"""
+Overview: Indexed CI search — trigger-maintained tsvector, trigram and tag GIN indexes.
+Architecture: Migration for ranked CMDB search (Section 8)
+Dependencies: alembic, sqlalchemy, pg_trgm
+Concepts: configuration_items.search_vector holds name (weight A) and description (weight B)
+    under the 'simple' configuration so identifiers are not stemmed; a BEFORE INSERT/UPDATE
+    trigger keeps it current. pg_trgm GIN indexes serve substring (ILIKE) matches on names
+    and external identifiers, and a jsonb_path_ops GIN index serves tag containment filters.
+"""
+
+revision = "114"
+down_revision = "113"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+_TRGM_COLUMNS = ("name", "description", "cloud_resource_id", "pulumi_urn")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column(
+        "configuration_items",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION configuration_items_search_vector() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'B');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_configuration_items_search_vector
+        BEFORE INSERT OR UPDATE OF name, description ON configuration_items
+        FOR EACH ROW EXECUTE FUNCTION configuration_items_search_vector()
+    """)
+    op.execute("""
+        UPDATE configuration_items SET search_vector =
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    """)
+
+    op.create_index(
+        "ix_ci_search_vector", "configuration_items", ["search_vector"],
+        postgresql_using="gin",
+    )
+    for column in _TRGM_COLUMNS:
+        op.create_index(
+            f"ix_ci_{column}_trgm", "configuration_items", [column],
+            postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"},
+        )
+    op.create_index(
+        "ix_ci_tags_gin", "configuration_items", ["tags"],
+        postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ci_tags_gin", table_name="configuration_items")
+    for column in reversed(_TRGM_COLUMNS):
+        op.drop_index(f"ix_ci_{column}_trgm", table_name="configuration_items")
+    op.drop_index("ix_ci_search_vector", table_name="configuration_items")
+    op.execute("DROP TRIGGER IF EXISTS trg_configuration_items_search_vector ON configuration_items")
+    op.execute("DROP FUNCTION IF EXISTS configuration_items_search_vector()")
+    op.drop_column("configuration_items", "search_vector")
@@ -0,0 +1,98 @@
+"""
+Overview: Create ci_explorer_counts and keep it current with triggers on configuration_items.
+Architecture: Migration for materialized CMDB explorer counts (Section 8)
+Dependencies: alembic, sqlalchemy
+Concepts: One row per (tenant, compartment, backend, class) bucket of live CIs. Statement-level
+    AFTER triggers read the transition tables, net the -1/+1 per bucket for every affected row
+    (create, soft delete, move, backend or class change, lifecycle change) and upsert only the
+    buckets whose count changed, so bulk statements cost one upsert per bucket, not per row.
+"""
+
+revision = "115"
+down_revision = "114"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+_KEY = "tenant_id, compartment_id, backend_id, ci_class_id"
+
+# Transition tables are only allowed on single-event triggers, so one trigger per event.
+_TRIGGERS = {
+    "INSERT": "REFERENCING NEW TABLE AS new_rows",
+    "UPDATE": "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def _apply(deltas: str) -> str:
+    return f"""
+            INSERT INTO ci_explorer_counts AS c ({_KEY}, ci_count)
+            SELECT {_KEY}, SUM(delta) FROM ({deltas}) d
+            GROUP BY {_KEY}
+            HAVING SUM(delta) <> 0
+            ON CONFLICT ON CONSTRAINT uq_ci_explorer_count_bucket
+            DO UPDATE SET ci_count = c.ci_count + EXCLUDED.ci_count;"""
+
+
+_OLD = f"SELECT {_KEY}, -1 AS delta FROM old_rows WHERE deleted_at IS NULL"
+_NEW = f"SELECT {_KEY}, 1 AS delta FROM new_rows WHERE deleted_at IS NULL"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ci_explorer_counts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("compartment_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("backend_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("ci_class_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("ci_count", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+        sa.ForeignKeyConstraint(["compartment_id"], ["compartments.id"]),
+        sa.ForeignKeyConstraint(["backend_id"], ["cloud_backends.id"]),
+        sa.ForeignKeyConstraint(["ci_class_id"], ["ci_classes.id"]),
+        sa.UniqueConstraint(
+            "tenant_id", "compartment_id", "backend_id", "ci_class_id",
+            name="uq_ci_explorer_count_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION ci_explorer_counts_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN{_apply(_NEW)}
+            ELSIF TG_OP = 'DELETE' THEN{_apply(_OLD)}
+            ELSE{_apply(f"{_OLD} UNION ALL {_NEW}")}
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for event, referencing in _TRIGGERS.items():
+        op.execute(f"""
+            CREATE TRIGGER trg_configuration_items_explorer_{event.lower()}
+            AFTER {event} ON configuration_items {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION ci_explorer_counts_apply()
+        """)
+
+    op.execute(f"""
+        INSERT INTO ci_explorer_counts ({_KEY}, ci_count)
+        SELECT {_KEY}, COUNT(*) FROM configuration_items
+        WHERE deleted_at IS NULL
+        GROUP BY {_KEY}
+    """)
+
+
+def downgrade() -> None:
+    for event in reversed(list(_TRIGGERS)):
+        op.execute(
+            f"DROP TRIGGER IF EXISTS trg_configuration_items_explorer_{event.lower()} "
+            "ON configuration_items"
+        )
+    op.execute("DROP FUNCTION IF EXISTS ci_explorer_counts_apply()")
+    op.drop_table("ci_explorer_counts")
@@ -0,0 +1,66 @@
+"""
+Overview: Add address_allocations.allocated_ips and backfill it from live child allocations.
+Architecture: Migration for persisted IPAM utilization counters (Section 4.2)
+Dependencies: alembic, sqlalchemy
+Concepts: allocated_ips holds the usable addresses consumed by an allocation's live children
+    (IPv4 excludes network/broadcast except /31 and /32; IPv6 counts every address), matching
+    calculate_usable_ips. Numeric(39, 0) fits any IPv6 count. utilization_percent is
+    refreshed from the backfilled counter.
+"""
+
+revision = "116"
+down_revision = "115"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade() -> None:
+    op.add_column(
+        "address_allocations",
+        sa.Column("allocated_ips", sa.Numeric(39, 0), server_default="0", nullable=False),
+    )
+    op.execute("""
+        WITH child AS (
+            SELECT parent_allocation_id AS id,
+                   family(cidr::inet) AS family,
+                   masklen(cidr::inet) AS masklen
+            FROM address_allocations
+            WHERE parent_allocation_id IS NOT NULL AND deleted_at IS NULL
+        ), usage AS (
+            SELECT id, SUM(
+                CASE
+                    WHEN family = 6 THEN power(2::numeric, 128 - masklen)
+                    WHEN masklen = 32 THEN 1
+                    WHEN masklen = 31 THEN 2
+                    ELSE power(2::numeric, 32 - masklen) - 2
+                END
+            ) AS allocated
+            FROM child GROUP BY id
+        )
+        UPDATE address_allocations a
+        SET allocated_ips = usage.allocated
+        FROM usage WHERE a.id = usage.id
+    """)
+    op.execute("""
+        UPDATE address_allocations
+        SET utilization_percent = LEAST(100, ROUND(allocated_ips * 100 / usable, 2))
+        FROM (
+            SELECT id AS alloc_id,
+                CASE
+                    WHEN family(cidr::inet) = 6 THEN power(2::numeric, 128 - masklen(cidr::inet))
+                    WHEN masklen(cidr::inet) = 32 THEN 1
+                    WHEN masklen(cidr::inet) = 31 THEN 2
+                    ELSE power(2::numeric, 32 - masklen(cidr::inet)) - 2
+                END AS usable
+            FROM address_allocations
+        ) sizes
+        WHERE address_allocations.id = sizes.alloc_id
+          AND sizes.usable > 0 AND allocated_ips > 0
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column("address_allocations", "allocated_ips")
@@ -0,0 +1,107 @@
+"""
+Overview: Database-enforced IPAM non-overlap — GiST exclusion constraints and unique reservations.
+Architecture: Migration for concurrency-safe IPAM allocation (Section 4.2)
+Dependencies: alembic, btree_gist
+Concepts: The text CIDR columns are compared as inet with the GiST inet_ops && (overlap)
+    operator. Live address spaces may not overlap within a landing zone; live allocations may
+    not overlap their siblings (same address space and parent, with top-level allocations
+    keyed by the address space). Active reservations are unique per allocation and address.
+    The service serializes writers with advisory locks; these constraints are the backstop.
+    Existing overlaps or duplicate reservations abort the upgrade with a report of the
+    offending rows, since the constraints cannot be added over them.
+"""
+
+revision = "117"
+down_revision = "116"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+_LISTED = 20
+
+_CONFLICTS = {
+    "Overlapping address spaces": """
+        SELECT format('landing zone %s: %s (%s) overlaps %s (%s)',
+                      a.landing_zone_id, a.cidr, a.id, b.cidr, b.id)
+        FROM address_spaces a
+        JOIN address_spaces b
+          ON b.landing_zone_id = a.landing_zone_id AND b.id > a.id
+         AND a.cidr::inet && b.cidr::inet
+        WHERE a.deleted_at IS NULL AND b.deleted_at IS NULL
+        ORDER BY a.landing_zone_id, a.cidr
+    """,
+    "Overlapping sibling allocations": """
+        SELECT format('address space %s: %s (%s) overlaps %s (%s)',
+                      a.address_space_id, a.cidr, a.id, b.cidr, b.id)
+        FROM address_allocations a
+        JOIN address_allocations b
+          ON b.address_space_id = a.address_space_id AND b.id > a.id
+         AND COALESCE(b.parent_allocation_id, b.address_space_id)
+             = COALESCE(a.parent_allocation_id, a.address_space_id)
+         AND a.cidr::inet && b.cidr::inet
+        WHERE a.deleted_at IS NULL AND b.deleted_at IS NULL
+        ORDER BY a.address_space_id, a.cidr
+    """,
+    "Duplicate active reservations": """
+        SELECT format('allocation %s: %s reserved %s times', allocation_id, ip_address::inet,
+                      COUNT(*))
+        FROM ip_reservations
+        WHERE deleted_at IS NULL
+        GROUP BY allocation_id, ip_address::inet
+        HAVING COUNT(*) > 1
+        ORDER BY allocation_id, ip_address::inet
+    """,
+}
+
+
+def _check_conflicts() -> None:
+    bind = op.get_bind()
+    report = []
+    for title, query in _CONFLICTS.items():
+        rows = bind.execute(sa.text(query)).scalars().all()
+        if rows:
+            report.append(f"{title} ({len(rows)}):")
+            report.extend(f"  {row}" for row in rows[:_LISTED])
+            if len(rows) > _LISTED:
+                report.append(f"  ... and {len(rows) - _LISTED} more")
+    if report:
+        raise RuntimeError(
+            "IPAM data violates the new non-overlap constraints; release or correct these "
+            "rows, then re-run the migration:\n" + "\n".join(report)
+        )
+
+
+def upgrade() -> None:
+    _check_conflicts()
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    op.execute("""
+        ALTER TABLE address_spaces
+        ADD CONSTRAINT excl_address_space_overlap
+        EXCLUDE USING gist (
+            landing_zone_id WITH =,
+            (cidr::inet) inet_ops WITH &&
+        ) WHERE (deleted_at IS NULL)
+    """)
+    op.execute("""
+        ALTER TABLE address_allocations
+        ADD CONSTRAINT excl_address_allocation_overlap
+        EXCLUDE USING gist (
+            address_space_id WITH =,
+            (COALESCE(parent_allocation_id, address_space_id)) WITH =,
+            (cidr::inet) inet_ops WITH &&
+        ) WHERE (deleted_at IS NULL)
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX uq_ip_reservation_active
+        ON ip_reservations (allocation_id, (ip_address::inet))
+        WHERE deleted_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_ip_reservation_active")
+    op.execute("ALTER TABLE address_allocations DROP CONSTRAINT IF EXISTS excl_address_allocation_overlap")
+    op.execute("ALTER TABLE address_spaces DROP CONSTRAINT IF EXISTS excl_address_space_overlap")
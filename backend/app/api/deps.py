@@ -5,13 +5,17 @@ Dependencies: fastapi, app.db.session, app.services.auth, app.core.tenant_contex
 Concepts: Dependency injection, authentication context, tenant context, permission checking
 """
 
+import uuid
+
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.models.user import User
-from app.services.auth.service import AuthError, AuthService
+from app.services.auth.principal import Principal, resolve_principal
+from app.services.auth.service import AuthService
+from app.services.auth.session_cache import SESSION_REVOKED, check_session
 
 _bearer_scheme = HTTPBearer()
 
@@ -20,60 +24,62 @@ async def get_auth_service(db: AsyncSession = Depends(get_db)) -> AuthService:
     return AuthService(db)
 
 
-async def get_current_user(
+def _unauthorized(request: Request, code: str, message: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail={
+            "error": {
+                "code": code,
+                "message": message,
+                "trace_id": getattr(request.state, "trace_id", None),
+            }
+        },
+    )
+
+
+async def get_current_principal(
     request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(_bearer_scheme),
     db: AsyncSession = Depends(get_db),
-) -> User:
-    """Validate the bearer token and return the authenticated user."""
-    auth_service = AuthService(db)
-    try:
-        payload = await auth_service.validate_token(credentials.credentials)
-    except AuthError as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "error": {
-                    "code": e.code,
-                    "message": e.message,
-                    "trace_id": getattr(request.state, "trace_id", None),
-                }
-            },
-        )
-
-    from sqlalchemy import select
+) -> Principal:
+    """Validate the bearer token and its session; return the request principal.
+
+    The token is decoded once per request (shared with the middleware) and the session
+    check is served from the session validity cache.
+    """
+    principal = resolve_principal(request)
+    if principal is None:
+        raise _unauthorized(request, "INVALID_TOKEN", "Invalid or expired token")
+
+    code = await check_session(db, principal)
+    if code == SESSION_REVOKED:
+        raise _unauthorized(request, code, "Session revoked")
+    if code is not None:
+        raise _unauthorized(request, "USER_INVALID", "User not found or disabled")
+
+    # Store JTI, user_id, and impersonation context on request for logout and actor tracking
+    request.state.jti = principal.jti
+    request.state.user_id = principal.user_id
+    request.state.impersonating = (
+        dict(principal.impersonating) if principal.impersonating else None
+    )
+    return principal
 
-    result = await db.execute(select(User).where(User.id == payload["sub"]))
-    user = result.scalar_one_or_none()
 
+async def get_current_user(
+    request: Request,
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Validate the bearer token and return the authenticated user."""
+    user = await db.get(User, uuid.UUID(principal.user_id))
     if not user or not user.is_active or user.is_deleted:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail={
-                "error": {
-                    "code": "USER_INVALID",
-                    "message": "User not found or disabled",
-                    "trace_id": getattr(request.state, "trace_id", None),
-                }
-            },
-        )
-
-    # Store JTI and user_id on request for logout and actor tracking
-    request.state.jti = payload["jti"]
-    request.state.user_id = str(user.id)
-
-    # Store impersonation context if present
-    impersonating = payload.get("impersonating")
-    if impersonating:
-        request.state.impersonating = impersonating
-    else:
-        request.state.impersonating = None
-
+        raise _unauthorized(request, "USER_INVALID", "User not found or disabled")
     return user
 
 
 def get_current_tenant_id(request: Request) -> str:
-    """Extract the current tenant ID from request state (set by TenantContextMiddleware)."""
+    """Extract the current tenant ID from request state (set by TenantContextStage)."""
     tenant_id = getattr(request.state, "current_tenant_id", None)
     if not tenant_id:
         raise HTTPException(
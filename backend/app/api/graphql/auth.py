@@ -1,14 +1,18 @@
 """
 Overview: GraphQL authentication and permission checking utilities.
 Architecture: GraphQL context helpers for permission enforcement (Section 5.2)
-Dependencies: strawberry, app.services.auth.jwt, app.api.graphql.context
-Concepts: GraphQL authentication, permission checking, per-request caching
+Dependencies: strawberry, app.services.auth.principal, app.services.auth.session_cache,
+    app.services.cache.response_cache
+Concepts: GraphQL authentication, session revocation, permission checking, per-request caching
 """
 
-from jose.exceptions import ExpiredSignatureError, JWTError
+from typing import Any
+
 from strawberry.types import Info
 
-from app.services.auth.jwt import decode_token
+from app.services.auth.principal import TOKEN_EXPIRED, auth_error, resolve_principal
+from app.services.auth.session_cache import check_session
+from app.services.cache.response_cache import unrecorded
 
 
 async def check_graphql_permission(info: Info, permission_key: str, tenant_id: str) -> str:
@@ -18,25 +22,38 @@ async def check_graphql_permission(info: Info, permission_key: str, tenant_id: s
     Uses the shared NimbusContext session and permission cache to avoid
     redundant DB connections within the same request.
     """
-    request = info.context.request
-    auth_header = request.headers.get("authorization", "")
-    if not auth_header.startswith("Bearer "):
-        raise PermissionError("Not authenticated")
+    return await check_context_permission(info.context, permission_key, tenant_id)
+
+
+async def check_context_permission(ctx: Any, permission_key: str, tenant_id: str) -> str:
+    """``check_graphql_permission`` against a GraphQL context rather than resolver Info."""
+    with unrecorded():
+        return await _check_context_permission(ctx, permission_key, tenant_id)
+
 
-    token = auth_header[7:]
-    try:
-        payload = decode_token(token)
-    except ExpiredSignatureError:
-        raise PermissionError("Token expired")
-    except JWTError:
+async def _check_context_permission(ctx: Any, permission_key: str, tenant_id: str) -> str:
+    request = ctx.request
+    principal = resolve_principal(request)
+    if principal is None:
+        if auth_error(request) == TOKEN_EXPIRED:
+            raise PermissionError("Token expired")
         raise PermissionError("Not authenticated")
-    user_id = payload["sub"]
+    user_id = principal.user_id
 
     # Fall back to JWT's current_tenant_id for provider-mode (no explicit tenant)
-    effective_tenant_id = tenant_id or payload.get("current_tenant_id", "")
+    effective_tenant_id = tenant_id or principal.current_tenant_id or ""
+
+    if hasattr(ctx, "session"):
+        if await check_session(await ctx.session(), principal):
+            raise PermissionError("Session revoked")
+    else:
+        from app.db.session import async_session_factory
+
+        async with async_session_factory() as db:
+            if await check_session(db, principal):
+                raise PermissionError("Session revoked")
 
     # Use context's cached permission check if NimbusContext is available
-    ctx = info.context
     if hasattr(ctx, "check_permission_cached"):
         allowed = await ctx.check_permission_cached(user_id, permission_key, effective_tenant_id)
     else:
@@ -1,7 +1,7 @@
 """
 Overview: GraphQL request context with shared DB session, permission cache, and dataloaders.
 Architecture: Per-request context passed to all resolvers via Strawberry Info (Section 7.2)
-Dependencies: strawberry, sqlalchemy, app.db.session, app.services
+Dependencies: strawberry, sqlalchemy, app.db.session, app.api.graphql.loaders, app.services
 Concepts: Shared session eliminates per-resolver connection overhead. Permission cache avoids
     redundant DB lookups. Dataloaders batch N+1 queries into single bulk fetches.
 """
@@ -12,12 +12,11 @@ import uuid
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from strawberry.dataloader import DataLoader
 from strawberry.fastapi import BaseContext
 
+from app.api.graphql.loaders import Loaders
 from app.db.session import async_session_factory
 
 if TYPE_CHECKING:
@@ -35,14 +34,22 @@ class NimbusContext(BaseContext):
     - Dataloaders for batch-fetching related entities
     """
 
+    # Set for query operations: the shared session comes from the read replica when fresh
+    read_replica: bool = field(default=False, init=False)
     _session: AsyncSession | None = field(default=None, init=False, repr=False)
     _permission_cache: dict[str, bool] = field(default_factory=dict, init=False, repr=False)
-    _loaders: dict[str, DataLoader] = field(default_factory=dict, init=False, repr=False)
+    _granted: set[tuple[str, str]] = field(default_factory=set, init=False, repr=False)
+    _loaders: Loaders | None = field(default=None, init=False, repr=False)
 
     async def session(self) -> AsyncSession:
         """Lazily create and return the shared DB session for this request."""
         if self._session is None:
-            self._session = async_session_factory()
+            factory = async_session_factory
+            if self.read_replica:
+                from app.db.replica import read_session_factory
+
+                factory = await read_session_factory()
+            self._session = factory()
         return self._session
 
     async def close(self) -> None:
@@ -62,113 +69,73 @@ class NimbusContext(BaseContext):
         """Check permission, returning cached result if already checked this request."""
         cache_key = self.permission_cache_key(user_id, permission_key, tenant_id)
         if cache_key in self._permission_cache:
-            return self._permission_cache[cache_key]
-
-        from app.services.permission.engine import PermissionEngine
-
-        db = await self.session()
-        engine = PermissionEngine(db)
-        allowed, _source = await engine.check_permission(user_id, permission_key, tenant_id)
-        self._permission_cache[cache_key] = allowed
+            allowed = self._permission_cache[cache_key]
+        else:
+            from app.services.permission.engine import PermissionEngine
+
+            db = await self.session()
+            engine = PermissionEngine(db)
+            allowed, _source = await engine.check_permission(user_id, permission_key, tenant_id)
+            self._permission_cache[cache_key] = allowed
+        if allowed:
+            self._granted.add((permission_key, tenant_id))
         return allowed
 
+    @property
+    def granted_permissions(self) -> frozenset[tuple[str, str]]:
+        """(permission_key, tenant_id) pairs granted so far in this request."""
+        return frozenset(self._granted)
+
     # ── Dataloaders ───────────────────────────────────────────────────
 
+    @property
+    def loaders(self) -> Loaders:
+        """Model-driven batch loaders (by id, by parent, by foreign key) for this request."""
+        if self._loaders is None:
+            self._loaders = Loaders(self.session)
+        return self._loaders
+
     @property
     def ci_class_loader(self) -> DataLoader[uuid.UUID, object | None]:
         """Batch-load CI classes by ID."""
-        if "ci_class" not in self._loaders:
-            self._loaders["ci_class"] = DataLoader(load_fn=self._load_ci_classes)
-        return self._loaders["ci_class"]
+        from app.models.cmdb.ci_class import CIClass
+
+        return self.loaders.by_id(CIClass)
 
     @property
     def backend_loader(self) -> DataLoader[uuid.UUID, object | None]:
         """Batch-load cloud backends by ID."""
-        if "backend" not in self._loaders:
-            self._loaders["backend"] = DataLoader(load_fn=self._load_backends)
-        return self._loaders["backend"]
+        from app.models.cloud_backend import CloudBackend
+
+        return self.loaders.by_id(CloudBackend)
 
     @property
     def user_loader(self) -> DataLoader[uuid.UUID, object | None]:
         """Batch-load users by ID."""
-        if "user" not in self._loaders:
-            self._loaders["user"] = DataLoader(load_fn=self._load_users)
-        return self._loaders["user"]
+        from app.models.user import User
+
+        return self.loaders.by_id(User)
 
     @property
     def relationship_type_loader(self) -> DataLoader[uuid.UUID, object | None]:
         """Batch-load relationship types by ID."""
-        if "rel_type" not in self._loaders:
-            self._loaders["rel_type"] = DataLoader(load_fn=self._load_relationship_types)
-        return self._loaders["rel_type"]
+        from app.models.cmdb.relationship_type import RelationshipType
+
+        return self.loaders.by_id(RelationshipType)
 
     @property
     def ci_loader(self) -> DataLoader[uuid.UUID, object | None]:
         """Batch-load CIs by ID (for relationship source/target resolution)."""
-        if "ci" not in self._loaders:
-            self._loaders["ci"] = DataLoader(load_fn=self._load_cis)
-        return self._loaders["ci"]
+        from app.models.cmdb.ci import ConfigurationItem
+
+        return self.loaders.by_id(ConfigurationItem)
 
     @property
     def semantic_type_loader(self) -> DataLoader[uuid.UUID, object | None]:
         """Batch-load semantic types by ID."""
-        if "semantic_type" not in self._loaders:
-            self._loaders["semantic_type"] = DataLoader(load_fn=self._load_semantic_types)
-        return self._loaders["semantic_type"]
-
-    # ── Batch-load implementations ────────────────────────────────────
-
-    async def _load_ci_classes(self, keys: list[uuid.UUID]) -> list[object | None]:
-        from app.models.cmdb.ci_class import CIClass
-
-        db = await self.session()
-        result = await db.execute(select(CIClass).where(CIClass.id.in_(keys)))
-        by_id = {row.id: row for row in result.scalars().all()}
-        return [by_id.get(k) for k in keys]
-
-    async def _load_backends(self, keys: list[uuid.UUID]) -> list[object | None]:
-        from app.models.cloud_backend import CloudBackend
-
-        db = await self.session()
-        result = await db.execute(select(CloudBackend).where(CloudBackend.id.in_(keys)))
-        by_id = {row.id: row for row in result.scalars().all()}
-        return [by_id.get(k) for k in keys]
-
-    async def _load_users(self, keys: list[uuid.UUID]) -> list[object | None]:
-        from app.models.user import User
-
-        db = await self.session()
-        result = await db.execute(select(User).where(User.id.in_(keys)))
-        by_id = {row.id: row for row in result.scalars().all()}
-        return [by_id.get(k) for k in keys]
-
-    async def _load_relationship_types(self, keys: list[uuid.UUID]) -> list[object | None]:
-        from app.models.cmdb.relationship_type import RelationshipType
+        from app.models.semantic_type import SemanticResourceType
 
-        db = await self.session()
-        result = await db.execute(select(RelationshipType).where(RelationshipType.id.in_(keys)))
-        by_id = {row.id: row for row in result.scalars().all()}
-        return [by_id.get(k) for k in keys]
-
-    async def _load_cis(self, keys: list[uuid.UUID]) -> list[object | None]:
-        from app.models.cmdb.configuration_item import ConfigurationItem
-
-        db = await self.session()
-        result = await db.execute(
-            select(ConfigurationItem)
-            .options(selectinload(ConfigurationItem.ci_class))
-            .where(ConfigurationItem.id.in_(keys))
-        )
-        by_id = {row.id: row for row in result.scalars().all()}
-        return [by_id.get(k) for k in keys]
-
-    async def _load_semantic_types(self, keys: list[uuid.UUID]) -> list[object | None]:
-        from app.models.semantic import SemanticType
-
-        db = await self.session()
-        result = await db.execute(select(SemanticType).where(SemanticType.id.in_(keys)))
-        by_id = {row.id: row for row in result.scalars().all()}
-        return [by_id.get(k) for k in keys]
+        return self.loaders.by_id(SemanticResourceType)
 
 
 async def get_context(request: Request = None, websocket: WebSocket = None) -> NimbusContext:
@@ -0,0 +1,151 @@
+"""
+Overview: Per-request DataLoader factory derived from SQLAlchemy model metadata.
+Architecture: Batch loading layer behind NimbusContext (Section 7.2)
+Dependencies: strawberry, sqlalchemy, app.db.base
+Concepts: Instead of one hand-written batch function per entity, loaders are built on demand
+    from the mapper: ``by_id(Model)`` batches primary-key lookups, ``by_parent(Child.parent_id)``
+    (or a one-to-many relationship attribute) batches child lists per parent key, and
+    ``related(Model.fk_id)`` follows a foreign key column or many-to-one relationship to the
+    ``by_id`` loader of the referenced model. Each distinct loader is created once per request,
+    so every resolver asking for the same relationship shares a batch and a cache. Loader
+    options (e.g. ``selectinload``) are part of the loader identity, so pass module-level
+    constants. Soft-deleted children are excluded from ``by_parent`` lists; a ``tenant_id``
+    scope limits them to that tenant's and shared rows and is part of the loader identity, so
+    children of a shared parent never leak across tenants.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import inspect, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, RelationshipProperty
+from sqlalchemy.sql.schema import Column
+from strawberry.dataloader import DataLoader
+
+from app.db.base import Base
+
+# ``by_parent`` scope meaning "rows of every tenant"
+_ALL_TENANTS: Any = object()
+
+
+def _column_of(attr: InstrumentedAttribute) -> Column:
+    prop = attr.property
+    if isinstance(prop, RelationshipProperty):
+        raise TypeError(f"{attr} is a relationship, not a column")
+    return prop.columns[0]
+
+
+def _model_for_table(table) -> type:
+    for mapper in Base.registry.mappers:
+        if mapper.local_table is table:
+            return mapper.class_
+    raise LookupError(f"No mapped model for table {table.name}")
+
+
+def _child_key(attr: InstrumentedAttribute) -> InstrumentedAttribute:
+    """The child-side key column attribute for ``by_parent``."""
+    prop = attr.property
+    if not isinstance(prop, RelationshipProperty):
+        return attr
+    if not prop.uselist:
+        raise TypeError(f"{attr} is not a one-to-many relationship")
+    _local, remote = prop.local_remote_pairs[0]
+    child = prop.mapper
+    return child.attrs[child.get_property_by_column(remote).key].class_attribute
+
+
+def _referenced_model(attr: InstrumentedAttribute) -> tuple[type, InstrumentedAttribute]:
+    """(target model, local foreign key attribute) for ``related``."""
+    prop = attr.property
+    if isinstance(prop, RelationshipProperty):
+        if prop.uselist:
+            raise TypeError(f"{attr} is not a many-to-one relationship")
+        local, _remote = prop.local_remote_pairs[0]
+        parent = prop.parent
+        fk = parent.attrs[parent.get_property_by_column(local).key].class_attribute
+        return prop.mapper.class_, fk
+    foreign_keys = _column_of(attr).foreign_keys
+    if not foreign_keys:
+        raise TypeError(f"{attr} has no foreign key")
+    return _model_for_table(next(iter(foreign_keys)).column.table), attr
+
+
+class Loaders:
+    """DataLoaders for one request, keyed by what they load."""
+
+    def __init__(self, session: Callable[[], Awaitable[AsyncSession]]) -> None:
+        self._session = session
+        self._loaders: dict[Any, DataLoader] = {}
+
+    def by_id(self, model: type, *options: Any) -> DataLoader[uuid.UUID, Any | None]:
+        """Batch-load ``model`` rows by primary key (None for missing keys)."""
+        key = ("id", model, options)
+        if key not in self._loaders:
+            mapper = inspect(model)
+            pk = mapper.primary_key[0]
+            pk_name = mapper.get_property_by_column(pk).key
+
+            async def load(keys: list[uuid.UUID]) -> list[Any | None]:
+                db = await self._session()
+                result = await db.execute(select(model).options(*options).where(pk.in_(keys)))
+                by_id = {getattr(row, pk_name): row for row in result.scalars().unique().all()}
+                return [by_id.get(k) for k in keys]
+
+            self._loaders[key] = DataLoader(load_fn=load)
+        return self._loaders[key]
+
+    def by_parent(
+        self,
+        attr: InstrumentedAttribute,
+        *options: Any,
+        tenant_id: Any = _ALL_TENANTS,
+        active_only: bool = False,
+    ) -> DataLoader[Any, list[Any]]:
+        """Batch-load child rows per parent key.
+
+        ``attr`` is the child's foreign key column (``Child.parent_id``) or the parent's
+        one-to-many relationship (``Parent.children``). With ``tenant_id``, only that tenant's
+        and shared (``tenant_id IS NULL``) children are returned — only shared ones for None.
+        ``active_only`` drops rows with ``is_active`` false. Children come back in
+        ``sort_order`` when the model has one, then by name, then by primary key.
+        """
+        fk = _child_key(attr)
+        model = fk.class_
+        key = ("parent", model, fk.key, options, tenant_id, active_only)
+        if key not in self._loaders:
+            stmt = select(model).options(*options)
+            if hasattr(model, "deleted_at"):
+                stmt = stmt.where(model.deleted_at.is_(None))
+            if tenant_id is not _ALL_TENANTS:
+                visible = model.tenant_id.is_(None)
+                if tenant_id is not None:
+                    visible = or_(model.tenant_id == tenant_id, visible)
+                stmt = stmt.where(visible)
+            if active_only:
+                stmt = stmt.where(model.is_active.is_(True))
+            order = [inspect(model).primary_key[0]]
+            if hasattr(model, "name"):
+                order.insert(0, model.name)
+            if hasattr(model, "sort_order"):
+                order.insert(0, model.sort_order)
+            stmt = stmt.order_by(*order)
+
+            async def load(keys: list[Any]) -> list[list[Any]]:
+                db = await self._session()
+                result = await db.execute(stmt.where(fk.in_(keys)))
+                grouped: dict[Any, list[Any]] = {k: [] for k in keys}
+                for row in result.scalars().unique().all():
+                    grouped.setdefault(getattr(row, fk.key), []).append(row)
+                return [grouped[k] for k in keys]
+
+            self._loaders[key] = DataLoader(load_fn=load)
+        return self._loaders[key]
+
+    def related(self, attr: InstrumentedAttribute, *options: Any) -> DataLoader[Any, Any | None]:
+        """The ``by_id`` loader of the model referenced by a FK column or many-to-one relation."""
+        model, _fk = _referenced_model(attr)
+        return self.by_id(model, *options)
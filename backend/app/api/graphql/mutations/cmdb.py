@@ -23,6 +23,9 @@ from app.api.graphql.queries.cmdb import (
 from app.api.graphql.types.cmdb import (
     CIAttributeDefinitionInput,
     CIAttributeDefinitionUpdateInput,
+    CIBulkRowResultType,
+    CIBulkUpsertItemInput,
+    CIBulkUpsertResultType,
     CIClassCreateInput,
     CIClassDetailType,
     CIClassType,
@@ -89,6 +92,61 @@ class CMDBMutation:
         await db.refresh(ci, ["ci_class"])
         return _ci_to_gql(ci)
 
+    @strawberry.mutation
+    async def bulk_upsert_cis(
+        self,
+        info: Info,
+        tenant_id: uuid.UUID,
+        items: list[CIBulkUpsertItemInput],
+        key_field: str = "pulumi_urn",
+        reason: str | None = None,
+    ) -> CIBulkUpsertResultType:
+        """Create or update CIs in one batch, matched on Pulumi URN or cloud resource ID."""
+        await check_graphql_permission(info, "cmdb:ci:create", str(tenant_id))
+        await check_graphql_permission(info, "cmdb:ci:update", str(tenant_id))
+        from app.services.cmdb.ci_bulk_service import CIBulkService
+
+        db = await _get_session(info)
+        rows = [
+            {
+                "ci_class_id": item.ci_class_id,
+                "name": item.name,
+                "description": item.description,
+                "compartment_id": item.compartment_id,
+                "lifecycle_state": item.lifecycle_state,
+                "attributes": item.attributes,
+                "tags": item.tags,
+                "cloud_resource_id": item.cloud_resource_id,
+                "pulumi_urn": item.pulumi_urn,
+                "backend_id": item.backend_id,
+            }
+            for item in items
+        ]
+        report = await CIBulkService(db).bulk_upsert(
+            str(tenant_id),
+            rows,
+            key_field=key_field,
+            reason=reason,
+        )
+        await db.commit()
+        return CIBulkUpsertResultType(
+            created=report.created,
+            updated=report.updated,
+            unchanged=report.unchanged,
+            failed=report.failed,
+            results=[
+                CIBulkRowResultType(
+                    index=r.index,
+                    key=r.key,
+                    status=r.status,
+                    ci_id=uuid.UUID(r.ci_id) if r.ci_id else None,
+                    version=r.version,
+                    error=r.error,
+                )
+                for r in report.results
+            ],
+        )
+
     @strawberry.mutation
     async def update_ci(
         self,
@@ -6,6 +6,7 @@ Dependencies: strawberry, app.services.cmdb.*
 Concepts: Delivery mutations enforce permission checks and commit within session context.
 """
 
+import logging
 import uuid
 
 
@@ -43,6 +44,7 @@ from app.api.graphql.types.delivery import (
     DeliveryRegionUpdateInput,
     EstimationLineItemCreateInput,
     EstimationLineItemType,
+    EstimationRecalcStartedType,
     InternalRateCardCreateInput,
     InternalRateCardType,
     InternalRateCardUpdateInput,
@@ -74,6 +76,8 @@ from app.api.graphql.types.delivery import (
     TenantRegionAcceptanceType,
 )
 
+logger = logging.getLogger(__name__)
+
 
 async def _get_session(info: Info):
     """Get shared DB session from NimbusContext, falling back to new session."""
@@ -116,7 +120,7 @@ class DeliveryMutation:
         }
         r = await service.create_region(str(tenant_id), data)
         await db.commit()
-        return _region_to_gql(r)
+        return _region_to_gql(r, tenant_id)
 
     @strawberry.mutation
     async def update_delivery_region(
@@ -149,7 +153,7 @@ class DeliveryMutation:
 
         r = await service.update_region(str(id), data)
         await db.commit()
-        return _region_to_gql(r)
+        return _region_to_gql(r, tenant_id)
 
     @strawberry.mutation
     async def delete_delivery_region(
@@ -345,7 +349,7 @@ class DeliveryMutation:
         }
         ou = await service.create_org_unit(str(tenant_id), data)
         await db.commit()
-        return _org_unit_to_gql(ou)
+        return _org_unit_to_gql(ou, tenant_id)
 
     @strawberry.mutation
     async def update_organizational_unit(
@@ -376,7 +380,7 @@ class DeliveryMutation:
 
         ou = await service.update_org_unit(str(id), data)
         await db.commit()
-        return _org_unit_to_gql(ou)
+        return _org_unit_to_gql(ou, tenant_id)
 
     @strawberry.mutation
     async def delete_organizational_unit(
@@ -1172,6 +1176,55 @@ class DeliveryMutation:
         await db.commit()
         return _estimation_to_gql(e)
 
+    @strawberry.mutation
+    async def recalculate_estimations(
+        self,
+        info: Info,
+        tenant_id: uuid.UUID,
+        price_list_id: uuid.UUID | None = None,
+        delivery_region_id: uuid.UUID | None = None,
+    ) -> EstimationRecalcStartedType:
+        """Start a bulk repricing of all draft estimations in scope."""
+        await check_graphql_permission(
+            info, "catalog:estimation:manage", str(tenant_id)
+        )
+
+        workflow_id = f"estimation-recalc-{tenant_id}-{uuid.uuid4().hex[:8]}"
+        warnings: list[str] = []
+        try:
+            from app.core.config import get_settings
+            from app.core.temporal import get_temporal_client
+            from app.workflows.estimation_recalc import EstimationRecalcParams
+
+            settings = get_settings()
+            client = await get_temporal_client()
+            await client.start_workflow(
+                "EstimationRecalcWorkflow",
+                EstimationRecalcParams(
+                    tenant_id=str(tenant_id),
+                    price_list_id=str(price_list_id) if price_list_id else None,
+                    delivery_region_id=(
+                        str(delivery_region_id) if delivery_region_id else None
+                    ),
+                ),
+                id=workflow_id,
+                task_queue=settings.temporal_task_queue,
+            )
+        except Exception:
+            logger.warning(
+                "Failed to start estimation recalculation for tenant %s",
+                tenant_id,
+                exc_info=True,
+            )
+            warnings.append(
+                "Workflow engine unavailable — recalculation will need to be retried"
+            )
+            return EstimationRecalcStartedType(
+                workflow_id=workflow_id, status="failed", warnings=warnings
+            )
+
+        return EstimationRecalcStartedType(workflow_id=workflow_id, status="started")
+
     # ── Price List Templates ──────────────────────────────────────────
 
     @strawberry.mutation
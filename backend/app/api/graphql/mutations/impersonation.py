@@ -56,16 +56,12 @@ class ImpersonationConfigInput:
 
 async def _get_authenticated_user_id(info: Info) -> str:
     """Extract authenticated user ID from GraphQL context request."""
-    request = info.context["request"]
-    auth_header = request.headers.get("authorization", "")
-    if not auth_header.startswith("Bearer "):
-        raise ValueError("Not authenticated")
-
-    token = auth_header[7:]
-    from app.services.auth.jwt import decode_token
+    from app.services.auth.principal import resolve_principal
 
-    payload = decode_token(token)
-    return payload["sub"]
+    principal = resolve_principal(info.context["request"])
+    if principal is None:
+        raise ValueError("Not authenticated")
+    return principal.user_id
 
 
 async def _get_session(info: Info):
@@ -489,27 +489,66 @@ class LandingZoneMutation:
 
         db = await _get_session(info)
         svc = IpamService()
-        cidr = await svc.suggest_next_block(
-            db, input.address_space_id, input.prefix_length,
-        )
-        if not cidr:
-            raise ValueError(
-                f"No available /{input.prefix_length} block in address space"
-            )
-        alloc = await svc.allocate_block(
-            db, input.address_space_id, input.subnet_name, cidr,
+        alloc = await svc.allocate_next_block(
+            db, input.address_space_id, input.subnet_name, input.prefix_length,
             "SUBNET",
             tenant_environment_id=input.environment_id,
             purpose=f"Subnet: {input.subnet_name}",
         )
         await db.commit()
         # Calculate gateway as first usable IP
-        net = ipaddress.ip_network(cidr, strict=False)
+        net = ipaddress.ip_network(alloc.cidr, strict=False)
         gateway = str(net.network_address + 1)
         return SubnetIpamAllocationResult(
-            cidr=cidr, gateway=gateway, allocation_id=alloc.id,
+            cidr=alloc.cidr, gateway=gateway, allocation_id=alloc.id,
         )
 
+    @strawberry.mutation
+    async def allocate_subnets_from_ipam(
+        self, info: Info, tenant_id: uuid.UUID, inputs: list[SubnetIpamAllocationInput],
+    ) -> list[SubnetIpamAllocationResult]:
+        """Allocate CIDR blocks for several subnets in one transaction — all or none."""
+        await check_graphql_permission(info, "ipam:allocation:manage", str(tenant_id))
+
+        import ipaddress
+
+        from app.services.ipam.ipam_service import BlockRequest, IpamService
+
+        db = await _get_session(info)
+        svc = IpamService()
+        by_space: dict[uuid.UUID, list[int]] = {}
+        for i, item in enumerate(inputs):
+            by_space.setdefault(item.address_space_id, []).append(i)
+
+        allocations: dict = {}
+        # Lock address spaces in a fixed order so concurrent batches cannot deadlock
+        for space_id in sorted(by_space, key=str):
+            indexes = by_space[space_id]
+            created = await svc.allocate_blocks(
+                db, space_id,
+                [
+                    BlockRequest(
+                        name=inputs[i].subnet_name,
+                        allocation_type="SUBNET",
+                        prefix_length=inputs[i].prefix_length,
+                        tenant_environment_id=inputs[i].environment_id,
+                        purpose=f"Subnet: {inputs[i].subnet_name}",
+                    )
+                    for i in indexes
+                ],
+            )
+            allocations.update(zip(indexes, created, strict=True))
+        await db.commit()
+
+        results = []
+        for i in range(len(inputs)):
+            alloc = allocations[i]
+            net = ipaddress.ip_network(alloc.cidr, strict=False)
+            results.append(SubnetIpamAllocationResult(
+                cidr=alloc.cidr, gateway=str(net.network_address + 1), allocation_id=alloc.id,
+            ))
+        return results
+
     @strawberry.mutation
     async def release_subnet_ipam_allocation(
         self, info: Info, tenant_id: uuid.UUID, allocation_id: uuid.UUID,
@@ -0,0 +1,171 @@
+"""
+Overview: Automatic persisted queries and a parsed/validated document cache for GraphQL.
+Architecture: Strawberry schema extension ahead of parsing and validation (Section 7.2)
+Dependencies: strawberry, graphql-core, app.services.events.valkey_client, app.core.config
+Concepts: Every document is keyed by the SHA-256 of its text and kept parsed, with its
+    validation result, in a per-process LRU, so repeated operations skip parse and validate.
+    Clients may send only ``extensions.persistedQuery.sha256Hash`` (Apollo APQ protocol); an
+    unknown hash answers PERSISTED_QUERY_NOT_FOUND and the client retries once with the full
+    text, which registers it. Registered texts are also stored in Valkey so other workers can
+    resolve the hash without a round trip to the client.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+
+from graphql import DocumentNode, GraphQLError, parse
+from strawberry.extensions import SchemaExtension
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+VALKEY_PREFIX = "nimbus:graphql:pq:"
+
+
+@dataclass
+class CachedDocument:
+    query: str
+    document: DocumentNode
+    errors: list[GraphQLError] | None = None  # None until validated
+
+
+class DocumentCache:
+    """LRU of parsed documents keyed by query hash."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedDocument] = OrderedDict()
+
+    def get(self, digest: str) -> CachedDocument | None:
+        entry = self._entries.get(digest)
+        if entry is not None:
+            self._entries.move_to_end(digest)
+        return entry
+
+    def put(self, digest: str, query: str) -> CachedDocument:
+        """Parse and cache ``query``. Raises GraphQLError on syntax errors (nothing cached)."""
+        entry = CachedDocument(query=query, document=parse(query))
+        self._entries[digest] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+_cache: DocumentCache | None = None
+
+
+def get_document_cache() -> DocumentCache:
+    """The process-wide GraphQL document cache."""
+    global _cache
+    if _cache is None:
+        _cache = DocumentCache(get_settings().graphql_document_cache_size)
+    return _cache
+
+
+async def _load_persisted(digest: str) -> str | None:
+    from app.services.events.valkey_client import get_valkey_client
+
+    client = await get_valkey_client()
+    if client is None:
+        return None
+    try:
+        return await client.get(VALKEY_PREFIX + digest)
+    except Exception:
+        logger.debug("Persisted query lookup failed", exc_info=True)
+        return None
+
+
+async def _store_persisted(digest: str, query: str) -> None:
+    from app.services.events.valkey_client import get_valkey_client
+
+    client = await get_valkey_client()
+    if client is None:
+        return
+    try:
+        await client.set(
+            VALKEY_PREFIX + digest, query, ex=get_settings().graphql_persisted_query_ttl_seconds
+        )
+    except Exception:
+        logger.debug("Persisted query registration failed", exc_info=True)
+
+
+def _error(message: str, code: str) -> GraphQLError:
+    return GraphQLError(message, extensions={"code": code})
+
+
+class PersistedQueryExtension(SchemaExtension):
+    """Resolves persisted query hashes and serves parse/validate results from the cache."""
+
+    _entry: CachedDocument | None = None
+
+    async def on_operation(self) -> AsyncIterator[None]:
+        ctx = self.execution_context
+        cache = get_document_cache()
+        persisted = (ctx.operation_extensions or {}).get("persistedQuery")
+        register = False
+
+        if persisted is not None:
+            digest = persisted.get("sha256Hash") if isinstance(persisted, dict) else None
+            if not isinstance(digest, str):
+                raise _error("Invalid persisted query", "PERSISTED_QUERY_INVALID")
+            if ctx.query is None:
+                entry = cache.get(digest)
+                if entry is None:
+                    query = await _load_persisted(digest)
+                    if query is None or query_hash(query) != digest:
+                        raise _error("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+                    ctx.query = query
+                else:
+                    ctx.query = entry.query
+            elif query_hash(ctx.query) != digest:
+                raise _error("provided sha does not match query", "PERSISTED_QUERY_INVALID")
+            else:
+                register = cache.get(digest) is None
+        elif ctx.query:
+            digest = query_hash(ctx.query)
+
+        if ctx.query:
+            entry = cache.get(digest)
+            if entry is None:
+                try:
+                    entry = cache.put(digest, ctx.query)
+                except GraphQLError:
+                    entry = None  # let the normal parse step report the syntax error
+                else:
+                    if register:
+                        await _store_persisted(digest, ctx.query)
+            if entry is not None:
+                ctx.graphql_document = entry.document
+                self._entry = entry
+        yield
+
+    def on_validate(self) -> Iterator[None]:
+        ctx = self.execution_context
+        entry = self._entry
+        if entry is not None and ctx.graphql_document is entry.document:
+            if entry.errors is not None:
+                ctx.pre_execution_errors = list(entry.errors)
+            else:
+                from strawberry.schema.schema import validate_document
+
+                entry.errors = validate_document(
+                    ctx.schema._schema, entry.document, ctx.validation_rules
+                )
+                ctx.pre_execution_errors = list(entry.errors)
+        yield
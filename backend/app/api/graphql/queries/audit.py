@@ -25,6 +25,12 @@ from app.api.graphql.types.audit import (
     TaxonomyResponseGQL,
     VerifyChainResultType,
 )
+from app.api.graphql.types.pagination import (
+    Connection,
+    ConnectionTotalGQL,
+    to_connection,
+    total_mode,
+)
 
 
 async def _get_session(info: Info):
@@ -76,6 +82,52 @@ class AuditQuery:
             limit=params.limit,
         )
 
+    @strawberry.field
+    async def audit_logs_connection(
+        self,
+        info: Info,
+        tenant_id: uuid.UUID,
+        search: AuditSearchInput | None = None,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        total: ConnectionTotalGQL = ConnectionTotalGQL.NONE,
+    ) -> Connection[AuditLogType]:
+        """Search audit logs newest first as a cursor-paginated connection.
+
+        The offset and limit fields of ``search`` are ignored; use first/after and last/before.
+        """
+        await check_graphql_permission(info, "audit:log:read", str(tenant_id))
+        from app.services.audit.query import AuditQueryService
+
+        params = search or AuditSearchInput()
+
+        db = await _get_session(info)
+        service = AuditQueryService(db)
+        page = await service.search_page(
+            str(tenant_id),
+            date_from=params.date_from,
+            date_to=params.date_to,
+            actor_id=str(params.actor_id) if params.actor_id else None,
+            action=params.action,
+            event_categories=(
+                [c.value for c in params.event_categories] if params.event_categories else None
+            ),
+            event_types=params.event_types,
+            resource_type=params.resource_type,
+            resource_id=params.resource_id,
+            priority=params.priority,
+            trace_id=params.trace_id,
+            full_text=params.full_text,
+            first=first,
+            after=after,
+            last=last,
+            before=before,
+            total=total_mode(total),
+        )
+        return to_connection(page, _to_audit_log_type)
+
     @strawberry.field
     async def audit_log(
         self, info: Info, tenant_id: uuid.UUID, log_id: uuid.UUID
@@ -136,9 +188,15 @@ class AuditQuery:
 
         db = await _get_session(info)
         service = RetentionService(db)
-        policy = await service.get_or_create_policy(str(tenant_id))
+        policy = await service.get_policy(str(tenant_id))
+        if policy is None:
+            # Queries may read from the replica: the default policy is created on the primary
+            from app.db.session import async_session_factory
+
+            async with async_session_factory() as primary:
+                policy = await RetentionService(primary).get_or_create_policy(str(tenant_id))
+                await primary.commit()
         overrides = await service.list_category_overrides(str(tenant_id))
-        await db.commit()
         return RetentionPolicyType(
             id=policy.id,
             tenant_id=policy.tenant_id,
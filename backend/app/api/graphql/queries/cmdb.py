@@ -9,13 +9,16 @@ Concepts: Read-only queries with permission checks, converter helpers, and pagin
 import uuid
 
 import strawberry
+from strawberry.scalars import JSON
 from strawberry.types import Info
 
 from app.api.graphql.auth import check_graphql_permission
 from app.api.graphql.types.cmdb import (
+    BatchImpactType,
     CIAttributeDefinitionType,
     CIClassDetailType,
     CIClassType,
+    CIImpactSetType,
     CIListType,
     CIRelationshipType,
     CISnapshotType,
@@ -26,11 +29,18 @@ from app.api.graphql.types.cmdb import (
     CompartmentNodeType,
     ExplorerSummaryType,
     GraphNodeType,
+    ImpactNodeType,
     LifecycleStateGQL,
     RelationshipTypeType,
     SavedSearchType,
     VersionDiffType,
 )
+from app.api.graphql.types.pagination import (
+    Connection,
+    ConnectionTotalGQL,
+    to_connection,
+    total_mode,
+)
 
 
 async def _get_session(info: Info):
@@ -234,6 +244,45 @@ class CMDBQuery:
             total=total,
         )
 
+    @strawberry.field
+    async def cis_connection(
+        self,
+        info: Info,
+        tenant_id: uuid.UUID,
+        ci_class_id: uuid.UUID | None = None,
+        compartment_id: uuid.UUID | None = None,
+        backend_id: uuid.UUID | None = None,
+        lifecycle_state: str | None = None,
+        search: str | None = None,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        total: ConnectionTotalGQL = ConnectionTotalGQL.NONE,
+    ) -> Connection[CIType]:
+        """List CIs by name as a cursor-paginated connection."""
+        await check_graphql_permission(info, "cmdb:ci:read", str(tenant_id))
+        from app.services.cmdb.ci_service import CIService
+
+        db = await _get_session(info)
+        service = CIService(db)
+        page = await service.list_cis_page(
+            tenant_id=str(tenant_id),
+            ci_class_id=str(ci_class_id) if ci_class_id else None,
+            compartment_id=(
+                str(compartment_id) if compartment_id else None
+            ),
+            backend_id=str(backend_id) if backend_id else None,
+            lifecycle_state=lifecycle_state,
+            search=search,
+            first=first,
+            after=after,
+            last=last,
+            before=before,
+            total=total_mode(total),
+        )
+        return to_connection(page, _ci_to_gql)
+
     # ── CI Versions ───────────────────────────────────────────────────
 
     @strawberry.field
@@ -281,6 +330,7 @@ class CMDBQuery:
             version_a=diff.get("version_a", version_a),
             version_b=diff.get("version_b", version_b),
             changes=diff.get("changes", {}),
+            paths=diff.get("paths"),
         )
 
     # ── CI Classes ────────────────────────────────────────────────────
@@ -455,6 +505,47 @@ class CMDBQuery:
             for n in nodes
         ]
 
+    @strawberry.field
+    async def ci_batch_impact(
+        self,
+        info: Info,
+        tenant_id: uuid.UUID,
+        ci_ids: list[uuid.UUID],
+        direction: str = "downstream",
+        max_depth: int = 5,
+    ) -> BatchImpactType:
+        """Blast radius of a set of CIs: union and per-CI impact sets with depths."""
+        await check_graphql_permission(info, "cmdb:ci:read", str(tenant_id))
+        from app.services.cmdb.graph_service import GraphService
+
+        db = await _get_session(info)
+        service = GraphService(db)
+        result = await service.batch_impact(
+            [str(c) for c in ci_ids], str(tenant_id), direction, max_depth
+        )
+
+        def entries(reached: dict[str, int]) -> list[ImpactNodeType]:
+            items = []
+            for ci_id, depth in reached.items():
+                name, ci_class = result.nodes.get(ci_id) or (ci_id, "")
+                items.append(ImpactNodeType(ci_id=ci_id, name=name, ci_class=ci_class, depth=depth))
+            items.sort(key=lambda n: (n.depth, n.name))
+            return items
+
+        sources = list(result.downstream) or list(result.upstream)
+        return BatchImpactType(
+            downstream=entries(result.downstream_union),
+            upstream=entries(result.upstream_union),
+            per_ci=[
+                CIImpactSetType(
+                    ci_id=ci_id,
+                    downstream=entries(result.downstream.get(ci_id, {})),
+                    upstream=entries(result.upstream.get(ci_id, {})),
+                )
+                for ci_id in sources
+            ],
+        )
+
     # ── Compartments ──────────────────────────────────────────────────
 
     @strawberry.field
@@ -513,12 +604,13 @@ class CMDBQuery:
         ci_class_id: uuid.UUID | None = None,
         compartment_id: uuid.UUID | None = None,
         lifecycle_state: str | None = None,
+        tags: JSON | None = None,
         offset: int = 0,
         limit: int = 50,
     ) -> CIListType:
-        """Search CIs with full-text query and filters."""
+        """Search CIs with a ranked text query and filters; totals are capped."""
         await check_graphql_permission(info, "cmdb:ci:read", str(tenant_id))
-        from app.services.cmdb.search_service import SearchService
+        from app.services.cmdb.search_service import DEFAULT_COUNT_CAP, SearchService
 
         db = await _get_session(info)
         service = SearchService(db)
@@ -530,13 +622,54 @@ class CMDBQuery:
                 str(compartment_id) if compartment_id else None
             ),
             lifecycle_state=lifecycle_state,
+            tags=tags,
             offset=offset,
             limit=limit,
         )
         return CIListType(
             items=[_ci_to_gql(ci) for ci in items],
             total=total,
+            total_capped=total >= DEFAULT_COUNT_CAP,
+        )
+
+    @strawberry.field
+    async def search_cis_connection(
+        self,
+        info: Info,
+        tenant_id: uuid.UUID,
+        query: str | None = None,
+        ci_class_id: uuid.UUID | None = None,
+        compartment_id: uuid.UUID | None = None,
+        lifecycle_state: str | None = None,
+        tags: JSON | None = None,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        total: ConnectionTotalGQL = ConnectionTotalGQL.NONE,
+    ) -> Connection[CIType]:
+        """Ranked CI search as a cursor-paginated connection."""
+        await check_graphql_permission(info, "cmdb:ci:read", str(tenant_id))
+        from app.services.cmdb.search_service import SearchService
+
+        db = await _get_session(info)
+        service = SearchService(db)
+        page = await service.search_cis_page(
+            tenant_id=str(tenant_id),
+            query=query,
+            ci_class_id=str(ci_class_id) if ci_class_id else None,
+            compartment_id=(
+                str(compartment_id) if compartment_id else None
+            ),
+            lifecycle_state=lifecycle_state,
+            tags=tags,
+            first=first,
+            after=after,
+            last=last,
+            before=before,
+            total=total_mode(total),
         )
+        return to_connection(page, _ci_to_gql)
 
     @strawberry.field
     async def saved_searches(
@@ -30,6 +30,7 @@ from app.api.graphql.types.delivery import (
     ProcessActivityLinkType,
     ProfitabilityByEntityType,
     ProfitabilityOverviewType,
+    ProfitabilityTrendPointType,
     RegionAcceptanceTemplateRuleType,
     RegionAcceptanceTemplateType,
     ServiceProcessAssignmentType,
@@ -44,7 +45,7 @@ from app.api.graphql.types.delivery import (
 # ── Helper converters ────────────────────────────────────────────────
 
 
-def _region_to_gql(r) -> DeliveryRegionType:
+def _region_to_gql(r, scope_tenant_id: uuid.UUID | None = None) -> DeliveryRegionType:
     return DeliveryRegionType(
         id=r.id,
         tenant_id=r.tenant_id,
@@ -59,6 +60,7 @@ def _region_to_gql(r) -> DeliveryRegionType:
         sort_order=r.sort_order,
         created_at=r.created_at,
         updated_at=r.updated_at,
+        scope_tenant_id=scope_tenant_id,
     )
 
 
@@ -99,7 +101,7 @@ def _tenant_acceptance_to_gql(a) -> TenantRegionAcceptanceType:
     )
 
 
-def _org_unit_to_gql(ou) -> OrganizationalUnitType:
+def _org_unit_to_gql(ou, scope_tenant_id: uuid.UUID | None = None) -> OrganizationalUnitType:
     return OrganizationalUnitType(
         id=ou.id,
         tenant_id=ou.tenant_id,
@@ -111,6 +113,7 @@ def _org_unit_to_gql(ou) -> OrganizationalUnitType:
         sort_order=ou.sort_order,
         created_at=ou.created_at,
         updated_at=ou.updated_at,
+        scope_tenant_id=scope_tenant_id,
     )
 
 
@@ -364,7 +367,7 @@ class DeliveryQuery:
             limit=limit,
         )
         return DeliveryRegionListType(
-            items=[_region_to_gql(r) for r in items],
+            items=[_region_to_gql(r, tenant_id) for r in items],
             total=total,
         )
 
@@ -385,7 +388,7 @@ class DeliveryQuery:
         db = await _get_session(info)
         service = DeliveryRegionService(db)
         r = await service.get_region(str(id))
-        return _region_to_gql(r) if r else None
+        return _region_to_gql(r, tenant_id) if r else None
 
     @strawberry.field
     async def region_children(
@@ -403,8 +406,8 @@ class DeliveryQuery:
 
         db = await _get_session(info)
         service = DeliveryRegionService(db)
-        children = await service.get_children(str(id))
-        return [_region_to_gql(r) for r in children]
+        children = await service.get_children(str(id), str(tenant_id))
+        return [_region_to_gql(r, tenant_id) for r in children]
 
     # ── Region Acceptance ─────────────────────────────────────────────
 
@@ -507,7 +510,7 @@ class DeliveryQuery:
         db = await _get_session(info)
         service = RateCardService(db)
         units = await service.list_org_units(str(tenant_id))
-        return [_org_unit_to_gql(ou) for ou in units]
+        return [_org_unit_to_gql(ou, tenant_id) for ou in units]
 
     # ── Staff Profiles ────────────────────────────────────────────────
 
@@ -927,3 +930,31 @@ class DeliveryQuery:
             )
             for item in items
         ]
+
+    @strawberry.field
+    async def profitability_trend(
+        self,
+        info: Info,
+        tenant_id: uuid.UUID,
+        months: int = 12,
+        client_tenant_id: uuid.UUID | None = None,
+        delivery_region_id: uuid.UUID | None = None,
+        service_offering_id: uuid.UUID | None = None,
+    ) -> list[ProfitabilityTrendPointType]:
+        """Get monthly profitability history, optionally filtered by one dimension."""
+        await check_graphql_permission(
+            info, "catalog:profitability:read", str(tenant_id)
+        )
+
+        from app.services.cmdb.profitability_service import ProfitabilityService
+
+        db = await _get_session(info)
+        service = ProfitabilityService(db)
+        items = await service.get_trend(
+            str(tenant_id),
+            months=months,
+            client_tenant_id=str(client_tenant_id) if client_tenant_id else None,
+            delivery_region_id=str(delivery_region_id) if delivery_region_id else None,
+            service_offering_id=str(service_offering_id) if service_offering_id else None,
+        )
+        return [ProfitabilityTrendPointType(**item) for item in items]
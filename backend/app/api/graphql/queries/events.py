@@ -19,6 +19,12 @@ from app.api.graphql.types.events import (
     event_type_to_gql,
     subscription_to_gql,
 )
+from app.api.graphql.types.pagination import (
+    Connection,
+    ConnectionTotalGQL,
+    to_connection,
+    total_mode,
+)
 
 
 async def _get_session(info: Info):
@@ -113,6 +119,38 @@ class EventQuery:
         )
         return [event_log_to_gql(e) for e in entries]
 
+    @strawberry.field
+    async def event_log_connection(
+        self,
+        info: Info,
+        tenant_id: uuid.UUID,
+        event_type_name: str | None = None,
+        source: str | None = None,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        total: ConnectionTotalGQL = ConnectionTotalGQL.NONE,
+    ) -> Connection[EventLogGQL]:
+        """List event log entries newest first as a cursor-paginated connection."""
+        await check_graphql_permission(info, "events:log:read", str(tenant_id))
+
+        from app.services.events.event_service import EventService
+
+        db = await _get_session(info)
+        svc = EventService(db)
+        page = await svc.list_event_log_page(
+            tenant_id=str(tenant_id),
+            event_type_name=event_type_name,
+            source=source,
+            first=first,
+            after=after,
+            last=last,
+            before=before,
+            total=total_mode(total),
+        )
+        return to_connection(page, event_log_to_gql)
+
     @strawberry.field
     async def event_log_entry(
         self, info: Info, tenant_id: uuid.UUID, id: uuid.UUID
@@ -22,6 +22,12 @@ from app.api.graphql.types.notification import (
     WebhookDeliveryStatusGQL,
     WebhookDeliveryType,
 )
+from app.api.graphql.types.pagination import (
+    Connection,
+    ConnectionTotalGQL,
+    to_connection,
+    total_mode,
+)
 
 
 async def _get_session(info: Info):
@@ -171,6 +177,44 @@ class NotificationQuery:
         )
 
 
+    @strawberry.field
+    async def webhook_deliveries_connection(
+        self,
+        info: Info,
+        tenant_id: uuid.UUID,
+        config_id: uuid.UUID | None = None,
+        status: WebhookDeliveryStatusGQL | None = None,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        total: ConnectionTotalGQL = ConnectionTotalGQL.NONE,
+    ) -> Connection[WebhookDeliveryType]:
+        """List webhook deliveries newest first as a cursor-paginated connection."""
+        await check_graphql_permission(
+            info, "notification:webhook:read", str(tenant_id)
+        )
+        from app.services.notification.webhook_delivery_service import WebhookDeliveryService
+
+        delivery_status = None
+        if status is not None:
+            from app.models.webhook_delivery import WebhookDeliveryStatus
+            delivery_status = WebhookDeliveryStatus(status.value)
+
+        db = await _get_session(info)
+        service = WebhookDeliveryService(db)
+        page = await service.list_deliveries_page(
+            tenant_id=str(tenant_id),
+            config_id=str(config_id) if config_id else None,
+            status=delivery_status,
+            first=first,
+            after=after,
+            last=last,
+            before=before,
+            total=total_mode(total),
+        )
+        return to_connection(page, _to_webhook_delivery_type)
+
 # -- Converters ---------------------------------------------------------------
 
 
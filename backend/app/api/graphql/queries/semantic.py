@@ -59,6 +59,36 @@ def _type_to_gql(t) -> SemanticResourceTypeType:
     )
 
 
+def _type_entry_to_gql(catalog, t) -> SemanticResourceTypeType:
+    """Convert a cached catalog TypeEntry, resolving category, parent, and children."""
+    parent = catalog.type(t.parent_type_id) if t.parent_type_id else None
+    return SemanticResourceTypeType(
+        id=t.id,
+        name=t.name,
+        display_name=t.display_name,
+        category=_category_to_type(catalog.category(t.category_id)),
+        description=t.description,
+        icon=t.icon,
+        is_abstract=t.is_abstract,
+        parent_type_name=parent.name if parent else None,
+        properties_schema=t.properties_schema,
+        allowed_relationship_kinds=(
+            list(t.allowed_relationship_kinds)
+            if t.allowed_relationship_kinds is not None
+            else None
+        ),
+        sort_order=t.sort_order,
+        is_system=t.is_system,
+        children=[
+            _type_entry_to_gql(catalog, c)
+            for c in catalog.children(t.id)
+            if catalog.category(c.category_id)
+        ],
+        created_at=t.created_at,
+        updated_at=t.updated_at,
+    )
+
+
 def _provider_to_gql(p) -> SemanticProviderType:
     return SemanticProviderType(
         id=p.id,
@@ -119,7 +149,7 @@ class SemanticQuery:
 
         db = await _get_session(info)
         service = SemanticService(db)
-        categories = await service.list_categories()
+        catalog = await service.get_catalog()
         return [
             SemanticCategoryWithTypesType(
                 id=c.id,
@@ -130,15 +160,11 @@ class SemanticQuery:
                 sort_order=c.sort_order,
                 is_system=c.is_system,
                 is_infrastructure=c.is_infrastructure,
-                types=[
-                    _type_to_gql(t)
-                    for t in sorted(c.types, key=lambda x: x.sort_order)
-                    if t.deleted_at is None
-                ],
+                types=[_type_entry_to_gql(catalog, t) for t in catalog.types_in(c.id)],
                 created_at=c.created_at,
                 updated_at=c.updated_at,
             )
-            for c in categories
+            for c in catalog.categories
         ]
 
     @strawberry.field
@@ -200,7 +226,7 @@ class SemanticQuery:
 
         db = await _get_session(info)
         service = SemanticService(db)
-        kinds = await service.list_relationship_kinds()
+        catalog = await service.get_catalog()
         return [
             SemanticRelationshipKindType(
                 id=k.id,
@@ -212,7 +238,7 @@ class SemanticQuery:
                 created_at=k.created_at,
                 updated_at=k.updated_at,
             )
-            for k in kinds
+            for k in catalog.relationship_kinds
         ]
 
     # -- Provider queries --------------------------------------------------
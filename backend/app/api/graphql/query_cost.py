@@ -0,0 +1,287 @@
+"""
+Overview: Static GraphQL query cost, depth and alias limits with a per-tenant cost budget.
+Architecture: Strawberry schema extension run before execution (Section 7.2)
+Dependencies: strawberry, graphql-core, app.core.config
+Concepts: Cost is computed from the validated document before any resolver runs. Every field
+    returning an object costs its weight (1 unless overridden in FIELD_WEIGHTS, root mutation
+    fields 10), scalars are free, and a list multiplies the cost of an item by the requested
+    page size — the ``limit``/``first`` argument of the list field or of the paginated field
+    wrapping it, else the argument default. An unpaginated list counts
+    ``graphql_default_list_size`` items at the outermost level only; nested inside another
+    list it is that item's own collection (tree children, a category's types) and is charged
+    once per enclosing item, so nesting does not grow the estimate as size^depth. Introspection
+    is not counted. Operations over the depth, alias, or cost limit are rejected; within the
+    limit, each tenant draws cost from a token bucket and is throttled once it is empty.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    GraphQLNamedType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    IntValueNode,
+    SelectionSetNode,
+    VariableNode,
+    get_named_type,
+    get_nullable_type,
+    is_composite_type,
+)
+from graphql.utilities import get_operation_ast
+from strawberry.extensions import SchemaExtension
+
+from app.core.config import get_settings
+
+# Per-field weight overrides ("Type.field"), for resolvers much heavier than a row lookup
+FIELD_WEIGHTS: dict[str, int] = {
+    "Query.ciGraph": 50,
+    "Query.ciImpact": 50,
+    "Query.ciBatchImpact": 100,
+    "Query.searchCis": 10,
+}
+MUTATION_WEIGHT = 10
+SIZE_ARGUMENTS = ("limit", "first", "last", "pageSize")
+
+
+@dataclass(frozen=True)
+class QueryCost:
+    cost: int
+    depth: int
+    aliases: int
+
+
+class _Analyzer:
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        fragments: Mapping[str, FragmentDefinitionNode],
+        variables: Mapping[str, Any],
+        default_list_size: int,
+    ) -> None:
+        self.schema = schema
+        self.fragments = fragments
+        self.variables = variables
+        self.default_list_size = default_list_size
+        self.max_depth = 0
+        self.aliases = 0
+
+    def selection_cost(
+        self,
+        parent: GraphQLNamedType,
+        selection_set: SelectionSetNode,
+        depth: int,
+        page_size: int | None,
+        root_weight: int | None = None,
+        in_list: bool = False,
+    ) -> int:
+        total = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                total += self.field_cost(
+                    parent, selection, depth, page_size, root_weight, in_list
+                )
+            elif isinstance(selection, InlineFragmentNode):
+                target = parent
+                if selection.type_condition is not None:
+                    target = self.schema.get_type(selection.type_condition.name.value) or parent
+                total += self.selection_cost(
+                    target, selection.selection_set, depth, page_size, root_weight, in_list
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = self.fragments.get(selection.name.value)
+                if fragment is not None:
+                    target = self.schema.get_type(fragment.type_condition.name.value) or parent
+                    total += self.selection_cost(
+                        target, fragment.selection_set, depth, page_size, root_weight, in_list
+                    )
+        return total
+
+    def field_cost(
+        self,
+        parent: GraphQLNamedType,
+        node: FieldNode,
+        depth: int,
+        page_size: int | None,
+        root_weight: int | None,
+        in_list: bool,
+    ) -> int:
+        name = node.name.value
+        if name.startswith("__"):
+            return 0
+        field = getattr(parent, "fields", {}).get(name)
+        if field is None:
+            return 0
+        if node.alias is not None:
+            self.aliases += 1
+        self.max_depth = max(self.max_depth, depth)
+
+        named = get_named_type(field.type)
+        if not is_composite_type(named):
+            return 0
+        weight = FIELD_WEIGHTS.get(f"{parent.name}.{name}")
+        if weight is None:
+            weight = root_weight if root_weight is not None else 1
+
+        size = self.size_argument(node, field)
+        if isinstance(get_nullable_type(field.type), GraphQLList):
+            items = size or page_size
+            if items is None:
+                # Unpaginated lists inside another list are an item's own collection
+                # (tree children, a category's types): charged once per enclosing item
+                items = 1 if in_list else self.default_list_size
+            child_page_size = None
+            child_in_list = True
+        else:
+            items = 1
+            child_page_size = size or page_size
+            child_in_list = in_list
+        children = 0
+        if node.selection_set is not None:
+            children = self.selection_cost(
+                named, node.selection_set, depth + 1, child_page_size, in_list=child_in_list
+            )
+        return items * (weight + children)
+
+    def size_argument(self, node: FieldNode, field: Any) -> int | None:
+        given = {arg.name.value: arg.value for arg in node.arguments or ()}
+        for name in SIZE_ARGUMENTS:
+            if name not in field.args:
+                continue
+            value = given.get(name)
+            if isinstance(value, IntValueNode):
+                return max(int(value.value), 0)
+            if isinstance(value, VariableNode):
+                variable = self.variables.get(value.name.value)
+                if isinstance(variable, int):
+                    return max(variable, 0)
+            default = field.args[name].default_value
+            if isinstance(default, int):
+                return default
+        return None
+
+
+def analyze_query(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    operation_name: str | None = None,
+    variables: Mapping[str, Any] | None = None,
+    default_list_size: int = 20,
+) -> QueryCost:
+    """Static cost, depth and alias count of the selected operation."""
+    operation = get_operation_ast(document, operation_name)
+    if operation is None:
+        return QueryCost(0, 0, 0)
+    root = schema.get_root_type(operation.operation)
+    if root is None:
+        return QueryCost(0, 0, 0)
+    fragments = {
+        d.name.value: d for d in document.definitions if isinstance(d, FragmentDefinitionNode)
+    }
+    analyzer = _Analyzer(schema, fragments, variables or {}, default_list_size)
+    root_weight = MUTATION_WEIGHT if root is schema.mutation_type else None
+    cost = analyzer.selection_cost(root, operation.selection_set, 1, None, root_weight)
+    return QueryCost(cost=cost, depth=analyzer.max_depth, aliases=analyzer.aliases)
+
+
+class CostBudget:
+    """Per-key token buckets of query cost."""
+
+    def __init__(self, rate_per_second: float, burst: float) -> None:
+        self.rate = rate_per_second
+        self.burst = burst
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def take(self, key: str, cost: float) -> float:
+        """Draw ``cost``; return 0 if allowed, else seconds until it would be."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < cost:
+            self._buckets[key] = (tokens, now)
+            return (cost - tokens) / self.rate
+        self._buckets[key] = (tokens - cost, now)
+        return 0.0
+
+
+_budget: CostBudget | None = None
+
+
+def get_cost_budget() -> CostBudget:
+    """The process-wide per-tenant cost budget."""
+    global _budget
+    if _budget is None:
+        settings = get_settings()
+        _budget = CostBudget(
+            settings.graphql_tenant_cost_per_second, settings.graphql_tenant_cost_burst
+        )
+    return _budget
+
+
+def _budget_key(context: Any) -> str:
+    request = getattr(context, "request", None)
+    if request is None:
+        return "anonymous"
+    tenant_id = getattr(request.state, "current_tenant_id", None)
+    if tenant_id:
+        return f"tenant:{tenant_id}"
+    client = getattr(request, "client", None)
+    return f"ip:{client.host}" if client else "anonymous"
+
+
+class QueryCostExtension(SchemaExtension):
+    """Rejects operations over the static limits and throttles tenants over their budget."""
+
+    _cost: QueryCost | None = None
+
+    def on_execute(self) -> Iterator[None]:
+        ctx = self.execution_context
+        settings = get_settings()
+        # A response served from cache (set by an earlier extension) costs nothing
+        if ctx.graphql_document is not None and ctx.result is None:
+            cost = analyze_query(
+                ctx.schema._schema,
+                ctx.graphql_document,
+                ctx.operation_name,
+                ctx.variables,
+                settings.graphql_default_list_size,
+            )
+            self._cost = cost
+            if cost.depth > settings.graphql_max_depth:
+                raise GraphQLError(
+                    f"Query depth {cost.depth} exceeds the limit of {settings.graphql_max_depth}",
+                    extensions={"code": "QUERY_TOO_DEEP"},
+                )
+            if cost.aliases > settings.graphql_max_aliases:
+                raise GraphQLError(
+                    f"{cost.aliases} aliases exceed the limit of {settings.graphql_max_aliases}",
+                    extensions={"code": "TOO_MANY_ALIASES"},
+                )
+            if cost.cost > settings.graphql_max_cost:
+                raise GraphQLError(
+                    f"Query cost {cost.cost} exceeds the limit of {settings.graphql_max_cost}",
+                    extensions={"code": "QUERY_TOO_COMPLEX", "cost": cost.cost},
+                )
+            wait = get_cost_budget().take(_budget_key(ctx.context), cost.cost)
+            if wait:
+                raise GraphQLError(
+                    "Query budget exhausted for this tenant",
+                    extensions={"code": "RATE_LIMITED", "retryAfter": math.ceil(wait)},
+                )
+        yield
+
+    def get_results(self) -> dict[str, Any]:
+        if self._cost is None or not get_settings().debug:
+            return {}
+        return {"cost": {"cost": self._cost.cost, "depth": self._cost.depth}}
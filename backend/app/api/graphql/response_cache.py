@@ -0,0 +1,169 @@
+"""
+Overview: Per-tenant GraphQL response cache for read-mostly catalog queries.
+Architecture: Strawberry schema extension around execution (Section 7.2)
+Dependencies: strawberry, graphql-core, app.api.graphql.auth, app.api.graphql.persisted_queries,
+    app.services.cache.response_cache, app.core.config
+Concepts: Query operations whose root fields are all in CACHEABLE_FIELDS are answered from the
+    response cache, keyed by tenant, document hash, operation name and variables. A miss
+    executes normally while the session records the tables and rows read; a result without
+    errors is stored with those tags and with the permissions granted while resolving it.
+    A hit first replays those permission checks for the current caller, so a cached response
+    is only served to callers who would have been allowed to produce it. Commits touching a
+    tagged table or row invalidate the entry.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from graphql import ExecutionResult, FieldNode, OperationType
+from graphql.utilities import get_operation_ast
+from strawberry.extensions import SchemaExtension
+
+from app.api.graphql.persisted_queries import query_hash
+from app.core.config import get_settings
+from app.services.cache.response_cache import (
+    RECORDER_KEY,
+    CachedResponse,
+    TagRecorder,
+    get_response_cache,
+)
+
+_SEMANTIC_CATALOG = (
+    "semantic_categories",
+    "semantic_resource_types",
+    "semantic_relationship_kinds",
+)
+
+# Root query fields whose results are cacheable (read-mostly catalog and reference data), with
+# tags every entry gets regardless of what it read. Semantic catalog fields are answered from
+# the in-process catalog snapshot without SQL, so they carry the catalog tables explicitly;
+# option catalogs are code-defined and only expire with the TTL.
+CACHEABLE_FIELDS: dict[str, tuple[str, ...]] = {
+    "semanticCategories": _SEMANTIC_CATALOG,
+    "semanticTypes": _SEMANTIC_CATALOG,
+    "semanticType": _SEMANTIC_CATALOG,
+    "semanticRelationshipKinds": _SEMANTIC_CATALOG,
+    "semanticProviders": (),
+    "semanticProvider": (),
+    "semanticActivityTypes": (),
+    "semanticActivityType": (),
+    "serviceOfferings": (),
+    "serviceOffering": (),
+    "serviceOfferingCategories": (),
+    "serviceCatalogs": (),
+    "serviceCatalog": (),
+    "priceLists": (),
+    "priceListVersions": (),
+    "priceListTemplates": (),
+    "priceListTemplate": (),
+    "deliveryRegions": (),
+    "deliveryRegion": (),
+    "regionChildren": (),
+    "envConfigOptionCatalog": ("option_catalogs",),
+    "envConfigOptionCategories": ("option_catalogs",),
+    "lzConfigOptionCatalog": ("option_catalogs",),
+    "lzConfigOptionCategories": ("option_catalogs",),
+}
+
+
+def _root_fields(ctx: Any) -> list[str] | None:
+    """Root field names of the operation, or None if it is not a plain query."""
+    operation = get_operation_ast(ctx.graphql_document, ctx.operation_name)
+    if operation is None or operation.operation is not OperationType.QUERY:
+        return None
+    names = []
+    for selection in operation.selection_set.selections:
+        if not isinstance(selection, FieldNode):
+            return None
+        if selection.name.value != "__typename":
+            names.append(selection.name.value)
+    return names
+
+
+def _tenant_of(context: Any) -> str:
+    request = getattr(context, "request", None)
+    state = getattr(request, "state", None)
+    return str(getattr(state, "current_tenant_id", None) or "")
+
+
+def cache_key(context: Any, query: str, operation_name: str | None, variables: Any) -> str:
+    payload = json.dumps(
+        [_tenant_of(context), query_hash(query), operation_name, variables or {}],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCacheExtension(SchemaExtension):
+    """Serves allowlisted query operations from the tagged response cache."""
+
+    async def on_execute(self) -> AsyncIterator[None]:
+        ctx = self.execution_context
+        context = ctx.context
+        if (
+            not get_settings().graphql_response_cache_enabled
+            or ctx.graphql_document is None
+            or ctx.query is None
+            or not hasattr(context, "session")
+        ):
+            yield
+            return
+        fields = _root_fields(ctx)
+        if not fields or not all(f in CACHEABLE_FIELDS for f in fields):
+            yield
+            return
+
+        cache = get_response_cache()
+        key = cache_key(context, ctx.query, ctx.operation_name, ctx.variables)
+        entry = await cache.get(key)
+        if entry is not None and await self._authorized(entry):
+            ctx.result = ExecutionResult(data=entry.data)
+            yield
+            return
+
+        seq = await cache.begin()
+        recorder = TagRecorder()
+        for field in fields:
+            recorder.tags.update(CACHEABLE_FIELDS[field])
+        # Build entries from the primary: a replica read could predate an invalidation
+        if hasattr(context, "read_replica"):
+            context.read_replica = False
+        session = await context.session()
+        session.info[RECORDER_KEY] = recorder
+        try:
+            yield
+        finally:
+            session.info.pop(RECORDER_KEY, None)
+        result = ctx.result
+        if (
+            isinstance(result, ExecutionResult)
+            and result.data is not None
+            and not result.errors
+            and recorder.cacheable
+            and recorder.tags
+        ):
+            await cache.put(
+                key,
+                CachedResponse(
+                    data=result.data,
+                    tags=frozenset(recorder.tags),
+                    permissions=getattr(context, "granted_permissions", frozenset()),
+                    seq=seq,
+                ),
+            )
+
+    async def _authorized(self, entry: CachedResponse) -> bool:
+        from app.api.graphql.auth import check_context_permission
+
+        context = self.execution_context.context
+        for permission_key, tenant_id in entry.permissions:
+            try:
+                await check_context_permission(context, permission_key, tenant_id)
+            except PermissionError:
+                return False
+        return True
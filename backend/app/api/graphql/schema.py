@@ -2,13 +2,16 @@
 Overview: Root GraphQL schema combining all query and mutation types.
 Architecture: GraphQL schema definition (Section 7.2)
 Dependencies: strawberry, app.api.graphql.queries, app.api.graphql.mutations
-Concepts: GraphQL schema, query and mutation aggregation, context lifecycle via extension
+Concepts: GraphQL schema, query and mutation aggregation, context lifecycle via extension,
+    persisted/cached documents, cached responses and query cost limits ahead of execution,
+    read-replica routing for query operations, SQL attribution per field
 """
 
 from typing import Any
 
 import strawberry
 from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
 
 from app.api.graphql.mutations.architecture import ArchitectureMutation
 from app.api.graphql.mutations.approval import ApprovalMutation
@@ -36,6 +39,7 @@ from app.api.graphql.mutations.tenant_tag import TenantTagMutation
 from app.api.graphql.mutations.tenants import TenantMutation
 from app.api.graphql.mutations.users import UserMutation
 from app.api.graphql.mutations.workflow import WorkflowMutation
+from app.api.graphql.persisted_queries import PersistedQueryExtension
 from app.api.graphql.queries.architecture import ArchitectureQuery
 from app.api.graphql.queries.approval import ApprovalQuery
 from app.api.graphql.queries.automation import AutomationQuery
@@ -63,6 +67,9 @@ from app.api.graphql.queries.tenant_tag import TenantTagQuery
 from app.api.graphql.queries.tenants import TenantQuery
 from app.api.graphql.queries.users import UserQuery
 from app.api.graphql.queries.workflow import WorkflowQuery
+from app.api.graphql.query_cost import QueryCostExtension
+from app.api.graphql.response_cache import ResponseCacheExtension
+from app.api.graphql.sql_instrumentation import SqlInstrumentationExtension
 
 
 @strawberry.type
@@ -91,6 +98,20 @@ class Mutation(
     pass
 
 
+class ReadReplicaExtension(SchemaExtension):
+    """Routes the shared session of query operations to the read replica when it is fresh."""
+
+    def on_execute(self) -> Any:
+        ctx = self.execution_context
+        if (
+            ctx.graphql_document is not None
+            and ctx.operation_type is OperationType.QUERY
+            and hasattr(ctx.context, "read_replica")
+        ):
+            ctx.context.read_replica = True
+        yield
+
+
 class ContextCleanupExtension(SchemaExtension):
     """Ensures NimbusContext DB sessions are closed after each GraphQL operation."""
 
@@ -104,5 +125,12 @@ class ContextCleanupExtension(SchemaExtension):
 schema = strawberry.Schema(
     query=Query,
     mutation=Mutation,
-    extensions=[ContextCleanupExtension],
+    extensions=[
+        PersistedQueryExtension,
+        ReadReplicaExtension,
+        ResponseCacheExtension,
+        QueryCostExtension,
+        SqlInstrumentationExtension,
+        ContextCleanupExtension,
+    ],
 )
@@ -0,0 +1,47 @@
+"""
+Overview: GraphQL field attribution and debug summary for request-level SQL instrumentation.
+Architecture: Strawberry schema extension around field resolution (Section 7.2)
+Dependencies: strawberry, app.core.config, app.db.instrumentation
+Concepts: In sampled requests every resolver runs with its ``Type.field`` name set as the SQL
+    field, so statements are counted against the innermost field that issued them (async
+    resolvers keep the name until they complete). In debug mode the operation's SQL summary —
+    totals, per-field and per-service breakdowns and N+1 shapes — is returned in the ``sql``
+    response extension. Unsampled requests pass straight through.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable
+from inspect import isawaitable
+from typing import Any
+
+from strawberry.extensions import SchemaExtension
+
+from app.core.config import get_settings
+from app.db.instrumentation import current_sql_trace, sql_field
+
+
+async def _in_field(result: Awaitable[Any], name: str) -> Any:
+    with sql_field(name):
+        return await result
+
+
+class SqlInstrumentationExtension(SchemaExtension):
+    """Attributes SQL to the resolving field; reports the summary in debug mode."""
+
+    def resolve(self, _next: Any, root: Any, info: Any, *args: Any, **kwargs: Any) -> Any:
+        if current_sql_trace() is None:
+            return _next(root, info, *args, **kwargs)
+        name = f"{info.parent_type.name}.{info.field_name}"
+        with sql_field(name):
+            result = _next(root, info, *args, **kwargs)
+        if isawaitable(result):
+            return _in_field(result, name)
+        return result
+
+    def get_results(self) -> dict[str, Any]:
+        settings = get_settings()
+        trace = current_sql_trace()
+        if not settings.debug or trace is None:
+            return {}
+        return {"sql": trace.summary(settings.sql_n_plus_one_threshold)}
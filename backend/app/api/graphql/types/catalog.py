@@ -2,15 +2,59 @@
 Overview: GraphQL types and input types for the service catalog — offerings, pricing, overrides,
     CI class activity associations.
 Architecture: GraphQL type definitions for service catalog operations (Section 8)
-Dependencies: strawberry
-Concepts: Service catalog types for pricing display and management.
+Dependencies: strawberry, app.api.graphql.loaders, app.api.graphql.types.delivery
+Concepts: Service catalog types for pricing display and management. Referenced offerings and
+    delivery regions resolve through the request's batch loaders, so selecting them on a list
+    of price lists or offerings costs one query per relationship rather than one per row.
 """
 
+import functools
 import uuid
 from datetime import date, datetime
 from decimal import Decimal
 
 import strawberry
+from strawberry.types import Info
+
+from app.api.graphql.types.delivery import DeliveryRegionType
+
+
+@functools.cache
+def _offering_options() -> tuple:
+    """Eager loads ``_offering_to_gql`` needs; built once so the loader identity is stable."""
+    from sqlalchemy.orm import selectinload
+
+    from app.models.cmdb.service_offering import ServiceOffering
+
+    return selectinload(ServiceOffering.regions), selectinload(ServiceOffering.ci_classes)
+
+
+async def _offering(info: Info, key: uuid.UUID | None) -> "ServiceOfferingType | None":
+    from app.api.graphql.queries.catalog import _offering_to_gql
+    from app.models.cmdb.service_offering import ServiceOffering
+
+    if key is None:
+        return None
+    loader = info.context.loaders.by_id(ServiceOffering, *_offering_options())
+    row = await loader.load(key)
+    return _offering_to_gql(row) if row is not None else None
+
+
+async def _regions(
+    info: Info, keys: list[uuid.UUID], tenant_id: uuid.UUID | None
+) -> list[DeliveryRegionType]:
+    from app.api.graphql.queries.delivery import _region_to_gql
+    from app.models.cmdb.delivery_region import DeliveryRegion
+
+    rows = await info.context.loaders.by_id(DeliveryRegion).load_many(keys)
+    return [_region_to_gql(r, tenant_id) for r in rows if r is not None]
+
+
+async def _region(
+    info: Info, key: uuid.UUID | None, tenant_id: uuid.UUID | None
+) -> DeliveryRegionType | None:
+    regions = await _regions(info, [key], tenant_id) if key is not None else []
+    return regions[0] if regions else None
 
 # ── Output types ──────────────────────────────────────────────────────
 
@@ -39,6 +83,10 @@ class ServiceOfferingType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def regions(self, info: Info) -> list[DeliveryRegionType]:
+        return await _regions(info, self.region_ids, self.tenant_id)
+
 
 @strawberry.type
 class ServiceOfferingListType:
@@ -63,6 +111,14 @@ class PriceListItemType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def service_offering(self, info: Info) -> ServiceOfferingType | None:
+        return await _offering(info, self.service_offering_id)
+
+    @strawberry.field
+    async def delivery_region(self, info: Info) -> DeliveryRegionType | None:
+        return await _region(info, self.delivery_region_id, None)
+
 
 @strawberry.type
 class PriceListType:
@@ -83,6 +139,14 @@ class PriceListType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def delivery_region(self, info: Info) -> DeliveryRegionType | None:
+        return await _region(info, self.delivery_region_id, self.tenant_id)
+
+    @strawberry.field
+    async def constraint_regions(self, info: Info) -> list[DeliveryRegionType]:
+        return await _regions(info, self.region_constraint_ids, self.tenant_id)
+
 
 @strawberry.type
 class PriceListSummaryType:
@@ -111,6 +175,14 @@ class PriceListOverlayItemType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def service_offering(self, info: Info) -> ServiceOfferingType | None:
+        return await _offering(info, self.service_offering_id)
+
+    @strawberry.field
+    async def delivery_region(self, info: Info) -> DeliveryRegionType | None:
+        return await _region(info, self.delivery_region_id, self.tenant_id)
+
 
 @strawberry.type
 class PinMinimumChargeType:
@@ -108,6 +108,7 @@ class CIType:
 class CIListType:
     items: list[CIType]
     total: int
+    total_capped: bool = False
 
 
 @strawberry.type
@@ -198,11 +199,34 @@ class GraphNodeType:
     path: list[str]
 
 
+@strawberry.type
+class ImpactNodeType:
+    ci_id: str
+    name: str
+    ci_class: str
+    depth: int
+
+
+@strawberry.type
+class CIImpactSetType:
+    ci_id: str
+    downstream: list[ImpactNodeType]
+    upstream: list[ImpactNodeType]
+
+
+@strawberry.type
+class BatchImpactType:
+    downstream: list[ImpactNodeType]
+    upstream: list[ImpactNodeType]
+    per_ci: list[CIImpactSetType]
+
+
 @strawberry.type
 class VersionDiffType:
     version_a: int
     version_b: int
     changes: JSON
+    paths: JSON | None = None
 
 
 @strawberry.type
@@ -264,6 +288,25 @@ class ExplorerSummaryType:
     backends: list["ExplorerBackendSummary"]
 
 
+@strawberry.type
+class CIBulkRowResultType:
+    index: int
+    key: str | None
+    status: str
+    ci_id: uuid.UUID | None = None
+    version: int | None = None
+    error: str | None = None
+
+
+@strawberry.type
+class CIBulkUpsertResultType:
+    created: int
+    updated: int
+    unchanged: int
+    failed: int
+    results: list[CIBulkRowResultType]
+
+
 # ── Input types ───────────────────────────────────────────────────────
 
 
@@ -280,6 +323,20 @@ class CICreateInput:
     pulumi_urn: str | None = None
 
 
+@strawberry.input
+class CIBulkUpsertItemInput:
+    ci_class_id: uuid.UUID | None = None
+    name: str | None = None
+    description: str | None = None
+    compartment_id: uuid.UUID | None = None
+    lifecycle_state: str | None = None
+    attributes: JSON | None = None
+    tags: JSON | None = None
+    cloud_resource_id: str | None = None
+    pulumi_urn: str | None = None
+    backend_id: uuid.UUID | None = None
+
+
 @strawberry.input
 class CIUpdateInput:
     name: str | None = None
@@ -2,9 +2,11 @@
 Overview: GraphQL types and input types for the service delivery engine — regions, acceptance,
     staff profiles, rate cards, activities, estimations, price list templates, profitability.
 Architecture: GraphQL type definitions for service delivery operations (Section 8)
-Dependencies: strawberry
+Dependencies: strawberry, app.api.graphql.loaders
 Concepts: Service delivery types covering the full delivery lifecycle from region management
-    through estimation and profitability analysis.
+    through estimation and profitability analysis. Referenced regions, staff profiles,
+    templates and processes resolve through the request's batch loaders, so selecting them
+    on a list costs one query per relationship rather than one per row.
 """
 
 import uuid
@@ -12,6 +14,27 @@ from datetime import date, datetime
 from decimal import Decimal
 
 import strawberry
+from strawberry.types import Info
+
+
+async def _load_related(info: Info, fk, key: uuid.UUID | None, convert):
+    """Load the row referenced by foreign key ``fk`` through the batch loader and convert it."""
+    if key is None:
+        return None
+    row = await info.context.loaders.related(fk).load(key)
+    return convert(row) if row is not None else None
+
+
+async def _region(info: Info, fk, key: uuid.UUID | None):
+    from app.api.graphql.queries.delivery import _region_to_gql
+
+    return await _load_related(info, fk, key, _region_to_gql)
+
+
+async def _staff_profile(info: Info, fk, key: uuid.UUID | None):
+    from app.api.graphql.queries.delivery import _staff_profile_to_gql
+
+    return await _load_related(info, fk, key, _staff_profile_to_gql)
 
 
 # ── Delivery Regions ─────────────────────────────────────────────────
@@ -33,6 +56,26 @@ class DeliveryRegionType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def parent(self, info: Info) -> "DeliveryRegionType | None":
+        from app.models.cmdb.delivery_region import DeliveryRegion
+
+        return await _region(info, DeliveryRegion.parent_region_id, self.parent_region_id)
+
+    # Tenant the region was requested for; children are limited to its and shared regions
+    scope_tenant_id: strawberry.Private[uuid.UUID | None] = None
+
+    @strawberry.field
+    async def children(self, info: Info) -> list["DeliveryRegionType"]:
+        from app.api.graphql.queries.delivery import _region_to_gql
+        from app.models.cmdb.delivery_region import DeliveryRegion
+
+        tenant_id = self.scope_tenant_id or self.tenant_id
+        rows = await info.context.loaders.by_parent(
+            DeliveryRegion.parent_region_id, tenant_id=tenant_id, active_only=True
+        ).load(self.id)
+        return [_region_to_gql(r, tenant_id) for r in rows]
+
 
 @strawberry.type
 class DeliveryRegionListType:
@@ -85,6 +128,14 @@ class RegionAcceptanceTemplateRuleType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def delivery_region(self, info: Info) -> DeliveryRegionType | None:
+        from app.models.cmdb.region_acceptance import RegionAcceptanceTemplateRule
+
+        return await _region(
+            info, RegionAcceptanceTemplateRule.delivery_region_id, self.delivery_region_id
+        )
+
 
 @strawberry.type
 class TenantRegionAcceptanceType:
@@ -97,6 +148,14 @@ class TenantRegionAcceptanceType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def delivery_region(self, info: Info) -> DeliveryRegionType | None:
+        from app.models.cmdb.region_acceptance import TenantRegionAcceptance
+
+        return await _region(
+            info, TenantRegionAcceptance.delivery_region_id, self.delivery_region_id
+        )
+
 
 @strawberry.type
 class EffectiveRegionAcceptanceType:
@@ -144,6 +203,20 @@ class OrganizationalUnitType:
     created_at: datetime
     updated_at: datetime
 
+    # Tenant the unit was requested for; children are limited to its and shared units
+    scope_tenant_id: strawberry.Private[uuid.UUID | None] = None
+
+    @strawberry.field
+    async def children(self, info: Info) -> list["OrganizationalUnitType"]:
+        from app.api.graphql.queries.delivery import _org_unit_to_gql
+        from app.models.cmdb.staff_profile import OrganizationalUnit
+
+        tenant_id = self.scope_tenant_id or self.tenant_id
+        rows = await info.context.loaders.by_parent(
+            OrganizationalUnit.parent_id, tenant_id=tenant_id
+        ).load(self.id)
+        return [_org_unit_to_gql(r, tenant_id) for r in rows]
+
 
 @strawberry.input
 class OrganizationalUnitCreateInput:
@@ -181,6 +254,15 @@ class StaffProfileType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def org_unit(self, info: Info) -> OrganizationalUnitType | None:
+        from app.api.graphql.queries.delivery import _org_unit_to_gql
+        from app.models.cmdb.staff_profile import StaffProfile
+
+        return await _load_related(
+            info, StaffProfile.org_unit_id, self.org_unit_id, _org_unit_to_gql
+        )
+
 
 @strawberry.type
 class StaffProfileListType:
@@ -229,6 +311,18 @@ class InternalRateCardType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def staff_profile(self, info: Info) -> StaffProfileType | None:
+        from app.models.cmdb.staff_profile import InternalRateCard
+
+        return await _staff_profile(info, InternalRateCard.staff_profile_id, self.staff_profile_id)
+
+    @strawberry.field
+    async def delivery_region(self, info: Info) -> DeliveryRegionType | None:
+        from app.models.cmdb.staff_profile import InternalRateCard
+
+        return await _region(info, InternalRateCard.delivery_region_id, self.delivery_region_id)
+
 
 @strawberry.input
 class InternalRateCardCreateInput:
@@ -265,6 +359,14 @@ class ActivityDefinitionType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def staff_profile(self, info: Info) -> StaffProfileType | None:
+        from app.models.cmdb.activity import ActivityDefinition
+
+        return await _staff_profile(
+            info, ActivityDefinition.staff_profile_id, self.staff_profile_id
+        )
+
 
 @strawberry.type
 class LinkedAutomatedActivityType:
@@ -334,6 +436,18 @@ class ProcessActivityLinkType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def activity_template(self, info: Info) -> ActivityTemplateType | None:
+        from app.api.graphql.queries.delivery import _activity_template_to_gql
+        from app.models.cmdb.activity import ProcessActivityLink
+
+        return await _load_related(
+            info,
+            ProcessActivityLink.activity_template_id,
+            self.activity_template_id,
+            _activity_template_to_gql,
+        )
+
 
 @strawberry.type
 class ServiceProcessType:
@@ -389,6 +503,15 @@ class ServiceProcessAssignmentType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def process(self, info: Info) -> ServiceProcessType | None:
+        from app.api.graphql.queries.delivery import _process_to_gql
+        from app.models.cmdb.activity import ServiceProcessAssignment
+
+        return await _load_related(
+            info, ServiceProcessAssignment.process_id, self.process_id, _process_to_gql
+        )
+
 
 @strawberry.input
 class ServiceProcessAssignmentCreateInput:
@@ -420,6 +543,20 @@ class EstimationLineItemType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def staff_profile(self, info: Info) -> StaffProfileType | None:
+        from app.models.cmdb.estimation import EstimationLineItem
+
+        return await _staff_profile(
+            info, EstimationLineItem.staff_profile_id, self.staff_profile_id
+        )
+
+    @strawberry.field
+    async def delivery_region(self, info: Info) -> DeliveryRegionType | None:
+        from app.models.cmdb.estimation import EstimationLineItem
+
+        return await _region(info, EstimationLineItem.delivery_region_id, self.delivery_region_id)
+
 
 @strawberry.type
 class ServiceEstimationType:
@@ -444,6 +581,12 @@ class ServiceEstimationType:
     created_at: datetime
     updated_at: datetime
 
+    @strawberry.field
+    async def delivery_region(self, info: Info) -> DeliveryRegionType | None:
+        from app.models.cmdb.estimation import ServiceEstimation
+
+        return await _region(info, ServiceEstimation.delivery_region_id, self.delivery_region_id)
+
 
 @strawberry.type
 class EstimationListType:
@@ -451,6 +594,13 @@ class EstimationListType:
     total: int
 
 
+@strawberry.type
+class EstimationRecalcStartedType:
+    workflow_id: str
+    status: str
+    warnings: list[str] | None = None
+
+
 @strawberry.input
 class ServiceEstimationCreateInput:
     client_tenant_id: uuid.UUID
@@ -554,6 +704,16 @@ class ProfitabilityOverviewType:
     estimation_count: int
 
 
+@strawberry.type
+class ProfitabilityTrendPointType:
+    period_start: date
+    total_revenue: Decimal
+    total_cost: Decimal
+    margin_amount: Decimal
+    margin_percent: Decimal
+    estimation_count: int
+
+
 @strawberry.type
 class ProfitabilityByEntityType:
     entity_id: str
@@ -0,0 +1,66 @@
+"""
+Overview: Strawberry GraphQL types for Relay-style cursor connections.
+Architecture: Shared GraphQL pagination types (Section 7.2)
+Dependencies: strawberry, app.db.pagination
+Concepts: Connections wrap a keyset page as edges (cursor + node) and PageInfo. Totals are
+    opt-in per request (exact or planner estimate) so plain page fetches skip the count.
+"""
+
+from collections.abc import Callable
+from enum import Enum
+
+import strawberry
+
+from app.db.pagination import KeysetPage
+
+
+@strawberry.enum
+class ConnectionTotalGQL(Enum):
+    NONE = "NONE"
+    EXACT = "EXACT"
+    ESTIMATE = "ESTIMATE"
+
+
+def total_mode(total: ConnectionTotalGQL) -> str | None:
+    """Map the GraphQL total argument to the ``paginate`` total mode."""
+    return None if total is ConnectionTotalGQL.NONE else total.value.lower()
+
+
+@strawberry.type
+class PageInfoType:
+    has_next_page: bool
+    has_previous_page: bool
+    start_cursor: str | None = None
+    end_cursor: str | None = None
+
+
+@strawberry.type
+class Edge[NodeT]:
+    cursor: str
+    node: NodeT
+
+
+@strawberry.type
+class Connection[NodeT]:
+    edges: list[Edge[NodeT]]
+    page_info: PageInfoType
+    total_count: int | None = None
+    total_is_estimate: bool = False
+
+
+def to_connection(page: KeysetPage, convert: Callable) -> Connection:
+    """Build a connection from a keyset page, converting each item with ``convert``."""
+    return Connection(
+        edges=[
+            Edge(cursor=cursor, node=convert(item))
+            for item, cursor in zip(page.items, page.cursors, strict=True)
+        ],
+        page_info=PageInfoType(
+            has_next_page=page.has_next_page,
+            has_previous_page=page.has_previous_page,
+            start_cursor=page.start_cursor,
+            end_cursor=page.end_cursor,
+        ),
+        total_count=page.total,
+        total_is_estimate=page.total_is_estimate,
+    )
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_tenant_id, get_current_user
 from app.core.permission_decorators import require_permission
+from app.db.replica import get_read_db
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.audit import (
@@ -119,7 +120,7 @@ async def list_audit_logs(
     params: AuditSearchParams = Depends(),
     tenant_id: str = Depends(get_current_tenant_id),
     current_user: User = Depends(require_permission("audit:log:read")),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> AuditLogListResponse:
     """Search audit logs with filtering and pagination."""
     from app.services.audit.query import AuditQueryService
@@ -155,7 +156,7 @@ async def get_audit_log(
     request: Request,
     tenant_id: str = Depends(get_current_tenant_id),
     current_user: User = Depends(require_permission("audit:log:read")),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> AuditLogResponse:
     """Get a single audit log entry."""
     from app.services.audit.query import AuditQueryService
@@ -182,7 +183,7 @@ async def get_audit_logs_by_trace(
     request: Request,
     tenant_id: str = Depends(get_current_tenant_id),
     current_user: User = Depends(require_permission("audit:log:read")),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[AuditLogResponse]:
     """Get all audit log entries for a trace ID."""
     from app.services.audit.query import AuditQueryService
@@ -602,7 +603,7 @@ async def list_saved_queries(
     request: Request,
     tenant_id: str = Depends(get_current_tenant_id),
     current_user: User = Depends(require_permission("audit:query:read")),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> list[SavedQueryResponse]:
     """List saved queries (own + shared)."""
     from app.services.audit.query import AuditQueryService
@@ -28,6 +28,11 @@ from app.services.auth.service import AuthError, AuthService
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+_LOGIN_ERROR_STATUS = {
+    "TOO_MANY_ATTEMPTS": status.HTTP_429_TOO_MANY_REQUESTS,
+    "AUTH_BUSY": status.HTTP_503_SERVICE_UNAVAILABLE,
+}
+
 
 @router.post("/login", response_model=TokenResponse)
 async def login(
@@ -64,7 +69,7 @@ async def login(
         }, "", "auth_service")
 
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
+            status_code=_LOGIN_ERROR_STATUS.get(e.code, status.HTTP_401_UNAUTHORIZED),
             detail={
                 "error": {
                     "code": e.code,
@@ -72,6 +77,7 @@ async def login(
                     "trace_id": getattr(request.state, "trace_id", None),
                 }
             },
+            headers={"Retry-After": str(e.retry_after)} if e.retry_after else None,
         )
 
 
@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_tenant_id, get_current_user, require_not_impersonating
 from app.core.permission_decorators import require_permission
-from app.db.session import get_db
+from app.db.session import get_db, get_tenant_pool_stats
 from app.models.user import User
 from app.schemas.tenant import (
     QuotaResponse,
@@ -104,6 +104,17 @@ async def list_tenants(
     return [TenantResponse.model_validate(t) for t in tenants]
 
 
+@router.get("/pool-stats")
+async def tenant_pool_stats(
+    current_user: User = Depends(require_permission("settings:tenant:read")),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, dict]:
+    """Database sessions in flight and dedicated pool stats per tenant of the provider."""
+    service = TenantService(db)
+    tenant_ids = await service.list_tenant_ids(str(current_user.provider_id))
+    return get_tenant_pool_stats(tenant_ids)
+
+
 @router.get("/{tenant_id}", response_model=TenantDetailResponse)
 async def get_tenant(
     tenant_id: str,
@@ -1,8 +1,10 @@
 """
-Overview: HTTP request/response audit middleware for automatic API action logging.
-Architecture: Middleware layer capturing request metadata for audit trail (Section 3.1, 8)
-Dependencies: starlette, asyncio, app.services.audit.service, app.services.audit.taxonomy
-Concepts: Request auditing, non-blocking logging, event taxonomy, actor type detection
+Overview: HTTP request/response audit stage for automatic API action logging.
+Architecture: Request pipeline stage capturing request metadata for audit trail (Section 3.1, 8)
+Dependencies: asyncio, app.core.middleware, app.services.audit.service,
+    app.services.audit.taxonomy
+Concepts: Request auditing, non-blocking logging, event taxonomy, actor type detection. The
+    logging config lookup and audit write run after the response has been sent.
 """
 
 import asyncio
@@ -10,11 +12,9 @@ import logging
 import time
 from typing import Any
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
-
+from app.core.middleware import RequestContext, Stage
 from app.models.audit import AuditPriority
+from app.services.auth.principal import resolve_principal
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +34,9 @@ _DEFAULT_CONFIG = {
 # Paths to skip auditing (health checks, docs, static)
 _SKIP_PATHS = {"/health", "/ready", "/live", "/docs", "/redoc", "/openapi.json"}
 
+# Strong references to in-flight audit writes
+_LOG_TASKS: set[asyncio.Task] = set()
+
 # Auth endpoint patterns -> specific event_type
 _AUTH_EVENT_MAP: dict[tuple[str, str], str] = {
     ("POST", "/api/v1/auth/login"): "auth.login",
@@ -101,64 +104,64 @@ def _should_log(
     return True
 
 
-class AuditMiddleware(BaseHTTPMiddleware):
-    """Captures request metadata and logs audit entries after response."""
+class AuditStage(Stage):
+    """Captures request metadata and logs audit entries once the response has been sent."""
+
+    name = "audit"
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+    async def after(self, ctx: RequestContext) -> None:
+        if ctx.status_code is None or ctx.response_started_at is None:
+            return
+        request = ctx.conn
         path = request.url.path
 
         # Skip health and docs endpoints
         if path in _SKIP_PATHS or path.startswith("/docs") or path.startswith("/redoc"):
-            return await call_next(request)
+            return
 
-        start_time = time.monotonic()
-        response = await call_next(request)
-        duration_ms = (time.monotonic() - start_time) * 1000
+        # Time to response start, as seen by the application
+        duration_ms = (ctx.response_started_at - ctx.started_at) * 1000
+        method = request.scope["method"]
+        status_code = ctx.status_code
 
         # Extract request context
         tenant_id = getattr(request.state, "current_tenant_id", None)
         if not tenant_id:
-            return response
+            return
 
         trace_id = getattr(request.state, "trace_id", None)
         actor_ip = request.client.host if request.client else None
         user_agent = request.headers.get("User-Agent")
 
-        # Extract actor info from JWT payload if available
+        # Actor from the principal decoded by the tenant context stage
         actor_id = None
         actor_email = None
         actor_type = "ANONYMOUS"
-        try:
-            auth_header = request.headers.get("Authorization", "")
-            if auth_header.startswith("Bearer "):
-                from app.services.auth.jwt import decode_token
+        principal = resolve_principal(request)
+        if principal is not None:
+            actor_id = principal.user_id
+            actor_email = principal.email
+            actor_type = "USER"
 
-                payload = decode_token(auth_header[7:])
-                actor_id = payload.get("sub")
-                actor_email = payload.get("email")
-                actor_type = "USER"
-        except Exception:
-            pass
-
-        event_type = _detect_event_type(request.method, path)
+        event_type = _detect_event_type(method, path)
 
         # Failed login detection
-        if event_type == "auth.login" and response.status_code >= 400:
+        if event_type == "auth.login" and status_code >= 400:
             event_type = "auth.login.failed"
 
         # Check tenant logging config before firing audit log
         config = await _get_logging_config(tenant_id)
-        if not _should_log(config, event_type, request.method, response.status_code):
-            return response
+        if not _should_log(config, event_type, method, status_code):
+            return
 
         priority = AuditPriority.INFO
-        if response.status_code >= 500:
+        if status_code >= 500:
             priority = AuditPriority.ERR
-        elif response.status_code >= 400:
+        elif status_code >= 400:
             priority = AuditPriority.WARN
 
         # Fire-and-forget audit log
-        asyncio.create_task(
+        task = asyncio.create_task(
             _log_request(
                 tenant_id=tenant_id,
                 event_type=event_type,
@@ -169,17 +172,17 @@ class AuditMiddleware(BaseHTTPMiddleware):
                 trace_id=trace_id,
                 priority=priority,
                 user_agent=user_agent,
-                request_method=request.method,
+                request_method=method,
                 request_path=path,
-                response_status=response.status_code,
+                response_status=status_code,
                 metadata={
                     "duration_ms": round(duration_ms, 2),
                     "query_params": str(request.query_params) if request.query_params else None,
                 },
             )
         )
-
-        return response
+        _LOG_TASKS.add(task)
+        task.add_done_callback(_LOG_TASKS.discard)
 
 
 async def _log_request(
@@ -24,6 +24,26 @@ class Settings(BaseSettings):
     db_max_overflow: int = 10
     db_pool_timeout: int = 30
     db_pool_recycle: int = 3600
+    # Compiled SQL kept per engine by SQLAlchemy, and prepared statements asyncpg keeps per
+    # connection (0 disables). Hot service queries are built once so both caches hit.
+    db_compiled_cache_size: int = 1200
+    db_prepared_statement_cache_size: int = 500
+    # Record compile vs execute time per statement (app.db.profiling, shown on /ready)
+    db_query_profiling: bool = False
+    # Request SQL instrumentation (app.db.instrumentation, exported on /metrics): share of
+    # requests traced (all of them in debug mode), repeats of one statement shape in a request
+    # above which it is flagged as N+1, and SQL time above which a request is logged as slow
+    sql_instrumentation_sample_rate: float = 0.05
+    sql_n_plus_one_threshold: int = 10
+    sql_slow_request_ms: float = 500.0
+    # Read replica for GraphQL queries, audit search, profitability and exports (unset: primary
+    # only). Reads go to the primary while the replica lags more than the limit or has not yet
+    # replayed the tenant's last write (pinned in Valkey; without Valkey reads stay on primary).
+    database_replica_url: str | None = None
+    db_replica_max_lag_seconds: float = 5.0
+    db_replica_lag_check_seconds: float = 1.0
+    # Hot tenants with their own connection pool: tenant id -> pool size (JSON in the env var)
+    db_dedicated_tenant_pools: dict[str, int] = {}
 
     # JWT
     jwt_secret_key: str = "CHANGE-ME-IN-PRODUCTION"
@@ -33,6 +53,22 @@ class Settings(BaseSettings):
 
     # Session
     max_concurrent_sessions: int = 5
+    # Validated-session cache: local reuse window, then a Valkey revocation check; the
+    # database is consulted again at least every revalidate interval
+    auth_session_cache_ttl_seconds: int = 5
+    auth_session_revalidate_seconds: int = 300
+
+    # Password hashing (argon2 on a bounded thread pool; changed parameters re-hash on login)
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536
+    argon2_parallelism: int = 4
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+
+    # Login throttling (attempts counted before hashing; a successful login clears the account)
+    login_max_attempts_per_account: int = 5
+    login_max_attempts_per_ip: int = 50
+    login_attempt_window_seconds: int = 900
 
     # Temporal
     temporal_host: str = "localhost"
@@ -43,6 +79,33 @@ class Settings(BaseSettings):
     # Tenant
     tenant_retention_days: int = 30
 
+    # CMDB graph engine (in-memory CSR adjacency; SQL CTEs are the fallback). Writes bump a
+    # per-tenant generation in Valkey; the TTL bounds staleness only while Valkey is down.
+    cmdb_graph_engine_enabled: bool = True
+    cmdb_graph_engine_ttl_seconds: int = 60
+    cmdb_graph_engine_max_edges: int = 2_000_000
+
+    # Semantic catalog read cache (dropped on local semantic commits; TTL bounds other workers)
+    semantic_catalog_ttl_seconds: int = 60
+
+    # GraphQL query limits (static cost from field weights; per-tenant cost budget per process)
+    graphql_max_depth: int = 12
+    graphql_max_aliases: int = 30
+    graphql_max_cost: int = 10_000
+    graphql_default_list_size: int = 20
+    graphql_tenant_cost_per_second: int = 5_000
+    graphql_tenant_cost_burst: int = 50_000
+    # Parsed + validated documents kept per process, keyed by query hash
+    graphql_document_cache_size: int = 1_000
+    graphql_persisted_query_ttl_seconds: int = 30 * 24 * 3600
+    # Response cache for allow-listed catalog queries. "valkey" shares entries and invalidations
+    # across workers (no caching while Valkey is down); "memory" is per process and only sees
+    # its own commits, so use it for single-worker deployments
+    graphql_response_cache_enabled: bool = True
+    graphql_response_cache_backend: str = "valkey"
+    graphql_response_cache_ttl_seconds: int = 300
+    graphql_response_cache_max_entries: int = 5_000
+
     # Impersonation
     impersonation_max_duration_minutes: int = 240
 
@@ -0,0 +1,88 @@
+"""
+Overview: ETag / If-None-Match support for REST GET responses.
+Architecture: Pure-ASGI middleware inside the request pipeline (Section 3.1)
+Dependencies: hashlib, starlette
+Concepts: Successful JSON responses to GET requests under the configured prefixes are buffered
+    and given a weak ETag over their body. A request whose If-None-Match lists that tag gets a
+    304 without a body. The handler still runs — this saves the transfer and client-side
+    parsing, not the server work, which the GraphQL response cache covers for catalog reads.
+    Responses that already carry an ETag, or are not JSON, pass through unbuffered.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def weak_etag(body: bytes) -> str:
+    return f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+class ETagMiddleware:
+    """Adds weak ETags to JSON GET responses and answers matching revalidations with 304."""
+
+    def __init__(self, app: ASGIApp, prefixes: Sequence[str] = ("/api/",)) -> None:
+        self.app = app
+        self.prefixes = tuple(prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] == 200
+                    and "etag" not in headers
+                    and headers.get("content-type", "").startswith("application/json")
+                ):
+                    start = message
+                    return
+                await send(message)
+                return
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            etag = weak_etag(body)
+            headers = MutableHeaders(raw=list(start["headers"]))
+            headers["etag"] = etag
+            if "cache-control" not in headers:
+                headers["cache-control"] = "private, no-cache"
+            if if_none_match and etag_matches(if_none_match, etag):
+                del headers["content-length"]
+                del headers["content-type"]
+                await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
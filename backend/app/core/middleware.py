@@ -1,65 +1,254 @@
 """
-Overview: Request middleware for trace ID injection, security headers, and tenant context.
+Overview: Pure-ASGI request pipeline — tenant context, security headers, and trace IDs as
+    composable stages with per-stage timing.
 Architecture: Middleware layer in request pipeline (Section 3.1, 5.5)
-Dependencies: fastapi, uuid, app.core.tenant_context
-Concepts: Observability, trace correlation, security headers, tenant context propagation
+Dependencies: starlette, uuid, app.core.tenant_context, app.services.auth.principal
+Concepts: One ASGI middleware runs an ordered list of stages around the application: ``before``
+    hooks in order on the request, ``on_response_start`` hooks in reverse order on the response
+    headers, and ``after`` hooks in reverse order once the response has been sent. The response
+    body is passed through untouched, so streaming responses stream and no extra task or memory
+    stream is created per request. Time spent in each stage is accumulated in
+    ``pipeline_timings`` and, in debug mode, reported in a Server-Timing header. The SQL stage
+    traces the statements of a sample of requests under their trace id (app.db.instrumentation).
 """
 
-import uuid
+from __future__ import annotations
 
-from jose import JWTError
+import logging
+import random
+import time
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.tenant_context import clear_tenant_context, set_current_tenant_id
+from app.db.instrumentation import (
+    current_sql_trace,
+    end_sql_trace,
+    get_sql_metrics,
+    start_sql_trace,
+)
+from app.services.auth.principal import resolve_principal
 
+logger = logging.getLogger(__name__)
 
-class TraceIDMiddleware(BaseHTTPMiddleware):
-    """Injects a unique trace ID into every request/response for log correlation."""
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        trace_id = request.headers.get("X-Trace-ID", str(uuid.uuid4()))
-        request.state.trace_id = trace_id
+@dataclass
+class RequestContext:
+    """Per-request state shared by the stages of one pipeline run."""
 
-        response = await call_next(request)
-        response.headers["X-Trace-ID"] = trace_id
-        return response
+    conn: HTTPConnection
+    started_at: float
+    status_code: int | None = None
+    response_started_at: float | None = None
+    timings: dict[str, float] = field(default_factory=dict)
 
 
-class TenantContextMiddleware(BaseHTTPMiddleware):
-    """Extracts current_tenant_id from JWT and sets it in request state + contextvar."""
+class Stage:
+    """A pipeline stage. Subclasses override the hooks they need."""
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        try:
-            auth_header = request.headers.get("Authorization", "")
-            if auth_header.startswith("Bearer "):
-                from app.services.auth.jwt import decode_token
+    name = "stage"
 
-                try:
-                    payload = decode_token(auth_header[7:])
-                    tenant_id = payload.get("current_tenant_id")
-                    if tenant_id:
-                        set_current_tenant_id(tenant_id)
-                        request.state.current_tenant_id = tenant_id
-                        request.state.tenant_ids = payload.get("tenant_ids", [])
-                except (JWTError, ValueError):
-                    pass
-
-            response = await call_next(request)
-            return response
+    async def before(self, ctx: RequestContext) -> None:
+        """Runs before the application, in pipeline order."""
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        """Runs on the response start message, in reverse order; may edit headers."""
+
+    async def after(self, ctx: RequestContext) -> None:
+        """Runs after the application returns or raises, in reverse order."""
+
+
+@dataclass
+class StageTiming:
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
+_TIMINGS: dict[str, StageTiming] = {}
+
+
+def pipeline_timings() -> dict[str, StageTiming]:
+    """Process-wide per-stage timing totals, including ``app`` for the wrapped application."""
+    return dict(_TIMINGS)
+
+
+def reset_pipeline_timings() -> None:
+    _TIMINGS.clear()
+
+
+class RequestPipeline:
+    """ASGI middleware running ``stages`` around every HTTP request."""
+
+    def __init__(self, app: ASGIApp, stages: Sequence[Stage], server_timing: bool = False) -> None:
+        self.app = app
+        self.stages = tuple(stages)
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(conn=HTTPConnection(scope), started_at=time.perf_counter())
+        timings = ctx.timings
+        stages = self.stages
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                ctx.status_code = message["status"]
+                ctx.response_started_at = time.perf_counter()
+                headers = MutableHeaders(scope=message)
+                for stage in reversed(stages):
+                    start = time.perf_counter()
+                    stage.on_response_start(ctx, headers)
+                    timings[stage.name] = timings.get(stage.name, 0.0) + (
+                        time.perf_counter() - start
+                    )
+                if self.server_timing:
+                    headers.append("Server-Timing", _server_timing(timings))
+            await send(message)
+
+        entered = 0
+        try:
+            for stage in stages:
+                start = time.perf_counter()
+                entered += 1
+                await stage.before(ctx)
+                timings[stage.name] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                timings["app"] = time.perf_counter() - start
         finally:
-            clear_tenant_context()
+            for stage in reversed(stages[:entered]):
+                start = time.perf_counter()
+                try:
+                    await stage.after(ctx)
+                except Exception:
+                    logger.exception("Request pipeline stage %s failed", stage.name)
+                timings[stage.name] = timings.get(stage.name, 0.0) + (
+                    time.perf_counter() - start
+                )
+            for name, seconds in timings.items():
+                timing = _TIMINGS.get(name)
+                if timing is None:
+                    timing = _TIMINGS[name] = StageTiming()
+                timing.record(seconds)
+
+
+def _server_timing(timings: dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.items())
+
+
+class TraceIDStage(Stage):
+    """Injects a unique trace ID into every request/response for log correlation."""
+
+    name = "trace_id"
+
+    async def before(self, ctx: RequestContext) -> None:
+        ctx.conn.state.trace_id = ctx.conn.headers.get("X-Trace-ID", str(uuid.uuid4()))
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        headers["X-Trace-ID"] = ctx.conn.state.trace_id
+
+
+class TenantContextStage(Stage):
+    """Sets current_tenant_id from the request principal in request state + contextvar."""
+
+    name = "tenant_context"
+
+    async def before(self, ctx: RequestContext) -> None:
+        principal = resolve_principal(ctx.conn)
+        if principal is not None and principal.current_tenant_id:
+            try:
+                set_current_tenant_id(principal.current_tenant_id)
+            except ValueError:
+                return
+            ctx.conn.state.current_tenant_id = principal.current_tenant_id
+            ctx.conn.state.tenant_ids = list(principal.tenant_ids)
+
+    async def after(self, ctx: RequestContext) -> None:
+        clear_tenant_context()
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersStage(Stage):
     """Adds standard security headers to all responses."""
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        return response
+    name = "security_headers"
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        headers["X-Content-Type-Options"] = "nosniff"
+        headers["X-Frame-Options"] = "DENY"
+        headers["X-XSS-Protection"] = "1; mode=block"
+        headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+
+
+class SqlInstrumentationStage(Stage):
+    """Traces the SQL of sampled requests; place after TraceIDStage.
+
+    Finished traces feed the SQL metrics, repeated statement shapes (N+1) and requests whose
+    SQL time exceeds ``slow_ms`` are logged with the trace id, and with ``report`` (debug) every
+    request is traced and its SQL time and statement count added to Server-Timing.
+    """
+
+    name = "sql"
+
+    def __init__(
+        self,
+        sample_rate: float,
+        n_plus_one_threshold: int,
+        slow_ms: float,
+        report: bool = False,
+    ) -> None:
+        self.sample_rate = 1.0 if report else sample_rate
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_ms = slow_ms
+        self.report = report
+
+    async def before(self, ctx: RequestContext) -> None:
+        if self.sample_rate >= 1.0 or random.random() < self.sample_rate:
+            state = ctx.conn.state
+            state.sql_trace_token = start_sql_trace(getattr(state, "trace_id", None))
+
+    def on_response_start(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        trace = current_sql_trace()
+        if self.report and trace is not None:
+            total = trace.total
+            headers.append(
+                "Server-Timing",
+                f'sql;dur={total.seconds * 1000:.3f};desc="{total.statements} statements"',
+            )
+
+    async def after(self, ctx: RequestContext) -> None:
+        token = getattr(ctx.conn.state, "sql_trace_token", None)
+        if token is None:
+            return
+        trace = end_sql_trace(token)
+        route = ctx.conn.scope.get("route")
+        endpoint = f"{ctx.conn.scope['method']} {getattr(route, 'path', 'unmatched')}"
+        repeated = trace.n_plus_one(self.n_plus_one_threshold)
+        get_sql_metrics().observe(endpoint, trace, len(repeated))
+        for shape in repeated:
+            logger.warning(
+                "N+1 query pattern on %s (trace %s): %d x %s [field=%s service=%s]",
+                endpoint, trace.trace_id, shape["count"], shape["statement"],
+                shape["field"], shape["service"],
+            )
+        if trace.total.seconds * 1000 > self.slow_ms:
+            logger.warning(
+                "Slow SQL on %s (trace %s): %s",
+                endpoint, trace.trace_id, trace.summary(self.n_plus_one_threshold),
+            )
@@ -0,0 +1,265 @@
+"""
+Overview: Request-level SQL instrumentation — statements, rows and time per request, GraphQL
+    field and service method, N+1 detection and Prometheus counters.
+Architecture: Database layer instrumentation on SQLAlchemy engine events (Section 3.1, 4)
+Dependencies: sqlalchemy
+Concepts: A sampled request carries a ``SqlTrace`` in a context variable (started by the
+    request pipeline with the request's trace id). Engine cursor events add every statement's
+    time and rows (rows returned by buffered cursors such as asyncpg's, rows affected by DML)
+    to the trace, attributed to the GraphQL field and the ``track_sql`` service method running
+    at the time. A statement shape (its SQL text, parameters excluded) repeated more than the
+    N+1 threshold within one request is flagged. Finished traces feed process-wide counters
+    rendered in the Prometheus text format. Requests that are not sampled pay one context
+    variable lookup per statement and per tracked call.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_MAX_SHAPES = 500
+_SHAPE_PREVIEW = 200
+
+_trace: ContextVar[SqlTrace | None] = ContextVar("sql_trace", default=None)
+_field: ContextVar[str | None] = ContextVar("sql_field", default=None)
+_service: ContextVar[str | None] = ContextVar("sql_service", default=None)
+
+
+@dataclass
+class SqlStats:
+    """Statement count, rows and time for one request, field or service method."""
+
+    statements: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+    def add(self, rows: int, seconds: float) -> None:
+        self.statements += 1
+        self.rows += rows
+        self.seconds += seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "statements": self.statements,
+            "rows": self.rows,
+            "ms": round(self.seconds * 1000, 3),
+        }
+
+
+@dataclass
+class _Shape:
+    count: int
+    field: str | None
+    service: str | None
+
+
+@dataclass
+class SqlTrace:
+    """SQL activity of one request."""
+
+    trace_id: str | None = None
+    total: SqlStats = field(default_factory=SqlStats)
+    fields: dict[str, SqlStats] = field(default_factory=dict)
+    services: dict[str, SqlStats] = field(default_factory=dict)
+    shapes: dict[str, _Shape] = field(default_factory=dict)
+
+    def record(self, statement: str, rows: int, seconds: float) -> None:
+        self.total.add(rows, seconds)
+        field_name = _field.get()
+        if field_name is not None:
+            self.fields.setdefault(field_name, SqlStats()).add(rows, seconds)
+        service = _service.get()
+        if service is not None:
+            self.services.setdefault(service, SqlStats()).add(rows, seconds)
+        shape = self.shapes.get(statement)
+        if shape is not None:
+            shape.count += 1
+        elif len(self.shapes) < _MAX_SHAPES:
+            self.shapes[statement] = _Shape(1, field_name, service)
+
+    def n_plus_one(self, threshold: int) -> list[dict[str, Any]]:
+        """Statement shapes repeated more than ``threshold`` times, most repeated first."""
+        repeated = [(s, shape) for s, shape in self.shapes.items() if shape.count > threshold]
+        repeated.sort(key=lambda item: item[1].count, reverse=True)
+        return [
+            {
+                "statement": statement[:_SHAPE_PREVIEW],
+                "count": shape.count,
+                "field": shape.field,
+                "service": shape.service,
+            }
+            for statement, shape in repeated
+        ]
+
+    def summary(self, threshold: int) -> dict[str, Any]:
+        return {
+            **self.total.to_dict(),
+            "fields": {name: stats.to_dict() for name, stats in self.fields.items()},
+            "services": {name: stats.to_dict() for name, stats in self.services.items()},
+            "nPlusOne": self.n_plus_one(threshold),
+        }
+
+
+def current_sql_trace() -> SqlTrace | None:
+    """The SQL trace of the running request, or None if it is not sampled."""
+    return _trace.get()
+
+
+def start_sql_trace(trace_id: str | None) -> Token:
+    """Trace SQL for the current request; pass the token to ``end_sql_trace``."""
+    return _trace.set(SqlTrace(trace_id))
+
+
+def end_sql_trace(token: Token) -> SqlTrace | None:
+    trace = _trace.get()
+    _trace.reset(token)
+    return trace
+
+
+@contextmanager
+def sql_field(name: str) -> Iterator[None]:
+    """Attribute statements run inside the block to a GraphQL field."""
+    token = _field.set(name)
+    try:
+        yield
+    finally:
+        _field.reset(token)
+
+
+def track_sql[**P, R](method: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+    """Attribute the statements of an async service method to it in sampled requests."""
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        if _trace.get() is None:
+            return await method(*args, **kwargs)
+        token = _service.set(name)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            _service.reset(token)
+
+    return wrapper
+
+
+# ── Process-wide counters ─────────────────────────────────────────
+
+
+class SqlMetrics:
+    """Counters over finished traces, exported in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._requests: dict[str, int] = {}
+        self._n_plus_one: dict[str, int] = {}
+        self._stats: dict[tuple[str, str], SqlStats] = {}
+
+    def observe(self, endpoint: str, trace: SqlTrace, n_plus_one: int) -> None:
+        with self._lock:
+            self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+            if n_plus_one:
+                self._n_plus_one[endpoint] = self._n_plus_one.get(endpoint, 0) + n_plus_one
+            self._merge(("endpoint", endpoint), trace.total)
+            for name, stats in trace.fields.items():
+                self._merge(("field", name), stats)
+            for name, stats in trace.services.items():
+                self._merge(("service", name), stats)
+
+    def _merge(self, key: tuple[str, str], stats: SqlStats) -> None:
+        total = self._stats.get(key)
+        if total is None:
+            total = self._stats[key] = SqlStats()
+        total.statements += stats.statements
+        total.rows += stats.rows
+        total.seconds += stats.seconds
+
+    def render(self, sample_rate: float) -> str:
+        with self._lock:
+            lines = [
+                "# HELP nimbus_sql_sample_rate Share of requests traced for SQL instrumentation.",
+                "# TYPE nimbus_sql_sample_rate gauge",
+                f"nimbus_sql_sample_rate {sample_rate}",
+                "# HELP nimbus_sql_sampled_requests_total Requests traced, by endpoint.",
+                "# TYPE nimbus_sql_sampled_requests_total counter",
+                *(
+                    f'nimbus_sql_sampled_requests_total{{endpoint="{_label(e)}"}} {n}'
+                    for e, n in self._requests.items()
+                ),
+                "# HELP nimbus_sql_n_plus_one_total N+1 statement shapes flagged, by endpoint.",
+                "# TYPE nimbus_sql_n_plus_one_total counter",
+                *(
+                    f'nimbus_sql_n_plus_one_total{{endpoint="{_label(e)}"}} {n}'
+                    for e, n in self._n_plus_one.items()
+                ),
+            ]
+            for metric, help_text, value in (
+                ("statements_total", "SQL statements", lambda s: s.statements),
+                ("rows_total", "SQL rows returned or affected", lambda s: s.rows),
+                ("seconds_total", "SQL execution time", lambda s: round(s.seconds, 6)),
+            ):
+                lines.append(
+                    f"# HELP nimbus_sql_{metric} {help_text} in traced requests, by scope."
+                )
+                lines.append(f"# TYPE nimbus_sql_{metric} counter")
+                lines.extend(
+                    f'nimbus_sql_{metric}{{scope="{scope}",name="{_label(name)}"}} {value(stats)}'
+                    for (scope, name), stats in self._stats.items()
+                )
+            return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._n_plus_one.clear()
+            self._stats.clear()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_metrics = SqlMetrics()
+
+
+def get_sql_metrics() -> SqlMetrics:
+    """The process-wide SQL instrumentation counters."""
+    return _metrics
+
+
+# ── Engine events ─────────────────────────────────────────────────
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    if _trace.get() is not None:
+        context._sql_started = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    trace = _trace.get()
+    started = getattr(context, "_sql_started", None)
+    if trace is None or started is None:
+        return
+    rows = cursor.rowcount
+    if rows < 0:
+        rows = len(getattr(cursor, "_rows", ()))
+    trace.record(statement, rows, time.perf_counter() - started)
+
+
+if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
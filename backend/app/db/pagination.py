@@ -0,0 +1,234 @@
+"""
+Overview: Keyset (cursor) pagination for list queries, with opaque cursors and optional totals.
+Architecture: Database layer helper shared by list services and GraphQL connections (Section 4)
+Dependencies: sqlalchemy
+Concepts: Pages are fetched with a WHERE on the sort key of the last row seen instead of OFFSET,
+    so deep pages cost the same as the first. Cursors are the row's sort-key values, JSON encoded
+    and base64'd; callers treat them as opaque. The last sort key must be unique (usually the
+    primary key) and all keys non-null. Totals are optional: exact (COUNT over the filtered
+    query) or estimated from the planner's row estimate, falling back to an exact count when
+    the estimate is small.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Literal
+
+from sqlalchemy import and_, func, literal, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ClauseElement, Executable, Select, operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+TotalMode = Literal["exact", "estimate"]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Planner estimates below this are replaced by an exact count (cheap at that size, and
+# estimates for small filtered sets are the least reliable).
+EXACT_COUNT_BELOW = 1_000
+
+
+class PaginationError(ValueError):
+    def __init__(self, message: str, code: str = "INVALID_PAGINATION"):
+        self.message = message
+        self.code = code
+        super().__init__(message)
+
+
+# ── Cursors ───────────────────────────────────────────────────────────
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"u": str(value)}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "u" in value:
+            return uuid.UUID(value["u"])
+        if "n" in value:
+            return Decimal(value["n"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a row's sort-key values as an opaque, URL-safe cursor."""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Decode a cursor produced by ``encode_cursor`` for a sort of ``size`` keys."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError(cursor)
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError) as e:
+        raise PaginationError("Invalid cursor", "INVALID_CURSOR") from e
+
+
+# ── Pages ─────────────────────────────────────────────────────────────
+
+
+@dataclass
+class KeysetPage[T]:
+    items: list[T] = field(default_factory=list)
+    cursors: list[str] = field(default_factory=list)
+    has_next_page: bool = False
+    has_previous_page: bool = False
+    total: int | None = None
+    total_is_estimate: bool = False
+
+    @property
+    def start_cursor(self) -> str | None:
+        return self.cursors[0] if self.cursors else None
+
+    @property
+    def end_cursor(self) -> str | None:
+        return self.cursors[-1] if self.cursors else None
+
+
+def _split_key(key) -> tuple[Any, bool]:
+    """(expression, descending) for a sort key given as ``col`` or ``col.desc()``/``.asc()``."""
+    if isinstance(key, UnaryExpression) and key.modifier in (operators.desc_op, operators.asc_op):
+        return key.element, key.modifier is operators.desc_op
+    return key, False
+
+
+def _after(keys: list[tuple[Any, bool]], values: list[Any]):
+    """Condition selecting rows strictly after ``values`` in the order given by ``keys``."""
+    if len({desc for _, desc in keys}) == 1:
+        left = tuple_(*(expr for expr, _ in keys))
+        right = tuple_(
+            *(literal(v, expr.type) for (expr, _), v in zip(keys, values, strict=True))
+        )
+        return left < right if keys[0][1] else left > right
+    clauses = []
+    for i, (expr, desc) in enumerate(keys):
+        step = expr < values[i] if desc else expr > values[i]
+        clauses.append(and_(*(e == v for (e, _), v in zip(keys[:i], values, strict=False)), step))
+    return or_(*clauses)
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    order_by: Sequence[Any],
+    *,
+    first: int | None = None,
+    after: str | None = None,
+    last: int | None = None,
+    before: str | None = None,
+    total: TotalMode | None = None,
+) -> KeysetPage:
+    """Fetch one keyset page of ``stmt`` (a filtered, unordered single-entity select).
+
+    ``order_by`` lists the sort keys, the last of which must be unique. ``first``/``after``
+    page forwards, ``last``/``before`` backwards, as in Relay connections. ``has_previous_page``
+    (forwards) and ``has_next_page`` (backwards) reflect whether a cursor was given rather than
+    an extra query.
+    """
+    if first is not None and last is not None:
+        raise PaginationError("Pass either first or last, not both")
+    size = last if last is not None else first
+    size = DEFAULT_PAGE_SIZE if size is None else size
+    if size < 0:
+        raise PaginationError("Page size must not be negative")
+    size = min(size, MAX_PAGE_SIZE)
+    backwards = last is not None or (before is not None and after is None)
+
+    keys = [_split_key(k) for k in order_by]
+    fetch_keys = [(expr, not desc) for expr, desc in keys] if backwards else keys
+
+    page_stmt = stmt
+    if after is not None:
+        page_stmt = page_stmt.where(_after(keys, decode_cursor(after, len(keys))))
+    if before is not None:
+        reversed_keys = [(expr, not desc) for expr, desc in keys]
+        page_stmt = page_stmt.where(_after(reversed_keys, decode_cursor(before, len(keys))))
+
+    # Sort keys ride along as extra columns so computed keys (ranks) can go into cursors too.
+    page_stmt = page_stmt.add_columns(
+        *(expr.label(f"_pk{i}") for i, (expr, _) in enumerate(keys))
+    )
+    page_stmt = page_stmt.order_by(
+        *(expr.desc() if desc else expr.asc() for expr, desc in fetch_keys)
+    ).limit(size + 1)
+
+    rows = list((await db.execute(page_stmt)).all())
+    has_more = len(rows) > size
+    rows = rows[:size]
+    if backwards:
+        rows.reverse()
+
+    page = KeysetPage(
+        items=[row[0] for row in rows],
+        cursors=[encode_cursor(row[1:]) for row in rows],
+        has_next_page=has_more if not backwards else before is not None,
+        has_previous_page=has_more if backwards else after is not None,
+    )
+    if total == "exact":
+        page.total = await count_rows(db, stmt)
+    elif total == "estimate":
+        page.total = await estimate_rows(db, stmt)
+        if page.total < EXACT_COUNT_BELOW:
+            page.total = await count_rows(db, stmt)
+        else:
+            page.total_is_estimate = True
+    return page
+
+
+# ── Totals ────────────────────────────────────────────────────────────
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, stmt: Select):
+        self.stmt = stmt
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.stmt, **kw)
+
+
+async def count_rows(db: AsyncSession, stmt: Select) -> int:
+    """Exact row count of ``stmt``."""
+    result = await db.execute(select(func.count()).select_from(stmt.order_by(None).subquery()))
+    return result.scalar() or 0
+
+
+async def estimate_rows(db: AsyncSession, stmt: Select) -> int:
+    """Planner row estimate for ``stmt``; the query itself is not run."""
+    stmt = stmt.with_only_columns(literal(1), maintain_column_froms=True).order_by(None)
+    result = await db.execute(_Explain(stmt))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,132 @@
+"""
+Overview: Per-statement query profiling that separates statement compilation from execution.
+Architecture: Database layer instrumentation on SQLAlchemy engine events (Section 3.1, 4)
+Dependencies: sqlalchemy
+Concepts: Once enabled (``db_query_profiling``), every engine records for each distinct SQL
+    statement how often it ran, the time SQLAlchemy spent turning the construct into SQL and
+    parameters (compiled-cache lookup, compilation, bind processing: ``before_execute`` to
+    ``before_cursor_execute``), the time the driver spent executing it (``before_cursor_execute``
+    to ``after_cursor_execute``, which for asyncpg includes preparing the statement unless it
+    is in the connection's prepared-statement cache), and how often the compiled cache was hit.
+    Statements built once at module level should show near-zero compile time and a hit rate
+    near 100%; statements rebuilt per call show where the saving is still to be had.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT
+
+_STARTED_KEY = "_profile_started"
+
+
+@dataclass
+class QueryStats:
+    """Accumulated timings for one SQL statement."""
+
+    statement: str
+    count: int = 0
+    cache_hits: int = 0
+    compile_seconds: float = 0.0
+    execute_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "cache_hit_ratio": round(self.cache_hits / self.count, 3) if self.count else 0.0,
+            "compile_ms": round(self.compile_seconds * 1000, 3),
+            "execute_ms": round(self.execute_seconds * 1000, 3),
+        }
+
+
+class QueryProfiler:
+    """Collects per-statement compile and execute times, bounded to ``max_statements``."""
+
+    def __init__(self, max_statements: int = 1000) -> None:
+        self.max_statements = max_statements
+        self._stats: dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self, statement: str, compile_seconds: float, execute_seconds: float, cache_hit: bool
+    ) -> None:
+        with self._lock:
+            stats = self._stats.get(statement)
+            if stats is None:
+                if len(self._stats) >= self.max_statements:
+                    return
+                stats = self._stats[statement] = QueryStats(statement)
+            stats.count += 1
+            stats.cache_hits += cache_hit
+            stats.compile_seconds += compile_seconds
+            stats.execute_seconds += execute_seconds
+
+    def snapshot(self, limit: int = 50) -> list[dict[str, Any]]:
+        """The most expensive statements by total time, slowest first."""
+        with self._lock:
+            ranked = sorted(
+                self._stats.values(),
+                key=lambda s: s.compile_seconds + s.execute_seconds,
+                reverse=True,
+            )
+            return [s.to_dict() for s in ranked[:limit]]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+_profiler = QueryProfiler()
+
+
+def get_query_profiler() -> QueryProfiler:
+    """The process-wide query profiler."""
+    return _profiler
+
+
+def _before_execute(conn: Any, clauseelement: Any, multiparams: Any, params: Any, options: Any):
+    conn.info[_STARTED_KEY] = time.perf_counter()
+
+
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    now = time.perf_counter()
+    context._profile_compiled = now - conn.info.pop(_STARTED_KEY, now)
+    context._profile_executing = now
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    started = getattr(context, "_profile_executing", None)
+    if started is None:
+        return
+    _profiler.record(
+        statement,
+        context._profile_compiled,
+        time.perf_counter() - started,
+        context.cache_hit is CACHE_HIT,
+    )
+
+
+def enable_query_profiling() -> None:
+    """Start profiling statements on every engine in the process."""
+    if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(Engine, "before_execute", _before_execute)
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def disable_query_profiling() -> None:
+    if event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.remove(Engine, "before_execute", _before_execute)
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
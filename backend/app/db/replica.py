@@ -0,0 +1,218 @@
+"""
+Overview: Read-replica session routing with replica lag checks and read-your-writes pinning.
+Architecture: Database layer beside the primary session factory (Section 3.1, 4)
+Dependencies: sqlalchemy[asyncio], asyncpg, app.core.config, app.core.tenant_context,
+    app.db.session
+Concepts: Heavy read paths (GraphQL query operations, audit search, profitability, exports)
+    ask ``read_session_factory()`` for a session factory. It returns the replica factory when
+    a replica is configured, its measured lag is within ``db_replica_max_lag_seconds`` and the
+    replica has replayed past the current tenant's last write; otherwise the primary factory.
+    Lag and the replica's replayed WAL position are measured at most every
+    ``db_replica_lag_check_seconds`` (lag is zero while the replica has replayed everything it
+    received) and an unreachable replica counts as too far behind. When a session that
+    flushed or ran DML commits, the primary's WAL position is read and pinned in Valkey for
+    the tenant in context before ``commit()`` returns, so every worker keeps that tenant on the
+    primary until the replica has replayed past it. Without Valkey reads stay on the primary.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import AsyncGenerator
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from app.core.tenant_context import get_current_tenant_id
+from app.db.session import async_session_factory, engine, engine_options, settings
+
+logger = logging.getLogger(__name__)
+
+_WROTE_KEY = "_replica_wrote"
+
+_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END,"
+    " pg_last_wal_replay_lsn() - '0/0'::pg_lsn"
+)
+_LSN_QUERY = text("SELECT pg_current_wal_lsn() - '0/0'::pg_lsn")
+
+_VALKEY_PREFIX = "nimbus:replica:lsn:"
+_PIN_TTL_SECONDS = 24 * 3600
+# Raise the pinned position, never lower it: a tenant's commits race from several workers
+_PIN_SCRIPT = """
+if tonumber(ARGV[1]) > tonumber(redis.call('GET', KEYS[1]) or '0') then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+end
+"""
+
+replica_engine = (
+    create_async_engine(settings.database_replica_url, **engine_options(settings.db_pool_size))
+    if settings.database_replica_url
+    else None
+)
+
+async_replica_session_factory = (
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
+
+class ReplicaRouter:
+    """Decides per read whether the replica is fresh enough."""
+
+    def __init__(self, max_lag: float, check_interval: float) -> None:
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lag: float | None = None
+        self._replayed = 0
+        self._checked_at = 0.0
+        self._writes: dict[str, float] = {}
+
+    async def measure(self) -> tuple[float, int] | None:
+        """Replica lag in seconds and its replayed WAL position, or None if it is unreachable."""
+        if replica_engine is None:
+            return None
+        try:
+            async with replica_engine.connect() as conn:
+                lag, replayed = (await conn.execute(_LAG_QUERY)).one()
+                return float(lag or 0), int(replayed or 0)
+        except Exception:
+            logger.warning("Replica lag check failed; reading from the primary", exc_info=True)
+            return None
+
+    async def lag(self) -> float | None:
+        now = time.time()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            self._lag, self._replayed = await self.measure() or (None, 0)
+        return self._lag
+
+    @staticmethod
+    async def _client():
+        from app.services.events.valkey_client import get_valkey_client
+
+        return await get_valkey_client()
+
+    def note_write(self, key: str) -> None:
+        """Pin ``key`` to the primary in this process until the replica has likely caught up.
+
+        Covers the committing worker even when the shared pin could not be written.
+        """
+        now = time.time()
+        self._writes[key] = now
+        if len(self._writes) > 10_000:
+            horizon = now - self.max_lag - self.check_interval
+            self._writes = {k: t for k, t in self._writes.items() if t > horizon}
+
+    async def pin_write(self, key: str) -> None:
+        """Pin ``key`` to the primary for all workers until the replica replays its commit."""
+        client = await self._client()
+        if client is None:
+            return
+        try:
+            async with engine.connect() as conn:
+                lsn = int((await conn.execute(_LSN_QUERY)).scalar())
+            await client.eval(_PIN_SCRIPT, 1, _VALKEY_PREFIX + key, lsn, _PIN_TTL_SECONDS)
+        except Exception:
+            logger.warning("Replica write pin failed", exc_info=True)
+
+    async def _pinned(self, key: str) -> int | None:
+        """WAL position of ``key``'s last pinned write (0 if none), or None without Valkey."""
+        client = await self._client()
+        if client is None:
+            return None
+        try:
+            return int(await client.get(_VALKEY_PREFIX + key) or 0)
+        except Exception:
+            logger.debug("Replica write pin unavailable", exc_info=True)
+            return None
+
+    async def use_replica(self, key: str) -> bool:
+        lag = await self.lag()
+        if lag is None or lag > self.max_lag:
+            return False
+        # The replica had replayed everything up to (check time - lag) when it was measured
+        if self._writes.get(key, 0.0) >= self._checked_at - lag:
+            return False
+        pinned = await self._pinned(key)
+        return pinned is not None and pinned <= self._replayed
+
+
+_router: ReplicaRouter | None = None
+
+
+def get_replica_router() -> ReplicaRouter:
+    """The process-wide replica router."""
+    global _router
+    if _router is None:
+        _router = ReplicaRouter(
+            settings.db_replica_max_lag_seconds, settings.db_replica_lag_check_seconds
+        )
+    return _router
+
+
+def _write_key() -> str:
+    return get_current_tenant_id() or ""
+
+
+async def read_session_factory(
+    tenant_id: str | None = None,
+) -> async_sessionmaker[AsyncSession]:
+    """Replica session factory when it is fresh enough for the tenant, else primary.
+
+    The tenant defaults to the one in context; pass it where no context is set (activities).
+    """
+    if async_replica_session_factory is not None and await get_replica_router().use_replica(
+        tenant_id or _write_key()
+    ):
+        return async_replica_session_factory
+    return async_session_factory
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that provides a read-only session, on the replica when possible."""
+    factory = await read_session_factory()
+    async with factory() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+
+
+# ── Write tracking ────────────────────────────────────────────────
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    session.info[_WROTE_KEY] = True
+
+
+def _on_execute(state: ORMExecuteState) -> None:
+    if state.is_update or state.is_delete or state.is_insert:
+        state.session.info[_WROTE_KEY] = True
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop(_WROTE_KEY, False) and async_replica_session_factory is not None:
+        router = get_replica_router()
+        key = _write_key()
+        router.note_write(key)
+        if in_greenlet():
+            # AsyncSession.commit(): pin before it returns, so no later read can miss the write
+            await_only(router.pin_write(key))
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_WROTE_KEY, None)
+
+
+if not event.contains(Session, "after_commit", _after_commit):
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "do_orm_execute", _on_execute)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
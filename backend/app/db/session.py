@@ -2,30 +2,62 @@
 Overview: Async SQLAlchemy engine and session factory for database access.
 Architecture: Database layer providing sessions to services (Section 3.1, 4)
 Dependencies: sqlalchemy[asyncio], asyncpg, app.core.config
-Concepts: Async database access, connection pooling, session management
+Concepts: Async database access, connection pooling, session management. Tenants listed in
+    ``db_dedicated_tenant_pools`` get their own engine and pool (created on first use) so a
+    hot tenant cannot exhaust the shared pool; every other tenant shares the default engine.
+    In-flight tenant sessions are counted per tenant; ``get_pool_stats`` reports them only in
+    aggregate (it backs the unauthenticated ``/ready``) and ``get_tenant_pool_stats`` breaks
+    them down per tenant for the admin endpoint. All engines share
+    ``engine_options``, which sizes SQLAlchemy's compiled cache and asyncpg's per-connection
+    prepared-statement cache.
 """
 
-from collections.abc import AsyncGenerator
+import uuid
+from collections import Counter
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import contextmanager
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import get_settings
+from app.db.profiling import enable_query_profiling
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_size=settings.db_pool_size,
-    max_overflow=settings.db_max_overflow,
-    pool_timeout=settings.db_pool_timeout,
-    pool_recycle=settings.db_pool_recycle,
-    pool_pre_ping=True,
-)
+
+def engine_options(pool_size: int) -> dict:
+    """Keyword arguments for ``create_async_engine`` shared by every Nimbus engine."""
+    return {
+        "echo": settings.debug,
+        "pool_size": pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": True,
+        "query_cache_size": settings.db_compiled_cache_size,
+        "connect_args": {
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size
+        },
+    }
+
+
+engine = create_async_engine(settings.database_url, **engine_options(settings.db_pool_size))
+
+if settings.db_query_profiling:
+    enable_query_profiling()
 
 async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+_tenant_engines: dict[str, AsyncEngine] = {}
+_tenant_factories: dict[str, async_sessionmaker[AsyncSession]] = {}
+_tenant_sessions: Counter[str] = Counter()
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency that provides a database session."""
@@ -38,9 +70,43 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
-def get_pool_stats() -> dict:
-    """Return connection pool statistics for health/monitoring endpoints."""
-    pool = engine.pool
+def session_factory_for(tenant_id: str) -> async_sessionmaker[AsyncSession]:
+    """Session factory for a tenant: its dedicated pool if configured, else the shared one."""
+    key = str(uuid.UUID(tenant_id))
+    factory = _tenant_factories.get(key)
+    if factory is not None:
+        return factory
+    dedicated = {str(uuid.UUID(t)): size for t, size in settings.db_dedicated_tenant_pools.items()}
+    if key not in dedicated:
+        return async_session_factory
+    tenant_engine = create_async_engine(settings.database_url, **engine_options(dedicated[key]))
+    _tenant_engines[key] = tenant_engine
+    factory = async_sessionmaker(tenant_engine, class_=AsyncSession, expire_on_commit=False)
+    _tenant_factories[key] = factory
+    return factory
+
+
+@contextmanager
+def track_tenant_session(tenant_id: str) -> Iterator[None]:
+    """Count a tenant session as in flight for the per-tenant pool statistics."""
+    _tenant_sessions[tenant_id] += 1
+    try:
+        yield
+    finally:
+        _tenant_sessions[tenant_id] -= 1
+        if not _tenant_sessions[tenant_id]:
+            del _tenant_sessions[tenant_id]
+
+
+async def dispose_tenant_engines() -> None:
+    """Close the dedicated tenant pools (application shutdown)."""
+    for tenant_engine in _tenant_engines.values():
+        await tenant_engine.dispose()
+    _tenant_engines.clear()
+    _tenant_factories.clear()
+
+
+def _pool_stats(pool) -> dict:
     if isinstance(pool, AsyncAdaptedQueuePool):
         return {
             "pool_size": pool.size(),
@@ -50,3 +116,40 @@ def get_pool_stats() -> dict:
             "invalid": pool.status(),
         }
     return {"status": str(pool.status())}
+
+
+def get_pool_stats() -> dict:
+    """Return connection pool statistics for health/monitoring endpoints.
+
+    Top-level keys describe the shared pool; tenant activity is only aggregated (sessions in
+    flight, dedicated pools and their checked-out connections), so no tenant is identified.
+    """
+    stats = _pool_stats(engine.pool)
+    stats["tenant_sessions"] = sum(_tenant_sessions.values())
+    stats["dedicated_pools"] = len(_tenant_engines)
+    stats["dedicated_checked_out"] = sum(
+        e.pool.checkedout() for e in _tenant_engines.values()
+        if isinstance(e.pool, AsyncAdaptedQueuePool)
+    )
+    return stats
+
+
+def get_tenant_pool_stats(tenant_ids: set[str] | None = None) -> dict[str, dict]:
+    """Per-tenant session counts and dedicated pool stats, for admin endpoints.
+
+    Lists tenants with sessions in flight or a dedicated pool (limited to ``tenant_ids`` if
+    given), with their session count and, if dedicated, that pool's stats.
+    """
+    tenants: dict[str, dict] = {
+        tenant_id: {"sessions": count, "dedicated": False}
+        for tenant_id, count in _tenant_sessions.items()
+    }
+    for tenant_id, tenant_engine in _tenant_engines.items():
+        tenants[tenant_id] = {
+            "sessions": _tenant_sessions.get(tenant_id, 0),
+            "dedicated": True,
+            **_pool_stats(tenant_engine.pool),
+        }
+    if tenant_ids is not None:
+        tenants = {t: stats for t, stats in tenants.items() if t in tenant_ids}
+    return tenants
@@ -2,46 +2,77 @@
 Overview: Tenant-aware database session factories that set search_path and RLS variables.
 Architecture: Tenant-scoped session management (Section 3.1, 4.2)
 Dependencies: sqlalchemy, app.db.session, app.services.tenant.schema_manager
-Concepts: Multi-tenancy, PostgreSQL search_path, RLS session variables
+Concepts: Multi-tenancy, PostgreSQL search_path, RLS session variables. The scope is stored
+    in ``session.info`` and applied when the session begins a transaction on a connection:
+    one ``SELECT set_config(..., true), ...`` sets search_path and the RLS variables together,
+    transaction-locally like ``SET LOCAL``. Nothing is sent until the session first touches
+    the database, it is re-applied for every new transaction of the session, and it ends with
+    the transaction, so a connection returned to the pool carries no tenant state.
 """
 
 import uuid
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from app.db.session import async_session_factory
+from app.db.session import async_session_factory, session_factory_for, track_tenant_session
 from app.services.tenant.schema_manager import get_schema_name
 
+SCOPE_KEY = "_db_scope"
+
+PROVIDER_SCOPE = {"app.is_provider_context": "true"}
+
+
+def tenant_scope(tenant_id: str) -> dict[str, str]:
+    """Settings for a session scoped to one tenant's schema and RLS rows."""
+    return {
+        "search_path": f'"{get_schema_name(tenant_id)}", public',
+        "app.current_tenant_id": tenant_id,
+    }
+
 
 async def get_tenant_db(tenant_id: str) -> AsyncGenerator[AsyncSession, None]:
     """Provide a session scoped to a specific tenant via search_path and RLS variable."""
-    uuid.UUID(tenant_id)  # Validate
-    schema_name = get_schema_name(tenant_id)
+    tenant_id = str(uuid.UUID(tenant_id))  # Validate
+    scope = tenant_scope(tenant_id)
 
-    async with async_session_factory() as session:
-        try:
-            await session.execute(
-                text(f'SET search_path TO "{schema_name}", public')
-            )
-            await session.execute(
-                text("SET app.current_tenant_id = :tid").bindparams(tid=tenant_id)
-            )
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+    with track_tenant_session(tenant_id):
+        async with session_factory_for(tenant_id)() as session:
+            session.info[SCOPE_KEY] = scope
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
 
 
 async def get_provider_db() -> AsyncGenerator[AsyncSession, None]:
     """Provide a session with provider-level access (bypasses RLS)."""
     async with async_session_factory() as session:
+        session.info[SCOPE_KEY] = PROVIDER_SCOPE
         try:
-            await session.execute(text("SET app.is_provider_context = 'true'"))
             yield session
             await session.commit()
         except Exception:
             await session.rollback()
             raise
+
+
+def _apply_scope(session: Session, transaction: Any, connection: Any) -> None:
+    scope = session.info.get(SCOPE_KEY)
+    if not scope:
+        return
+    calls, params = [], {}
+    for i, (name, value) in enumerate(scope.items()):
+        calls.append(f"set_config(:name_{i}, :value_{i}, true)")
+        params[f"name_{i}"] = name
+        params[f"value_{i}"] = value
+    connection.execute(text("SELECT " + ", ".join(calls)), params)
+
+
+if not event.contains(Session, "after_begin", _apply_scope):
+    event.listen(Session, "after_begin", _apply_scope)
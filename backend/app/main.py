@@ -10,18 +10,21 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from strawberry.fastapi import GraphQLRouter
 
 from app.api.graphql.context import get_context
 from app.api.graphql.schema import schema
 from app.api.v1.router import router as api_v1_router
-from app.core.audit_middleware import AuditMiddleware
+from app.core.audit_middleware import AuditStage
 from app.core.config import get_settings
+from app.core.etag import ETagMiddleware
 from app.core.middleware import (
-    SecurityHeadersMiddleware,
-    TenantContextMiddleware,
-    TraceIDMiddleware,
+    RequestPipeline,
+    SecurityHeadersStage,
+    SqlInstrumentationStage,
+    TenantContextStage,
+    TraceIDStage,
 )
 
 settings = get_settings()
@@ -36,6 +39,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     register_audit_hooks(db_engine)
 
+    from app.services.cache.response_cache import register_response_cache_hooks
+
+    register_response_cache_hooks()
+
     from app.services.resolver.setup import setup_resolvers
 
     setup_resolvers()
@@ -61,8 +68,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception:
         pass
 
-    from app.db.session import engine
+    from app.services.auth.password import shutdown_password_pool
+
+    shutdown_password_pool()
 
+    from app.db.session import dispose_tenant_engines, engine
+
+    await dispose_tenant_engines()
     await engine.dispose()
 
 
@@ -77,11 +89,25 @@ app = FastAPI(
 
 # Middleware: last add_middleware = outermost wrapper (runs first on request)
 # CORS must be outermost to handle preflight and attach headers to error responses
-# AuditMiddleware is innermost — runs after auth/tenant context is established
-app.add_middleware(AuditMiddleware)
-app.add_middleware(TraceIDMiddleware)
-app.add_middleware(SecurityHeadersMiddleware)
-app.add_middleware(TenantContextMiddleware)
+# Pipeline stages run in request order; audit is last — after auth/tenant context is established
+# ETags are innermost so the pipeline's headers and audit see the final (possibly 304) response
+app.add_middleware(ETagMiddleware, prefixes=["/api/v1/"])
+app.add_middleware(
+    RequestPipeline,
+    stages=[
+        TenantContextStage(),
+        SecurityHeadersStage(),
+        TraceIDStage(),
+        SqlInstrumentationStage(
+            settings.sql_instrumentation_sample_rate,
+            settings.sql_n_plus_one_threshold,
+            settings.sql_slow_request_ms,
+            report=settings.debug,
+        ),
+        AuditStage(),
+    ],
+    server_timing=settings.debug,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:4200", "http://127.0.0.1:4200"],
@@ -123,7 +149,8 @@ async def ready() -> dict:
     from sqlalchemy import text
 
     from app.core.temporal import check_temporal_health
-    from app.db.session import async_session_factory, get_pool_stats
+    from app.db.profiling import get_query_profiler
+    from app.db.session import async_session_factory, get_pool_stats, settings
 
     # --- Database ---
     try:
@@ -147,7 +174,7 @@ async def ready() -> dict:
     else:
         overall = "ready"
 
-    return {
+    response = {
         "status": overall,
         "checks": {
             "database": db_check,
@@ -155,9 +182,24 @@ async def ready() -> dict:
         },
         "pool": get_pool_stats(),
     }
+    if settings.db_query_profiling:
+        response["queries"] = get_query_profiler().snapshot(limit=20)
+    return response
 
 
 @app.get("/live")
 async def live() -> dict:
     """Liveness check — is the process healthy?"""
     return {"status": "alive"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """SQL instrumentation counters in the Prometheus text format."""
+    from app.db.instrumentation import get_sql_metrics
+
+    sample_rate = 1.0 if settings.debug else settings.sql_instrumentation_sample_rate
+    return PlainTextResponse(
+        get_sql_metrics().render(sample_rate),
+        media_type="text/plain; version=0.0.4",
+    )
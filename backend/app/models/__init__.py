@@ -25,6 +25,7 @@ from app.models.cmdb import (
     CIAttributeDefinition,
     CIClass,
     CIClassActivityAssociation,
+    CIExplorerCount,
     CIRelationship,
     CISnapshot,
     CITemplate,
@@ -37,6 +38,7 @@ from app.models.cmdb import (
     PriceListItem,
     PriceListTemplate,
     PriceListTemplateItem,
+    ProfitabilityRollup,
     ProviderSku,
     RegionAcceptanceTemplate,
     RegionAcceptanceTemplateRule,
@@ -148,6 +150,7 @@ __all__ = [
     "CIAttributeDefinition",
     "CIClass",
     "CIClassActivityAssociation",
+    "CIExplorerCount",
     "CIRelationship",
     "CISnapshot",
     "CITemplate",
@@ -197,6 +200,7 @@ __all__ = [
     "PriceListItem",
     "PriceListTemplate",
     "PriceListTemplateItem",
+    "ProfitabilityRollup",
     "Provider",
     "ProviderSku",
     "Resolver",
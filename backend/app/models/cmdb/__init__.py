@@ -2,9 +2,9 @@
 Overview: CMDB model package — re-exports all CMDB models for convenient importing.
 Architecture: Configuration Management Database models (Section 8)
 Dependencies: app.models.cmdb.*
-Concepts: CI classes, configuration items, relationships, snapshots, templates, service catalog,
-    delivery regions, region acceptance, staff profiles, activities, processes, estimations,
-    price list templates, organizational units
+Concepts: CI classes, configuration items, explorer counts, relationships, snapshots, templates,
+    service catalog, delivery regions, region acceptance, staff profiles, activities, processes,
+    estimations, price list templates, organizational units
 """
 
 from app.models.cmdb.blueprint_parameter import StackBlueprintParameter
@@ -17,6 +17,7 @@ from app.models.cmdb.activity import (
 )
 from app.models.cmdb.ci import ConfigurationItem
 from app.models.cmdb.ci_class import CIAttributeDefinition, CIClass
+from app.models.cmdb.ci_explorer_count import CIExplorerCount
 from app.models.cmdb.ci_class_activity_association import CIClassActivityAssociation
 from app.models.cmdb.ci_relationship import CIRelationship
 from app.models.cmdb.ci_snapshot import CISnapshot
@@ -29,6 +30,7 @@ from app.models.cmdb.pin_minimum_charge import PinMinimumCharge
 from app.models.cmdb.price_list import PriceList, PriceListItem, TenantPriceListPin
 from app.models.cmdb.price_list_overlay import PriceListOverlayItem
 from app.models.cmdb.price_list_template import PriceListTemplate, PriceListTemplateItem
+from app.models.cmdb.profitability_rollup import ProfitabilityRollup
 from app.models.cmdb.provider_sku import ProviderSku, ServiceOfferingSku
 from app.models.cmdb.region_acceptance import (
     RegionAcceptanceTemplate,
@@ -66,6 +68,7 @@ __all__ = [
     "CIAttributeDefinition",
     "CIClass",
     "CIClassActivityAssociation",
+    "CIExplorerCount",
     "CIRelationship",
     "CISnapshot",
     "CITemplate",
@@ -83,6 +86,7 @@ __all__ = [
     "PriceListTemplate",
     "PriceListTemplateItem",
     "ProcessActivityLink",
+    "ProfitabilityRollup",
     "ProviderSku",
     "RegionAcceptanceTemplate",
     "RegionAcceptanceTemplateRule",
@@ -5,12 +5,13 @@ Dependencies: sqlalchemy, app.db.base, app.models.base
 Concepts: CIs represent infrastructure resources. Each CI belongs to a class (schema), may live
     in a compartment, tracks lifecycle state, and stores flexible attributes as JSONB. Cloud
     resource IDs and Pulumi URNs provide external linkage for discovery and IaC operations.
+    A trigger-maintained tsvector plus trigram and tag GIN indexes back CMDB search.
 """
 
 import uuid
 
-from sqlalchemy import ForeignKey, Index, String, Text
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -51,6 +52,13 @@ class ConfigurationItem(Base, IDMixin, TimestampMixin, SoftDeleteMixin):
     backend_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("cloud_backends.id"), nullable=True, index=True
     )
+    current_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Maintained by the trg_configuration_items_search_vector trigger
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, nullable=True, deferred=True
+    )
 
     ci_class: Mapped["CIClass"] = relationship(lazy="joined")  # noqa: F821
     compartment: Mapped["Compartment | None"] = relationship(lazy="joined")  # noqa: F821
@@ -62,4 +70,34 @@ class ConfigurationItem(Base, IDMixin, TimestampMixin, SoftDeleteMixin):
         Index("ix_ci_cloud_resource_id", "cloud_resource_id"),
         Index("ix_ci_pulumi_urn", "pulumi_urn"),
         Index("ix_ci_lifecycle_state", "lifecycle_state"),
+        Index("ix_ci_search_vector", "search_vector", postgresql_using="gin"),
+        *(
+            Index(
+                f"ix_ci_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in ("name", "description", "cloud_resource_id", "pulumi_urn")
+        ),
+        Index(
+            "ix_ci_tags_gin",
+            "tags",
+            postgresql_using="gin",
+            postgresql_ops={"tags": "jsonb_path_ops"},
+        ),
+        Index(
+            "uq_ci_tenant_pulumi_urn",
+            "tenant_id",
+            "pulumi_urn",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL AND pulumi_urn IS NOT NULL"),
+        ),
+        Index(
+            "uq_ci_tenant_cloud_resource_id",
+            "tenant_id",
+            "cloud_resource_id",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL AND cloud_resource_id IS NOT NULL"),
+        ),
     )
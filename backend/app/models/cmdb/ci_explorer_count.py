@@ -0,0 +1,48 @@
+"""
+Overview: CI explorer count model — live CI counts per tenant, compartment, backend, and class.
+Architecture: Materialized CMDB explorer aggregates (Section 8)
+Dependencies: sqlalchemy, app.db.base
+Concepts: One row per (tenant, compartment, backend, class) bucket holding the number of live
+    (not soft-deleted) configuration items. Rows are maintained by statement-level triggers on
+    configuration_items, so every writer — service, bulk import, resolver — keeps them current.
+    The explorer tree renders from this table instead of grouping configuration_items.
+"""
+
+import uuid
+
+from sqlalchemy import ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.base import IDMixin
+
+
+class CIExplorerCount(Base, IDMixin):
+    """Number of live CIs in one tenant/compartment/backend/class bucket."""
+
+    __tablename__ = "ci_explorer_counts"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id",
+            "compartment_id",
+            "backend_id",
+            "ci_class_id",
+            name="uq_ci_explorer_count_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False
+    )
+    compartment_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("compartments.id"), nullable=True
+    )
+    backend_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("cloud_backends.id"), nullable=True
+    )
+    ci_class_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("ci_classes.id"), nullable=False
+    )
+    ci_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
@@ -2,14 +2,15 @@
 Overview: CI snapshot model — versioned point-in-time captures of configuration item state.
 Architecture: Append-only snapshot history for CI versioning (Section 8)
 Dependencies: sqlalchemy, app.db.base, app.models.base
-Concepts: Each snapshot captures the full CI state (attributes, tags, lifecycle, compartment)
-    at a specific version number. Snapshots are immutable and support point-in-time queries.
+Concepts: Keyframe snapshots capture the full CI state (attributes, tags, lifecycle,
+    compartment) at a version number; delta snapshots store a JSON patch against the previous
+    version. Snapshots are immutable and support point-in-time queries.
 """
 
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -32,7 +33,11 @@ class CISnapshot(Base, IDMixin):
         UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False, index=True
     )
     version_number: Mapped[int] = mapped_column(Integer, nullable=False)
-    snapshot_data: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    snapshot_data: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    is_keyframe: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=True, server_default="true"
+    )
+    delta: Mapped[list | None] = mapped_column(JSONB, nullable=True)
     changed_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=True
     )
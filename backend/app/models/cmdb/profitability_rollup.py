@@ -0,0 +1,64 @@
+"""
+Overview: Profitability rollup model — incrementally maintained aggregates of approved
+    estimations per client, delivery region, service offering, and month.
+Architecture: Service delivery profitability reporting (Section 8)
+Dependencies: sqlalchemy, app.db.base, app.models.base
+Concepts: One row per (tenant, client, region, offering, month) bucket. Rows are upserted
+    when an estimation is approved and can be rebuilt from raw estimations at any time.
+    Dashboards aggregate over this table instead of scanning service_estimations.
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.base import IDMixin, TimestampMixin
+
+
+class ProfitabilityRollup(Base, IDMixin, TimestampMixin):
+    """Aggregated revenue, cost, and margin for one dimension/month bucket."""
+
+    __tablename__ = "profitability_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id",
+            "client_tenant_id",
+            "delivery_region_id",
+            "service_offering_id",
+            "period_start",
+            name="uq_profitability_rollup_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_profitability_rollups_tenant_period", "tenant_id", "period_start"),
+    )
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False
+    )
+    client_tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False
+    )
+    delivery_region_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("delivery_regions.id"), nullable=True
+    )
+    service_offering_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("service_offerings.id"), nullable=False
+    )
+    period_start: Mapped[date] = mapped_column(Date, nullable=False)
+    total_revenue: Mapped[Decimal] = mapped_column(
+        Numeric(18, 4), nullable=False, server_default="0"
+    )
+    total_cost: Mapped[Decimal] = mapped_column(
+        Numeric(18, 4), nullable=False, server_default="0"
+    )
+    total_margin: Mapped[Decimal] = mapped_column(
+        Numeric(18, 4), nullable=False, server_default="0"
+    )
+    estimation_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
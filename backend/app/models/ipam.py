@@ -2,15 +2,17 @@
 Overview: IPAM models — address spaces, hierarchical allocations, IP reservations.
 Architecture: IP address management data layer (Section 4.2)
 Dependencies: sqlalchemy, app.models.base, app.db.base
-Concepts: CIDR hierarchy, address allocation, IP reservation, utilization tracking
+Concepts: CIDR hierarchy, address allocation, IP reservation, utilization tracking with a
+    persisted per-allocation counter of addresses held by children
 """
 
 from __future__ import annotations
 
 import enum
 import uuid
+from decimal import Decimal
 
-from sqlalchemy import Enum, Float, ForeignKey, Index, Integer, SmallInteger, String, Text
+from sqlalchemy import Enum, Float, ForeignKey, Index, Integer, Numeric, SmallInteger, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -104,6 +106,10 @@ class AddressAllocation(Base, IDMixin, TimestampMixin, SoftDeleteMixin):
     )
     cloud_resource_id: Mapped[str | None] = mapped_column(String(500), nullable=True)
     utilization_percent: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Usable IPs held by live child allocations; kept current on allocate/release
+    allocated_ips: Mapped[Decimal] = mapped_column(
+        Numeric(39, 0), nullable=False, default=0, server_default="0"
+    )
     allocation_metadata: Mapped[dict | None] = mapped_column("metadata", JSONB, nullable=True)
 
     # Relationships
@@ -1,7 +1,7 @@
 """
 Overview: Topology graph validator — validates semantic types, relationships, properties, and structure.
 Architecture: Validation service for architecture planner (Section 5)
-Dependencies: sqlalchemy, app.models.semantic_type
+Dependencies: sqlalchemy, app.services.semantic.catalog_cache
 Concepts: Graph validation, semantic type verification, relationship rules, property schema matching
 """
 
@@ -15,7 +15,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.policy_library import PolicyLibraryEntry
-from app.models.semantic_type import SemanticCategory, SemanticRelationshipKind, SemanticResourceType
+from app.services.semantic.catalog_cache import (
+    RelationshipKindEntry,
+    TypeEntry,
+    get_semantic_catalog,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -77,39 +81,32 @@ class TopologyValidator:
             else:
                 node_type_map[nid] = st_id
 
-        # Load semantic types from DB
+        # Resolve semantic types and relationship kinds from the cached catalog
+        rk_ids = set()
+        for conn in connections:
+            rk_id = conn.get("relationship_kind_id") or conn.get("relationshipKindId")
+            if rk_id:
+                rk_ids.add(rk_id)
+
         type_ids = set(node_type_map.values())
-        type_map: dict[str, SemanticResourceType] = {}
-        if type_ids:
-            stmt = select(SemanticResourceType).where(
-                SemanticResourceType.id.in_(list(type_ids)),
-                SemanticResourceType.deleted_at.is_(None),
-            )
-            db_result = await self.db.execute(stmt)
-            for st in db_result.scalars().all():
-                type_map[str(st.id)] = st
+        catalog = await get_semantic_catalog(self.db) if type_ids or rk_ids else None
+
+        type_map: dict[str, TypeEntry] = {}
+        for st_id in type_ids:
+            st = catalog.type(st_id)
+            if st:
+                type_map[st_id] = st
 
         # Verify semantic type IDs exist
         for nid, st_id in node_type_map.items():
             if st_id not in type_map:
                 result.add_error(f"Unknown semantic type ID '{st_id}'", nid)
 
-        # Load relationship kinds from DB
-        rk_ids = set()
-        for conn in connections:
-            rk_id = conn.get("relationship_kind_id") or conn.get("relationshipKindId")
-            if rk_id:
-                rk_ids.add(rk_id)
-
-        rk_map: dict[str, SemanticRelationshipKind] = {}
-        if rk_ids:
-            stmt = select(SemanticRelationshipKind).where(
-                SemanticRelationshipKind.id.in_(list(rk_ids)),
-                SemanticRelationshipKind.deleted_at.is_(None),
-            )
-            db_result = await self.db.execute(stmt)
-            for rk in db_result.scalars().all():
-                rk_map[str(rk.id)] = rk
+        rk_map: dict[str, RelationshipKindEntry] = {}
+        for rk_id in rk_ids:
+            rk = catalog.relationship_kind(rk_id)
+            if rk:
+                rk_map[rk_id] = rk
 
         # Validate connections
         conn_ids = set()
@@ -2,7 +2,8 @@
 Overview: Audit log query service for searching, filtering, and saved queries.
 Architecture: Audit read path (Section 8)
 Dependencies: sqlalchemy, app.models.audit
-Concepts: Paginated search, multi-field filtering, saved queries, trace grouping, event taxonomy
+Concepts: Paginated search (offset or keyset cursors), multi-field filtering, saved queries,
+    trace grouping, event taxonomy
 """
 
 from datetime import UTC, datetime
@@ -10,6 +11,7 @@ from datetime import UTC, datetime
 from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.pagination import KeysetPage, TotalMode, paginate
 from app.models.audit import AuditAction, AuditLog, AuditPriority, SavedQuery
 
 
@@ -17,7 +19,7 @@ class AuditQueryService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def search(
+    def _conditions(
         self,
         tenant_id: str,
         *,
@@ -32,29 +34,19 @@ class AuditQueryService:
         priority: AuditPriority | None = None,
         trace_id: str | None = None,
         full_text: str | None = None,
-        offset: int = 0,
-        limit: int = 50,
-    ) -> tuple[list[AuditLog], int]:
-        """Search audit logs with filtering and pagination."""
-        query = select(AuditLog).where(AuditLog.tenant_id == tenant_id)
-        count_query = select(func.count(AuditLog.id)).where(AuditLog.tenant_id == tenant_id)
+    ) -> list:
+        conditions = [AuditLog.tenant_id == tenant_id]
 
         if date_from:
-            query = query.where(AuditLog.created_at >= date_from)
-            count_query = count_query.where(AuditLog.created_at >= date_from)
+            conditions.append(AuditLog.created_at >= date_from)
         if date_to:
-            query = query.where(AuditLog.created_at <= date_to)
-            count_query = count_query.where(AuditLog.created_at <= date_to)
+            conditions.append(AuditLog.created_at <= date_to)
         if actor_id:
-            query = query.where(AuditLog.actor_id == actor_id)
-            count_query = count_query.where(AuditLog.actor_id == actor_id)
+            conditions.append(AuditLog.actor_id == actor_id)
         if action:
-            query = query.where(AuditLog.action == action)
-            count_query = count_query.where(AuditLog.action == action)
+            conditions.append(AuditLog.action == action)
         if event_categories:
-            cat_filter = AuditLog.event_category.in_(event_categories)
-            query = query.where(cat_filter)
-            count_query = count_query.where(cat_filter)
+            conditions.append(AuditLog.event_category.in_(event_categories))
         if event_types:
             # Support prefix matching: "auth.*" matches all auth.* event types
             type_conditions = []
@@ -65,40 +57,97 @@ class AuditQueryService:
                 else:
                     type_conditions.append(AuditLog.event_type == et)
             if type_conditions:
-                combined = or_(*type_conditions)
-                query = query.where(combined)
-                count_query = count_query.where(combined)
+                conditions.append(or_(*type_conditions))
         if resource_type:
-            query = query.where(AuditLog.resource_type == resource_type)
-            count_query = count_query.where(AuditLog.resource_type == resource_type)
+            conditions.append(AuditLog.resource_type == resource_type)
         if resource_id:
-            query = query.where(AuditLog.resource_id == resource_id)
-            count_query = count_query.where(AuditLog.resource_id == resource_id)
+            conditions.append(AuditLog.resource_id == resource_id)
         if priority:
-            query = query.where(AuditLog.priority == priority)
-            count_query = count_query.where(AuditLog.priority == priority)
+            conditions.append(AuditLog.priority == priority)
         if trace_id:
-            query = query.where(AuditLog.trace_id == trace_id)
-            count_query = count_query.where(AuditLog.trace_id == trace_id)
+            conditions.append(AuditLog.trace_id == trace_id)
         if full_text:
-            text_filter = or_(
-                AuditLog.actor_email.ilike(f"%{full_text}%"),
-                AuditLog.resource_name.ilike(f"%{full_text}%"),
-                AuditLog.resource_type.ilike(f"%{full_text}%"),
-                AuditLog.resource_id.ilike(f"%{full_text}%"),
-                AuditLog.event_type.ilike(f"%{full_text}%"),
+            conditions.append(
+                or_(
+                    AuditLog.actor_email.ilike(f"%{full_text}%"),
+                    AuditLog.resource_name.ilike(f"%{full_text}%"),
+                    AuditLog.resource_type.ilike(f"%{full_text}%"),
+                    AuditLog.resource_id.ilike(f"%{full_text}%"),
+                    AuditLog.event_type.ilike(f"%{full_text}%"),
+                )
             )
-            query = query.where(text_filter)
-            count_query = count_query.where(text_filter)
+        return conditions
+
+    async def search(
+        self,
+        tenant_id: str,
+        *,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        actor_id: str | None = None,
+        action: AuditAction | None = None,
+        event_categories: list[str] | None = None,
+        event_types: list[str] | None = None,
+        resource_type: str | None = None,
+        resource_id: str | None = None,
+        priority: AuditPriority | None = None,
+        trace_id: str | None = None,
+        full_text: str | None = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> tuple[list[AuditLog], int]:
+        """Search audit logs with filtering and pagination."""
+        conditions = self._conditions(
+            tenant_id,
+            date_from=date_from,
+            date_to=date_to,
+            actor_id=actor_id,
+            action=action,
+            event_categories=event_categories,
+            event_types=event_types,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            priority=priority,
+            trace_id=trace_id,
+            full_text=full_text,
+        )
 
-        total_result = await self.db.execute(count_query)
+        total_result = await self.db.execute(select(func.count(AuditLog.id)).where(*conditions))
         total = total_result.scalar() or 0
 
-        query = query.order_by(AuditLog.created_at.desc()).offset(offset).limit(limit)
+        query = (
+            select(AuditLog)
+            .where(*conditions)
+            .order_by(AuditLog.created_at.desc())
+            .offset(offset)
+            .limit(limit)
+        )
         result = await self.db.execute(query)
 
         return list(result.scalars().all()), total
 
+    async def search_page(
+        self,
+        tenant_id: str,
+        *,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        total: TotalMode | None = None,
+        **filters,
+    ) -> KeysetPage[AuditLog]:
+        """Search audit logs newest first with keyset pagination (see ``app.db.pagination``).
+
+        ``filters`` are the filter keywords of ``search``.
+        """
+        return await paginate(
+            self.db,
+            select(AuditLog).where(*self._conditions(tenant_id, **filters)),
+            [AuditLog.created_at.desc(), AuditLog.id.desc()],
+            first=first, after=after, last=last, before=before, total=total,
+        )
+
     async def get_by_id(self, log_id: str, tenant_id: str) -> AuditLog | None:
         result = await self.db.execute(
             select(AuditLog).where(
@@ -26,6 +26,7 @@ _EVENT_TYPE_TO_ACTION = {
     "data.create": AuditAction.CREATE,
     "data.read": AuditAction.READ,
     "data.update": AuditAction.UPDATE,
+    "data.bulk_upsert": AuditAction.UPDATE,
     "data.delete": AuditAction.DELETE,
     "data.export": AuditAction.EXPORT,
     "data.archive": AuditAction.ARCHIVE,
@@ -45,6 +45,7 @@ TAXONOMY: dict[EventCategory, list[dict]] = {
     EventCategory.DATA: [
         {"key": "data.create", "label": "Create", "description": "Generic data creation", "default_priority": "INFO"},
         {"key": "data.update", "label": "Update", "description": "Generic data update", "default_priority": "INFO"},
+        {"key": "data.bulk_upsert", "label": "Bulk Upsert", "description": "Batched create/update from sync", "default_priority": "INFO"},
         {"key": "data.delete", "label": "Delete", "description": "Generic data deletion", "default_priority": "WARN"},
         {"key": "data.read", "label": "Read", "description": "Generic data read", "default_priority": "DEBUG"},
         {"key": "data.export", "label": "Export", "description": "Data export", "default_priority": "INFO"},
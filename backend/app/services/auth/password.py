@@ -1,24 +1,122 @@
 """
-Overview: Password hashing and verification using argon2.
+Overview: Password hashing and verification using argon2, off the event loop.
 Architecture: Security layer for credential storage (Section 5.1)
-Dependencies: argon2-cffi
-Concepts: Password hashing, credential security
+Dependencies: argon2-cffi, app.core.config
+Concepts: Password hashing, credential security. Argon2 is deliberately slow, so hashes are
+    computed in a dedicated, size-limited thread pool (argon2-cffi releases the GIL) instead of
+    on the event loop. Work beyond the pending limit is rejected rather than queued without
+    bound, and queue depth, wait, and hash times are kept for monitoring. Hashes made with
+    older parameters are re-hashed after a successful verification.
 """
 
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
 from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
+from argon2.exceptions import InvalidHashError, VerificationError
 
-_hasher = PasswordHasher()
+from app.core.config import get_settings
 
 
-def hash_password(password: str) -> str:
-    """Hash a plaintext password using argon2."""
-    return _hasher.hash(password)
+class PasswordHashingBusyError(Exception):
+    """The password hashing pool is at its pending limit."""
 
 
-def verify_password(password: str, password_hash: str) -> bool:
-    """Verify a plaintext password against an argon2 hash."""
+@dataclass
+class PasswordPoolStats:
+    submitted: int = 0
+    completed: int = 0
+    rejected: int = 0
+    pending: int = 0
+    max_pending: int = 0
+    queue_wait_seconds: float = 0.0
+    hash_seconds: float = 0.0
+
+
+_settings = get_settings()
+_hasher = PasswordHasher(
+    time_cost=_settings.argon2_time_cost,
+    memory_cost=_settings.argon2_memory_cost,
+    parallelism=_settings.argon2_parallelism,
+)
+_stats = PasswordPoolStats()
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=_settings.password_hash_workers, thread_name_prefix="argon2"
+        )
+    return _executor
+
+
+def password_pool_stats() -> PasswordPoolStats:
+    """Snapshot of the hashing pool counters."""
+    return PasswordPoolStats(**vars(_stats))
+
+
+async def _run(fn, *args):
+    """Run ``fn`` on the hashing pool, recording queue wait and run time."""
+    if _stats.pending >= _settings.password_hash_max_pending:
+        _stats.rejected += 1
+        raise PasswordHashingBusyError("Password hashing is at capacity")
+
+    submitted_at = time.perf_counter()
+
+    def timed():
+        started_at = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            _stats.queue_wait_seconds += started_at - submitted_at
+            _stats.hash_seconds += time.perf_counter() - started_at
+
+    _stats.submitted += 1
+    _stats.pending += 1
+    _stats.max_pending = max(_stats.max_pending, _stats.pending)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), timed)
+    finally:
+        _stats.pending -= 1
+        _stats.completed += 1
+
+
+def _verify(password: str, password_hash: str) -> bool:
     try:
         return _hasher.verify(password_hash, password)
-    except VerifyMismatchError:
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+async def hash_password(password: str) -> str:
+    """Hash a plaintext password using argon2."""
+    return await _run(_hasher.hash, password)
+
+
+async def verify_password(password: str, password_hash: str | None) -> bool:
+    """Verify a plaintext password against an argon2 hash."""
+    if not password_hash:
         return False
+    return await _run(_verify, password, password_hash)
+
+
+async def verify_and_rehash(password: str, password_hash: str | None) -> tuple[bool, str | None]:
+    """Verify a password; on success also return a new hash if the parameters changed."""
+    if not await verify_password(password, password_hash):
+        return False, None
+    if _hasher.check_needs_rehash(password_hash):
+        return True, await hash_password(password)
+    return True, None
+
+
+def shutdown_password_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
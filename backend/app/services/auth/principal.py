@@ -0,0 +1,82 @@
+"""
+Overview: Request principal — the access token's claims, decoded once per request.
+Architecture: Shared auth context for middleware, REST dependencies, and GraphQL (Section 5.1)
+Dependencies: python-jose, starlette, app.services.auth.jwt
+Concepts: The bearer token is verified on first use and the result (principal or error code)
+    is stored in request state, which Starlette keeps in the ASGI scope, so the tenant and
+    audit middleware, FastAPI dependencies, and GraphQL resolvers all read the same decode.
+    Only access tokens yield a principal.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from jose.exceptions import ExpiredSignatureError, JWTError
+from starlette.requests import HTTPConnection
+
+from app.services.auth.jwt import decode_token
+
+NOT_AUTHENTICATED = "NOT_AUTHENTICATED"
+TOKEN_EXPIRED = "TOKEN_EXPIRED"
+INVALID_TOKEN = "INVALID_TOKEN"
+
+_UNSET = object()
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    user_id: str
+    jti: str
+    provider_id: str | None
+    tenant_ids: tuple[str, ...]
+    current_tenant_id: str | None
+    impersonating: Mapping[str, Any] | None
+    email: str | None
+    expires_at: float | None
+
+    @classmethod
+    def from_claims(cls, claims: Mapping[str, Any]) -> Principal:
+        return cls(
+            user_id=str(claims["sub"]),
+            jti=str(claims["jti"]),
+            provider_id=claims.get("provider_id"),
+            tenant_ids=tuple(claims.get("tenant_ids") or ()),
+            current_tenant_id=claims.get("current_tenant_id"),
+            impersonating=claims.get("impersonating"),
+            email=claims.get("email"),
+            expires_at=claims.get("exp"),
+        )
+
+
+def _decode(authorization: str) -> tuple[Principal | None, str | None]:
+    if not authorization.startswith("Bearer "):
+        return None, NOT_AUTHENTICATED
+    try:
+        claims = decode_token(authorization[7:])
+    except ExpiredSignatureError:
+        return None, TOKEN_EXPIRED
+    except JWTError:
+        return None, INVALID_TOKEN
+    if claims.get("type") != "access" or "sub" not in claims or "jti" not in claims:
+        return None, INVALID_TOKEN
+    return Principal.from_claims(claims), None
+
+
+def resolve_principal(conn: HTTPConnection) -> Principal | None:
+    """The request's principal, decoding the Authorization header on first call only."""
+    state = conn.state
+    principal = getattr(state, "principal", _UNSET)
+    if principal is _UNSET:
+        principal, error = _decode(conn.headers.get("authorization", ""))
+        state.principal = principal
+        state.auth_error = error
+    return principal
+
+
+def auth_error(conn: HTTPConnection) -> str | None:
+    """Why ``resolve_principal`` returned None (one of the module's error codes)."""
+    resolve_principal(conn)
+    return conn.state.auth_error
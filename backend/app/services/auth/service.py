@@ -1,17 +1,20 @@
 """
 Overview: Authentication service handling login, token management, sessions, and tenant switching.
 Architecture: Service layer for auth operations (Section 3.1, 5.1)
-Dependencies: sqlalchemy, app.models, app.services.auth.jwt, app.services.auth.password
-Concepts: Authentication, session management, concurrent session limits, tenant context
+Dependencies: sqlalchemy, app.models, app.services.auth.jwt, app.services.auth.password,
+    app.services.auth.throttle
+Concepts: Authentication, login throttling, session management, concurrent session limits,
+    tenant context
 """
 
 from datetime import UTC, datetime
 
 from jose import JWTError
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.db.instrumentation import track_sql
 from app.models.session import Session
 from app.models.user import User
 from app.models.user_tenant import UserTenant
@@ -21,15 +24,20 @@ from app.services.auth.jwt import (
     decode_token,
     hash_refresh_token,
 )
-from app.services.auth.password import verify_password
+from app.services.auth.password import PasswordHashingBusyError, verify_and_rehash
+from app.services.auth.throttle import LoginThrottledError, get_login_throttle
 
 settings = get_settings()
 
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_SESSION_BY_JTI = select(Session).where(Session.token_jti == bindparam("jti"))
+
 
 class AuthError(Exception):
-    def __init__(self, message: str, code: str = "AUTH_ERROR"):
+    def __init__(self, message: str, code: str = "AUTH_ERROR", retry_after: int | None = None):
         self.message = message
         self.code = code
+        self.retry_after = retry_after
         super().__init__(message)
 
 
@@ -37,6 +45,7 @@ class AuthService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    @track_sql
     async def login(
         self,
         email: str,
@@ -45,9 +54,29 @@ class AuthService:
         user_agent: str | None = None,
     ) -> dict:
         """Authenticate a user and create a new session with tokens."""
+        throttle = get_login_throttle()
+        try:
+            await throttle.attempt(email, ip_address)
+        except LoginThrottledError as e:
+            raise AuthError(
+                "Too many login attempts", "TOO_MANY_ATTEMPTS", retry_after=e.retry_after
+            ) from None
+
         user = await self._get_user_by_email(email)
-        if not user or not verify_password(password, user.password_hash):
+        if not user:
             raise AuthError("Invalid email or password", "INVALID_CREDENTIALS")
+        try:
+            valid, new_hash = await verify_and_rehash(password, user.password_hash)
+        except PasswordHashingBusyError:
+            raise AuthError(
+                "Authentication is busy, try again", "AUTH_BUSY", retry_after=1
+            ) from None
+        if not valid:
+            raise AuthError("Invalid email or password", "INVALID_CREDENTIALS")
+
+        await throttle.succeeded(email, ip_address)
+        if new_hash:
+            user.password_hash = new_hash
 
         if not user.is_active:
             raise AuthError("Account is disabled", "ACCOUNT_DISABLED")
@@ -59,6 +88,7 @@ class AuthService:
 
         return await self._create_session(user, ip_address, user_agent)
 
+    @track_sql
     async def refresh(self, refresh_token: str) -> dict:
         """Issue new tokens using a valid refresh token."""
         try:
@@ -118,6 +148,7 @@ class AuthService:
         )
         return list(result.scalars().all())
 
+    @track_sql
     async def validate_token(self, token: str) -> dict:
         """Validate an access token and return its payload (including impersonating claim)."""
         try:
@@ -151,6 +182,7 @@ class AuthService:
 
         return payload
 
+    @track_sql
     async def switch_tenant(self, user: User, tenant_id: str) -> dict:
         """Switch the user's active tenant. Returns new tokens with updated context."""
         tenant_ids = await self._get_user_tenant_ids(str(user.id))
@@ -179,11 +211,11 @@ class AuthService:
         return result.scalar_one_or_none()
 
     async def _get_user_by_id(self, user_id: str) -> User | None:
-        result = await self.db.execute(select(User).where(User.id == user_id))
+        result = await self.db.execute(_USER_BY_ID, {"user_id": user_id})
         return result.scalar_one_or_none()
 
     async def _get_session_by_jti(self, jti: str) -> Session | None:
-        result = await self.db.execute(select(Session).where(Session.token_jti == jti))
+        result = await self.db.execute(_SESSION_BY_JTI, {"jti": jti})
         return result.scalar_one_or_none()
 
     async def _enforce_session_limit(self, user_id) -> None:
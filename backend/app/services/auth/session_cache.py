@@ -0,0 +1,276 @@
+"""
+Overview: Validated-session cache — decides whether a principal's session and user are still
+    valid without a database round trip per request.
+Architecture: Auth read path for REST dependencies and GraphQL permission checks (Section 5.1)
+Dependencies: sqlalchemy, app.models, app.services.events.valkey_client, app.core.config
+Concepts: The first request with a token checks its session (or impersonation session) and
+    user in the database; the outcome is reused in-process for a short TTL. After that the
+    entry is confirmed against two Valkey sorted sets — revoked token jtis and recently
+    changed users — and the database is read again only when the user changed since the last
+    check, the revalidate interval has passed, or Valkey is unreachable. Commits that revoke a
+    session, end an impersonation, or disable/delete a user are captured from the ORM flush:
+    local entries are dropped immediately and the change is published to Valkey for other
+    processes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as OrmSession
+
+from app.models.impersonation import ImpersonationSession, ImpersonationStatus
+from app.models.session import Session
+from app.models.user import User
+from app.services.auth.principal import Principal
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY = "nimbus:auth:revoked_jtis"
+USERS_CHANGED_KEY = "nimbus:auth:users_changed"
+
+SESSION_REVOKED = "SESSION_REVOKED"
+USER_INVALID = "USER_INVALID"
+
+_PENDING_KEY = "_auth_session_changes"
+# Revocations of tokens with no known expiry are kept this long
+_DEFAULT_REVOCATION_SECONDS = 24 * 3600
+
+
+@dataclass(slots=True)
+class _Entry:
+    user_id: str
+    code: str | None
+    validated_at: float  # wall clock of the last database check
+    checked_at: float  # monotonic time of the last database or Valkey check
+
+
+class SessionValidityCache:
+    """Per-process LRU of session checks keyed by token jti."""
+
+    def __init__(
+        self, ttl_seconds: float, revalidate_seconds: float, max_entries: int = 10_000
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.revalidate_seconds = revalidate_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    async def check(self, db: AsyncSession, principal: Principal) -> str | None:
+        """None if the session is valid, else SESSION_REVOKED or USER_INVALID."""
+        now = time.monotonic()
+        entry = self._entries.get(principal.jti)
+        if entry is not None and now - entry.checked_at < self.ttl_seconds:
+            return entry.code
+
+        if entry is not None and time.time() - entry.validated_at < self.revalidate_seconds:
+            remote = await _remote_state(principal)
+            if remote is not None:
+                revoked, user_changed_at = remote
+                if revoked:
+                    self._store(principal, SESSION_REVOKED, time.time())
+                    return SESSION_REVOKED
+                if user_changed_at is None or user_changed_at < entry.validated_at:
+                    entry.checked_at = now
+                    self._entries.move_to_end(principal.jti)
+                    return entry.code
+
+        # Stamp before reading so a change committed during the read is not masked
+        validated_at = time.time()
+        code = await _validate(db, principal)
+        self._store(principal, code, validated_at)
+        return code
+
+    def forget(self, jtis: set[str] = frozenset(), user_ids: set[str] = frozenset()) -> None:
+        for jti in jtis:
+            self._entries.pop(jti, None)
+        if user_ids:
+            for jti in [j for j, e in self._entries.items() if e.user_id in user_ids]:
+                del self._entries[jti]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _store(self, principal: Principal, code: str | None, validated_at: float) -> None:
+        self._entries[principal.jti] = _Entry(
+            user_id=principal.user_id,
+            code=code,
+            validated_at=validated_at,
+            checked_at=time.monotonic(),
+        )
+        self._entries.move_to_end(principal.jti)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+async def _validate(db: AsyncSession, principal: Principal) -> str | None:
+    """Database check, equivalent to AuthService.validate_token plus the user status check."""
+    if principal.impersonating:
+        session_id = principal.impersonating.get("session_id")
+        if session_id:
+            status = (
+                await db.execute(
+                    select(ImpersonationSession.status).where(
+                        ImpersonationSession.id == session_id
+                    )
+                )
+            ).scalar_one_or_none()
+            if status != ImpersonationStatus.ACTIVE:
+                return SESSION_REVOKED
+    else:
+        row = (
+            await db.execute(
+                select(Session.revoked_at).where(Session.token_jti == principal.jti)
+            )
+        ).first()
+        if row is None or row.revoked_at is not None:
+            return SESSION_REVOKED
+
+    user = (
+        await db.execute(
+            select(User.is_active, User.deleted_at).where(User.id == principal.user_id)
+        )
+    ).first()
+    if user is None or not user.is_active or user.deleted_at is not None:
+        return USER_INVALID
+    return None
+
+
+async def _remote_state(principal: Principal) -> tuple[bool, float | None] | None:
+    """(jti revoked, last change time of the user) from Valkey, or None if unavailable."""
+    from app.services.events.valkey_client import get_valkey_client
+
+    client = await get_valkey_client()
+    if client is None:
+        return None
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.zscore(REVOKED_KEY, principal.jti)
+            pipe.zscore(USERS_CHANGED_KEY, principal.user_id)
+            revoked, user_changed_at = await pipe.execute()
+    except Exception:
+        logger.debug("Session revocation lookup failed", exc_info=True)
+        return None
+    return revoked is not None, user_changed_at
+
+
+async def _publish(revoked: dict[str, float], user_ids: set[str]) -> None:
+    from app.services.events.valkey_client import get_valkey_client
+
+    client = await get_valkey_client()
+    if client is None:
+        return
+    now = time.time()
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            if revoked:
+                pipe.zadd(REVOKED_KEY, revoked)
+                pipe.zremrangebyscore(REVOKED_KEY, "-inf", now)
+            if user_ids:
+                pipe.zadd(USERS_CHANGED_KEY, dict.fromkeys(user_ids, now))
+                horizon = now - 2 * get_session_cache().revalidate_seconds
+                pipe.zremrangebyscore(USERS_CHANGED_KEY, "-inf", horizon)
+            await pipe.execute()
+    except Exception:
+        logger.warning("Failed to publish session revocations", exc_info=True)
+
+
+_cache: SessionValidityCache | None = None
+
+
+def get_session_cache() -> SessionValidityCache:
+    """The process-wide session validity cache."""
+    global _cache
+    if _cache is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+        _cache = SessionValidityCache(
+            settings.auth_session_cache_ttl_seconds, settings.auth_session_revalidate_seconds
+        )
+    return _cache
+
+
+async def check_session(db: AsyncSession, principal: Principal) -> str | None:
+    """None if the principal's session and user are valid, else an AuthError code."""
+    return await get_session_cache().check(db, principal)
+
+
+# ── Invalidation on commit ─────────────────────────────────────────
+
+
+def _changed(obj: Any, attr: str) -> bool:
+    return inspect(obj).attrs[attr].history.has_changes()
+
+
+def _expiry(value: datetime | None) -> float:
+    if value is None:
+        return time.time() + _DEFAULT_REVOCATION_SECONDS
+    return value.timestamp()
+
+
+def _after_flush(session: OrmSession, flush_context: Any) -> None:
+    revoked: dict[str, float] = {}
+    user_ids: set[str] = set()
+    for obj in session.dirty:
+        if isinstance(obj, Session) and obj.revoked_at and _changed(obj, "revoked_at"):
+            revoked[obj.token_jti] = _expiry(obj.expires_at)
+        elif isinstance(obj, User) and (
+            _changed(obj, "is_active") or _changed(obj, "deleted_at")
+        ):
+            user_ids.add(str(obj.id))
+        elif (
+            isinstance(obj, ImpersonationSession)
+            and obj.token_jti
+            and obj.status != ImpersonationStatus.ACTIVE
+            and _changed(obj, "status")
+        ):
+            revoked[obj.token_jti] = _expiry(obj.expires_at)
+    for obj in session.deleted:
+        if isinstance(obj, Session):
+            revoked[obj.token_jti] = _expiry(obj.expires_at)
+        elif isinstance(obj, User):
+            user_ids.add(str(obj.id))
+
+    if revoked or user_ids:
+        pending = session.info.setdefault(_PENDING_KEY, ({}, set()))
+        pending[0].update(revoked)
+        pending[1].update(user_ids)
+
+
+_publish_tasks: set[asyncio.Task] = set()
+
+
+def _after_commit(session: OrmSession) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    revoked, user_ids = pending
+    if _cache is not None:
+        _cache.forget(set(revoked), user_ids)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Sync sessions (workers): other processes catch up at their revalidate interval
+        return
+    task = loop.create_task(_publish(revoked, user_ids))
+    _publish_tasks.add(task)
+    task.add_done_callback(_publish_tasks.discard)
+
+
+def _after_rollback(session: OrmSession) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+if not event.contains(OrmSession, "after_flush", _after_flush):
+    event.listen(OrmSession, "after_flush", _after_flush)
+    event.listen(OrmSession, "after_commit", _after_commit)
+    event.listen(OrmSession, "after_rollback", _after_rollback)
@@ -0,0 +1,128 @@
+"""
+Overview: Login throttling — per-account and per-IP attempt limits checked before hashing.
+Architecture: Auth guard in front of password verification (Section 5.1)
+Dependencies: app.services.events.valkey_client, app.core.config
+Concepts: Every login attempt increments a fixed-window counter for the account and for the
+    client IP before any argon2 work is done, so concurrent guesses are counted as they
+    arrive. Once a counter passes its limit, attempts are refused until the window expires.
+    A successful login clears the account counter and returns its attempt to the IP counter.
+    Counters live in Valkey so all workers share them; without Valkey each process keeps its
+    own.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "nimbus:auth:attempts:"
+
+
+class LoginThrottledError(Exception):
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__(f"Too many login attempts; retry in {retry_after}s")
+
+
+def _account_key(email: str) -> str:
+    digest = hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+    return f"{_KEY_PREFIX}account:{digest}"
+
+
+def _ip_key(ip: str) -> str:
+    return f"{_KEY_PREFIX}ip:{ip}"
+
+
+class LoginThrottle:
+    def __init__(self, max_per_account: int, max_per_ip: int, window_seconds: int) -> None:
+        self.max_per_account = max_per_account
+        self.max_per_ip = max_per_ip
+        self.window_seconds = window_seconds
+        self._local: dict[str, tuple[int, float]] = {}
+
+    async def attempt(self, email: str, ip: str | None) -> None:
+        """Count an attempt; raise LoginThrottledError if the account or IP is over its limit."""
+        limits = {_account_key(email): self.max_per_account}
+        if ip:
+            limits[_ip_key(ip)] = self.max_per_ip
+        counts = await self._increment(list(limits))
+        retry_after = max(
+            (ttl for key, (count, ttl) in counts.items() if count > limits[key]), default=None
+        )
+        if retry_after is not None:
+            raise LoginThrottledError(max(retry_after, 1))
+
+    async def succeeded(self, email: str, ip: str | None) -> None:
+        """Clear the account counter and give the attempt back to the IP counter."""
+        account, ip_key = _account_key(email), _ip_key(ip) if ip else None
+        client = await _client()
+        if client is not None:
+            try:
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.delete(account)
+                    if ip_key:
+                        pipe.decr(ip_key)
+                    await pipe.execute()
+                return
+            except Exception:
+                logger.debug("Login throttle reset failed", exc_info=True)
+        self._local.pop(account, None)
+        if ip_key and ip_key in self._local:
+            count, expires = self._local[ip_key]
+            self._local[ip_key] = (max(count - 1, 0), expires)
+
+    async def _increment(self, keys: list[str]) -> dict[str, tuple[int, int]]:
+        """Increment each key; return {key: (count, seconds until the window resets)}."""
+        client = await _client()
+        if client is not None:
+            try:
+                async with client.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.incr(key)
+                        pipe.expire(key, self.window_seconds, nx=True)
+                        pipe.ttl(key)
+                    results = await pipe.execute()
+                return {
+                    key: (int(results[i * 3]), int(results[i * 3 + 2]))
+                    for i, key in enumerate(keys)
+                }
+            except Exception:
+                logger.debug("Login throttle counter unavailable", exc_info=True)
+        return {key: self._increment_local(key) for key in keys}
+
+    def _increment_local(self, key: str) -> tuple[int, int]:
+        now = time.monotonic()
+        count, expires = self._local.get(key, (0, 0.0))
+        if expires <= now:
+            count, expires = 0, now + self.window_seconds
+            if len(self._local) > 100_000:
+                self._local = {k: v for k, v in self._local.items() if v[1] > now}
+        self._local[key] = (count + 1, expires)
+        return count + 1, int(expires - now)
+
+
+async def _client():
+    from app.services.events.valkey_client import get_valkey_client
+
+    return await get_valkey_client()
+
+
+_throttle: LoginThrottle | None = None
+
+
+def get_login_throttle() -> LoginThrottle:
+    """The process-wide login throttle."""
+    global _throttle
+    if _throttle is None:
+        from app.core.config import get_settings
+
+        settings = get_settings()
+        _throttle = LoginThrottle(
+            settings.login_max_attempts_per_account,
+            settings.login_max_attempts_per_ip,
+            settings.login_attempt_window_seconds,
+        )
+    return _throttle
@@ -0,0 +1,10 @@
+"""
+Overview: Shared read caches — tagged response cache with commit-time invalidation.
+Architecture: Service layer caching (Section 7.2)
+Dependencies: app.services.cache.response_cache
+Concepts: Entity tags, sequence-based invalidation, in-memory or Valkey storage
+"""
+
+from app.services.cache.response_cache import get_response_cache, invalidate_tags
+
+__all__ = ["get_response_cache", "invalidate_tags"]
@@ -0,0 +1,380 @@
+"""
+Overview: Response cache with entity tags — entries are tagged with the tables and rows they
+    read and dropped when a commit changes any of them.
+Architecture: Read cache behind the GraphQL response cache extension (Section 7.2)
+Dependencies: sqlalchemy, app.core.config, app.services.events.valkey_client
+Concepts: While a cacheable operation runs, its session records a tag for every table it
+    selects from (plus tables eagerly loaded with them). Primary-key lookups (``pk = x``,
+    ``pk IN (...)``, ``get``) record ``table:id`` tags for the requested keys instead, so an
+    entry built from by-id loads survives changes to other rows of the same table. Flushes
+    report ``table`` for inserts and ``table`` + ``table:id`` for updates and deletes (bulk
+    DML reports its table); on commit those tags are invalidated. Invalidation bumps a global
+    sequence and stamps each tag with it; an entry is valid while none of its tags is stamped
+    later than the sequence read when its execution began, so a change that races an
+    execution also invalidates its result. Storage is Valkey, where stamps and entries are
+    shared by all workers, or a per-process LRU for single-worker deployments (it never sees
+    other workers' commits, so their changes would only show after the TTL).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Table, event, inspect
+from sqlalchemy.orm import Mapper, ORMExecuteState, Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+from sqlalchemy.sql.schema import Column
+from sqlalchemy.sql.util import find_tables
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+RECORDER_KEY = "_response_cache_recorder"
+_PENDING_KEY = "_response_cache_invalidations"
+_VALKEY_PREFIX = "nimbus:respcache:"
+_EAGER = ("joined", "selectin", "subquery", "immediate")
+_suspended: ContextVar[bool] = ContextVar("response_cache_suspended", default=False)
+
+
+def row_tag(table: str, pk: Any) -> str:
+    return f"{table}:{pk}"
+
+
+@dataclass
+class CachedResponse:
+    data: Any
+    tags: frozenset[str]
+    permissions: frozenset[tuple[str, str]]
+    seq: int
+    stored_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "data": self.data,
+                "tags": sorted(self.tags),
+                "permissions": sorted(self.permissions),
+                "seq": self.seq,
+                "stored_at": self.stored_at,
+            },
+            default=str,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> CachedResponse:
+        payload = json.loads(raw)
+        return cls(
+            data=payload["data"],
+            tags=frozenset(payload["tags"]),
+            permissions=frozenset(tuple(p) for p in payload["permissions"]),
+            seq=payload["seq"],
+            stored_at=payload["stored_at"],
+        )
+
+
+class MemoryResponseCache:
+    """Per-process LRU of tagged responses."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._stamps: dict[str, int] = {}
+        self._seq = 0
+
+    async def begin(self) -> int:
+        """The sequence to store with an entry whose execution starts now."""
+        return self._seq
+
+    async def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry.stored_at > self.ttl_seconds or any(
+            self._stamps.get(tag, 0) > entry.seq for tag in entry.tags
+        ):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def put(self, key: str, entry: CachedResponse) -> None:
+        if any(self._stamps.get(tag, 0) > entry.seq for tag in entry.tags):
+            return  # invalidated while executing
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        self._seq += 1
+        for tag in tags:
+            self._stamps[tag] = self._seq
+        if len(self._stamps) > 4 * self.max_entries:
+            # Stamps at or below the oldest live entry's sequence can no longer invalidate it
+            floor = min((e.seq for e in self._entries.values()), default=self._seq)
+            self._stamps = {t: s for t, s in self._stamps.items() if s > floor}
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Strong references to in-flight Valkey invalidations
+_INVALIDATIONS: set[asyncio.Task] = set()
+
+
+class ValkeyResponseCache:
+    """Tagged responses and tag stamps in Valkey, shared by all workers."""
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    async def _client():
+        from app.services.events.valkey_client import get_valkey_client
+
+        return await get_valkey_client()
+
+    async def begin(self) -> int:
+        client = await self._client()
+        if client is None:
+            return 0
+        try:
+            return int(await client.get(_VALKEY_PREFIX + "seq") or 0)
+        except Exception:
+            logger.debug("Response cache sequence unavailable", exc_info=True)
+            return 0
+
+    async def get(self, key: str) -> CachedResponse | None:
+        client = await self._client()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(_VALKEY_PREFIX + "entry:" + key)
+            if raw is None:
+                return None
+            entry = CachedResponse.from_json(raw)
+            if entry.tags:
+                stamps = await client.mget([_VALKEY_PREFIX + "tag:" + t for t in entry.tags])
+                if any(int(s or 0) > entry.seq for s in stamps):
+                    return None
+            return entry
+        except Exception:
+            logger.debug("Response cache read failed", exc_info=True)
+            return None
+
+    async def put(self, key: str, entry: CachedResponse) -> None:
+        client = await self._client()
+        if client is None:
+            return
+        try:
+            await client.set(
+                _VALKEY_PREFIX + "entry:" + key, entry.to_json(), ex=self.ttl_seconds
+            )
+        except Exception:
+            logger.debug("Response cache write failed", exc_info=True)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug("No event loop for response cache invalidation")
+            return
+        task = loop.create_task(self._invalidate(tags))
+        _INVALIDATIONS.add(task)
+        task.add_done_callback(_INVALIDATIONS.discard)
+
+    async def _invalidate(self, tags: list[str]) -> None:
+        client = await self._client()
+        if client is None:
+            return
+        try:
+            seq = await client.incr(_VALKEY_PREFIX + "seq")
+            async with client.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.set(_VALKEY_PREFIX + "tag:" + tag, seq, ex=self.ttl_seconds)
+                await pipe.execute()
+        except Exception:
+            logger.warning("Response cache invalidation failed", exc_info=True)
+
+
+_cache: MemoryResponseCache | ValkeyResponseCache | None = None
+
+
+def get_response_cache() -> MemoryResponseCache | ValkeyResponseCache:
+    """The process-wide response cache for the configured backend."""
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        if settings.graphql_response_cache_backend == "valkey":
+            _cache = ValkeyResponseCache(settings.graphql_response_cache_ttl_seconds)
+        else:
+            _cache = MemoryResponseCache(
+                settings.graphql_response_cache_max_entries,
+                settings.graphql_response_cache_ttl_seconds,
+            )
+    return _cache
+
+
+def invalidate_tags(tags: Iterable[str]) -> None:
+    """Invalidate every cached response tagged with any of ``tags``.
+
+    Runs in every writing process (API workers that never served a cached query, REST-only
+    writers, Temporal workers), so a shared backend hears about every change.
+    """
+    tags = set(tags)
+    if tags and get_settings().graphql_response_cache_enabled:
+        get_response_cache().invalidate(tags)
+
+
+# ── Tag recording ──────────────────────────────────────────────────
+
+
+@dataclass
+class TagRecorder:
+    """Tags read by one operation; ``cacheable`` drops to False on anything untaggable."""
+
+    tags: set[str] = field(default_factory=set)
+    cacheable: bool = True
+
+
+@contextmanager
+def unrecorded() -> Iterator[None]:
+    """Keep reads in this block (e.g. permission checks, replayed on every hit) out of the tags."""
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+@functools.cache
+def _eager_tables(mapper: Mapper) -> frozenset[str]:
+    """Tables loaded along with ``mapper`` through eager relationships, transitively."""
+    names: set[str] = set()
+    seen = {mapper}
+    stack = [mapper]
+    while stack:
+        for rel in stack.pop().relationships:
+            if rel.lazy not in _EAGER:
+                continue
+            if rel.secondary is not None:
+                names.add(rel.secondary.name)
+            if rel.mapper not in seen:
+                seen.add(rel.mapper)
+                names.add(rel.mapper.local_table.name)
+                stack.append(rel.mapper)
+    return frozenset(names)
+
+
+def _pk_lookup(state: ORMExecuteState) -> tuple[Table, list[Any]] | None:
+    """(table, keys) of a ``pk = x`` / ``pk IN (...)`` select, else None."""
+    where = getattr(state.statement, "whereclause", None)
+    if not isinstance(where, BinaryExpression) or where.operator not in (
+        operators.eq,
+        operators.in_op,
+    ):
+        return None
+    column, param = where.left, where.right
+    if not (
+        isinstance(column, Column)
+        and column.primary_key
+        and isinstance(column.table, Table)
+        and isinstance(param, BindParameter)
+    ):
+        return None
+    value = param.value
+    if value is None and isinstance(state.parameters, dict):
+        value = state.parameters.get(param.key)
+    if value is None:
+        return None
+    return column.table, list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _record_statement(state: ORMExecuteState) -> None:
+    if state.is_update or state.is_delete or state.is_insert:
+        table = getattr(state.statement, "table", None)
+        if isinstance(table, Table):
+            state.session.info.setdefault(_PENDING_KEY, set()).add(table.name)
+    recorder = state.session.info.get(RECORDER_KEY)
+    if recorder is None or _suspended.get():
+        return
+    if not state.is_select:
+        recorder.cacheable = False
+        return
+    tables = [
+        t
+        for t in find_tables(state.statement, include_joins=True, include_aliases=True)
+        if isinstance(t, Table)
+    ]
+    if not tables:
+        recorder.cacheable = False
+        return
+    names = {t.name for t in tables}
+    lookup = _pk_lookup(state)
+    if lookup is not None:
+        table, keys = lookup
+        names.discard(table.name)
+        recorder.tags.update(row_tag(table.name, key) for key in keys)
+    recorder.tags.update(names)
+    for mapper in state.all_mappers:
+        recorder.tags.update(_eager_tables(mapper))
+
+
+# ── Invalidation on commit ─────────────────────────────────────────
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    tags: set[str] = set()
+    for obj in session.new:
+        tags.add(inspect(obj).mapper.local_table.name)
+    for obj in (*session.dirty, *session.deleted):
+        state = inspect(obj)
+        table = state.mapper.local_table.name
+        tags.add(table)
+        if state.identity:
+            tags.add(row_tag(table, state.identity[0]))
+    if tags:
+        session.info.setdefault(_PENDING_KEY, set()).update(tags)
+
+
+def _after_commit(session: Session) -> None:
+    tags = session.info.pop(_PENDING_KEY, None)
+    if tags:
+        invalidate_tags(tags)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def register_response_cache_hooks() -> None:
+    """Record tags and publish commit invalidations on every session of the process.
+
+    Called at API and worker startup so processes that write without ever caching still
+    invalidate; importing this module registers them as well.
+    """
+    if not event.contains(Session, "do_orm_execute", _record_statement):
+        event.listen(Session, "do_orm_execute", _record_statement)
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+
+
+register_response_cache_hooks()
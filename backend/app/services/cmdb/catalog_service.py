@@ -12,15 +12,17 @@ Concepts: Service offerings are billable items. Price lists group pricing with d
 """
 from __future__ import annotations
 
+import functools
 import logging
 import uuid as uuid_mod
 from datetime import UTC, date, datetime
 from decimal import Decimal
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, bindparam, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.db.instrumentation import track_sql
 from app.models.cmdb.price_list import (
     PriceList,
     PriceListItem,
@@ -33,6 +35,56 @@ from app.models.cmdb.service_offering_region import ServiceOfferingRegion
 
 logger = logging.getLogger(__name__)
 
+_PINNED_PRICE_LISTS = select(TenantPriceListPin.price_list_id).where(
+    TenantPriceListPin.tenant_id == bindparam("tenant_id"),
+    TenantPriceListPin.deleted_at.is_(None),
+)
+
+# Price list filters per cascade tier; values are bound at execution time
+_TIER_FILTERS = {
+    "client": lambda: [
+        PriceList.id.in_(bindparam("pinned_ids", expanding=True)),
+        PriceList.tenant_id == bindparam("tenant_id"),
+        PriceList.status == "published",
+    ],
+    "region": lambda: [
+        PriceList.id.in_(bindparam("pinned_ids", expanding=True)),
+        PriceList.delivery_region_id == bindparam("delivery_region_id"),
+        PriceList.status == "published",
+    ],
+    "default": lambda: [
+        PriceList.is_default.is_(True),
+        PriceList.status == "published",
+    ],
+    "legacy": lambda: [
+        PriceList.is_default.is_(True),
+        PriceList.status.is_(None) | (PriceList.status == "published"),
+    ],
+}
+
+
+@functools.cache
+def _price_item_query(tier: str, by_region: bool, by_coverage: bool) -> Select:
+    """Cascade lookup for one tier and specificity level, built once per process."""
+    return (
+        select(PriceListItem)
+        .join(PriceList)
+        .where(
+            PriceList.deleted_at.is_(None),
+            PriceListItem.service_offering_id == bindparam("service_offering_id"),
+            PriceListItem.deleted_at.is_(None),
+            *_TIER_FILTERS[tier](),
+            PriceListItem.delivery_region_id == bindparam("region")
+            if by_region
+            else PriceListItem.delivery_region_id.is_(None),
+            PriceListItem.coverage_model == bindparam("coverage")
+            if by_coverage
+            else PriceListItem.coverage_model.is_(None),
+        )
+        .order_by(PriceList.created_at.desc())
+        .limit(1)
+    )
+
 
 class CatalogServiceError(Exception):
     def __init__(self, message: str, code: str = "CATALOG_ERROR"):
@@ -812,6 +864,7 @@ class CatalogService:
 
     # ── Pricing Engine (Region + Coverage Cascade) ─────────────────────
 
+    @track_sql
     async def get_effective_price(
         self,
         tenant_id: str,
@@ -1027,66 +1080,34 @@ class CatalogService:
         specificity_levels.append((None, None))
 
         # Get pinned price list IDs for this tenant
-        pin_result = await self.db.execute(
-            select(TenantPriceListPin.price_list_id).where(
-                TenantPriceListPin.tenant_id == tenant_id,
-                TenantPriceListPin.deleted_at.is_(None),
-            )
-        )
+        pin_result = await self.db.execute(_PINNED_PRICE_LISTS, {"tenant_id": tenant_id})
         pinned_ids = [row for row in pin_result.scalars().all()]
 
+        tiers = []
         # TIER 2: Pinned client-specific lists (tenant_id matches, no region default)
         if pinned_ids:
-            for region_val, coverage_val in specificity_levels:
-                item = await self._search_price_item(
-                    service_offering_id, region_val, coverage_val,
-                    extra_filters=[
-                        PriceList.id.in_(pinned_ids),
-                        PriceList.tenant_id == tenant_id,
-                        PriceList.status == "published",
-                    ],
-                )
-                if item:
-                    return item
-
+            tiers.append("client")
         # TIER 3: Pinned region-default lists (delivery_region_id matches)
         if pinned_ids and delivery_region_id:
+            tiers.append("region")
+        # TIER 4: Global default price lists (is_default=true, published)
+        tiers.append("default")
+        # Fallback: legacy price lists without status (treat as published)
+        tiers.append("legacy")
+
+        params = {
+            "pinned_ids": pinned_ids,
+            "tenant_id": tenant_id,
+            "delivery_region_id": delivery_region_id,
+        }
+        for tier in tiers:
             for region_val, coverage_val in specificity_levels:
                 item = await self._search_price_item(
-                    service_offering_id, region_val, coverage_val,
-                    extra_filters=[
-                        PriceList.id.in_(pinned_ids),
-                        PriceList.delivery_region_id == delivery_region_id,
-                        PriceList.status == "published",
-                    ],
+                    service_offering_id, region_val, coverage_val, tier, params
                 )
                 if item:
                     return item
 
-        # TIER 4: Global default price lists (is_default=true, published)
-        for region_val, coverage_val in specificity_levels:
-            item = await self._search_price_item(
-                service_offering_id, region_val, coverage_val,
-                extra_filters=[
-                    PriceList.is_default.is_(True),
-                    PriceList.status == "published",
-                ],
-            )
-            if item:
-                return item
-
-        # Fallback: legacy price lists without status (treat as published)
-        for region_val, coverage_val in specificity_levels:
-            item = await self._search_price_item(
-                service_offering_id, region_val, coverage_val,
-                extra_filters=[
-                    PriceList.is_default.is_(True),
-                    PriceList.status.is_(None) | (PriceList.status == "published"),
-                ],
-            )
-            if item:
-                return item
-
         return None
 
     async def get_offering_cost_breakdown(
@@ -1201,32 +1222,19 @@ class CatalogService:
         service_offering_id: str,
         region_val: str | None,
         coverage_val: str | None,
-        extra_filters: list,
+        tier: str,
+        params: dict,
     ) -> PriceListItem | None:
-        """Search for a price list item with given filters and specificity."""
-        base_filters = [
-            PriceList.deleted_at.is_(None),
-            PriceListItem.service_offering_id == service_offering_id,
-            PriceListItem.deleted_at.is_(None),
-            *extra_filters,
-        ]
-
-        if region_val:
-            base_filters.append(PriceListItem.delivery_region_id == region_val)
-        else:
-            base_filters.append(PriceListItem.delivery_region_id.is_(None))
-
-        if coverage_val:
-            base_filters.append(PriceListItem.coverage_model == coverage_val)
-        else:
-            base_filters.append(PriceListItem.coverage_model.is_(None))
-
+        """Search for a price list item in one cascade tier with given specificity."""
+        query = _price_item_query(tier, bool(region_val), bool(coverage_val))
         result = await self.db.execute(
-            select(PriceListItem)
-            .join(PriceList)
-            .where(*base_filters)
-            .order_by(PriceList.created_at.desc())
-            .limit(1)
+            query,
+            {
+                **params,
+                "service_offering_id": service_offering_id,
+                "region": region_val,
+                "coverage": coverage_val,
+            },
         )
         return result.scalar_one_or_none()
 
@@ -0,0 +1,474 @@
+"""
+Overview: Bulk CI ingest service — batched upsert of configuration items keyed on Pulumi URN
+    or cloud resource ID, for Pulumi stack and cloud discovery sync.
+Architecture: Tenant-scoped bulk path alongside CIService (Section 8)
+Dependencies: sqlalchemy, app.models.cmdb.*, app.services.cmdb.validation_service,
+    app.services.cmdb.snapshot_store, app.services.audit.service, app.services.events.event_bus
+Concepts: One call loads all referenced CI classes and all existing CIs for the batch with a
+    query each, validates every row against cached effective schemas, then writes changed rows
+    with multi-row INSERT ... ON CONFLICT DO UPDATE, which also bumps each CI's version
+    counter. Snapshots are inserted in one executemany as deltas against the pre-image already
+    in memory. Bulk deletes soft-delete with one UPDATE ... RETURNING per chunk. One audit
+    entry and one event are emitted per batch, and a per-row report is returned so callers
+    can surface individual validation failures.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from dataclasses import dataclass, field
+
+from sqlalchemy import and_, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.cmdb.ci import ConfigurationItem
+from app.models.cmdb.ci_class import CIClass
+from app.models.cmdb.ci_snapshot import CISnapshot
+from app.services.cmdb.graph_engine import record_change
+from app.services.cmdb.snapshot_store import KEYFRAME_INTERVAL, make_patch
+from app.services.cmdb.validation_service import merge_schemas, validate_ci_attributes
+
+logger = logging.getLogger(__name__)
+
+KEY_FIELDS = ("pulumi_urn", "cloud_resource_id")
+WRITE_CHUNK = 1000
+
+_UPSERT_COLUMNS = (
+    "ci_class_id",
+    "compartment_id",
+    "name",
+    "description",
+    "lifecycle_state",
+    "attributes",
+    "tags",
+    "cloud_resource_id",
+    "pulumi_urn",
+    "backend_id",
+)
+
+_STATE_FIELDS = (
+    "name",
+    "description",
+    "lifecycle_state",
+    "attributes",
+    "tags",
+    "compartment_id",
+    "cloud_resource_id",
+    "pulumi_urn",
+)
+
+
+class CIBulkServiceError(Exception):
+    def __init__(self, message: str, code: str = "CI_BULK_ERROR"):
+        self.message = message
+        self.code = code
+        super().__init__(message)
+
+
+@dataclass
+class BulkRowResult:
+    index: int
+    key: str | None
+    status: str  # created | updated | unchanged | deleted | error
+    ci_id: str | None = None
+    version: int | None = None
+    error: str | None = None
+
+
+@dataclass
+class BulkUpsertReport:
+    results: list[BulkRowResult] = field(default_factory=list)
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    failed: int = 0
+
+
+@dataclass
+class _ClassInfo:
+    schema: dict | None
+    attribute_definitions: list | None
+
+
+def _state(data: dict) -> dict:
+    """Snapshot document for a row dict, matching snapshot_store.ci_state."""
+    out = {f: data.get(f) for f in _STATE_FIELDS}
+    if out["compartment_id"] is not None:
+        out["compartment_id"] = str(out["compartment_id"])
+    return out
+
+
+class CIBulkService:
+    """Batched CI upsert for discovery and IaC sync."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._class_cache: dict[str, _ClassInfo | None] = {}
+
+    async def bulk_upsert(
+        self,
+        tenant_id: str,
+        rows: list[dict],
+        key_field: str = "pulumi_urn",
+        user_id: str | None = None,
+        reason: str | None = None,
+        source: str = "cmdb_service",
+    ) -> BulkUpsertReport:
+        """Create or update CIs matched on ``key_field``; return a per-row report.
+
+        Each row accepts the same keys as ``CIService.create_ci``. For existing CIs,
+        attributes are merged over the current attributes like ``update_ci`` does.
+        """
+        if key_field not in KEY_FIELDS:
+            raise CIBulkServiceError(
+                f"Unsupported key field '{key_field}'", "INVALID_KEY_FIELD"
+            )
+
+        report = BulkUpsertReport(results=[None] * len(rows))  # type: ignore[list-item]
+
+        # 1. Key rows; later duplicates of the same key win
+        keyed: dict[str, int] = {}
+        for i, row in enumerate(rows):
+            key = row.get(key_field)
+            if not key:
+                report.results[i] = BulkRowResult(i, None, "error", error=f"Missing {key_field}")
+                continue
+            if key in keyed:
+                prev = keyed[key]
+                report.results[prev] = BulkRowResult(
+                    prev, key, "error", error="Superseded by a later row with the same key"
+                )
+            keyed[key] = i
+
+        # 2. Load classes and existing CIs for the whole batch
+        await self._load_classes({str(rows[i]["ci_class_id"]) for i in keyed.values()
+                                  if rows[i].get("ci_class_id")})
+        existing = await self._load_existing(tenant_id, key_field, list(keyed))
+
+        # 3. Validate and build write params
+        writes: list[dict] = []
+        pre_images: dict[str, dict | None] = {}
+        for key, i in keyed.items():
+            row = rows[i]
+            current = existing.get(key)
+            class_id = str(row.get("ci_class_id") or (current.ci_class_id if current else ""))
+            if current is None and not row.get("name"):
+                report.results[i] = BulkRowResult(i, key, "error", error="Missing name")
+                continue
+            info = self._class_cache.get(class_id)
+            if info is None:
+                report.results[i] = BulkRowResult(i, key, "error", error="CI class not found")
+                continue
+
+            attributes = row.get("attributes") or {}
+            if current is not None:
+                attributes = {**(current.attributes or {}), **attributes}
+            validation = validate_ci_attributes(attributes, info.schema, info.attribute_definitions)
+            if not validation.is_valid:
+                report.results[i] = BulkRowResult(
+                    i, key, "error", error=f"Attribute validation failed: {validation.errors}"
+                )
+                continue
+
+            params = self._row_params(tenant_id, row, current, class_id, attributes)
+            if current is not None:
+                before = _state(self._current_params(current))
+                if before == _state(params) and str(current.ci_class_id) == class_id:
+                    report.results[i] = BulkRowResult(
+                        i, key, "unchanged", ci_id=str(current.id),
+                        version=current.current_version,
+                    )
+                    continue
+                pre_images[key] = before
+            else:
+                pre_images[key] = None
+            params["_index"] = i
+            writes.append(params)
+
+        # 4. Upsert in chunks, collecting versions from RETURNING
+        snapshots: list[dict] = []
+        for start in range(0, len(writes), WRITE_CHUNK):
+            chunk = writes[start:start + WRITE_CHUNK]
+            returned = await self._upsert_chunk(key_field, chunk)
+            for params in chunk:
+                key = params[key_field]
+                ci_id, version = returned[key]
+                i = params["_index"]
+                created = pre_images[key] is None
+                if not created and pre_images[key]["name"] != params["name"]:
+                    record_change(self.db, tenant_id, "rename_node", str(ci_id), params["name"])
+                report.results[i] = BulkRowResult(
+                    i, key, "created" if created else "updated",
+                    ci_id=str(ci_id), version=version,
+                )
+                snapshots.append(
+                    self._snapshot_params(
+                        tenant_id, ci_id, version, params, pre_images[key],
+                        user_id, reason, created,
+                    )
+                )
+
+        if snapshots:
+            await self.db.execute(insert(CISnapshot), snapshots)
+        await self.db.flush()
+
+        for r in report.results:
+            if r.status == "created":
+                report.created += 1
+            elif r.status == "updated":
+                report.updated += 1
+            elif r.status == "unchanged":
+                report.unchanged += 1
+            else:
+                report.failed += 1
+
+        if report.created or report.updated:
+            await self._record_batch(tenant_id, key_field, report, user_id, source)
+        return report
+
+    async def bulk_delete(
+        self,
+        tenant_id: str,
+        keys: list[str],
+        key_field: str = "pulumi_urn",
+        user_id: str | None = None,
+        reason: str | None = None,
+        source: str = "cmdb_service",
+    ) -> BulkUpsertReport:
+        """Soft-delete live CIs matched on ``key_field``, writing a final keyframe for each."""
+        if key_field not in KEY_FIELDS:
+            raise CIBulkServiceError(
+                f"Unsupported key field '{key_field}'", "INVALID_KEY_FIELD"
+            )
+        key_col = getattr(ConfigurationItem, key_field)
+        report = BulkUpsertReport()
+        snapshots: list[dict] = []
+        for start in range(0, len(keys), WRITE_CHUNK):
+            result = await self.db.execute(
+                update(ConfigurationItem)
+                .where(
+                    ConfigurationItem.tenant_id == tenant_id,
+                    key_col.in_(keys[start:start + WRITE_CHUNK]),
+                    ConfigurationItem.deleted_at.is_(None),
+                )
+                .values(
+                    deleted_at=func.now(),
+                    lifecycle_state="deleted",
+                    current_version=ConfigurationItem.current_version + 1,
+                )
+                .returning(
+                    ConfigurationItem.id,
+                    ConfigurationItem.current_version,
+                    *(getattr(ConfigurationItem, f) for f in _STATE_FIELDS),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            for row in result.mappings().all():
+                record_change(self.db, tenant_id, "remove_node", str(row["id"]))
+                report.results.append(BulkRowResult(
+                    len(report.results), row[key_field], "deleted",
+                    ci_id=str(row["id"]), version=row["current_version"],
+                ))
+                snapshots.append({
+                    "id": uuid.uuid4(),
+                    "ci_id": row["id"],
+                    "tenant_id": tenant_id,
+                    "version_number": row["current_version"],
+                    "snapshot_data": _state(dict(row)),
+                    "is_keyframe": True,
+                    "delta": None,
+                    "changed_by": user_id,
+                    "change_reason": reason or "Deleted",
+                    "change_type": "delete",
+                })
+
+        if snapshots:
+            await self.db.execute(insert(CISnapshot), snapshots)
+            await self.db.flush()
+            report.deleted = len(snapshots)
+            await self._record_batch(tenant_id, key_field, report, user_id, source)
+        return report
+
+    # ── Loading ───────────────────────────────────────────────────────
+
+    async def _load_classes(self, class_ids: set[str]) -> None:
+        missing = [cid for cid in class_ids if cid not in self._class_cache]
+        if not missing:
+            return
+        result = await self.db.execute(
+            select(CIClass)
+            .where(CIClass.id.in_(missing), CIClass.deleted_at.is_(None))
+            .options(selectinload(CIClass.attribute_definitions))
+        )
+        loaded = {str(c.id): c for c in result.scalars().unique().all()}
+        for cid in missing:
+            ci_class = loaded.get(cid)
+            if ci_class is None:
+                self._class_cache[cid] = None
+                continue
+            self._class_cache[cid] = _ClassInfo(
+                schema=self._effective_schema(ci_class),
+                attribute_definitions=(
+                    list(ci_class.attribute_definitions)
+                    if ci_class.attribute_definitions else None
+                ),
+            )
+
+    def _effective_schema(self, ci_class: CIClass) -> dict | None:
+        if not ci_class.parent_class:
+            return ci_class.schema
+        return merge_schemas(self._effective_schema(ci_class.parent_class), ci_class.schema)
+
+    async def _load_existing(
+        self, tenant_id: str, key_field: str, keys: list[str]
+    ) -> dict[str, ConfigurationItem]:
+        if not keys:
+            return {}
+        key_col = getattr(ConfigurationItem, key_field)
+        found: dict[str, ConfigurationItem] = {}
+        for start in range(0, len(keys), WRITE_CHUNK):
+            result = await self.db.execute(
+                select(ConfigurationItem)
+                .where(
+                    ConfigurationItem.tenant_id == tenant_id,
+                    key_col.in_(keys[start:start + WRITE_CHUNK]),
+                    ConfigurationItem.deleted_at.is_(None),
+                )
+            )
+            for ci in result.scalars().unique().all():
+                found[getattr(ci, key_field)] = ci
+        return found
+
+    # ── Writing ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def _current_params(ci: ConfigurationItem) -> dict:
+        return {f: getattr(ci, f) for f in _STATE_FIELDS}
+
+    @staticmethod
+    def _row_params(
+        tenant_id: str,
+        row: dict,
+        current: ConfigurationItem | None,
+        class_id: str,
+        attributes: dict,
+    ) -> dict:
+        def pick(name: str, default=None):
+            if row.get(name) is not None:
+                return row[name]
+            return getattr(current, name) if current is not None else default
+
+        return {
+            "id": current.id if current is not None else uuid.uuid4(),
+            "tenant_id": tenant_id,
+            "ci_class_id": class_id,
+            "compartment_id": pick("compartment_id"),
+            "name": pick("name"),
+            "description": pick("description"),
+            "lifecycle_state": pick("lifecycle_state", "planned"),
+            "attributes": attributes,
+            "tags": pick("tags", {}),
+            "cloud_resource_id": pick("cloud_resource_id"),
+            "pulumi_urn": pick("pulumi_urn"),
+            "backend_id": pick("backend_id"),
+        }
+
+    async def _upsert_chunk(
+        self, key_field: str, chunk: list[dict]
+    ) -> dict[str, tuple[uuid.UUID, int]]:
+        """Multi-row INSERT ... ON CONFLICT on the tenant/key partial unique index."""
+        values = [
+            {k: v for k, v in p.items() if not k.startswith("_")} | {"current_version": 1}
+            for p in chunk
+        ]
+        key_col = getattr(ConfigurationItem, key_field)
+        stmt = pg_insert(ConfigurationItem).values(values)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ConfigurationItem.tenant_id, key_col],
+            index_where=and_(ConfigurationItem.deleted_at.is_(None), key_col.isnot(None)),
+            set_={
+                **{col: excluded[col] for col in _UPSERT_COLUMNS},
+                "current_version": ConfigurationItem.current_version + 1,
+                "updated_at": func.now(),
+            },
+        ).returning(ConfigurationItem.id, key_col, ConfigurationItem.current_version)
+        result = await self.db.execute(stmt)
+        return {row[1]: (row[0], row[2]) for row in result.all()}
+
+    @staticmethod
+    def _snapshot_params(
+        tenant_id: str,
+        ci_id: uuid.UUID,
+        version: int,
+        params: dict,
+        before: dict | None,
+        user_id: str | None,
+        reason: str | None,
+        created: bool,
+    ) -> dict:
+        after = _state(params)
+        keyframe = before is None or (version - 1) % KEYFRAME_INTERVAL == 0
+        return {
+            "id": uuid.uuid4(),
+            "ci_id": ci_id,
+            "tenant_id": tenant_id,
+            "version_number": version,
+            "snapshot_data": after if keyframe else None,
+            "is_keyframe": keyframe,
+            "delta": None if keyframe else make_patch(before, after),
+            "changed_by": user_id,
+            "change_reason": reason or ("Bulk import" if created else "Bulk sync"),
+            "change_type": "create" if created else "update",
+        }
+
+    async def _record_batch(
+        self,
+        tenant_id: str,
+        key_field: str,
+        report: BulkUpsertReport,
+        user_id: str | None,
+        source: str,
+    ) -> None:
+        """One audit entry and one event for the whole batch."""
+        summary = {
+            "key_field": key_field,
+            "created": report.created,
+            "updated": report.updated,
+            "unchanged": report.unchanged,
+            "deleted": report.deleted,
+            "failed": report.failed,
+        }
+        try:
+            from app.services.audit.service import AuditService
+
+            await AuditService(self.db).log(
+                tenant_id=tenant_id,
+                event_type="data.bulk_upsert",
+                actor_type="USER" if user_id else "SYSTEM",
+                actor_id=user_id,
+                resource_type="configuration_items",
+                new_values=summary,
+            )
+        except Exception:
+            logger.warning("Failed to record bulk CI audit entry", exc_info=True)
+
+        from app.services.events.event_bus import emit_event_async
+
+        emit_event_async(
+            "cmdb.ci.bulk_upserted",
+            {
+                **summary,
+                "ci_ids": [
+                    r.ci_id for r in report.results
+                    if r.status in ("created", "updated", "deleted")
+                ],
+            },
+            tenant_id,
+            source,
+            emitted_by=user_id,
+        )
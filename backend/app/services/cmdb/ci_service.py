@@ -4,7 +4,9 @@ Architecture: Tenant-scoped service for CI management with audit integration (Se
 Dependencies: sqlalchemy, app.models.cmdb.*, app.services.cmdb.validation_service
 Concepts: CIs go through lifecycle states (planned→active→maintenance→retired→deleted). Each
     mutation creates a snapshot and logs an audit event. Attributes are validated against the
-    CI class schema before persistence.
+    CI class schema before persistence. Explorer counts come from ci_explorer_counts, which
+    database triggers keep in step with every CI write; the nightly
+    ExplorerCountRebuildWorkflow recomputes them to repair any drift.
 """
 
 import contextlib
@@ -12,21 +14,27 @@ import logging
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.db.pagination import KeysetPage, TotalMode, paginate
 from app.models.cmdb.ci import ConfigurationItem
 from app.models.cmdb.ci_class import CIClass
+from app.models.cmdb.ci_explorer_count import CIExplorerCount
 from app.models.cmdb.ci_relationship import CIRelationship
 from app.models.cmdb.ci_snapshot import CISnapshot
 from app.models.cmdb.relationship_type import RelationshipType
 from app.schemas.cmdb import LIFECYCLE_TRANSITIONS
+from app.services.cmdb.graph_engine import record_change
+from app.services.cmdb.snapshot_store import SnapshotStore
 from app.services.cmdb.validation_service import (
     ValidationError,
     merge_schemas,
     validate_ci_attributes,
 )
+from app.services.semantic.catalog_cache import get_semantic_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -80,8 +88,9 @@ class CIService:
             cloud_resource_id=data.get("cloud_resource_id"),
             pulumi_urn=data.get("pulumi_urn"),
         )
-        self.db.add(ci)
-        await self.db.flush()
+        async with self._unique_external_keys():
+            self.db.add(ci)
+            await self.db.flush()
 
         await self._create_snapshot(
             ci, tenant_id, user_id, "create", "Initial creation"
@@ -121,15 +130,34 @@ class CIService:
                 )
             ci.attributes = merged_attrs
 
-        for field in ("name", "description", "tags", "cloud_resource_id", "pulumi_urn"):
-            if field in data and data[field] is not None:
-                setattr(ci, field, data[field])
-
-        await self.db.flush()
+        async with self._unique_external_keys():
+            for field in ("name", "description", "tags", "cloud_resource_id", "pulumi_urn"):
+                if field in data and data[field] is not None:
+                    setattr(ci, field, data[field])
+            await self.db.flush()
+        if data.get("name") is not None:
+            record_change(self.db, tenant_id, "rename_node", str(ci.id), ci.name)
         await self._create_snapshot(ci, tenant_id, user_id, "update", reason)
 
         return ci
 
+    @contextlib.asynccontextmanager
+    async def _unique_external_keys(self):
+        """Run a CI write in a savepoint; a duplicate external key raises CIServiceError.
+
+        Only the savepoint is rolled back, so the caller's transaction stays usable.
+        """
+        try:
+            async with self.db.begin_nested():
+                yield
+        except IntegrityError as exc:
+            if "uq_ci_tenant_" not in str(exc.orig):
+                raise
+            raise CIServiceError(
+                "Another CI in this tenant already has this Pulumi URN or cloud resource ID",
+                "DUPLICATE_EXTERNAL_KEY",
+            ) from exc
+
     async def delete_ci(
         self,
         ci_id: str,
@@ -145,6 +173,7 @@ class CIService:
         ci.lifecycle_state = "deleted"
         await self.db.flush()
         await self._create_snapshot(ci, tenant_id, user_id, "delete", "Deleted")
+        record_change(self.db, tenant_id, "remove_node", str(ci.id))
         return True
 
     async def get_ci(
@@ -155,15 +184,10 @@ class CIService:
     ) -> ConfigurationItem | None:
         """Get a CI by ID. If version is specified, return snapshot data."""
         if version is not None:
-            snapshot = await self.db.execute(
-                select(CISnapshot).where(
-                    CISnapshot.ci_id == ci_id,
-                    CISnapshot.tenant_id == tenant_id,
-                    CISnapshot.version_number == version,
-                )
+            snapshot_data = await SnapshotStore(self.db).reconstruct(
+                ci_id, tenant_id, version
             )
-            snap = snapshot.scalar_one_or_none()
-            if not snap:
+            if snapshot_data is None:
                 return None
             ci = await self.db.execute(
                 select(ConfigurationItem)
@@ -171,8 +195,8 @@ class CIService:
                 .options(selectinload(ConfigurationItem.ci_class))
             )
             ci_obj = ci.scalar_one_or_none()
-            if ci_obj and snap.snapshot_data:
-                for key, val in snap.snapshot_data.items():
+            if ci_obj and snapshot_data:
+                for key, val in snapshot_data.items():
                     if hasattr(ci_obj, key) and key not in ("id", "tenant_id", "ci_class_id"):
                         with contextlib.suppress(AttributeError, TypeError):
                             setattr(ci_obj, key, val)
@@ -189,7 +213,7 @@ class CIService:
         )
         return result.scalar_one_or_none()
 
-    async def list_cis(
+    def _list_stmt(
         self,
         tenant_id: str,
         ci_class_id: str | None = None,
@@ -198,10 +222,7 @@ class CIService:
         lifecycle_state: str | None = None,
         search: str | None = None,
         tags: dict | None = None,
-        offset: int = 0,
-        limit: int = 50,
-    ) -> tuple[list[ConfigurationItem], int]:
-        """List CIs with filtering and pagination."""
+    ):
         stmt = select(ConfigurationItem).where(
             ConfigurationItem.tenant_id == tenant_id,
             ConfigurationItem.deleted_at.is_(None),
@@ -228,6 +249,24 @@ class CIService:
                 stmt = stmt.where(
                     ConfigurationItem.tags[key].astext == str(value)
                 )
+        return stmt
+
+    async def list_cis(
+        self,
+        tenant_id: str,
+        ci_class_id: str | None = None,
+        compartment_id: str | None = None,
+        backend_id: str | None = None,
+        lifecycle_state: str | None = None,
+        search: str | None = None,
+        tags: dict | None = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> tuple[list[ConfigurationItem], int]:
+        """List CIs with filtering and pagination."""
+        stmt = self._list_stmt(
+            tenant_id, ci_class_id, compartment_id, backend_id, lifecycle_state, search, tags
+        )
 
         count_stmt = select(func.count()).select_from(stmt.subquery())
         count_result = await self.db.execute(count_stmt)
@@ -241,6 +280,32 @@ class CIService:
 
         return items, total
 
+    async def list_cis_page(
+        self,
+        tenant_id: str,
+        ci_class_id: str | None = None,
+        compartment_id: str | None = None,
+        backend_id: str | None = None,
+        lifecycle_state: str | None = None,
+        search: str | None = None,
+        tags: dict | None = None,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        total: TotalMode | None = None,
+    ) -> KeysetPage[ConfigurationItem]:
+        """List CIs by name with keyset pagination (see ``app.db.pagination``)."""
+        stmt = self._list_stmt(
+            tenant_id, ci_class_id, compartment_id, backend_id, lifecycle_state, search, tags
+        )
+        return await paginate(
+            self.db,
+            stmt.options(selectinload(ConfigurationItem.ci_class)),
+            [ConfigurationItem.name, ConfigurationItem.id],
+            first=first, after=after, last=last, before=before, total=total,
+        )
+
     async def move_ci(
         self,
         ci_id: str,
@@ -328,6 +393,12 @@ class CIService:
         )
         self.db.add(rel)
         await self.db.flush()
+        record_change(
+            self.db, tenant_id, "add_edge", str(rel.id),
+            (str(source_ci.id), source_ci.name, source_ci.ci_class.name if source_ci.ci_class else ""),
+            (str(target_ci.id), target_ci.name, target_ci.ci_class.name if target_ci.ci_class else ""),
+            rel_type.name,
+        )
         return rel
 
     async def _load_ci_with_class(self, ci_id: str, tenant_id: str) -> ConfigurationItem:
@@ -436,6 +507,7 @@ class CIService:
 
         rel.deleted_at = datetime.now(UTC)
         await self.db.flush()
+        record_change(self.db, tenant_id, "remove_edge", str(rel.id))
         return True
 
     async def get_relationships(
@@ -496,7 +568,10 @@ class CIService:
         compartment_id: str | None = None,
         backend_id: str | None = None,
     ):
-        """Get aggregated CI counts grouped by semantic category/type and backend."""
+        """Get aggregated CI counts grouped by semantic category/type and backend.
+
+        Reads the ``ci_explorer_counts`` buckets maintained by triggers on configuration_items.
+        """
         from app.api.graphql.types.cmdb import (
             ExplorerBackendSummary,
             ExplorerCategorySummary,
@@ -504,89 +579,57 @@ class CIService:
             ExplorerTypeSummary,
         )
         from app.models.cloud_backend import CloudBackend
-        from app.models.semantic_type import SemanticCategory, SemanticResourceType
-
-        # Base filter for CIs
-        base_conditions = [
-            ConfigurationItem.tenant_id == tenant_id,
-            ConfigurationItem.deleted_at.is_(None),
-        ]
-        if compartment_id:
-            base_conditions.append(
-                ConfigurationItem.compartment_id == compartment_id
-            )
-        if backend_id:
-            base_conditions.append(
-                ConfigurationItem.backend_id == backend_id
-            )
 
-        # Total count
-        total_stmt = select(func.count()).select_from(
-            select(ConfigurationItem.id).where(*base_conditions).subquery()
-        )
-        total_result = await self.db.execute(total_stmt)
-        total_cis = total_result.scalar() or 0
-
-        # Count CIs per class (join to get semantic info)
-        count_stmt = (
+        # One grouped read over the trigger-maintained counts (tenant-prefixed unique index)
+        counts_stmt = (
             select(
                 CIClass.id.label("class_id"),
                 CIClass.name.label("class_name"),
                 CIClass.display_name.label("class_display_name"),
                 CIClass.icon.label("class_icon"),
                 CIClass.semantic_type_id,
-                func.count(ConfigurationItem.id).label("ci_count"),
-            )
-            .select_from(ConfigurationItem)
-            .join(CIClass, ConfigurationItem.ci_class_id == CIClass.id)
-            .where(*base_conditions)
-            .group_by(
-                CIClass.id,
-                CIClass.name,
-                CIClass.display_name,
-                CIClass.icon,
-                CIClass.semantic_type_id,
+                CloudBackend.id.label("backend_id"),
+                CloudBackend.name.label("backend_name"),
+                func.sum(CIExplorerCount.ci_count).label("ci_count"),
             )
+            .select_from(CIExplorerCount)
+            .join(CIClass, CIExplorerCount.ci_class_id == CIClass.id)
+            .outerjoin(CloudBackend, CIExplorerCount.backend_id == CloudBackend.id)
+            .where(CIExplorerCount.tenant_id == tenant_id, CIExplorerCount.ci_count > 0)
+            .group_by(CIClass.id, CloudBackend.id)
         )
-        count_result = await self.db.execute(count_stmt)
-        class_counts = count_result.all()
-
-        # Load semantic types and categories for mapping
-        semantic_type_ids = {
-            row.semantic_type_id for row in class_counts if row.semantic_type_id
-        }
-        type_to_category: dict[str, tuple[str, str, str | None]] = {}
-        if semantic_type_ids:
-            st_stmt = (
-                select(
-                    SemanticResourceType.id,
-                    SemanticResourceType.name,
-                    SemanticResourceType.display_name,
-                    SemanticCategory.id.label("cat_id"),
-                    SemanticCategory.name.label("cat_name"),
-                    SemanticCategory.display_name.label("cat_display_name"),
-                    SemanticCategory.icon.label("cat_icon"),
-                )
-                .join(
-                    SemanticCategory,
-                    SemanticResourceType.category_id == SemanticCategory.id,
-                )
-                .where(SemanticResourceType.id.in_(semantic_type_ids))
-            )
-            st_result = await self.db.execute(st_stmt)
-            for st_row in st_result.all():
-                type_to_category[str(st_row.id)] = (
-                    str(st_row.cat_id),
-                    st_row.cat_display_name or st_row.cat_name,
-                    st_row.cat_icon,
+        if compartment_id:
+            counts_stmt = counts_stmt.where(CIExplorerCount.compartment_id == compartment_id)
+        if backend_id:
+            counts_stmt = counts_stmt.where(CIExplorerCount.backend_id == backend_id)
+        rows = (await self.db.execute(counts_stmt)).all()
+
+        catalog = await get_semantic_catalog(self.db)
+        total_cis = 0
+        class_rows: dict[str, tuple] = {}
+        class_totals: dict[str, int] = {}
+        backend_totals: dict[str, list] = {}
+        for row in rows:
+            count = int(row.ci_count)
+            total_cis += count
+            class_id = str(row.class_id)
+            class_rows.setdefault(class_id, row)
+            class_totals[class_id] = class_totals.get(class_id, 0) + count
+            if row.backend_id is not None:
+                entry = backend_totals.setdefault(
+                    str(row.backend_id), [row.backend_name, 0]
                 )
+                entry[1] += count
 
-        # Build category → types hierarchy
+        # Build category → types hierarchy from the cached semantic catalog
         categories_map: dict[str, dict] = {}
-        for row in class_counts:
-            st_id = str(row.semantic_type_id) if row.semantic_type_id else None
-            if st_id and st_id in type_to_category:
-                cat_id, cat_name, cat_icon = type_to_category[st_id]
+        for class_id, row in class_rows.items():
+            st = catalog.type(row.semantic_type_id) if row.semantic_type_id else None
+            category = catalog.category(st.category_id) if st else None
+            if st and category:
+                cat_id = str(category.id)
+                cat_name = category.display_name or category.name
+                cat_icon = category.icon
             else:
                 cat_id = "__uncategorized__"
                 cat_name = "Uncategorized"
@@ -601,30 +644,23 @@ class CIService:
                     "total_count": 0,
                 }
 
-            # Load the semantic type display name
-            st_name = row.class_display_name or row.class_name
-            if st_id and st_id in type_to_category:
-                # Get actual semantic type name
-                st_name_stmt = select(
-                    SemanticResourceType.display_name,
-                    SemanticResourceType.name,
-                ).where(SemanticResourceType.id == st_id)
-                st_name_result = await self.db.execute(st_name_stmt)
-                st_name_row = st_name_result.one_or_none()
-                if st_name_row:
-                    st_name = st_name_row.display_name or st_name_row.name
-
+            class_name = row.class_display_name or row.class_name
+            count = class_totals[class_id]
             categories_map[cat_id]["types"].append(
                 ExplorerTypeSummary(
-                    semantic_type_id=st_id,
-                    semantic_type_name=st_name,
-                    ci_class_id=str(row.class_id),
-                    ci_class_name=row.class_display_name or row.class_name,
+                    semantic_type_id=(
+                        str(row.semantic_type_id) if row.semantic_type_id else None
+                    ),
+                    semantic_type_name=(
+                        (st.display_name or st.name) if st and category else class_name
+                    ),
+                    ci_class_id=class_id,
+                    ci_class_name=class_name,
                     ci_class_icon=row.class_icon,
-                    count=row.ci_count,
+                    count=count,
                 )
             )
-            categories_map[cat_id]["total_count"] += row.ci_count
+            categories_map[cat_id]["total_count"] += count
 
         categories = [
             ExplorerCategorySummary(**cat_data)
@@ -633,27 +669,14 @@ class CIService:
             )
         ]
 
-        # Backend counts
-        backend_stmt = (
-            select(
-                CloudBackend.id.label("backend_id"),
-                CloudBackend.name.label("backend_name"),
-                func.count(ConfigurationItem.id).label("ci_count"),
-            )
-            .select_from(ConfigurationItem)
-            .join(CloudBackend, ConfigurationItem.backend_id == CloudBackend.id)
-            .where(*base_conditions)
-            .group_by(CloudBackend.id, CloudBackend.name)
-        )
-        backend_result = await self.db.execute(backend_stmt)
         backends = [
             ExplorerBackendSummary(
-                backend_id=str(row.backend_id),
-                backend_name=row.backend_name,
+                backend_id=backend_key,
+                backend_name=name,
                 provider_name="",
-                ci_count=row.ci_count,
+                ci_count=count,
             )
-            for row in backend_result.all()
+            for backend_key, (name, count) in backend_totals.items()
         ]
 
         return ExplorerSummaryType(
@@ -662,6 +685,41 @@ class CIService:
             backends=backends,
         )
 
+    async def find_explorer_count_tenants(self) -> list[str]:
+        """Tenants with live CIs or existing count buckets (nightly rebuild scope)."""
+        live = select(ConfigurationItem.tenant_id).where(ConfigurationItem.deleted_at.is_(None))
+        result = await self.db.execute(live.union(select(CIExplorerCount.tenant_id)))
+        return [str(tenant_id) for tenant_id in result.scalars().all()]
+
+    async def rebuild_explorer_counts(self, tenant_id: str) -> int:
+        """Recompute a tenant's explorer count buckets from its live CIs."""
+        await self.db.execute(
+            delete(CIExplorerCount).where(CIExplorerCount.tenant_id == tenant_id)
+        )
+        key = (
+            ConfigurationItem.tenant_id,
+            ConfigurationItem.compartment_id,
+            ConfigurationItem.backend_id,
+            ConfigurationItem.ci_class_id,
+        )
+        source = (
+            select(func.gen_random_uuid(), *key, func.count(ConfigurationItem.id))
+            .where(
+                ConfigurationItem.tenant_id == tenant_id,
+                ConfigurationItem.deleted_at.is_(None),
+            )
+            .group_by(*key)
+        )
+        result = await self.db.execute(
+            insert(CIExplorerCount).from_select(
+                ["id", "tenant_id", "compartment_id", "backend_id", "ci_class_id", "ci_count"],
+                source,
+            )
+        )
+        await self.db.flush()
+        logger.info("Rebuilt CI explorer counts for tenant %s", tenant_id)
+        return result.rowcount or 0
+
     # ── Private helpers ───────────────────────────────────────────────
 
     async def _get_class(self, class_id: uuid.UUID | str) -> CIClass | None:
@@ -688,31 +746,6 @@ class CIService:
         reason: str | None,
     ) -> CISnapshot:
         """Create a versioned snapshot of the CI's current state."""
-        count_result = await self.db.execute(
-            select(func.count()).select_from(
-                select(CISnapshot).where(CISnapshot.ci_id == ci.id).subquery()
-            )
+        return await SnapshotStore(self.db).append(
+            ci, tenant_id, user_id, change_type, reason
         )
-        version = (count_result.scalar() or 0) + 1
-
-        snapshot = CISnapshot(
-            ci_id=ci.id,
-            tenant_id=tenant_id,
-            version_number=version,
-            snapshot_data={
-                "name": ci.name,
-                "description": ci.description,
-                "lifecycle_state": ci.lifecycle_state,
-                "attributes": ci.attributes,
-                "tags": ci.tags,
-                "compartment_id": str(ci.compartment_id) if ci.compartment_id else None,
-                "cloud_resource_id": ci.cloud_resource_id,
-                "pulumi_urn": ci.pulumi_urn,
-            },
-            changed_by=user_id,
-            change_reason=reason,
-            change_type=change_type,
-        )
-        self.db.add(snapshot)
-        await self.db.flush()
-        return snapshot
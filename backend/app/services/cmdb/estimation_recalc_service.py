@@ -0,0 +1,415 @@
+"""
+Overview: Bulk estimation recalculation engine — reprices every affected draft estimation and
+    line item for a tenant, price list, or delivery region in set-based passes.
+Architecture: Service delivery estimation engine, bulk path (Section 8)
+Dependencies: sqlalchemy, app.models.cmdb.estimation, app.models.cmdb.price_list,
+    app.models.cmdb.staff_profile, app.services.cmdb.catalog_service
+Concepts: Estimations are processed in keyset-ordered chunks. Each chunk loads its line items,
+    rate cards, and price list items with one query each, resolves rates and prices in memory,
+    computes costs and margins column-wise with Decimal, and writes only changed rows back with
+    a single executemany UPDATE per table. Prices that cannot be resolved from the estimation's
+    own price list fall back to the full pricing cascade, memoized per distinct lookup key.
+"""
+from __future__ import annotations
+
+import logging
+import uuid
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.cmdb.estimation import EstimationLineItem, ServiceEstimation
+from app.models.cmdb.price_list import PriceList, PriceListItem
+from app.models.cmdb.staff_profile import InternalRateCard
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0")
+HUNDRED = Decimal("100")
+_QUANT = Decimal("0.0001")
+
+ProgressCallback = Callable[[int, int], Awaitable[None] | None]
+
+
+# ── Pure arithmetic ──────────────────────────────────────────────────
+
+
+def compute_line_costs(
+    hours: Sequence[Decimal], rates: Sequence[Decimal]
+) -> list[Decimal]:
+    """Element-wise hours x rate for a column of line items."""
+    return [h * r for h, r in zip(hours, rates, strict=True)]
+
+
+def compute_estimation_totals(
+    sell_price_per_unit: Decimal, quantity: Decimal, line_costs: Sequence[Decimal]
+) -> dict[str, Decimal]:
+    """Compute total cost, total sell price, and margin for one estimation."""
+    total_cost = sum(line_costs, ZERO)
+    total_sell = sell_price_per_unit * quantity
+    margin_amount = total_sell - total_cost
+    margin_percent = (margin_amount / total_sell * HUNDRED) if total_sell > 0 else ZERO
+    return {
+        "total_estimated_cost": total_cost,
+        "total_sell_price": total_sell,
+        "margin_amount": margin_amount,
+        "margin_percent": margin_percent,
+    }
+
+
+def _changed(old: Decimal | None, new: Decimal) -> bool:
+    """Compare at the stored Numeric scale so rounding noise does not cause writes."""
+    if old is None:
+        return True
+    return old.quantize(_QUANT) != new.quantize(_QUANT)
+
+
+def _specificity_levels(
+    region_id: str | None, coverage_model: str | None
+) -> list[tuple[str | None, str | None]]:
+    """Same region+coverage → region → coverage → base order as CatalogService."""
+    levels: list[tuple[str | None, str | None]] = []
+    if region_id and coverage_model:
+        levels.append((region_id, coverage_model))
+    if region_id:
+        levels.append((region_id, None))
+    if coverage_model:
+        levels.append((None, coverage_model))
+    levels.append((None, None))
+    return levels
+
+
+# ── Results ──────────────────────────────────────────────────────────
+
+
+@dataclass
+class RecalculationResult:
+    estimations_scanned: int = 0
+    estimations_updated: int = 0
+    line_items_updated: int = 0
+    prices_unresolved: int = 0
+
+
+class EstimationRecalcService:
+    """Set-based repricing of draft estimations."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._cascade_cache: dict[tuple, dict | None] = {}
+
+    async def count_affected(
+        self,
+        tenant_id: str,
+        price_list_id: str | None = None,
+        delivery_region_id: str | None = None,
+    ) -> int:
+        stmt = select(func.count()).select_from(ServiceEstimation).where(
+            *self._scope_filters(tenant_id, price_list_id, delivery_region_id)
+        )
+        return (await self.db.execute(stmt)).scalar() or 0
+
+    async def recalculate(
+        self,
+        tenant_id: str,
+        price_list_id: str | None = None,
+        delivery_region_id: str | None = None,
+        refresh_rates: bool = True,
+        refresh_prices: bool = True,
+        batch_size: int = 500,
+        as_of: date | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> RecalculationResult:
+        """Reprice all draft estimations in scope, chunk by chunk.
+
+        Scope is the provider tenant, optionally narrowed to estimations referencing
+        ``price_list_id`` and/or delivered from ``delivery_region_id``. Each chunk is
+        flushed but not committed; the caller owns the transaction.
+        """
+        check_date = as_of or date.today()
+        total = await self.count_affected(tenant_id, price_list_id, delivery_region_id)
+        result = RecalculationResult()
+        last_id: uuid.UUID | None = None
+
+        while True:
+            stmt = (
+                select(
+                    ServiceEstimation.id,
+                    ServiceEstimation.client_tenant_id,
+                    ServiceEstimation.service_offering_id,
+                    ServiceEstimation.delivery_region_id,
+                    ServiceEstimation.coverage_model,
+                    ServiceEstimation.price_list_id,
+                    ServiceEstimation.quantity,
+                    ServiceEstimation.sell_price_per_unit,
+                    ServiceEstimation.sell_currency,
+                    ServiceEstimation.total_estimated_cost,
+                    ServiceEstimation.total_sell_price,
+                    ServiceEstimation.margin_amount,
+                    ServiceEstimation.margin_percent,
+                )
+                .where(*self._scope_filters(tenant_id, price_list_id, delivery_region_id))
+                .order_by(ServiceEstimation.id)
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                stmt = stmt.where(ServiceEstimation.id > last_id)
+            chunk = (await self.db.execute(stmt)).all()
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+
+            await self._process_chunk(
+                tenant_id, chunk, refresh_rates, refresh_prices, check_date, result
+            )
+            result.estimations_scanned += len(chunk)
+
+            if progress is not None:
+                maybe = progress(result.estimations_scanned, total)
+                if maybe is not None:
+                    await maybe
+
+            if len(chunk) < batch_size:
+                break
+
+        logger.info(
+            "Recalculated estimations for tenant %s: scanned=%d updated=%d lines=%d",
+            tenant_id,
+            result.estimations_scanned,
+            result.estimations_updated,
+            result.line_items_updated,
+        )
+        return result
+
+    # ── Chunk processing ────────────────────────────────────────────
+
+    @staticmethod
+    def _scope_filters(
+        tenant_id: str, price_list_id: str | None, delivery_region_id: str | None
+    ) -> list:
+        filters = [
+            ServiceEstimation.tenant_id == tenant_id,
+            ServiceEstimation.status == "draft",
+            ServiceEstimation.deleted_at.is_(None),
+        ]
+        if price_list_id:
+            filters.append(ServiceEstimation.price_list_id == price_list_id)
+        if delivery_region_id:
+            filters.append(ServiceEstimation.delivery_region_id == delivery_region_id)
+        return filters
+
+    async def _process_chunk(
+        self,
+        tenant_id: str,
+        chunk: Sequence,
+        refresh_rates: bool,
+        refresh_prices: bool,
+        check_date: date,
+        result: RecalculationResult,
+    ) -> None:
+        est_ids = [row.id for row in chunk]
+
+        line_rows = (
+            await self.db.execute(
+                select(
+                    EstimationLineItem.id,
+                    EstimationLineItem.estimation_id,
+                    EstimationLineItem.staff_profile_id,
+                    EstimationLineItem.delivery_region_id,
+                    EstimationLineItem.estimated_hours,
+                    EstimationLineItem.hourly_rate,
+                    EstimationLineItem.rate_currency,
+                    EstimationLineItem.rate_card_id,
+                    EstimationLineItem.line_cost,
+                ).where(
+                    EstimationLineItem.estimation_id.in_(est_ids),
+                    EstimationLineItem.deleted_at.is_(None),
+                )
+            )
+        ).all()
+
+        # Column-wise rate resolution
+        rates = [row.hourly_rate for row in line_rows]
+        currencies = [row.rate_currency for row in line_rows]
+        card_ids = [row.rate_card_id for row in line_rows]
+        if refresh_rates and line_rows:
+            rate_index = await self._load_rate_index(tenant_id, line_rows, check_date)
+            for i, row in enumerate(line_rows):
+                card = rate_index.get((row.staff_profile_id, row.delivery_region_id))
+                if card is not None:
+                    card_ids[i] = card.id
+                    rates[i] = card.hourly_cost
+                    currencies[i] = card.currency
+                else:
+                    card_ids[i] = None
+
+        costs = compute_line_costs([row.estimated_hours for row in line_rows], rates)
+
+        line_params: list[dict] = []
+        costs_by_estimation: dict[uuid.UUID, list[Decimal]] = {eid: [] for eid in est_ids}
+        for i, row in enumerate(line_rows):
+            costs_by_estimation[row.estimation_id].append(costs[i])
+            if (
+                _changed(row.line_cost, costs[i])
+                or _changed(row.hourly_rate, rates[i])
+                or row.rate_card_id != card_ids[i]
+                or row.rate_currency != currencies[i]
+            ):
+                line_params.append({
+                    "id": row.id,
+                    "rate_card_id": card_ids[i],
+                    "hourly_rate": rates[i],
+                    "rate_currency": currencies[i],
+                    "line_cost": costs[i],
+                })
+
+        prices: dict[uuid.UUID, tuple[Decimal, str]] = {}
+        if refresh_prices:
+            prices = await self._resolve_prices(chunk, check_date, result)
+
+        est_params: list[dict] = []
+        for row in chunk:
+            sell_price, currency = prices.get(
+                row.id, (row.sell_price_per_unit, row.sell_currency)
+            )
+            totals = compute_estimation_totals(
+                sell_price, row.quantity, costs_by_estimation[row.id]
+            )
+            if (
+                _changed(row.sell_price_per_unit, sell_price)
+                or row.sell_currency != currency
+                or any(_changed(getattr(row, k), v) for k, v in totals.items())
+            ):
+                est_params.append({
+                    "id": row.id,
+                    "sell_price_per_unit": sell_price,
+                    "sell_currency": currency,
+                    **totals,
+                })
+
+        if line_params:
+            await self.db.execute(update(EstimationLineItem), line_params)
+        if est_params:
+            await self.db.execute(update(ServiceEstimation), est_params)
+        if line_params or est_params:
+            await self.db.flush()
+
+        result.line_items_updated += len(line_params)
+        result.estimations_updated += len(est_params)
+
+    async def _load_rate_index(
+        self, tenant_id: str, line_rows: Sequence, check_date: date
+    ) -> dict[tuple[uuid.UUID, uuid.UUID], InternalRateCard]:
+        """Load every candidate rate card once; keep the latest effective per key."""
+        profile_ids = {row.staff_profile_id for row in line_rows}
+        region_ids = {row.delivery_region_id for row in line_rows}
+        cards = (
+            await self.db.execute(
+                select(InternalRateCard)
+                .where(
+                    InternalRateCard.tenant_id == tenant_id,
+                    InternalRateCard.staff_profile_id.in_(profile_ids),
+                    InternalRateCard.delivery_region_id.in_(region_ids),
+                    InternalRateCard.effective_from <= check_date,
+                    (InternalRateCard.effective_to.is_(None))
+                    | (InternalRateCard.effective_to >= check_date),
+                    InternalRateCard.deleted_at.is_(None),
+                )
+                .order_by(InternalRateCard.effective_from.desc())
+            )
+        ).scalars().all()
+
+        index: dict[tuple[uuid.UUID, uuid.UUID], InternalRateCard] = {}
+        for card in cards:
+            index.setdefault((card.staff_profile_id, card.delivery_region_id), card)
+        return index
+
+    async def _resolve_prices(
+        self, chunk: Sequence, check_date: date, result: RecalculationResult
+    ) -> dict[uuid.UUID, tuple[Decimal, str]]:
+        """Resolve sell prices for a chunk of estimations.
+
+        Estimations bound to a price list are matched against that list's items (loaded
+        in one query) using the standard specificity cascade; the rest fall back to the
+        full pricing engine, memoized per (client, offering, region, coverage, list).
+        """
+        list_ids = {row.price_list_id for row in chunk if row.price_list_id}
+        offering_ids = {row.service_offering_id for row in chunk}
+
+        item_index: dict[tuple, PriceListItem] = {}
+        if list_ids:
+            items = (
+                await self.db.execute(
+                    select(PriceListItem)
+                    .join(PriceList)
+                    .where(
+                        PriceList.id.in_(list_ids),
+                        PriceList.deleted_at.is_(None),
+                        PriceListItem.service_offering_id.in_(offering_ids),
+                        PriceListItem.deleted_at.is_(None),
+                    )
+                )
+            ).scalars().all()
+            for item in items:
+                key = (
+                    item.price_list_id,
+                    item.service_offering_id,
+                    str(item.delivery_region_id) if item.delivery_region_id else None,
+                    item.coverage_model,
+                )
+                item_index.setdefault(key, item)
+
+        prices: dict[uuid.UUID, tuple[Decimal, str]] = {}
+        for row in chunk:
+            region = str(row.delivery_region_id) if row.delivery_region_id else None
+            if row.price_list_id:
+                for region_val, coverage_val in _specificity_levels(region, row.coverage_model):
+                    item = item_index.get(
+                        (row.price_list_id, row.service_offering_id, region_val, coverage_val)
+                    )
+                    if item is not None:
+                        prices[row.id] = (item.price_per_unit, item.currency)
+                        break
+                if row.id in prices:
+                    continue
+
+            price = await self._cascade_price(row, region, check_date)
+            if price:
+                prices[row.id] = (
+                    price["price_per_unit"],
+                    price.get("currency", row.sell_currency),
+                )
+            else:
+                result.prices_unresolved += 1
+        return prices
+
+    async def _cascade_price(self, row, region: str | None, check_date: date) -> dict | None:
+        key = (
+            row.client_tenant_id,
+            row.service_offering_id,
+            region,
+            row.coverage_model,
+            row.price_list_id,
+        )
+        if key in self._cascade_cache:
+            return self._cascade_cache[key]
+
+        from app.services.cmdb.catalog_service import CatalogService
+
+        price: dict | None = None
+        try:
+            price = await CatalogService(self.db).get_effective_price(
+                str(row.client_tenant_id),
+                str(row.service_offering_id),
+                delivery_region_id=region,
+                coverage_model=row.coverage_model,
+                as_of=check_date,
+                price_list_id=str(row.price_list_id) if row.price_list_id else None,
+            )
+        except Exception:
+            logger.warning("Failed to resolve sell price for %s", key, exc_info=True)
+        self._cascade_cache[key] = price
+        return price
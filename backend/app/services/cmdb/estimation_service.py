@@ -24,6 +24,7 @@ from app.models.cmdb.activity import (
     ProcessActivityLink,
 )
 from app.models.cmdb.estimation import EstimationLineItem, ServiceEstimation
+from app.services.cmdb.estimation_recalc_service import compute_estimation_totals
 from app.services.cmdb.rate_card_service import RateCardService
 from app.services.cmdb.region_acceptance_service import RegionAcceptanceService
 
@@ -330,6 +331,9 @@ class EstimationService:
         estimation.approved_by = approved_by
         estimation.approved_at = datetime.now(UTC)
         await self.db.flush()
+
+        from app.services.cmdb.profitability_service import ProfitabilityService
+        await ProfitabilityService(self.db).apply_estimation(estimation)
         return estimation
 
     async def reject_estimation(
@@ -546,7 +550,18 @@ class EstimationService:
         await self.db.flush()
 
     async def _recalculate(self, estimation: ServiceEstimation) -> None:
-        """Recalculate estimation totals and margin."""
+        """Recalculate estimation totals and margin.
+
+        An approved estimation is retracted from its profitability bucket with its old totals
+        and folded back in with the new ones, in the same transaction.
+        """
+        rollup = None
+        if estimation.status == "approved":
+            from app.services.cmdb.profitability_service import ProfitabilityService
+
+            rollup = ProfitabilityService(self.db)
+            await rollup.apply_estimation(estimation, sign=-1)
+
         # Re-fetch line items
         result = await self.db.execute(
             select(EstimationLineItem).where(
@@ -556,15 +571,13 @@ class EstimationService:
         )
         items = list(result.scalars().all())
 
-        total_cost = sum(item.line_cost for item in items)
-        total_sell = estimation.sell_price_per_unit * estimation.quantity
-
-        estimation.total_estimated_cost = total_cost
-        estimation.total_sell_price = total_sell
-        estimation.margin_amount = total_sell - total_cost
-        estimation.margin_percent = (
-            (estimation.margin_amount / total_sell * Decimal("100"))
-            if total_sell > 0
-            else Decimal("0")
+        totals = compute_estimation_totals(
+            estimation.sell_price_per_unit,
+            estimation.quantity,
+            [item.line_cost for item in items],
         )
+        for key, val in totals.items():
+            setattr(estimation, key, val)
         await self.db.flush()
+        if rollup is not None:
+            await rollup.apply_estimation(estimation)
@@ -0,0 +1,720 @@
+"""
+Overview: In-memory CI graph engine — compact CSR adjacency per tenant for traversal, shortest
+    path, cycle detection and blast-radius queries without recursive CTEs.
+Architecture: Optional accelerator behind GraphService; the CTE queries remain the fallback
+    (Section 8)
+Dependencies: sqlalchemy, app.models.cmdb.*, app.core.config, app.services.events.valkey_client
+Concepts: Each tenant graph stores live CIs as dense integer indices and relationships as
+    compressed sparse rows (offset + target + type arrays) in both directions, with relationship
+    types interned to small integers so type filters are set lookups. BFS visits each node once,
+    so results carry the shortest depth/path instead of every simple path. Committed
+    relationship adds/removes and CI deletions are applied to a small overlay and compacted into
+    a fresh CSR when the overlay grows; any change drops the graph's cached transitive
+    closures. Every commit with graph changes also bumps a per-tenant generation counter in
+    Valkey; a cached graph built at an older generation is rebuilt on its next use, so other
+    API workers and Temporal workers see the write on their next query. The TTL only bounds
+    staleness while Valkey is unreachable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.cmdb.ci import ConfigurationItem
+from app.models.cmdb.ci_class import CIClass
+from app.models.cmdb.ci_relationship import CIRelationship
+from app.models.cmdb.relationship_type import RelationshipType
+from app.services.cmdb.graph_service import GraphNode
+
+logger = logging.getLogger(__name__)
+
+_OVERLAY_COMPACT_RATIO = 0.1
+_CLOSURE_CACHE_ENTRIES = 2_000_000
+_CHANGES_KEY = "_graph_engine_changes"
+_HOOKED_KEY = "_graph_engine_hooked"
+_VALKEY_PREFIX = "nimbus:cmdb_graph:gen:"
+
+_PUBLISHES: set[asyncio.Task] = set()
+
+
+@dataclass
+class _Overlay:
+    """Edges and node deletions applied since the CSR arrays were built."""
+
+    out: dict[int, list[tuple[int, int, str]]] = field(default_factory=dict)
+    inc: dict[int, list[tuple[int, int, str]]] = field(default_factory=dict)
+    removed: set[str] = field(default_factory=set)
+    dead: set[int] = field(default_factory=set)
+    size: int = 0
+
+
+class CSRGraph:
+    """Directed labeled multigraph over one tenant's live CIs."""
+
+    def __init__(
+        self,
+        nodes: Iterable[tuple[str, str, str]],
+        edges: Iterable[tuple[str, str, str, str]],
+    ) -> None:
+        """``nodes``: (ci_id, name, class_name); ``edges``: (rel_id, source, target, type)."""
+        self.node_ids: list[str] = []
+        self.names: list[str] = []
+        self.classes: list[str] = []
+        self.index: dict[str, int] = {}
+        for ci_id, name, class_name in nodes:
+            self._add_node(ci_id, name, class_name)
+
+        self.type_names: list[str] = []
+        self.type_index: dict[str, int] = {}
+        src = array("i")
+        dst = array("i")
+        typ = array("i")
+        rel_ids: list[str] = []
+        for rel_id, source, target, type_name in edges:
+            s = self.index.get(source)
+            t = self.index.get(target)
+            if s is None or t is None:
+                continue
+            src.append(s)
+            dst.append(t)
+            typ.append(self._type_id(type_name))
+            rel_ids.append(rel_id)
+
+        self.edge_count = len(rel_ids)
+        self.out_off, self.out_dst, self.out_typ, self.out_rel = self._compress(src, dst, typ, rel_ids)
+        self.in_off, self.in_src, self.in_typ, self.in_rel = self._compress(dst, src, typ, rel_ids)
+        self.overlay = _Overlay()
+        self.built_at = time.monotonic()
+        self.generation = 0
+        # (direction, type ids, depth cap) -> node -> {reachable node: depth}
+        self._closures: dict[tuple, dict[int, dict[int, int]]] = {}
+        self._closure_entries = 0
+
+    # ── Construction ──────────────────────────────────────────────────
+
+    def _add_node(self, ci_id: str, name: str, class_name: str) -> int:
+        idx = len(self.node_ids)
+        self.node_ids.append(ci_id)
+        self.names.append(name)
+        self.classes.append(class_name)
+        self.index[ci_id] = idx
+        return idx
+
+    def _type_id(self, name: str) -> int:
+        tid = self.type_index.get(name)
+        if tid is None:
+            tid = len(self.type_names)
+            self.type_names.append(name)
+            self.type_index[name] = tid
+        return tid
+
+    def _compress(
+        self, keys: array, vals: array, typ: array, rel_ids: list[str]
+    ) -> tuple[array, array, array, list[str]]:
+        """Counting-sort edges by ``keys`` into offset/value/type/relationship arrays."""
+        n = len(self.node_ids)
+        off = array("i", [0]) * (n + 1)
+        for k in keys:
+            off[k + 1] += 1
+        for i in range(n):
+            off[i + 1] += off[i]
+        cursor = array("i", off[:n])
+        out_vals = array("i", [0]) * len(keys)
+        out_typ = array("i", [0]) * len(keys)
+        out_rel: list[str] = [""] * len(keys)
+        for e, k in enumerate(keys):
+            pos = cursor[k]
+            cursor[k] += 1
+            out_vals[pos] = vals[e]
+            out_typ[pos] = typ[e]
+            out_rel[pos] = rel_ids[e]
+        return off, out_vals, out_typ, out_rel
+
+    # ── Incremental maintenance ───────────────────────────────────────
+
+    def add_edge(
+        self,
+        rel_id: str,
+        source: tuple[str, str, str],
+        target: tuple[str, str, str],
+        type_name: str,
+    ) -> None:
+        """Record a committed relationship; endpoints are (ci_id, name, class_name)."""
+        s = self.index.get(source[0])
+        if s is None:
+            s = self._add_node(*source)
+        t = self.index.get(target[0])
+        if t is None:
+            t = self._add_node(*target)
+        tid = self._type_id(type_name)
+        self.overlay.removed.discard(rel_id)
+        self.overlay.out.setdefault(s, []).append((t, tid, rel_id))
+        self.overlay.inc.setdefault(t, []).append((s, tid, rel_id))
+        self.overlay.size += 1
+        self._clear_closures()
+
+    def remove_edge(self, rel_id: str) -> None:
+        self.overlay.removed.add(rel_id)
+        self.overlay.size += 1
+        self._clear_closures()
+
+    def rename_node(self, ci_id: str, name: str) -> None:
+        idx = self.index.get(ci_id)
+        if idx is not None:
+            self.names[idx] = name
+
+    def remove_node(self, ci_id: str) -> None:
+        idx = self.index.get(ci_id)
+        if idx is not None:
+            self.overlay.dead.add(idx)
+            self.overlay.size += 1
+        self._clear_closures()
+
+    def _clear_closures(self) -> None:
+        self._closures.clear()
+        self._closure_entries = 0
+
+    def needs_compaction(self) -> bool:
+        return self.overlay.size > max(64, int(self.edge_count * _OVERLAY_COMPACT_RATIO))
+
+    def compacted(self) -> CSRGraph:
+        """A fresh graph with the overlay folded into the CSR arrays."""
+        dead = self.overlay.dead
+        nodes = [
+            (self.node_ids[i], self.names[i], self.classes[i])
+            for i in range(len(self.node_ids)) if i not in dead
+        ]
+        edges = [
+            (rel, self.node_ids[s], self.node_ids[t], self.type_names[tid])
+            for s in range(len(self.node_ids))
+            for t, tid, rel in self._neighbors(s, "outgoing", None)
+        ]
+        return CSRGraph(nodes, edges)
+
+    # ── Adjacency ─────────────────────────────────────────────────────
+
+    def is_live(self, ci_id: str) -> bool:
+        idx = self.index.get(ci_id)
+        return idx is not None and idx not in self.overlay.dead
+
+    def type_mask(self, relationship_types: list[str] | None) -> set[int] | None:
+        if not relationship_types:
+            return None
+        return {self.type_index[t] for t in relationship_types if t in self.type_index}
+
+    def _neighbors(
+        self, node: int, direction: str, mask: set[int] | None
+    ) -> Iterator[tuple[int, int, str]]:
+        """Yield (neighbor, type_id, relationship_id) honouring the overlay."""
+        overlay = self.overlay
+        sides = []
+        if direction in ("outgoing", "both"):
+            sides.append((self.out_off, self.out_dst, self.out_typ, self.out_rel, overlay.out))
+        if direction in ("incoming", "both"):
+            sides.append((self.in_off, self.in_src, self.in_typ, self.in_rel, overlay.inc))
+        base_n = len(self.out_off) - 1
+        for off, vals, typ, rels, extra in sides:
+            if node < base_n:
+                for pos in range(off[node], off[node + 1]):
+                    t = typ[pos]
+                    if mask is not None and t not in mask:
+                        continue
+                    nb = vals[pos]
+                    if nb in overlay.dead or (overlay.removed and rels[pos] in overlay.removed):
+                        continue
+                    yield nb, t, rels[pos]
+            for nb, t, rel in extra.get(node, ()):
+                if mask is not None and t not in mask:
+                    continue
+                if nb in overlay.dead or rel in overlay.removed:
+                    continue
+                yield nb, t, rel
+
+    # ── Queries ───────────────────────────────────────────────────────
+
+    def bfs(
+        self,
+        sources: Iterable[int],
+        direction: str,
+        mask: set[int] | None,
+        max_depth: int,
+    ) -> tuple[dict[int, int], dict[int, int]]:
+        """Multi-source BFS; returns (depth by node, parent by node)."""
+        depth: dict[int, int] = {}
+        parent: dict[int, int] = {}
+        queue: deque[int] = deque()
+        for s in sources:
+            if s not in depth:
+                depth[s] = 0
+                queue.append(s)
+        while queue:
+            node = queue.popleft()
+            d = depth[node]
+            if d >= max_depth:
+                continue
+            for nb, _, _ in self._neighbors(node, direction, mask):
+                if nb not in depth:
+                    depth[nb] = d + 1
+                    parent[nb] = node
+                    queue.append(nb)
+        return depth, parent
+
+    def closure(
+        self,
+        node: int,
+        direction: str,
+        mask: set[int] | None,
+        max_depth: int,
+    ) -> dict[int, int]:
+        """Nodes reachable from ``node`` within ``max_depth`` hops, with their shortest depth.
+
+        Closures are cached per (direction, types, depth). A BFS that reaches a node whose
+        closure is already cached merges it at the node's depth instead of re-expanding it;
+        entries beyond the remaining depth budget are dropped so results stay exact.
+        """
+        key = (direction, frozenset(mask) if mask is not None else None, max_depth)
+        cache = self._closures.setdefault(key, {})
+        cached = cache.get(node)
+        if cached is not None:
+            return cached
+
+        depth: dict[int, int] = {node: 0}
+        queue: deque[int] = deque([node])
+        while queue:
+            current = queue.popleft()
+            d = depth[current]
+            if d >= max_depth:
+                continue
+            for nb, _, _ in self._neighbors(current, direction, mask):
+                if nb in depth and depth[nb] <= d + 1:
+                    continue
+                depth[nb] = d + 1
+                shared = cache.get(nb)
+                if shared is None:
+                    queue.append(nb)
+                    continue
+                budget = max_depth - (d + 1)
+                for w, dw in shared.items():
+                    if dw <= budget and depth.get(w, max_depth + 1) > d + 1 + dw:
+                        depth[w] = d + 1 + dw
+        if self._closure_entries + len(depth) <= _CLOSURE_CACHE_ENTRIES:
+            cache[node] = depth
+            self._closure_entries += len(depth)
+        return depth
+
+    def reach(
+        self,
+        ci_ids: Iterable[str],
+        relationship_types: list[str] | None,
+        direction: str,
+        max_depth: int,
+    ) -> dict[str, dict[str, int]]:
+        """Per-CI reachable sets (excluding the CI itself) keyed by CI id, with depths."""
+        mask = self.type_mask(relationship_types)
+        result: dict[str, dict[str, int]] = {}
+        for ci_id in ci_ids:
+            if not self.is_live(ci_id):
+                result[ci_id] = {}
+                continue
+            start = self.index[ci_id]
+            reached = self.closure(start, direction, mask, max_depth)
+            result[ci_id] = {
+                self.node_ids[n]: d for n, d in reached.items() if n != start
+            }
+        return result
+
+    def node_info(self, ci_id: str) -> tuple[str, str] | None:
+        idx = self.index.get(ci_id)
+        if idx is None:
+            return None
+        return self.names[idx], self.classes[idx]
+
+    def _path(self, node: int, parent: dict[int, int]) -> list[str]:
+        path = [self.node_ids[node]]
+        while node in parent:
+            node = parent[node]
+            path.append(self.node_ids[node])
+        path.reverse()
+        return path
+
+    def traverse(
+        self,
+        ci_id: str,
+        relationship_types: list[str] | None,
+        direction: str,
+        max_depth: int,
+    ) -> list[GraphNode]:
+        if not self.is_live(ci_id):
+            return []
+        start = self.index[ci_id]
+        depth, parent = self.bfs([start], direction, self.type_mask(relationship_types), max_depth)
+        nodes = [
+            GraphNode(
+                ci_id=self.node_ids[n],
+                name=self.names[n],
+                ci_class=self.classes[n],
+                depth=d,
+                path=self._path(n, parent),
+            )
+            for n, d in depth.items()
+            if n != start
+        ]
+        nodes.sort(key=lambda g: (g.depth, g.name))
+        return nodes
+
+    def shortest_path(self, source_id: str, target_id: str, max_nodes: int) -> list[str] | None:
+        """Bidirectional BFS over edges in either direction; paths hold at most ``max_nodes``."""
+        if not self.is_live(source_id) or not self.is_live(target_id):
+            return None
+        s, t = self.index[source_id], self.index[target_id]
+        if s == t:
+            return [source_id]
+        parents_f: dict[int, int | None] = {s: None}
+        parents_b: dict[int, int | None] = {t: None}
+        frontier_f, frontier_b = [s], [t]
+        edges_used = 0
+        while frontier_f and frontier_b and edges_used < max_nodes - 1:
+            # Expand the smaller frontier
+            forward = len(frontier_f) <= len(frontier_b)
+            frontier = frontier_f if forward else frontier_b
+            mine, theirs = (parents_f, parents_b) if forward else (parents_b, parents_f)
+            nxt: list[int] = []
+            meet: int | None = None
+            for node in frontier:
+                for nb, _, _ in self._neighbors(node, "both", None):
+                    if nb in mine:
+                        continue
+                    mine[nb] = node
+                    if nb in theirs:
+                        meet = nb
+                        break
+                    nxt.append(nb)
+                if meet is not None:
+                    break
+            edges_used += 1
+            if meet is not None:
+                head: list[int] = []
+                node: int | None = meet
+                while node is not None:
+                    head.append(node)
+                    node = parents_f[node]
+                head.reverse()
+                node = parents_b[meet]
+                while node is not None:
+                    head.append(node)
+                    node = parents_b[node]
+                return [self.node_ids[i] for i in head]
+            if forward:
+                frontier_f = nxt
+            else:
+                frontier_b = nxt
+        return None
+
+    def cycles_from(self, ci_id: str) -> list[list[str]] | None:
+        """One cycle per strongly connected component reachable from ``ci_id``.
+
+        Each result is the path from ``ci_id`` into the component followed by a shortest
+        cycle back to the entry node, so the last element repeats an earlier one.
+        """
+        if not self.is_live(ci_id):
+            return None
+        start = self.index[ci_id]
+        reach, parent = self.bfs([start], "outgoing", None, len(self.node_ids))
+        components = self._sccs(reach.keys())
+        cycles: list[list[str]] = []
+        for comp in components:
+            members = set(comp)
+            entry = min(comp, key=lambda n: reach[n])
+            if len(comp) == 1 and not any(
+                nb == entry for nb, _, _ in self._neighbors(entry, "outgoing", None)
+            ):
+                continue
+            loop = self._shortest_cycle(entry, members)
+            if loop:
+                cycles.append(self._path(entry, parent) + [self.node_ids[n] for n in loop[1:]])
+        return cycles or None
+
+    def _shortest_cycle(self, entry: int, members: set[int]) -> list[int] | None:
+        parent: dict[int, int] = {}
+        queue: deque[int] = deque([entry])
+        seen = {entry}
+        while queue:
+            node = queue.popleft()
+            for nb, _, _ in self._neighbors(node, "outgoing", None):
+                if nb == entry:
+                    loop = [node]
+                    while loop[-1] != entry:
+                        loop.append(parent[loop[-1]])
+                    loop.reverse()
+                    return loop + [entry]
+                if nb in members and nb not in seen:
+                    seen.add(nb)
+                    parent[nb] = node
+                    queue.append(nb)
+        return None
+
+    def _sccs(self, nodes: Iterable[int]) -> list[list[int]]:
+        """Iterative Tarjan over the given node set (outgoing edges)."""
+        allowed = set(nodes)
+        index: dict[int, int] = {}
+        low: dict[int, int] = {}
+        on_stack: set[int] = set()
+        stack: list[int] = []
+        result: list[list[int]] = []
+        counter = 0
+        for root in allowed:
+            if root in index:
+                continue
+            work = [(root, iter(list(self._neighbors(root, "outgoing", None))))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, it = work[-1]
+                advanced = False
+                for nb, _, _ in it:
+                    if nb not in allowed:
+                        continue
+                    if nb not in index:
+                        index[nb] = low[nb] = counter
+                        counter += 1
+                        stack.append(nb)
+                        on_stack.add(nb)
+                        work.append((nb, iter(list(self._neighbors(nb, "outgoing", None)))))
+                        advanced = True
+                        break
+                    if nb in on_stack:
+                        low[node] = min(low[node], index[nb])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                if low[node] == index[node]:
+                    comp = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        comp.append(w)
+                        if w == node:
+                            break
+                    result.append(comp)
+        return result
+
+
+# ── Per-tenant registry ───────────────────────────────────────────────
+
+
+class GraphEngine:
+    """Process-wide cache of tenant graphs."""
+
+    def __init__(self, ttl_seconds: float = 300.0, max_edges: int = 2_000_000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_edges = max_edges
+        self._graphs: dict[str, CSRGraph] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def get(self, db: AsyncSession, tenant_id: str) -> CSRGraph | None:
+        """The tenant's graph, (re)built when missing, behind the shared generation, or
+        older than the TTL.
+
+        Returns None when the tenant is too large for the in-memory engine.
+        """
+        generation = await self._generation(tenant_id)
+        graph = self._graphs.get(tenant_id)
+        if self._fresh(graph, generation):
+            return graph
+        lock = self._locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            graph = self._graphs.get(tenant_id)
+            if self._fresh(graph, generation):
+                return graph
+            graph = await self._build(db, tenant_id)
+            if graph is None:
+                self._graphs.pop(tenant_id, None)
+                return None
+            graph.generation = generation or 0
+            self._graphs[tenant_id] = graph
+            return graph
+
+    def _fresh(self, graph: CSRGraph | None, generation: int | None) -> bool:
+        if graph is None or time.monotonic() - graph.built_at >= self.ttl_seconds:
+            return False
+        return generation is None or graph.generation >= generation
+
+    @staticmethod
+    async def _client():
+        from app.services.events.valkey_client import get_valkey_client
+
+        return await get_valkey_client()
+
+    async def _generation(self, tenant_id: str) -> int | None:
+        """The tenant's shared change generation, or None when Valkey is unavailable."""
+        client = await self._client()
+        if client is None:
+            return None
+        try:
+            return int(await client.get(_VALKEY_PREFIX + tenant_id) or 0)
+        except Exception:
+            logger.debug("CI graph generation unavailable", exc_info=True)
+            return None
+
+    async def publish(self, tenant_ids: set[str]) -> None:
+        """Bump the shared generation of tenants whose graph changed in a local commit.
+
+        The local graph already holds the change, so it adopts the new generation unless
+        another process bumped the counter in between.
+        """
+        client = await self._client()
+        if client is None:
+            return
+        for tenant_id in tenant_ids:
+            try:
+                generation = await client.incr(_VALKEY_PREFIX + tenant_id)
+            except Exception:
+                logger.warning("CI graph invalidation failed", exc_info=True)
+                return
+            graph = self._graphs.get(tenant_id)
+            if graph is not None and graph.generation == generation - 1:
+                graph.generation = generation
+
+    async def _build(self, db: AsyncSession, tenant_id: str) -> CSRGraph | None:
+        started = time.perf_counter()
+        ci_rows = await db.execute(
+            select(ConfigurationItem.id, ConfigurationItem.name, CIClass.name)
+            .join(CIClass, CIClass.id == ConfigurationItem.ci_class_id)
+            .where(
+                ConfigurationItem.tenant_id == tenant_id,
+                ConfigurationItem.deleted_at.is_(None),
+            )
+        )
+        nodes = [(str(r[0]), r[1], r[2]) for r in ci_rows.all()]
+        rel_rows = await db.execute(
+            select(
+                CIRelationship.id,
+                CIRelationship.source_ci_id,
+                CIRelationship.target_ci_id,
+                RelationshipType.name,
+            )
+            .join(RelationshipType, RelationshipType.id == CIRelationship.relationship_type_id)
+            .where(
+                CIRelationship.tenant_id == tenant_id,
+                CIRelationship.deleted_at.is_(None),
+            )
+            .limit(self.max_edges + 1)
+        )
+        edges = [(str(r[0]), str(r[1]), str(r[2]), r[3]) for r in rel_rows.all()]
+        if len(edges) > self.max_edges:
+            logger.info("CI graph for tenant %s exceeds %d edges; using SQL", tenant_id, self.max_edges)
+            return None
+        graph = CSRGraph(nodes, edges)
+        logger.debug(
+            "Built CI graph for tenant %s: %d nodes, %d edges in %.1f ms",
+            tenant_id, len(nodes), graph.edge_count, (time.perf_counter() - started) * 1000,
+        )
+        return graph
+
+    def invalidate(self, tenant_id: str | None = None) -> None:
+        if tenant_id is None:
+            self._graphs.clear()
+        else:
+            self._graphs.pop(tenant_id, None)
+
+    def apply(self, tenant_id: str, change: tuple) -> None:
+        """Fold one committed change into a cached graph, if the tenant is cached."""
+        graph = self._graphs.get(tenant_id)
+        if graph is None:
+            return
+        kind = change[0]
+        if kind == "add_edge":
+            graph.add_edge(*change[1:])
+        elif kind == "remove_edge":
+            graph.remove_edge(change[1])
+        elif kind == "remove_node":
+            graph.remove_node(change[1])
+        elif kind == "rename_node":
+            graph.rename_node(change[1], change[2])
+        if graph.needs_compaction():
+            fresh = graph.compacted()
+            fresh.built_at = graph.built_at
+            fresh.generation = graph.generation
+            self._graphs[tenant_id] = fresh
+
+
+_engine: GraphEngine | None = None
+
+
+def get_graph_engine() -> GraphEngine | None:
+    """The process-wide engine, or None when disabled in settings."""
+    global _engine
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    if not settings.cmdb_graph_engine_enabled:
+        return None
+    if _engine is None:
+        _engine = GraphEngine(
+            ttl_seconds=settings.cmdb_graph_engine_ttl_seconds,
+            max_edges=settings.cmdb_graph_engine_max_edges,
+        )
+    return _engine
+
+
+# ── Transactional change feed ─────────────────────────────────────────
+
+
+def record_change(db: AsyncSession, tenant_id: str, *change) -> None:
+    """Queue a graph change on the session; it is applied only if the transaction commits.
+
+    Changes: ("add_edge", rel_id, (src_id, name, class), (tgt_id, name, class), type_name),
+    ("remove_edge", rel_id), ("remove_node", ci_id), ("rename_node", ci_id, name).
+    """
+    session = getattr(db, "sync_session", None)
+    if not isinstance(session, Session):
+        return
+    if not session.info.get(_HOOKED_KEY):
+        event.listen(session, "after_commit", _after_commit)
+        event.listen(session, "after_rollback", _after_rollback)
+        session.info[_HOOKED_KEY] = True
+    session.info.setdefault(_CHANGES_KEY, []).append((str(tenant_id), change))
+
+
+def _after_commit(session: Session) -> None:
+    changes = session.info.pop(_CHANGES_KEY, [])
+    engine = get_graph_engine() if changes else None
+    if engine is None:
+        return
+    for tenant_id, change in changes:
+        try:
+            engine.apply(tenant_id, change)
+        except Exception:
+            logger.warning("Failed to apply CI graph change; invalidating", exc_info=True)
+            engine.invalidate(tenant_id)
+    if changes:
+        _schedule_publish(engine, {tenant_id for tenant_id, _ in changes})
+
+
+def _schedule_publish(engine: GraphEngine, tenant_ids: set[str]) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.debug("No event loop for CI graph invalidation")
+        return
+    task = loop.create_task(engine.publish(tenant_ids))
+    _PUBLISHES.add(task)
+    task.add_done_callback(_PUBLISHES.discard)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_CHANGES_KEY, None)
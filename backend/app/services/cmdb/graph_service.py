@@ -2,18 +2,155 @@
 Overview: Graph service — traversal, path finding, and impact analysis on the CI relationship graph.
 Architecture: Recursive CTE-based graph queries for the CMDB (Section 8)
 Dependencies: sqlalchemy, app.models.cmdb.*
-Concepts: The CI graph is a directed labeled multigraph. Traversal uses recursive CTEs for
-    efficient multi-hop queries. Impact analysis follows depends_on/contains/uses edges to
+Concepts: The CI graph is a directed labeled multigraph. Queries are answered by the in-memory
+    graph engine when it is enabled and the tenant fits; otherwise recursive CTEs run the
+    multi-hop queries in SQL. Impact analysis follows depends_on/contains/uses edges to
     determine downstream/upstream blast radius.
 """
 
+import functools
 import logging
 
-from sqlalchemy import text
+from sqlalchemy import TextClause, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.db.instrumentation import track_sql
+from app.models.cmdb.ci import ConfigurationItem
+from app.models.cmdb.ci_class import CIClass
+from app.models.cmdb.ci_relationship import CIRelationship
+from app.models.cmdb.relationship_type import RelationshipType
 
 logger = logging.getLogger(__name__)
 
+IMPACT_TYPES = ["depends_on", "contains", "uses"]
+
+# Impact direction → edge direction followed from the failing CI
+_IMPACT_EDGE_DIRECTION = {"downstream": "incoming", "upstream": "outgoing"}
+
+
+@functools.cache
+def _traverse_query(direction: str, filtered: bool) -> TextClause:
+    """Recursive traversal CTE for a direction, built once per direction and filter."""
+    type_filter = "AND rt.name = ANY(:rel_types)" if filtered else ""
+    if direction == "outgoing":
+        join_clause = "cr.source_ci_id = g.ci_id"
+        next_ci = "cr.target_ci_id"
+    elif direction == "incoming":
+        join_clause = "cr.target_ci_id = g.ci_id"
+        next_ci = "cr.source_ci_id"
+    else:
+        join_clause = "(cr.source_ci_id = g.ci_id OR cr.target_ci_id = g.ci_id)"
+        next_ci = (
+            "CASE WHEN cr.source_ci_id = g.ci_id "
+            "THEN cr.target_ci_id ELSE cr.source_ci_id END"
+        )
+
+    return text(f"""
+        WITH RECURSIVE graph AS (
+            SELECT
+                ci.id AS ci_id,
+                ci.name AS ci_name,
+                cc.name AS class_name,
+                0 AS depth,
+                ARRAY[ci.id::text] AS path
+            FROM configuration_items ci
+            JOIN ci_classes cc ON cc.id = ci.ci_class_id
+            WHERE ci.id = :ci_id
+              AND ci.tenant_id = :tenant_id
+              AND ci.deleted_at IS NULL
+
+            UNION ALL
+
+            SELECT
+                next_ci.id AS ci_id,
+                next_ci.name AS ci_name,
+                ncc.name AS class_name,
+                g.depth + 1 AS depth,
+                g.path || next_ci.id::text
+            FROM graph g
+            JOIN ci_relationships cr ON {join_clause}
+                AND cr.tenant_id = :tenant_id
+                AND cr.deleted_at IS NULL
+            JOIN relationship_types rt ON rt.id = cr.relationship_type_id
+                {type_filter}
+            JOIN configuration_items next_ci ON next_ci.id = {next_ci}
+                AND next_ci.tenant_id = :tenant_id
+                AND next_ci.deleted_at IS NULL
+            JOIN ci_classes ncc ON ncc.id = next_ci.ci_class_id
+            WHERE g.depth < :max_depth
+              AND NOT (next_ci.id::text = ANY(g.path))
+        )
+        SELECT ci_id, ci_name, class_name, depth, path
+        FROM graph
+        WHERE depth > 0
+        ORDER BY depth, ci_name
+    """)
+
+
+_FIND_PATH = text("""
+    WITH RECURSIVE bfs AS (
+        SELECT
+            ci.id AS ci_id,
+            ARRAY[ci.id::text] AS path
+        FROM configuration_items ci
+        WHERE ci.id = :source_id
+          AND ci.tenant_id = :tenant_id
+          AND ci.deleted_at IS NULL
+
+        UNION ALL
+
+        SELECT
+            next_ci.id,
+            b.path || next_ci.id::text
+        FROM bfs b
+        JOIN ci_relationships cr ON (
+            cr.source_ci_id = b.ci_id OR cr.target_ci_id = b.ci_id
+        )
+            AND cr.tenant_id = :tenant_id
+            AND cr.deleted_at IS NULL
+        JOIN configuration_items next_ci ON next_ci.id = (
+            CASE WHEN cr.source_ci_id = b.ci_id
+            THEN cr.target_ci_id ELSE cr.source_ci_id END
+        )
+            AND next_ci.tenant_id = :tenant_id
+            AND next_ci.deleted_at IS NULL
+        WHERE NOT (next_ci.id::text = ANY(b.path))
+          AND array_length(b.path, 1) < :max_depth
+    )
+    SELECT path FROM bfs
+    WHERE ci_id = :target_id
+    ORDER BY array_length(path, 1)
+    LIMIT 1
+""")
+
+_DETECT_CYCLES = text("""
+    WITH RECURSIVE cycle_check AS (
+        SELECT
+            cr.target_ci_id AS ci_id,
+            ARRAY[cr.source_ci_id::text, cr.target_ci_id::text] AS path,
+            false AS has_cycle
+        FROM ci_relationships cr
+        WHERE cr.source_ci_id = :ci_id
+          AND cr.tenant_id = :tenant_id
+          AND cr.deleted_at IS NULL
+
+        UNION ALL
+
+        SELECT
+            cr.target_ci_id,
+            cc.path || cr.target_ci_id::text,
+            cr.target_ci_id::text = ANY(cc.path)
+        FROM cycle_check cc
+        JOIN ci_relationships cr ON cr.source_ci_id = cc.ci_id
+            AND cr.tenant_id = :tenant_id
+            AND cr.deleted_at IS NULL
+        WHERE NOT cc.has_cycle
+          AND array_length(cc.path, 1) < 20
+    )
+    SELECT path FROM cycle_check WHERE has_cycle = true
+""")
+
 
 class GraphServiceError(Exception):
     def __init__(self, message: str, code: str = "GRAPH_ERROR"):
@@ -33,10 +170,53 @@ class GraphNode:
         self.path = path
 
 
+class BatchImpactResult:
+    """Blast radius of a set of CIs: per-CI reachable sets and their union, with depths."""
+
+    def __init__(self) -> None:
+        self.downstream: dict[str, dict[str, int]] = {}
+        self.upstream: dict[str, dict[str, int]] = {}
+        self.nodes: dict[str, tuple[str, str]] = {}
+
+    @staticmethod
+    def _union(per_ci: dict[str, dict[str, int]]) -> dict[str, int]:
+        union: dict[str, int] = {}
+        for reached in per_ci.values():
+            for ci_id, depth in reached.items():
+                if depth < union.get(ci_id, depth + 1):
+                    union[ci_id] = depth
+        return union
+
+    @property
+    def downstream_union(self) -> dict[str, int]:
+        return self._union(self.downstream)
+
+    @property
+    def upstream_union(self) -> dict[str, int]:
+        return self._union(self.upstream)
+
+
 class GraphService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, use_engine: bool = True):
         self.db = db
+        self.use_engine = use_engine
+
+    async def _graph(self, tenant_id: str):
+        """The tenant's in-memory graph, or None to use the SQL path."""
+        if not self.use_engine:
+            return None
+        from app.services.cmdb.graph_engine import get_graph_engine
+
+        engine = get_graph_engine()
+        if engine is None:
+            return None
+        try:
+            return await engine.get(self.db, tenant_id)
+        except Exception:
+            logger.warning("CI graph engine unavailable; falling back to SQL", exc_info=True)
+            return None
 
+    @track_sql
     async def traverse(
         self,
         ci_id: str,
@@ -54,71 +234,21 @@ class GraphService:
             direction: 'outgoing', 'incoming', or 'both'
             max_depth: Maximum traversal depth
         """
-        type_filter = ""
+        graph = await self._graph(tenant_id)
+        if graph is not None:
+            return graph.traverse(ci_id, relationship_types, direction, max_depth)
+
         params: dict = {
             "ci_id": ci_id,
             "tenant_id": tenant_id,
             "max_depth": max_depth,
         }
-
         if relationship_types:
-            type_filter = "AND rt.name = ANY(:rel_types)"
             params["rel_types"] = relationship_types
 
-        if direction == "outgoing":
-            join_clause = "cr.source_ci_id = g.ci_id"
-            next_ci = "cr.target_ci_id"
-        elif direction == "incoming":
-            join_clause = "cr.target_ci_id = g.ci_id"
-            next_ci = "cr.source_ci_id"
-        else:
-            join_clause = "(cr.source_ci_id = g.ci_id OR cr.target_ci_id = g.ci_id)"
-            next_ci = (
-                "CASE WHEN cr.source_ci_id = g.ci_id "
-                "THEN cr.target_ci_id ELSE cr.source_ci_id END"
-            )
-
-        query = text(f"""
-            WITH RECURSIVE graph AS (
-                SELECT
-                    ci.id AS ci_id,
-                    ci.name AS ci_name,
-                    cc.name AS class_name,
-                    0 AS depth,
-                    ARRAY[ci.id::text] AS path
-                FROM configuration_items ci
-                JOIN ci_classes cc ON cc.id = ci.ci_class_id
-                WHERE ci.id = :ci_id
-                  AND ci.tenant_id = :tenant_id
-                  AND ci.deleted_at IS NULL
-
-                UNION ALL
-
-                SELECT
-                    next_ci.id AS ci_id,
-                    next_ci.name AS ci_name,
-                    ncc.name AS class_name,
-                    g.depth + 1 AS depth,
-                    g.path || next_ci.id::text
-                FROM graph g
-                JOIN ci_relationships cr ON {join_clause}
-                    AND cr.tenant_id = :tenant_id
-                    AND cr.deleted_at IS NULL
-                JOIN relationship_types rt ON rt.id = cr.relationship_type_id
-                    {type_filter}
-                JOIN configuration_items next_ci ON next_ci.id = {next_ci}
-                    AND next_ci.tenant_id = :tenant_id
-                    AND next_ci.deleted_at IS NULL
-                JOIN ci_classes ncc ON ncc.id = next_ci.ci_class_id
-                WHERE g.depth < :max_depth
-                  AND NOT (next_ci.id::text = ANY(g.path))
-            )
-            SELECT ci_id, ci_name, class_name, depth, path
-            FROM graph
-            WHERE depth > 0
-            ORDER BY depth, ci_name
-        """)
-
+        if direction not in ("outgoing", "incoming"):
+            direction = "both"
+        query = _traverse_query(direction, bool(relationship_types))
         result = await self.db.execute(query, params)
         rows = result.fetchall()
         return [
@@ -132,6 +262,7 @@ class GraphService:
             for row in rows
         ]
 
+    @track_sql
     async def find_path(
         self,
         source_id: str,
@@ -139,44 +270,12 @@ class GraphService:
         tenant_id: str,
         max_depth: int = 10,
     ) -> list[str] | None:
-        """Find the shortest path between two CIs using BFS via recursive CTE."""
-        query = text("""
-            WITH RECURSIVE bfs AS (
-                SELECT
-                    ci.id AS ci_id,
-                    ARRAY[ci.id::text] AS path
-                FROM configuration_items ci
-                WHERE ci.id = :source_id
-                  AND ci.tenant_id = :tenant_id
-                  AND ci.deleted_at IS NULL
-
-                UNION ALL
-
-                SELECT
-                    next_ci.id,
-                    b.path || next_ci.id::text
-                FROM bfs b
-                JOIN ci_relationships cr ON (
-                    cr.source_ci_id = b.ci_id OR cr.target_ci_id = b.ci_id
-                )
-                    AND cr.tenant_id = :tenant_id
-                    AND cr.deleted_at IS NULL
-                JOIN configuration_items next_ci ON next_ci.id = (
-                    CASE WHEN cr.source_ci_id = b.ci_id
-                    THEN cr.target_ci_id ELSE cr.source_ci_id END
-                )
-                    AND next_ci.tenant_id = :tenant_id
-                    AND next_ci.deleted_at IS NULL
-                WHERE NOT (next_ci.id::text = ANY(b.path))
-                  AND array_length(b.path, 1) < :max_depth
-            )
-            SELECT path FROM bfs
-            WHERE ci_id = :target_id
-            ORDER BY array_length(path, 1)
-            LIMIT 1
-        """)
+        """Find the shortest path between two CIs, ignoring edge direction."""
+        graph = await self._graph(tenant_id)
+        if graph is not None:
+            return graph.shortest_path(source_id, target_id, max_depth)
 
-        result = await self.db.execute(query, {
+        result = await self.db.execute(_FIND_PATH, {
             "source_id": source_id,
             "target_id": target_id,
             "tenant_id": tenant_id,
@@ -185,6 +284,7 @@ class GraphService:
         row = result.fetchone()
         return row[0] if row else None
 
+    @track_sql
     async def impact_analysis(
         self,
         ci_id: str,
@@ -197,57 +297,135 @@ class GraphService:
         Downstream: follows depends_on, contains, uses edges outward from target.
         Upstream: follows inverse edges to find what depends on this CI.
         """
-        impact_types = ["depends_on", "contains", "uses"]
-
         if direction == "downstream":
             return await self.traverse(
                 ci_id, tenant_id,
-                relationship_types=impact_types,
+                relationship_types=IMPACT_TYPES,
                 direction="incoming",
                 max_depth=max_depth,
             )
         else:
             return await self.traverse(
                 ci_id, tenant_id,
-                relationship_types=impact_types,
+                relationship_types=IMPACT_TYPES,
                 direction="outgoing",
                 max_depth=max_depth,
             )
 
+    @track_sql
+    async def batch_impact(
+        self,
+        ci_ids: list[str],
+        tenant_id: str,
+        direction: str = "downstream",
+        max_depth: int = 5,
+    ) -> BatchImpactResult:
+        """Impact analysis for many CIs in one pass.
+
+        ``direction`` is 'downstream', 'upstream' or 'both'. Traversals share cached closures
+        of common sub-graphs. Without the in-memory engine, the reachable sub-graph is loaded
+        with one query per depth level for all CIs together and analysed the same way.
+        """
+        if direction not in ("downstream", "upstream", "both"):
+            raise GraphServiceError(f"Invalid impact direction '{direction}'", "INVALID_DIRECTION")
+        directions = ["downstream", "upstream"] if direction == "both" else [direction]
+        ci_ids = list(dict.fromkeys(str(c) for c in ci_ids))
+
+        graph = await self._graph(tenant_id)
+        if graph is None:
+            graph = await self._impact_subgraph(ci_ids, tenant_id, directions, max_depth)
+
+        result = BatchImpactResult()
+        for d in directions:
+            reached = graph.reach(ci_ids, IMPACT_TYPES, _IMPACT_EDGE_DIRECTION[d], max_depth)
+            setattr(result, d, reached)
+            for per_ci in reached.values():
+                for ci_id in per_ci:
+                    if ci_id not in result.nodes:
+                        result.nodes[ci_id] = graph.node_info(ci_id)
+        for ci_id in ci_ids:
+            info = graph.node_info(ci_id)
+            if info is not None:
+                result.nodes.setdefault(ci_id, info)
+        return result
+
+    async def _impact_subgraph(
+        self,
+        ci_ids: list[str],
+        tenant_id: str,
+        directions: list[str],
+        max_depth: int,
+    ):
+        """Load the impact-type edges within ``max_depth`` of ``ci_ids`` level by level."""
+        from app.services.cmdb.graph_engine import CSRGraph
+
+        src_ci = aliased(ConfigurationItem)
+        tgt_ci = aliased(ConfigurationItem)
+        base = (
+            select(
+                CIRelationship.id,
+                CIRelationship.source_ci_id,
+                CIRelationship.target_ci_id,
+                RelationshipType.name,
+            )
+            .join(RelationshipType, RelationshipType.id == CIRelationship.relationship_type_id)
+            .join(src_ci, src_ci.id == CIRelationship.source_ci_id)
+            .join(tgt_ci, tgt_ci.id == CIRelationship.target_ci_id)
+            .where(
+                CIRelationship.tenant_id == tenant_id,
+                CIRelationship.deleted_at.is_(None),
+                RelationshipType.name.in_(IMPACT_TYPES),
+                src_ci.deleted_at.is_(None),
+                tgt_ci.deleted_at.is_(None),
+            )
+        )
+
+        seen: set[str] = set(ci_ids)
+        frontier = list(ci_ids)
+        edges: dict[str, tuple[str, str, str, str]] = {}
+        for _ in range(max_depth):
+            if not frontier:
+                break
+            sides = []
+            if "downstream" in directions:
+                sides.append(CIRelationship.target_ci_id.in_(frontier))
+            if "upstream" in directions:
+                sides.append(CIRelationship.source_ci_id.in_(frontier))
+            rows = (await self.db.execute(base.where(or_(*sides)))).all()
+            nxt: list[str] = []
+            for rel_id, source, target, type_name in rows:
+                rel_id, source, target = str(rel_id), str(source), str(target)
+                edges[rel_id] = (rel_id, source, target, type_name)
+                for ci_id in (source, target):
+                    if ci_id not in seen:
+                        seen.add(ci_id)
+                        nxt.append(ci_id)
+            frontier = nxt
+
+        node_rows = await self.db.execute(
+            select(ConfigurationItem.id, ConfigurationItem.name, CIClass.name)
+            .join(CIClass, CIClass.id == ConfigurationItem.ci_class_id)
+            .where(
+                ConfigurationItem.id.in_(list(seen)),
+                ConfigurationItem.tenant_id == tenant_id,
+                ConfigurationItem.deleted_at.is_(None),
+            )
+        )
+        nodes = [(str(r[0]), r[1], r[2]) for r in node_rows.all()]
+        return CSRGraph(nodes, edges.values())
+
+    @track_sql
     async def detect_cycles(
         self,
         ci_id: str,
         tenant_id: str,
     ) -> list[list[str]] | None:
-        """Detect cycles involving a specific CI in the relationship graph."""
-        query = text("""
-            WITH RECURSIVE cycle_check AS (
-                SELECT
-                    cr.target_ci_id AS ci_id,
-                    ARRAY[cr.source_ci_id::text, cr.target_ci_id::text] AS path,
-                    false AS has_cycle
-                FROM ci_relationships cr
-                WHERE cr.source_ci_id = :ci_id
-                  AND cr.tenant_id = :tenant_id
-                  AND cr.deleted_at IS NULL
-
-                UNION ALL
-
-                SELECT
-                    cr.target_ci_id,
-                    cc.path || cr.target_ci_id::text,
-                    cr.target_ci_id::text = ANY(cc.path)
-                FROM cycle_check cc
-                JOIN ci_relationships cr ON cr.source_ci_id = cc.ci_id
-                    AND cr.tenant_id = :tenant_id
-                    AND cr.deleted_at IS NULL
-                WHERE NOT cc.has_cycle
-                  AND array_length(cc.path, 1) < 20
-            )
-            SELECT path FROM cycle_check WHERE has_cycle = true
-        """)
+        """Detect cycles reachable from a specific CI in the relationship graph."""
+        graph = await self._graph(tenant_id)
+        if graph is not None:
+            return graph.cycles_from(ci_id)
 
-        result = await self.db.execute(query, {
+        result = await self.db.execute(_DETECT_CYCLES, {
             "ci_id": ci_id,
             "tenant_id": tenant_id,
         })
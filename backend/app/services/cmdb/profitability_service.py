@@ -1,179 +1,272 @@
 """
-Overview: Profitability service — aggregation queries on approved estimations for
-    per-client, per-region, and per-service profitability analysis.
+Overview: Profitability service — aggregation queries on precomputed profitability rollups for
+    per-client, per-region, per-service, and time-bucketed profitability analysis.
 Architecture: Service delivery profitability reporting (Section 8)
-Dependencies: sqlalchemy, app.models.cmdb.estimation
-Concepts: Aggregates approved estimations to calculate revenue, cost, and margin
-    breakdowns by client, region, and service offering.
+Dependencies: sqlalchemy, app.models.cmdb.estimation, app.models.cmdb.profitability_rollup
+Concepts: Approved estimations are folded into monthly rollup buckets when they are approved;
+    a nightly ProfitabilityRebuildWorkflow recomputes every tenant's buckets to repair drift.
+    Dashboard reads aggregate the rollup table and join dimension names in the same query,
+    so each breakdown is a single round trip regardless of the number of result rows.
 """
 from __future__ import annotations
 
 import logging
+from datetime import UTC, date, datetime
 from decimal import Decimal
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.cmdb.estimation import ServiceEstimation
+from app.models.cmdb.profitability_rollup import ProfitabilityRollup
 from app.models.tenant import Tenant
 
 logger = logging.getLogger(__name__)
 
+R = ProfitabilityRollup
+E = ServiceEstimation
+
+
+def _margin_percent(revenue: Decimal, margin: Decimal) -> Decimal:
+    return (margin / revenue * Decimal("100")) if revenue > 0 else Decimal("0")
+
+
+def _period_start(value: datetime | date | None) -> date:
+    """First day of the month a rollup bucket covers."""
+    d = value or datetime.now(UTC)
+    if isinstance(d, datetime):
+        d = d.date()
+    return d.replace(day=1)
+
 
 class ProfitabilityService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    # ── Reads ────────────────────────────────────────────────────────
+
     async def get_overview(self, tenant_id: str) -> dict:
         result = await self.db.execute(
             select(
-                func.coalesce(func.sum(ServiceEstimation.total_sell_price), 0),
-                func.coalesce(func.sum(ServiceEstimation.total_estimated_cost), 0),
-                func.coalesce(func.sum(ServiceEstimation.margin_amount), 0),
-                func.count(ServiceEstimation.id),
-            ).where(
-                ServiceEstimation.tenant_id == tenant_id,
-                ServiceEstimation.status == "approved",
-                ServiceEstimation.deleted_at.is_(None),
-            )
+                func.coalesce(func.sum(R.total_revenue), 0),
+                func.coalesce(func.sum(R.total_cost), 0),
+                func.coalesce(func.sum(R.total_margin), 0),
+                func.coalesce(func.sum(R.estimation_count), 0),
+            ).where(R.tenant_id == tenant_id)
         )
         row = result.one()
         revenue = row[0] or Decimal("0")
         cost = row[1] or Decimal("0")
         margin = row[2] or Decimal("0")
-        count = row[3] or 0
-        margin_pct = (margin / revenue * Decimal("100")) if revenue > 0 else Decimal("0")
+        count = int(row[3] or 0)
 
         return {
             "total_revenue": revenue,
             "total_cost": cost,
             "total_margin": margin,
-            "margin_percent": margin_pct,
+            "margin_percent": _margin_percent(revenue, margin),
             "estimation_count": count,
         }
 
     async def get_by_client(self, tenant_id: str) -> list[dict]:
-        result = await self.db.execute(
+        return await self._get_by_dimension(
+            tenant_id, R.client_tenant_id, Tenant, Tenant.name
+        )
+
+    async def get_by_region(self, tenant_id: str) -> list[dict]:
+        from app.models.cmdb.delivery_region import DeliveryRegion
+
+        return await self._get_by_dimension(
+            tenant_id,
+            R.delivery_region_id,
+            DeliveryRegion,
+            DeliveryRegion.display_name,
+            extra_filters=[R.delivery_region_id.isnot(None)],
+        )
+
+    async def get_by_service(self, tenant_id: str) -> list[dict]:
+        from app.models.cmdb.service_offering import ServiceOffering
+
+        return await self._get_by_dimension(
+            tenant_id, R.service_offering_id, ServiceOffering, ServiceOffering.name
+        )
+
+    async def get_trend(
+        self,
+        tenant_id: str,
+        months: int = 12,
+        client_tenant_id: str | None = None,
+        delivery_region_id: str | None = None,
+        service_offering_id: str | None = None,
+    ) -> list[dict]:
+        """Monthly revenue/cost/margin history, oldest bucket first."""
+        today = date.today()
+        start_index = today.year * 12 + today.month - 1 - (months - 1)
+        since = date(start_index // 12, start_index % 12 + 1, 1)
+
+        stmt = (
             select(
-                ServiceEstimation.client_tenant_id,
-                func.coalesce(func.sum(ServiceEstimation.total_sell_price), 0),
-                func.coalesce(func.sum(ServiceEstimation.total_estimated_cost), 0),
-                func.coalesce(func.sum(ServiceEstimation.margin_amount), 0),
-                func.count(ServiceEstimation.id),
-            )
-            .where(
-                ServiceEstimation.tenant_id == tenant_id,
-                ServiceEstimation.status == "approved",
-                ServiceEstimation.deleted_at.is_(None),
+                R.period_start,
+                func.sum(R.total_revenue),
+                func.sum(R.total_cost),
+                func.sum(R.total_margin),
+                func.sum(R.estimation_count),
             )
-            .group_by(ServiceEstimation.client_tenant_id)
+            .where(R.tenant_id == tenant_id, R.period_start >= since)
+            .group_by(R.period_start)
+            .order_by(R.period_start)
         )
-        rows = result.all()
+        if client_tenant_id:
+            stmt = stmt.where(R.client_tenant_id == client_tenant_id)
+        if delivery_region_id:
+            stmt = stmt.where(R.delivery_region_id == delivery_region_id)
+        if service_offering_id:
+            stmt = stmt.where(R.service_offering_id == service_offering_id)
+
+        result = await self.db.execute(stmt)
         items = []
-        for row in rows:
+        for row in result.all():
             revenue = row[1] or Decimal("0")
-            cost = row[2] or Decimal("0")
             margin = row[3] or Decimal("0")
-            margin_pct = (margin / revenue * Decimal("100")) if revenue > 0 else Decimal("0")
-
-            # Get tenant name
-            tenant_result = await self.db.execute(
-                select(Tenant.name).where(Tenant.id == row[0])
-            )
-            tenant_name = tenant_result.scalar_one_or_none() or str(row[0])
-
             items.append({
-                "entity_id": str(row[0]),
-                "entity_name": tenant_name,
+                "period_start": row[0],
                 "total_revenue": revenue,
-                "total_cost": cost,
+                "total_cost": row[2] or Decimal("0"),
                 "margin_amount": margin,
-                "margin_percent": margin_pct,
-                "estimation_count": row[4],
+                "margin_percent": _margin_percent(revenue, margin),
+                "estimation_count": int(row[4] or 0),
             })
         return items
 
-    async def get_by_region(self, tenant_id: str) -> list[dict]:
-        from app.models.cmdb.delivery_region import DeliveryRegion
-
+    async def _get_by_dimension(
+        self,
+        tenant_id: str,
+        key_col,
+        name_model,
+        name_col,
+        extra_filters: list | None = None,
+    ) -> list[dict]:
+        """Aggregate rollups by one dimension with its display name joined in."""
         result = await self.db.execute(
             select(
-                ServiceEstimation.delivery_region_id,
-                func.coalesce(func.sum(ServiceEstimation.total_sell_price), 0),
-                func.coalesce(func.sum(ServiceEstimation.total_estimated_cost), 0),
-                func.coalesce(func.sum(ServiceEstimation.margin_amount), 0),
-                func.count(ServiceEstimation.id),
+                key_col,
+                name_col,
+                func.coalesce(func.sum(R.total_revenue), 0),
+                func.coalesce(func.sum(R.total_cost), 0),
+                func.coalesce(func.sum(R.total_margin), 0),
+                func.coalesce(func.sum(R.estimation_count), 0),
             )
-            .where(
-                ServiceEstimation.tenant_id == tenant_id,
-                ServiceEstimation.status == "approved",
-                ServiceEstimation.delivery_region_id.isnot(None),
-                ServiceEstimation.deleted_at.is_(None),
-            )
-            .group_by(ServiceEstimation.delivery_region_id)
+            .outerjoin(name_model, name_model.id == key_col)
+            .where(R.tenant_id == tenant_id, *(extra_filters or []))
+            .group_by(key_col, name_col)
         )
-        rows = result.all()
         items = []
-        for row in rows:
-            revenue = row[1] or Decimal("0")
-            cost = row[2] or Decimal("0")
-            margin = row[3] or Decimal("0")
-            margin_pct = (margin / revenue * Decimal("100")) if revenue > 0 else Decimal("0")
-
-            region_result = await self.db.execute(
-                select(DeliveryRegion.display_name).where(DeliveryRegion.id == row[0])
-            )
-            region_name = region_result.scalar_one_or_none() or str(row[0])
-
+        for row in result.all():
+            revenue = row[2] or Decimal("0")
+            cost = row[3] or Decimal("0")
+            margin = row[4] or Decimal("0")
             items.append({
                 "entity_id": str(row[0]),
-                "entity_name": region_name,
+                "entity_name": row[1] or str(row[0]),
                 "total_revenue": revenue,
                 "total_cost": cost,
                 "margin_amount": margin,
-                "margin_percent": margin_pct,
-                "estimation_count": row[4],
+                "margin_percent": _margin_percent(revenue, margin),
+                "estimation_count": int(row[5] or 0),
             })
         return items
 
-    async def get_by_service(self, tenant_id: str) -> list[dict]:
-        from app.models.cmdb.service_offering import ServiceOffering
+    # ── Rollup maintenance ───────────────────────────────────────────
 
-        result = await self.db.execute(
+    async def apply_estimation(
+        self, estimation: ServiceEstimation, sign: int = 1
+    ) -> None:
+        """Fold an approved estimation into its bucket (sign=-1 retracts it)."""
+        s = Decimal(sign)
+        revenue = (estimation.total_sell_price or Decimal("0")) * s
+        cost = (estimation.total_estimated_cost or Decimal("0")) * s
+        margin = (estimation.margin_amount or Decimal("0")) * s
+
+        stmt = pg_insert(R).values(
+            tenant_id=estimation.tenant_id,
+            client_tenant_id=estimation.client_tenant_id,
+            delivery_region_id=estimation.delivery_region_id,
+            service_offering_id=estimation.service_offering_id,
+            period_start=_period_start(estimation.approved_at),
+            total_revenue=revenue,
+            total_cost=cost,
+            total_margin=margin,
+            estimation_count=sign,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_profitability_rollup_bucket",
+            set_={
+                "total_revenue": R.total_revenue + stmt.excluded.total_revenue,
+                "total_cost": R.total_cost + stmt.excluded.total_cost,
+                "total_margin": R.total_margin + stmt.excluded.total_margin,
+                "estimation_count": R.estimation_count + stmt.excluded.estimation_count,
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def find_rollup_tenants(self) -> list[str]:
+        """Tenants with approved estimations or existing rollups (nightly rebuild scope)."""
+        approved = select(E.tenant_id).where(E.status == "approved", E.deleted_at.is_(None))
+        result = await self.db.execute(approved.union(select(R.tenant_id)))
+        return [str(tenant_id) for tenant_id in result.scalars().all()]
+
+    async def rebuild(self, tenant_id: str) -> int:
+        """Recompute all rollup buckets for a tenant from approved estimations."""
+        await self.db.execute(delete(R).where(R.tenant_id == tenant_id))
+
+        period = func.date_trunc(
+            "month", func.coalesce(E.approved_at, E.updated_at)
+        ).cast(R.period_start.type)
+        source = (
             select(
-                ServiceEstimation.service_offering_id,
-                func.coalesce(func.sum(ServiceEstimation.total_sell_price), 0),
-                func.coalesce(func.sum(ServiceEstimation.total_estimated_cost), 0),
-                func.coalesce(func.sum(ServiceEstimation.margin_amount), 0),
-                func.count(ServiceEstimation.id),
+                func.gen_random_uuid(),
+                E.tenant_id,
+                E.client_tenant_id,
+                E.delivery_region_id,
+                E.service_offering_id,
+                period,
+                func.coalesce(func.sum(E.total_sell_price), 0),
+                func.coalesce(func.sum(E.total_estimated_cost), 0),
+                func.coalesce(func.sum(E.margin_amount), 0),
+                func.count(E.id),
             )
             .where(
-                ServiceEstimation.tenant_id == tenant_id,
-                ServiceEstimation.status == "approved",
-                ServiceEstimation.deleted_at.is_(None),
+                E.tenant_id == tenant_id,
+                E.status == "approved",
+                E.deleted_at.is_(None),
+            )
+            .group_by(
+                E.tenant_id,
+                E.client_tenant_id,
+                E.delivery_region_id,
+                E.service_offering_id,
+                period,
             )
-            .group_by(ServiceEstimation.service_offering_id)
         )
-        rows = result.all()
-        items = []
-        for row in rows:
-            revenue = row[1] or Decimal("0")
-            cost = row[2] or Decimal("0")
-            margin = row[3] or Decimal("0")
-            margin_pct = (margin / revenue * Decimal("100")) if revenue > 0 else Decimal("0")
-
-            svc_result = await self.db.execute(
-                select(ServiceOffering.name).where(ServiceOffering.id == row[0])
+        result = await self.db.execute(
+            insert(R).from_select(
+                [
+                    "id",
+                    "tenant_id",
+                    "client_tenant_id",
+                    "delivery_region_id",
+                    "service_offering_id",
+                    "period_start",
+                    "total_revenue",
+                    "total_cost",
+                    "total_margin",
+                    "estimation_count",
+                ],
+                source,
             )
-            svc_name = svc_result.scalar_one_or_none() or str(row[0])
-
-            items.append({
-                "entity_id": str(row[0]),
-                "entity_name": svc_name,
-                "total_revenue": revenue,
-                "total_cost": cost,
-                "margin_amount": margin,
-                "margin_percent": margin_pct,
-                "estimation_count": row[4],
-            })
-        return items
+        )
+        await self.db.flush()
+        logger.info("Rebuilt profitability rollups for tenant %s", tenant_id)
+        return result.rowcount or 0
@@ -0,0 +1,529 @@
+"""
+Overview: Streaming Pulumi ingestion — reads stack exports or engine event logs incrementally,
+    maps resources to semantic types in batches and syncs them into the CMDB.
+Architecture: Pulumi → semantic layer → CMDB sync pipeline (Sections 5, 8)
+Dependencies: sqlalchemy, app.services.semantic.mapping_engine, app.services.cmdb.ci_bulk_service
+Concepts: Stack exports (``pulumi stack export``) are scanned element by element out of the
+    deployment's ``resources`` array, and event logs (``--event-log``, one JSON object per line)
+    are read line by line, so only one batch of resources is in memory at a time. Pulumi types
+    resolve once per type through a memoized MappingEngine lookup and a tenant class index.
+    Each batch is upserted on pulumi_urn via CIBulkService. Event-log deletes apply inline; a
+    full stack export sweeps CIs of the stack it did not see, tracking seen URNs as 64-bit
+    hashes and deleting stale CIs page by page. Event-log lines that are not JSON objects are
+    counted and reported as failed records. A checkpoint (records consumed) is reported after
+    each batch so interrupted runs can resume.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass, field
+from typing import TextIO
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.cmdb.ci import ConfigurationItem
+from app.models.cmdb.ci_class import CIClass
+from app.services.cmdb.ci_bulk_service import CIBulkService
+from app.services.semantic.data_classes import ProviderResource
+from app.services.semantic.mapping_engine import MappingEngine
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK = 1 << 16
+DEFAULT_BATCH_SIZE = 500
+
+_SKIP_TYPE_PREFIXES = ("pulumi:pulumi:", "pulumi:providers:")
+_DELETE_OPS = {"delete", "discard", "delete-replaced", "read-discard"}
+_PROVIDER_SUFFIXES = ("-native", "-classic")
+
+
+class PulumiIngestError(Exception):
+    def __init__(self, message: str, code: str = "PULUMI_INGEST_ERROR"):
+        self.message = message
+        self.code = code
+        super().__init__(message)
+
+
+@dataclass
+class PulumiRecord:
+    """One resource state (or deletion) read from a Pulumi stream."""
+
+    urn: str
+    type: str
+    resource_id: str | None = None
+    outputs: dict = field(default_factory=dict)
+    deleted: bool = False
+    error: str | None = None
+
+
+@dataclass
+class PulumiIngestReport:
+    mode: str = "state"
+    records: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    failed: int = 0
+    skipped: int = 0
+    unmapped: dict[str, int] = field(default_factory=dict)
+    errors: list[dict] = field(default_factory=list)
+    checkpoint: int = 0
+
+
+# ── Stream readers ────────────────────────────────────────────────────
+
+
+def _state_record(resource: dict) -> PulumiRecord | None:
+    urn = resource.get("urn")
+    rtype = resource.get("type") or ""
+    if not urn or resource.get("delete"):
+        return None
+    return PulumiRecord(
+        urn=urn,
+        type=rtype,
+        resource_id=resource.get("id") or None,
+        outputs=resource.get("outputs") or resource.get("inputs") or {},
+    )
+
+
+def _event_record(event: dict) -> PulumiRecord | None:
+    meta = (event.get("resOutputsEvent") or {}).get("metadata")
+    if not meta or not meta.get("urn"):
+        return None
+    if meta.get("op") in _DELETE_OPS:
+        return PulumiRecord(urn=meta["urn"], type=meta.get("type") or "", deleted=True)
+    new = meta.get("new") or {}
+    return PulumiRecord(
+        urn=meta["urn"],
+        type=meta.get("type") or new.get("type") or "",
+        resource_id=new.get("id") or None,
+        outputs=new.get("outputs") or new.get("inputs") or {},
+    )
+
+
+def _iter_array(
+    stream: TextIO, key: str, buf: str = "", chunk_size: int = READ_CHUNK
+) -> Iterator[dict]:
+    """Yield the elements of the first ``"key": [...]`` array without reading the whole file."""
+    decoder = json.JSONDecoder()
+    marker = f'"{key}"'
+    pos = 0
+
+    def fill() -> bool:
+        nonlocal buf, pos
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_ws() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ""
+
+    # Locate the key followed by a colon and an opening bracket
+    while True:
+        idx = buf.find(marker, pos)
+        if idx < 0:
+            pos = max(pos, len(buf) - len(marker))
+            if not fill():
+                return
+            continue
+        pos = idx + len(marker)
+        if skip_ws() == ":":
+            pos += 1
+            if skip_ws() == "[":
+                pos += 1
+                break
+
+    while True:
+        ch = skip_ws()
+        if ch == ",":
+            pos += 1
+            continue
+        if ch in ("]", ""):
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if not fill():
+                raise PulumiIngestError("Truncated Pulumi state", "TRUNCATED_STATE") from None
+            continue
+        pos = end
+        yield item
+
+
+def detect_mode(stream: TextIO) -> tuple[str, str]:
+    """Peek the stream and return (mode, consumed_prefix); mode is 'events' or 'state'."""
+    head = stream.readline(READ_CHUNK)
+    if head.endswith("\n"):
+        try:
+            first = json.loads(head)
+        except json.JSONDecodeError:
+            first = None
+        if isinstance(first, dict) and (
+            "sequence" in first or any(k.endswith("Event") for k in first)
+        ):
+            return "events", head
+    return "state", head
+
+
+def iter_pulumi_records(stream: TextIO) -> tuple[str, Iterator[PulumiRecord]]:
+    """Return the detected mode and an iterator over the stream's resource records."""
+    mode, head = detect_mode(stream)
+
+    def events() -> Iterator[PulumiRecord]:
+        for number, line in enumerate(_chain_lines(head, stream), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield PulumiRecord(urn="", type="", error=f"Line {number}: invalid JSON ({exc})")
+                continue
+            if not isinstance(event, dict):
+                yield PulumiRecord(urn="", type="", error=f"Line {number}: not a JSON object")
+                continue
+            record = _event_record(event)
+            if record is not None:
+                yield record
+
+    def state() -> Iterator[PulumiRecord]:
+        for resource in _iter_array(stream, "resources", buf=head):
+            record = _state_record(resource)
+            if record is not None:
+                yield record
+
+    return mode, events() if mode == "events" else state()
+
+
+def _chain_lines(head: str, stream: TextIO) -> Iterator[str]:
+    yield head
+    yield from stream
+
+
+# ── Type resolution ───────────────────────────────────────────────────
+
+
+def _kebab(name: str) -> str:
+    s1 = re.sub(r"(.)([A-Z][a-z]+)", r"\1-\2", name)
+    return re.sub(r"([a-z0-9])([A-Z])", r"\1-\2", s1).lower()
+
+
+def split_pulumi_type(pulumi_type: str) -> tuple[str, str]:
+    """Map a Pulumi type token to (provider_name, api_type) as used by the mapping registry.
+
+    ``aws:ec2/instance:Instance`` → ``("aws", "ec2:instance")``;
+    ``azure-native:network:VirtualNetwork`` → ``("azure", "network:virtual-network")``.
+    """
+    parts = pulumi_type.split(":")
+    if len(parts) != 3:
+        return pulumi_type.split(":", 1)[0], pulumi_type
+    provider, module, resource = parts
+    for suffix in _PROVIDER_SUFFIXES:
+        provider = provider.removesuffix(suffix)
+    return provider, f"{module.split('/', 1)[0]}:{_kebab(resource)}"
+
+
+def _urn_prefix(urn: str) -> str:
+    """``urn:pulumi:<stack>::<project>::`` — the scope shared by every resource of a stack."""
+    parts = urn.split("::")
+    return "::".join(parts[:2]) + "::" if len(parts) >= 3 else urn
+
+
+def _urn_name(urn: str) -> str:
+    return urn.rsplit("::", 1)[-1]
+
+
+class PulumiIngestService:
+    """Sync a Pulumi stack's resources into a tenant's CMDB."""
+
+    def __init__(self, db: AsyncSession, engine: MappingEngine | None = None):
+        self.db = db
+        self.engine = engine or MappingEngine()
+        self._resolved: dict[str, tuple] = {}
+        self._class_ids: dict[str, str] | None = None
+
+    async def ingest(
+        self,
+        tenant_id: str,
+        stream: TextIO,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        checkpoint: int = 0,
+        on_checkpoint: Callable[[int], Awaitable[None]] | None = None,
+        backend_id: str | None = None,
+        user_id: str | None = None,
+        sweep: bool = True,
+    ) -> PulumiIngestReport:
+        """Stream records into the CMDB in batches.
+
+        ``checkpoint`` skips that many records (their URNs still count as seen for the
+        sweep). ``on_checkpoint`` is awaited after each applied batch — callers commit there.
+        """
+        mode, records = iter_pulumi_records(stream)
+        report = PulumiIngestReport(mode=mode, checkpoint=checkpoint)
+        bulk = CIBulkService(self.db)
+        await self._load_class_index(tenant_id)
+
+        seen: set[int] = set()
+        prefix: str | None = None
+        batch: list[PulumiRecord] = []
+
+        for position, record in enumerate(records, start=1):
+            if record.urn:
+                prefix = prefix or _urn_prefix(record.urn)
+                if not record.deleted:
+                    seen.add(hash(record.urn))
+            if position <= checkpoint:
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                await self._apply(tenant_id, batch, bulk, report, backend_id, user_id)
+                report.checkpoint = position
+                batch = []
+                if on_checkpoint:
+                    await on_checkpoint(position)
+
+        if batch:
+            await self._apply(tenant_id, batch, bulk, report, backend_id, user_id)
+            report.checkpoint += len(batch)
+            if on_checkpoint:
+                await on_checkpoint(report.checkpoint)
+
+        if mode == "state" and sweep and prefix:
+            await self._sweep(tenant_id, prefix, seen, bulk, report, batch_size, user_id)
+
+        if report.unmapped:
+            logger.info(
+                "Pulumi ingest skipped %d unmapped resources across %d types",
+                sum(report.unmapped.values()), len(report.unmapped),
+            )
+        return report
+
+    async def _apply(
+        self,
+        tenant_id: str,
+        batch: list[PulumiRecord],
+        bulk: CIBulkService,
+        report: PulumiIngestReport,
+        backend_id: str | None,
+        user_id: str | None,
+    ) -> None:
+        report.records += len(batch)
+        upserts: list[dict] = []
+        deletes: list[str] = []
+        unmapped: Counter[str] = Counter()
+
+        for record in batch:
+            if record.error is not None:
+                report.failed += 1
+                report.errors.append({"urn": None, "error": record.error})
+                continue
+            if record.deleted:
+                deletes.append(record.urn)
+                continue
+            if record.type.startswith(_SKIP_TYPE_PREFIXES):
+                report.skipped += 1
+                continue
+            row = self._to_row(record, backend_id)
+            if row is None:
+                unmapped[record.type] += 1
+                continue
+            upserts.append(row)
+
+        for rtype, count in unmapped.items():
+            report.unmapped[rtype] = report.unmapped.get(rtype, 0) + count
+        report.skipped += sum(unmapped.values())
+
+        if upserts:
+            result = await bulk.bulk_upsert(
+                tenant_id, upserts, key_field="pulumi_urn", user_id=user_id,
+                reason="Pulumi sync", source="cmdb_service",
+            )
+            report.created += result.created
+            report.updated += result.updated
+            report.unchanged += result.unchanged
+            report.failed += result.failed
+            report.errors.extend(
+                {"urn": r.key, "error": r.error} for r in result.results if r.status == "error"
+            )
+        if deletes:
+            result = await bulk.bulk_delete(
+                tenant_id, deletes, key_field="pulumi_urn", user_id=user_id,
+                reason="Deleted from Pulumi stack",
+            )
+            report.deleted += result.deleted
+
+    def _to_row(self, record: PulumiRecord, backend_id: str | None) -> dict | None:
+        resolved = self._resolve(record.type)
+        if resolved is None:
+            return None
+        type_def, class_id = resolved
+        provider_name, api_type = split_pulumi_type(record.type)
+        semantic = self.engine.map_resolved(
+            ProviderResource(
+                provider_name=provider_name,
+                resource_type=api_type,
+                resource_id=record.resource_id or record.urn,
+                name=_urn_name(record.urn),
+                raw_attributes=record.outputs,
+            ),
+            type_def,
+        )
+        tags = record.outputs.get("tags")
+        return {
+            "pulumi_urn": record.urn,
+            "ci_class_id": class_id,
+            "name": _urn_name(record.urn)[:255],
+            "attributes": semantic.attributes,
+            "tags": tags if isinstance(tags, dict) else {},
+            "cloud_resource_id": record.resource_id,
+            "lifecycle_state": "active",
+            "backend_id": backend_id,
+        }
+
+    def _resolve(self, pulumi_type: str) -> tuple | None:
+        """Memoized Pulumi type → (semantic type, CI class id); None when unmapped."""
+        if pulumi_type in self._resolved:
+            return self._resolved[pulumi_type]
+        provider_name, api_type = split_pulumi_type(pulumi_type)
+        type_def = self.engine.resolve(provider_name, api_type)
+        class_id = self._class_ids.get(type_def.name) if type_def else None
+        resolved = (type_def, class_id) if class_id else None
+        self._resolved[pulumi_type] = resolved
+        return resolved
+
+    async def _load_class_index(self, tenant_id: str) -> None:
+        """Class name → id for system and tenant classes; tenant classes take precedence."""
+        if self._class_ids is not None:
+            return
+        result = await self.db.execute(
+            select(CIClass.id, CIClass.name, CIClass.tenant_id).where(
+                or_(CIClass.tenant_id == tenant_id, CIClass.tenant_id.is_(None)),
+                CIClass.is_active.is_(True),
+                CIClass.deleted_at.is_(None),
+            )
+        )
+        index: dict[str, str] = {}
+        for class_id, name, _owner in sorted(result.all(), key=lambda r: r[2] is not None):
+            index[name] = str(class_id)
+        self._class_ids = index
+
+    async def _sweep(
+        self,
+        tenant_id: str,
+        prefix: str,
+        seen: set[int],
+        bulk: CIBulkService,
+        report: PulumiIngestReport,
+        page_size: int,
+        user_id: str | None,
+    ) -> None:
+        """Delete live CIs of this stack that the export no longer contains, a page at a time."""
+        last: str | None = None
+        while True:
+            stmt = (
+                select(ConfigurationItem.pulumi_urn)
+                .where(
+                    ConfigurationItem.tenant_id == tenant_id,
+                    ConfigurationItem.pulumi_urn.startswith(prefix, autoescape=True),
+                    ConfigurationItem.deleted_at.is_(None),
+                )
+                .order_by(ConfigurationItem.pulumi_urn)
+                .limit(page_size)
+            )
+            if last is not None:
+                stmt = stmt.where(ConfigurationItem.pulumi_urn > last)
+            urns = list((await self.db.execute(stmt)).scalars().all())
+            if not urns:
+                break
+            last = urns[-1]
+            stale = [u for u in urns if hash(u) not in seen]
+            if stale:
+                result = await bulk.bulk_delete(
+                    tenant_id, stale, key_field="pulumi_urn",
+                    user_id=user_id, reason="Removed from Pulumi stack",
+                )
+                report.deleted += result.deleted
+
+
+# ── CLI ───────────────────────────────────────────────────────────────
+
+
+async def main(argv: list[str] | None = None) -> PulumiIngestReport:
+    """``python -m app.services.cmdb.pulumi_ingest --tenant-id <id> [FILE|-]``."""
+    import argparse
+    import sys
+    from pathlib import Path
+
+    from app.db.session import async_session_factory
+
+    parser = argparse.ArgumentParser(description="Sync a Pulumi stack into the CMDB")
+    parser.add_argument("source", nargs="?", default="-", help="stack export / event log, or -")
+    parser.add_argument("--tenant-id", required=True)
+    parser.add_argument("--backend-id")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--checkpoint-file", help="resume position is read from and written here")
+    parser.add_argument("--no-sweep", action="store_true", help="do not delete missing CIs")
+    args = parser.parse_args(argv)
+
+    checkpoint_path = Path(args.checkpoint_file) if args.checkpoint_file else None
+    checkpoint = 0
+    if checkpoint_path and checkpoint_path.exists():
+        checkpoint = int(json.loads(checkpoint_path.read_text()).get("position", 0))
+
+    stream = sys.stdin if args.source == "-" else open(args.source, encoding="utf-8")  # noqa: SIM115
+    async with async_session_factory() as db:
+
+        async def commit(position: int) -> None:
+            await db.commit()
+            if checkpoint_path:
+                checkpoint_path.write_text(json.dumps({"position": position}))
+
+        try:
+            report = await PulumiIngestService(db).ingest(
+                args.tenant_id,
+                stream,
+                batch_size=args.batch_size,
+                checkpoint=checkpoint,
+                on_checkpoint=commit,
+                backend_id=args.backend_id,
+                sweep=not args.no_sweep,
+            )
+            await db.commit()
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+    logger.info(
+        "Pulumi ingest (%s): %d records, %d created, %d updated, %d unchanged, "
+        "%d deleted, %d failed, %d skipped",
+        report.mode, report.records, report.created, report.updated,
+        report.unchanged, report.deleted, report.failed, report.skipped,
+    )
+    return report
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    asyncio.run(main())
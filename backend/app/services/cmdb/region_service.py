@@ -85,13 +85,20 @@ class DeliveryRegionService:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
-    async def get_children(self, region_id: str) -> list[DeliveryRegion]:
+    async def get_children(
+        self, region_id: str, tenant_id: str | None = None
+    ) -> list[DeliveryRegion]:
+        stmt = select(DeliveryRegion).where(
+            DeliveryRegion.parent_region_id == region_id,
+            DeliveryRegion.deleted_at.is_(None),
+            DeliveryRegion.is_active.is_(True),
+        )
+        if tenant_id:
+            stmt = stmt.where(
+                (DeliveryRegion.tenant_id == tenant_id) | (DeliveryRegion.tenant_id.is_(None))
+            )
         result = await self.db.execute(
-            select(DeliveryRegion).where(
-                DeliveryRegion.parent_region_id == region_id,
-                DeliveryRegion.deleted_at.is_(None),
-                DeliveryRegion.is_active.is_(True),
-            ).order_by(DeliveryRegion.sort_order, DeliveryRegion.name)
+            stmt.order_by(DeliveryRegion.sort_order, DeliveryRegion.name)
         )
         return list(result.scalars().all())
 
@@ -2,8 +2,10 @@
 Overview: CMDB search service — full-text search, filters, and saved searches.
 Architecture: Search and filtering for configuration items (Section 8)
 Dependencies: sqlalchemy, app.models.cmdb.*
-Concepts: Full-text search across CI names/descriptions with filtering by class, compartment,
-    lifecycle state, and tags. Saved searches persist user queries for reuse.
+Concepts: Ranked search across CI names/descriptions (tsvector) and identifiers (trigram-indexed
+    substring match) with filtering by class, compartment, lifecycle state, and tags (JSONB
+    containment). Totals are capped counts so broad queries do not count every match. Saved
+    searches persist user queries for reuse.
 """
 
 import logging
@@ -13,6 +15,7 @@ from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.db.pagination import KeysetPage, TotalMode, paginate
 from app.models.cmdb.ci import ConfigurationItem
 from app.models.cmdb.ci_relationship import CIRelationship
 from app.models.cmdb.saved_search import SavedSearch
@@ -20,6 +23,21 @@ from app.models.cmdb.saved_search import SavedSearch
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_COUNT_CAP = 10_000
+
+
+def _tag_filters(tags: dict) -> list:
+    """String tag values become one JSONB containment test (GIN-indexed); others compare as text."""
+    contained = {k: v for k, v in tags.items() if isinstance(v, str)}
+    filters = [ConfigurationItem.tags.contains(contained)] if contained else []
+    filters.extend(
+        ConfigurationItem.tags[k].astext == str(v)
+        for k, v in tags.items()
+        if not isinstance(v, str)
+    )
+    return filters
+
+
 class SearchServiceError(Exception):
     def __init__(self, message: str, code: str = "SEARCH_ERROR"):
         self.message = message
@@ -31,7 +49,7 @@ class SearchService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def search_cis(
+    def _search_stmt(
         self,
         tenant_id: str,
         query: str | None = None,
@@ -39,25 +57,34 @@ class SearchService:
         compartment_id: str | None = None,
         lifecycle_state: str | None = None,
         tags: dict | None = None,
-        offset: int = 0,
-        limit: int = 50,
-    ) -> tuple[list[ConfigurationItem], int]:
-        """Search CIs with full-text query and filters."""
+    ) -> tuple:
+        """Filtered CI select plus its sort keys (rank first when there is a query)."""
         stmt = select(ConfigurationItem).where(
             ConfigurationItem.tenant_id == tenant_id,
             ConfigurationItem.deleted_at.is_(None),
         )
 
+        order_by: list = []
         if query:
-            pattern = f"%{query}%"
+            tsquery = func.websearch_to_tsquery("simple", query)
             stmt = stmt.where(
                 or_(
-                    ConfigurationItem.name.ilike(pattern),
-                    ConfigurationItem.description.ilike(pattern),
-                    ConfigurationItem.cloud_resource_id.ilike(pattern),
-                    ConfigurationItem.pulumi_urn.ilike(pattern),
+                    ConfigurationItem.search_vector.op("@@")(tsquery),
+                    *(
+                        col.icontains(query, autoescape=True)
+                        for col in (
+                            ConfigurationItem.name,
+                            ConfigurationItem.description,
+                            ConfigurationItem.cloud_resource_id,
+                            ConfigurationItem.pulumi_urn,
+                        )
+                    ),
                 )
             )
+            order_by = [
+                func.ts_rank_cd(ConfigurationItem.search_vector, tsquery).desc(),
+                func.similarity(ConfigurationItem.name, query).desc(),
+            ]
 
         if ci_class_id:
             stmt = stmt.where(ConfigurationItem.ci_class_id == ci_class_id)
@@ -66,23 +93,74 @@ class SearchService:
         if lifecycle_state:
             stmt = stmt.where(ConfigurationItem.lifecycle_state == lifecycle_state)
         if tags:
-            for key, value in tags.items():
-                stmt = stmt.where(
-                    ConfigurationItem.tags[key].astext == str(value)
-                )
+            stmt = stmt.where(*_tag_filters(tags))
 
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        count_result = await self.db.execute(count_stmt)
-        total = count_result.scalar() or 0
+        return stmt, [*order_by, ConfigurationItem.name, ConfigurationItem.id]
+
+    async def search_cis(
+        self,
+        tenant_id: str,
+        query: str | None = None,
+        ci_class_id: str | None = None,
+        compartment_id: str | None = None,
+        lifecycle_state: str | None = None,
+        tags: dict | None = None,
+        offset: int = 0,
+        limit: int = 50,
+        count_cap: int | None = DEFAULT_COUNT_CAP,
+    ) -> tuple[list[ConfigurationItem], int]:
+        """Search CIs with a ranked text query and filters.
+
+        With a query, results are ordered by full-text rank, then name similarity. The total
+        is exact up to ``count_cap`` and equals ``count_cap`` beyond it (None = always exact).
+        """
+        stmt, order_by = self._search_stmt(
+            tenant_id, query, ci_class_id, compartment_id, lifecycle_state, tags
+        )
+
+        total = await self._count(stmt, count_cap)
 
         stmt = stmt.options(selectinload(ConfigurationItem.ci_class))
-        stmt = stmt.order_by(ConfigurationItem.name)
+        stmt = stmt.order_by(*order_by)
         stmt = stmt.offset(offset).limit(limit)
         result = await self.db.execute(stmt)
         items = list(result.scalars().unique().all())
 
         return items, total
 
+    async def search_cis_page(
+        self,
+        tenant_id: str,
+        query: str | None = None,
+        ci_class_id: str | None = None,
+        compartment_id: str | None = None,
+        lifecycle_state: str | None = None,
+        tags: dict | None = None,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        total: TotalMode | None = None,
+    ) -> KeysetPage[ConfigurationItem]:
+        """Search CIs with keyset pagination; rank values are part of the cursor."""
+        stmt, order_by = self._search_stmt(
+            tenant_id, query, ci_class_id, compartment_id, lifecycle_state, tags
+        )
+        return await paginate(
+            self.db,
+            stmt.options(selectinload(ConfigurationItem.ci_class)),
+            order_by,
+            first=first, after=after, last=last, before=before, total=total,
+        )
+
+    async def _count(self, stmt, cap: int | None) -> int:
+        """Row count of ``stmt``, stopping at ``cap`` rows so large matches stay cheap."""
+        if cap is not None:
+            stmt = stmt.with_only_columns(ConfigurationItem.id).limit(cap)
+        count_stmt = select(func.count()).select_from(stmt.subquery())
+        count_result = await self.db.execute(count_stmt)
+        return count_result.scalar() or 0
+
     async def search_connected_cis(
         self,
         tenant_id: str,
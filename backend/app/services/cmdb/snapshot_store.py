@@ -0,0 +1,274 @@
+"""
+Overview: Delta-encoded CI snapshot store — O(1) version numbering, keyframe + JSON-patch
+    storage, on-demand reconstruction, and deep path-level diffs.
+Architecture: Append-only snapshot history for CI versioning (Section 8)
+Dependencies: sqlalchemy, app.models.cmdb.ci, app.models.cmdb.ci_snapshot
+Concepts: Version numbers come from a per-CI counter on configuration_items, bumped with a
+    single UPDATE ... RETURNING. Every KEYFRAME_INTERVAL-th version (and the first) stores the
+    full state; the others store an RFC 6902 patch (add/remove/replace) against the previous
+    version. Reconstructing any version reads at most one keyframe plus the deltas after it.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+from typing import Any
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.cmdb.ci import ConfigurationItem
+from app.models.cmdb.ci_snapshot import CISnapshot
+
+logger = logging.getLogger(__name__)
+
+KEYFRAME_INTERVAL = 16
+
+_MISSING = object()
+
+
+class SnapshotChainError(Exception):
+    """A CI's snapshot history cannot be replayed (e.g. deltas with no preceding keyframe)."""
+
+
+# ── JSON pointer / patch helpers ──────────────────────────────────────
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _split_pointer(path: str) -> list[str]:
+    """Tokens of an RFC 6901 pointer; ``""`` is the whole document, ``"/"`` the key ``""``."""
+    if not path:
+        return []
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {path!r}")
+    return [_unescape(t) for t in path[1:].split("/")]
+
+
+def make_patch(old: Any, new: Any, path: str = "") -> list[dict]:
+    """Build a JSON patch turning ``old`` into ``new``.
+
+    Objects are diffed recursively; lists and scalars are replaced as a whole, which
+    keeps patches small for the attribute/tag maps CIs actually carry.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict] = []
+        for key in old.keys() - new.keys():
+            ops.append({"op": "remove", "path": f"{path}/{_escape(str(key))}"})
+        for key, val in new.items():
+            child = f"{path}/{_escape(str(key))}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": val})
+            elif old[key] != val:
+                ops.extend(make_patch(old[key], val, child))
+        return ops
+    if old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(doc: Any, ops: list[dict]) -> Any:
+    """Apply a patch produced by :func:`make_patch` and return the new document."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        tokens = _split_pointer(op["path"])
+        if not tokens:
+            doc = copy.deepcopy(op.get("value"))
+            continue
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[token]
+        leaf = tokens[-1]
+        if op["op"] == "remove":
+            parent.pop(leaf, None)
+        else:
+            parent[leaf] = copy.deepcopy(op.get("value"))
+    return doc
+
+
+def deep_diff(old: Any, new: Any, path: str = "") -> list[dict]:
+    """Path-level differences between two documents, recursing into objects and lists."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes: list[dict] = []
+        for key in sorted(old.keys() | new.keys(), key=str):
+            child = f"{path}/{_escape(str(key))}"
+            changes.extend(deep_diff(old.get(key, _MISSING), new.get(key, _MISSING), child))
+        return changes
+    if isinstance(old, list) and isinstance(new, list):
+        changes = []
+        for i in range(max(len(old), len(new))):
+            changes.extend(deep_diff(
+                old[i] if i < len(old) else _MISSING,
+                new[i] if i < len(new) else _MISSING,
+                f"{path}/{i}",
+            ))
+        return changes
+    if old is _MISSING and new is _MISSING:
+        return []
+    if old is _MISSING:
+        return [{"path": path, "op": "add", "from": None, "to": new}]
+    if new is _MISSING:
+        return [{"path": path, "op": "remove", "from": old, "to": None}]
+    if old != new:
+        return [{"path": path, "op": "replace", "from": old, "to": new}]
+    return []
+
+
+def ci_state(ci: ConfigurationItem) -> dict:
+    """The snapshot document for a CI's current in-memory state."""
+    return {
+        "name": ci.name,
+        "description": ci.description,
+        "lifecycle_state": ci.lifecycle_state,
+        "attributes": ci.attributes,
+        "tags": ci.tags,
+        "compartment_id": str(ci.compartment_id) if ci.compartment_id else None,
+        "cloud_resource_id": ci.cloud_resource_id,
+        "pulumi_urn": ci.pulumi_urn,
+    }
+
+
+class SnapshotStore:
+    """Append and reconstruct delta-encoded CI snapshots."""
+
+    def __init__(self, db: AsyncSession, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.db = db
+        self.keyframe_interval = keyframe_interval
+
+    async def next_version(self, ci: ConfigurationItem) -> int:
+        """Atomically bump and return the CI's version counter."""
+        result = await self.db.execute(
+            update(ConfigurationItem)
+            .where(ConfigurationItem.id == ci.id)
+            .values(current_version=ConfigurationItem.current_version + 1)
+            .returning(ConfigurationItem.current_version)
+            .execution_options(synchronize_session=False)
+        )
+        version = result.scalar_one()
+        set_committed_value(ci, "current_version", version)
+        return version
+
+    async def append(
+        self,
+        ci: ConfigurationItem,
+        tenant_id: str,
+        user_id: str | None,
+        change_type: str,
+        reason: str | None,
+    ) -> CISnapshot:
+        """Record the CI's current state as its next version."""
+        version = await self.next_version(ci)
+        state = ci_state(ci)
+
+        snapshot = CISnapshot(
+            ci_id=ci.id,
+            tenant_id=tenant_id,
+            version_number=version,
+            changed_by=user_id,
+            change_reason=reason,
+            change_type=change_type,
+        )
+        previous = None
+        if version > 1 and (version - 1) % self.keyframe_interval != 0:
+            previous = await self.reconstruct(str(ci.id), tenant_id, version - 1)
+
+        if previous is None:
+            snapshot.is_keyframe = True
+            snapshot.snapshot_data = state
+        else:
+            snapshot.is_keyframe = False
+            snapshot.delta = make_patch(previous, state)
+
+        self.db.add(snapshot)
+        await self.db.flush()
+        set_committed_value(snapshot, "snapshot_data", state)
+        return snapshot
+
+    async def reconstruct(
+        self, ci_id: str, tenant_id: str, version: int
+    ) -> dict | None:
+        """Rebuild the full state of ``version`` from its keyframe and deltas."""
+        states = self._replay(await self._chain(ci_id, tenant_id, version, version))
+        return states.get(version)
+
+    async def materialize(
+        self, snapshots: list[CISnapshot], ci_id: str, tenant_id: str
+    ) -> list[CISnapshot]:
+        """Fill ``snapshot_data`` on delta rows without marking them dirty.
+
+        All requested versions are replayed from a single range query.
+        """
+        pending = [s for s in snapshots if not s.is_keyframe or s.snapshot_data is None]
+        if not pending:
+            return snapshots
+        lo = min(s.version_number for s in pending)
+        hi = max(s.version_number for s in pending)
+        states = self._replay(await self._chain(ci_id, tenant_id, lo, hi))
+        for snap in pending:
+            set_committed_value(snap, "snapshot_data", states.get(snap.version_number) or {})
+        return snapshots
+
+    @staticmethod
+    def _replay(rows: list[CISnapshot]) -> dict[int, dict]:
+        states: dict[int, dict] = {}
+        state: dict | None = None
+        for row in rows:
+            if row.is_keyframe:
+                state = copy.deepcopy(row.snapshot_data) if row.snapshot_data else {}
+            elif state is None:
+                raise SnapshotChainError(
+                    f"Snapshot version {row.version_number} is a delta with no preceding keyframe"
+                )
+            else:
+                state = apply_patch(state, row.delta or [])
+            states[row.version_number] = state
+        return states
+
+    async def diff(
+        self, ci_id: str, tenant_id: str, version_a: int, version_b: int
+    ) -> list[dict] | None:
+        state_a = await self.reconstruct(ci_id, tenant_id, version_a)
+        state_b = await self.reconstruct(ci_id, tenant_id, version_b)
+        if state_a is None or state_b is None:
+            return None
+        return deep_diff(state_a, state_b)
+
+    async def _chain(
+        self, ci_id: str, tenant_id: str, lo: int, hi: int
+    ) -> list[CISnapshot]:
+        """Load the nearest keyframe at or before ``lo`` and every row up to ``hi``.
+
+        Without such a keyframe every row up to ``hi`` is loaded, so replay reports the broken
+        chain instead of the versions silently coming back empty.
+        """
+        keyframe_q = (
+            select(CISnapshot.version_number)
+            .where(
+                CISnapshot.ci_id == ci_id,
+                CISnapshot.tenant_id == tenant_id,
+                CISnapshot.version_number <= lo,
+                CISnapshot.is_keyframe.is_(True),
+            )
+            .order_by(CISnapshot.version_number.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            select(CISnapshot)
+            .where(
+                CISnapshot.ci_id == ci_id,
+                CISnapshot.tenant_id == tenant_id,
+                CISnapshot.version_number <= hi,
+                CISnapshot.version_number >= func.coalesce(keyframe_q, 0),
+            )
+            .order_by(CISnapshot.version_number)
+        )
+        return list(result.scalars().all())
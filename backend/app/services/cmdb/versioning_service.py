@@ -1,9 +1,10 @@
 """
 Overview: CI versioning service — snapshot management and point-in-time queries.
 Architecture: Append-only snapshot history for CI change tracking (Section 8)
-Dependencies: sqlalchemy, app.models.cmdb.ci_snapshot
-Concepts: Every CI mutation creates a snapshot with the full state. Snapshots are immutable
-    and support point-in-time queries, version comparison, and change history.
+Dependencies: sqlalchemy, app.models.cmdb.ci_snapshot, app.services.cmdb.snapshot_store
+Concepts: Every CI mutation creates a snapshot (keyframe or delta). Snapshots are immutable
+    and support point-in-time queries, path-level version comparison, and change history.
+    Delta rows are materialized to full state on read.
 """
 
 import logging
@@ -12,6 +13,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.cmdb.ci_snapshot import CISnapshot
+from app.services.cmdb.snapshot_store import SnapshotStore, deep_diff
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,7 @@ logger = logging.getLogger(__name__)
 class VersioningService:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.store = SnapshotStore(db)
 
     async def get_versions(
         self,
@@ -40,7 +43,8 @@ class VersioningService:
         stmt = stmt.order_by(CISnapshot.version_number.desc())
         stmt = stmt.offset(offset).limit(limit)
         result = await self.db.execute(stmt)
-        return list(result.scalars().all()), total
+        items = await self.store.materialize(list(result.scalars().all()), ci_id, tenant_id)
+        return items, total
 
     async def get_version(
         self,
@@ -56,7 +60,10 @@ class VersioningService:
                 CISnapshot.version_number == version_number,
             )
         )
-        return result.scalar_one_or_none()
+        snap = result.scalar_one_or_none()
+        if snap:
+            await self.store.materialize([snap], ci_id, tenant_id)
+        return snap
 
     async def get_latest_version(
         self,
@@ -73,7 +80,10 @@ class VersioningService:
             .order_by(CISnapshot.version_number.desc())
             .limit(1)
         )
-        return result.scalar_one_or_none()
+        snap = result.scalar_one_or_none()
+        if snap:
+            await self.store.materialize([snap], ci_id, tenant_id)
+        return snap
 
     async def diff_versions(
         self,
@@ -82,20 +92,22 @@ class VersioningService:
         version_a: int,
         version_b: int,
     ) -> dict:
-        """Compare two versions of a CI and return the differences."""
-        snap_a = await self.get_version(ci_id, tenant_id, version_a)
-        snap_b = await self.get_version(ci_id, tenant_id, version_b)
+        """Compare two versions of a CI.
 
-        if not snap_a or not snap_b:
-            return {"error": "One or both versions not found"}
+        ``changes`` keeps the top-level ``{key: {from, to}}`` summary; ``paths`` lists every
+        leaf-level difference as ``{path, op, from, to}`` using JSON pointer paths.
+        """
+        data_a = await self.store.reconstruct(ci_id, tenant_id, version_a)
+        data_b = await self.store.reconstruct(ci_id, tenant_id, version_b)
 
-        data_a = snap_a.snapshot_data or {}
-        data_b = snap_b.snapshot_data or {}
+        if data_a is None or data_b is None:
+            return {"error": "One or both versions not found"}
 
         diff: dict = {
             "version_a": version_a,
             "version_b": version_b,
             "changes": {},
+            "paths": deep_diff(data_a, data_b),
         }
 
         all_keys = set(data_a.keys()) | set(data_b.keys())
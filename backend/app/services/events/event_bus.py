@@ -12,15 +12,20 @@ import json
 import logging
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.instrumentation import track_sql
 from app.models.event import EventLog, EventType
 from app.services.events.registry import get_event_type_registry
 from app.services.events.valkey_client import xadd_event
 
 logger = logging.getLogger(__name__)
 
+_EVENT_TYPE_BY_NAME = select(EventType).where(
+    EventType.name == bindparam("name"), EventType.deleted_at.is_(None)
+)
+
 
 class EventBus:
     """Emits events to PostgreSQL (audit trail) and Valkey Streams (dispatch queue)."""
@@ -28,6 +33,7 @@ class EventBus:
     def __init__(self, db: AsyncSession):
         self._db = db
 
+    @track_sql
     async def emit(
         self,
         event_type_name: str,
@@ -85,12 +91,7 @@ class EventBus:
         self, name: str, tenant_id: str
     ) -> EventType | None:
         """Look up event type from DB, falling back to registry check."""
-        result = await self._db.execute(
-            select(EventType).where(
-                EventType.name == name,
-                EventType.deleted_at.is_(None),
-            )
-        )
+        result = await self._db.execute(_EVENT_TYPE_BY_NAME, {"name": name})
         db_type = result.scalar_one_or_none()
         if db_type:
             return db_type
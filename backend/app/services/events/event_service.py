@@ -16,6 +16,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.db.pagination import KeysetPage, TotalMode, paginate
 from app.models.event import (
     EventDelivery,
     EventLog,
@@ -195,16 +196,38 @@ class EventService:
         offset: int = 0,
         limit: int = 50,
     ) -> list[EventLog]:
-        query = select(EventLog).where(EventLog.tenant_id == tenant_id)
+        query = self._event_log_query(tenant_id, event_type_name, source)
+        query = query.order_by(EventLog.emitted_at.desc()).offset(offset).limit(limit)
+        result = await self._db.execute(query)
+        return list(result.scalars().all())
 
+    async def list_event_log_page(
+        self,
+        tenant_id: str,
+        event_type_name: str | None = None,
+        source: str | None = None,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        total: TotalMode | None = None,
+    ) -> KeysetPage[EventLog]:
+        """List event log entries newest first with keyset pagination."""
+        return await paginate(
+            self._db,
+            self._event_log_query(tenant_id, event_type_name, source),
+            [EventLog.emitted_at.desc(), EventLog.id.desc()],
+            first=first, after=after, last=last, before=before, total=total,
+        )
+
+    @staticmethod
+    def _event_log_query(tenant_id: str, event_type_name: str | None, source: str | None):
+        query = select(EventLog).where(EventLog.tenant_id == tenant_id)
         if event_type_name:
             query = query.where(EventLog.event_type_name == event_type_name)
         if source:
             query = query.where(EventLog.source == source)
-
-        query = query.order_by(EventLog.emitted_at.desc()).offset(offset).limit(limit)
-        result = await self._db.execute(query)
-        return list(result.scalars().all())
+        return query
 
     async def get_event_log_entry(self, entry_id: str) -> EventLog | None:
         result = await self._db.execute(
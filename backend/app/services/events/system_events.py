@@ -157,6 +157,12 @@ def register_system_events() -> None:
             description="Configuration item deleted",
             source_validators=["cmdb_service"],
         ),
+        EventTypeDefinition(
+            name="cmdb.ci.bulk_upserted",
+            category="CMDB",
+            description="Batch of configuration items created, updated or deleted by sync",
+            source_validators=["cmdb_service"],
+        ),
         # Automation
         EventTypeDefinition(
             name="activity.execution.started",
@@ -52,7 +52,7 @@ class ImpersonationService:
             raise ImpersonationError("Requester not found", "USER_NOT_FOUND")
 
         # Re-authenticate requester
-        if not requester.password_hash or not verify_password(password, requester.password_hash):
+        if not await verify_password(password, requester.password_hash):
             raise ImpersonationError("Invalid password", "INVALID_CREDENTIALS")
 
         # Block nested impersonation (requester must not already be impersonating)
@@ -220,7 +220,7 @@ class ImpersonationService:
         session.original_is_active = target.is_active
 
         # Deactivate target and set new password
-        target.password_hash = hash_password(new_password)
+        target.password_hash = await hash_password(new_password)
         target.is_active = False
 
         session.status = ImpersonationStatus.ACTIVE
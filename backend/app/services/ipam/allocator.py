@@ -0,0 +1,192 @@
+"""
+Overview: IPAM allocator — integer interval arithmetic and a free-block (buddy) index.
+Architecture: IPAM allocation engine under the validation layer (Section 5)
+Dependencies: ipaddress (stdlib), bisect
+Concepts: CIDRs are handled as (version, start, prefix) integers. The free space inside a parent
+    is kept as maximal aligned blocks in one sorted list per prefix length (a buddy free-list):
+    first-fit takes the lowest free block that can hold the request, best-fit the smallest,
+    each in O(W + log n) for address width W. Carving splits a block into its buddies and
+    freeing merges buddies back. Parsed spans are cached, so overlap checks compare integers
+    instead of building ipaddress objects per pair.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Literal
+
+FitStrategy = Literal["first_fit", "best_fit"]
+
+_WIDTH = {4: 32, 6: 128}
+
+
+@dataclass(frozen=True, slots=True)
+class Span:
+    """A CIDR as integers: addresses [start, end) of the given IP version."""
+
+    version: int
+    start: int
+    prefix: int
+
+    @property
+    def size(self) -> int:
+        return 1 << (_WIDTH[self.version] - self.prefix)
+
+    @property
+    def end(self) -> int:
+        return self.start + self.size
+
+    def contains(self, other: Span) -> bool:
+        return (
+            self.version == other.version
+            and self.start <= other.start
+            and other.end <= self.end
+        )
+
+    def overlaps(self, other: Span) -> bool:
+        return (
+            self.version == other.version
+            and self.start < other.end
+            and other.start < self.end
+        )
+
+    def to_cidr(self) -> str:
+        return format_cidr(self.version, self.start, self.prefix)
+
+
+@lru_cache(maxsize=65536)
+def parse_span(cidr: str) -> Span:
+    """Parse a CIDR (host bits allowed, as ``strict=False``) into a Span."""
+    net = ipaddress.ip_network(cidr, strict=False)
+    return Span(net.version, int(net.network_address), net.prefixlen)
+
+
+def format_cidr(version: int, start: int, prefix: int) -> str:
+    address = ipaddress.IPv4Address(start) if version == 4 else ipaddress.IPv6Address(start)
+    return f"{address}/{prefix}"
+
+
+def aligned_blocks(start: int, end: int, width: int) -> list[tuple[int, int]]:
+    """Cover [start, end) with the fewest aligned CIDR blocks, as (start, prefix) pairs."""
+    blocks = []
+    while start < end:
+        # Largest block aligned at start that does not run past end
+        bits = (start & -start).bit_length() - 1 if start else width
+        while (1 << bits) > end - start:
+            bits -= 1
+        blocks.append((start, width - bits))
+        start += 1 << bits
+    return blocks
+
+
+class FreeBlockIndex:
+    """Free space of one parent block, as aligned free blocks bucketed by prefix length."""
+
+    def __init__(self, parent: Span, used: list[Span] | tuple[Span, ...] = ()) -> None:
+        self.parent = parent
+        self.width = _WIDTH[parent.version]
+        self._free: dict[int, list[int]] = {}
+        self.free_addresses = 0
+
+        cursor = parent.start
+        for span in sorted(
+            (s for s in used if s.overlaps(parent)), key=lambda s: s.start
+        ):
+            if span.start > cursor:
+                self._add_range(cursor, span.start)
+            cursor = max(cursor, span.end)
+        if cursor < parent.end:
+            self._add_range(cursor, parent.end)
+
+    def _add_range(self, start: int, end: int) -> None:
+        for block_start, prefix in aligned_blocks(start, end, self.width):
+            insort(self._free.setdefault(prefix, []), block_start)
+            self.free_addresses += 1 << (self.width - prefix)
+
+    def _take(self, prefix: int, block_start: int) -> None:
+        starts = self._free[prefix]
+        del starts[bisect_left(starts, block_start)]
+        if not starts:
+            del self._free[prefix]
+
+    def _has(self, prefix: int, block_start: int) -> bool:
+        starts = self._free.get(prefix)
+        if not starts:
+            return False
+        i = bisect_left(starts, block_start)
+        return i < len(starts) and starts[i] == block_start
+
+    def _select(self, prefix: int, strategy: FitStrategy) -> tuple[int, int] | None:
+        """(free prefix, start) of the free block a ``/prefix`` request is carved from."""
+        if prefix < self.parent.prefix or prefix > self.width:
+            return None
+        best: tuple[tuple[int, int], int] | None = None
+        for free_prefix, starts in self._free.items():
+            if free_prefix > prefix:
+                continue
+            # first-fit: lowest address; best-fit: smallest block, then lowest address
+            key = (-free_prefix, starts[0]) if strategy == "best_fit" else (starts[0], 0)
+            if best is None or key < best[0]:
+                best = (key, free_prefix)
+        if best is None:
+            return None
+        key, free_prefix = best
+        return free_prefix, key[1] if strategy == "best_fit" else key[0]
+
+    def find(self, prefix: int, strategy: FitStrategy = "first_fit") -> Span | None:
+        """The block a request for ``/prefix`` would get, without allocating it."""
+        selected = self._select(prefix, strategy)
+        if selected is None:
+            return None
+        return Span(self.parent.version, selected[1], prefix)
+
+    def allocate(self, prefix: int, strategy: FitStrategy = "first_fit") -> Span | None:
+        """Carve a ``/prefix`` block out of free space, or None if none fits."""
+        selected = self._select(prefix, strategy)
+        if selected is None:
+            return None
+        free_prefix, block_start = selected
+        self._take(free_prefix, block_start)
+        # The unused upper halves become free buddies, one per prefix level
+        for level in range(prefix, free_prefix, -1):
+            insort(
+                self._free.setdefault(level, []),
+                block_start + (1 << (self.width - level)),
+            )
+        span = Span(self.parent.version, block_start, prefix)
+        self.free_addresses -= span.size
+        return span
+
+    def claim(self, span: Span) -> bool:
+        """Take a specific block if it lies entirely in free space; False otherwise."""
+        if not self.parent.contains(span):
+            return False
+        for free_prefix in range(span.prefix, self.parent.prefix - 1, -1):
+            block_start = span.start & ~((1 << (self.width - free_prefix)) - 1)
+            if not self._has(free_prefix, block_start):
+                continue
+            self._take(free_prefix, block_start)
+            # Free every buddy on the path from the enclosing block down to the claimed one
+            for level in range(free_prefix + 1, span.prefix + 1):
+                half = 1 << (self.width - level)
+                inside = span.start & ~(half - 1)
+                insort(self._free.setdefault(level, []), inside ^ half)
+            self.free_addresses -= span.size
+            return True
+        return False
+
+    def release(self, span: Span) -> None:
+        """Return a previously allocated block, merging it with free buddies."""
+        start, prefix = span.start, span.prefix
+        self.free_addresses += span.size
+        while prefix > self.parent.prefix:
+            buddy = start ^ (1 << (self.width - prefix))
+            if not self._has(prefix, buddy):
+                break
+            self._take(prefix, buddy)
+            start = min(start, buddy)
+            prefix -= 1
+        insort(self._free.setdefault(prefix, []), start)
@@ -2,17 +2,26 @@
 Overview: IPAM service — address space CRUD, hierarchical allocation, IP reservation, utilization tracking.
 Architecture: IPAM service layer (Section 6)
 Dependencies: sqlalchemy, app.models.ipam, app.services.ipam.validation
-Concepts: CIDR allocation, overlap detection, hierarchical address management, utilization tracking
+Concepts: CIDR allocation, overlap detection, hierarchical address management, utilization tracking.
+    Each allocation persists the usable IPs held by its children (allocated_ips), adjusted
+    atomically on allocate/release, so utilization is read rather than recomputed. Writers
+    serialize per address space (per landing zone for new spaces) on a transaction-scoped
+    advisory lock, so read-check-insert cannot race; GiST exclusion constraints on the CIDRs
+    and a unique reservation index reject overlaps from any writer that bypasses the lock.
 """
 
 from __future__ import annotations
 
 import logging
 import uuid
+from dataclasses import dataclass
+from decimal import Decimal
 
-from sqlalchemy import select, func
+from sqlalchemy import Numeric, func, literal, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.base import Base
 from app.models.ipam import (
     AddressAllocation,
     AddressSpace,
@@ -22,6 +31,7 @@ from app.models.ipam import (
     IpReservation,
     ReservationStatus,
 )
+from app.services.ipam.allocator import FitStrategy, FreeBlockIndex, parse_span
 from app.services.ipam.validation import (
     calculate_usable_ips,
     find_overlaps,
@@ -33,6 +43,34 @@ from app.services.ipam.validation import (
 
 logger = logging.getLogger(__name__)
 
+# First key of the two-key advisory locks, so IPAM locks never collide with other users
+_LOCK_ADDRESS_SPACE = 0x1BA0
+_LOCK_LANDING_ZONE = 0x1BA1
+_IP_COUNT = Numeric(39, 0)
+
+
+@dataclass
+class BlockRequest:
+    """One block in a batch allocation: an explicit ``cidr`` or a ``prefix_length`` to place."""
+
+    name: str
+    allocation_type: AllocationType
+    cidr: str | None = None
+    prefix_length: int | None = None
+    parent_allocation_id: uuid.UUID | None = None
+    tenant_environment_id: uuid.UUID | None = None
+    purpose: str | None = None
+    description: str | None = None
+
+
+def _lock_key(value: uuid.UUID) -> int:
+    """Signed 32-bit advisory lock key derived from a UUID."""
+    return int.from_bytes(uuid.UUID(str(value)).bytes[:4], "big", signed=True)
+
+
+async def _advisory_lock(db: AsyncSession, lock_class: int, value: uuid.UUID) -> None:
+    await db.execute(select(func.pg_advisory_xact_lock(lock_class, _lock_key(value))))
+
 
 class IpamService:
     """Service for IP Address Management — address spaces, allocations, and reservations."""
@@ -54,6 +92,7 @@ class IpamService:
     ) -> AddressSpace:
         """Create a new address space after validating CIDR and checking for overlaps."""
         validate_cidr(cidr)
+        await _advisory_lock(db, _LOCK_LANDING_ZONE, landing_zone_id)
 
         # Check for overlapping address spaces within the same landing zone
         result = await db.execute(
@@ -79,8 +118,7 @@ class IpamService:
             ip_version=ip_version,
             status=AddressSpaceStatus.ACTIVE,
         )
-        db.add(space)
-        await db.flush()
+        await _add_or_conflict(db, f"CIDR {cidr} overlaps with an existing address space", space)
         return space
 
     async def get_address_space(
@@ -151,57 +189,168 @@ class IpamService:
     ) -> AddressAllocation:
         """Allocate a CIDR block within an address space, optionally under a parent allocation."""
         validate_cidr(cidr)
+        [allocation] = await self.allocate_blocks(
+            db,
+            address_space_id,
+            [
+                BlockRequest(
+                    name=name,
+                    allocation_type=allocation_type,
+                    cidr=cidr,
+                    parent_allocation_id=parent_allocation_id,
+                    tenant_environment_id=tenant_environment_id,
+                    purpose=purpose,
+                    description=description,
+                )
+            ],
+        )
+        return allocation
+
+    async def allocate_next_block(
+        self,
+        db: AsyncSession,
+        address_space_id: uuid.UUID,
+        name: str,
+        prefix_length: int,
+        allocation_type: AllocationType,
+        *,
+        parent_allocation_id: uuid.UUID | None = None,
+        tenant_environment_id: uuid.UUID | None = None,
+        purpose: str | None = None,
+        description: str | None = None,
+        strategy: FitStrategy = "first_fit",
+    ) -> AddressAllocation:
+        """Pick and allocate a free block of ``prefix_length`` in one locked step."""
+        [allocation] = await self.allocate_blocks(
+            db,
+            address_space_id,
+            [
+                BlockRequest(
+                    name=name,
+                    allocation_type=allocation_type,
+                    prefix_length=prefix_length,
+                    parent_allocation_id=parent_allocation_id,
+                    tenant_environment_id=tenant_environment_id,
+                    purpose=purpose,
+                    description=description,
+                )
+            ],
+            strategy=strategy,
+        )
+        return allocation
+
+    async def allocate_blocks(
+        self,
+        db: AsyncSession,
+        address_space_id: uuid.UUID,
+        requests: list[BlockRequest],
+        *,
+        strategy: FitStrategy = "first_fit",
+    ) -> list[AddressAllocation]:
+        """Allocate several blocks in one transaction — all of them or none.
+
+        Explicit CIDRs are checked for containment and overlap; prefix-only requests are
+        placed from the remaining free space, seeing blocks planned earlier in the batch.
+        The address space stays locked until the surrounding transaction ends.
+        """
+        await _advisory_lock(db, _LOCK_ADDRESS_SPACE, address_space_id)
 
-        # Fetch the address space
         space = await self.get_address_space(db, address_space_id)
         if not space:
             raise ValueError(f"Address space '{address_space_id}' not found")
 
-        # Verify allocation fits within address space
-        if not is_contained_in(cidr, space.cidr):
-            raise ValueError(
-                f"Allocation CIDR {cidr} is not contained within address space CIDR {space.cidr}"
-            )
-
-        # If parent allocation specified, verify containment
-        if parent_allocation_id:
-            parent = await self.get_allocation(db, parent_allocation_id)
-            if not parent:
-                raise ValueError(f"Parent allocation '{parent_allocation_id}' not found")
-            if not is_contained_in(cidr, parent.cidr):
-                raise ValueError(
-                    f"Allocation CIDR {cidr} is not contained within parent CIDR {parent.cidr}"
+        # parent id -> (parent, free-block index, sibling CIDRs incl. planned ones)
+        scopes: dict[uuid.UUID | None, tuple[AddressAllocation | None, FreeBlockIndex, list]] = {}
+        planned: list[tuple[BlockRequest, str]] = []
+        for request in requests:
+            parent_id = request.parent_allocation_id
+            if parent_id not in scopes:
+                parent = None
+                if parent_id:
+                    parent = await self.get_allocation(db, parent_id)
+                    if not parent:
+                        raise ValueError(f"Parent allocation '{parent_id}' not found")
+                siblings = await self._sibling_cidrs(db, address_space_id, parent_id)
+                index = FreeBlockIndex(
+                    parse_span(parent.cidr if parent else space.cidr),
+                    [parse_span(c) for c in siblings],
                 )
-
-        # Check for overlapping sibling allocations
-        sibling_query = select(AddressAllocation.cidr).where(
-            AddressAllocation.address_space_id == address_space_id,
-            AddressAllocation.parent_allocation_id == parent_allocation_id,
-            AddressAllocation.deleted_at.is_(None),
+                scopes[parent_id] = (parent, index, siblings)
+            parent, index, siblings = scopes[parent_id]
+
+            if request.cidr:
+                cidr = request.cidr
+                if not is_contained_in(cidr, space.cidr):
+                    raise ValueError(
+                        f"Allocation CIDR {cidr} is not contained within address space "
+                        f"CIDR {space.cidr}"
+                    )
+                if parent and not is_contained_in(cidr, parent.cidr):
+                    raise ValueError(
+                        f"Allocation CIDR {cidr} is not contained within parent CIDR "
+                        f"{parent.cidr}"
+                    )
+                if not index.claim(parse_span(cidr)):
+                    raise ValueError(
+                        f"Allocation CIDR {cidr} overlaps with existing allocations: "
+                        f"{', '.join(find_overlaps(cidr, siblings))}"
+                    )
+            else:
+                if request.prefix_length is None:
+                    raise ValueError(f"Block request '{request.name}' needs a cidr or prefix")
+                span = index.allocate(request.prefix_length, strategy)
+                if span is None:
+                    raise ValueError(
+                        f"No available /{request.prefix_length} block in "
+                        f"{parent.cidr if parent else space.cidr}"
+                    )
+                cidr = span.to_cidr()
+            siblings.append(cidr)
+            planned.append((request, cidr))
+
+        allocations = [
+            AddressAllocation(
+                address_space_id=address_space_id,
+                parent_allocation_id=request.parent_allocation_id,
+                tenant_environment_id=request.tenant_environment_id,
+                name=request.name,
+                description=request.description,
+                cidr=cidr,
+                allocation_type=request.allocation_type,
+                status=AllocationStatus.PLANNED,
+                purpose=request.purpose,
+            )
+            for request, cidr in planned
+        ]
+        await _add_or_conflict(
+            db, "Allocation overlaps with a concurrently created block", *allocations
         )
-        result = await db.execute(sibling_query)
-        existing_cidrs = list(result.scalars().all())
 
-        overlaps = find_overlaps(cidr, existing_cidrs)
-        if overlaps:
-            raise ValueError(
-                f"Allocation CIDR {cidr} overlaps with existing allocations: {', '.join(overlaps)}"
+        for parent_id, (parent, _, _) in scopes.items():
+            if parent is None:
+                continue
+            used = sum(
+                calculate_usable_ips(cidr)
+                for request, cidr in planned
+                if request.parent_allocation_id == parent_id
             )
+            await self._adjust_allocated_ips(db, parent, used)
+        return allocations
 
-        allocation = AddressAllocation(
-            address_space_id=address_space_id,
-            parent_allocation_id=parent_allocation_id,
-            tenant_environment_id=tenant_environment_id,
-            name=name,
-            description=description,
-            cidr=cidr,
-            allocation_type=allocation_type,
-            status=AllocationStatus.PLANNED,
-            purpose=purpose,
+    async def _sibling_cidrs(
+        self,
+        db: AsyncSession,
+        address_space_id: uuid.UUID,
+        parent_allocation_id: uuid.UUID | None,
+    ) -> list[str]:
+        result = await db.execute(
+            select(AddressAllocation.cidr).where(
+                AddressAllocation.address_space_id == address_space_id,
+                AddressAllocation.parent_allocation_id == parent_allocation_id,
+                AddressAllocation.deleted_at.is_(None),
+            )
         )
-        db.add(allocation)
-        await db.flush()
-        return allocation
+        return list(result.scalars().all())
 
     async def get_allocation(
         self,
@@ -267,6 +416,12 @@ class IpamService:
         allocation.status = AllocationStatus.RELEASED
         allocation.deleted_at = func.now()
         await db.flush()
+        if allocation.parent_allocation_id:
+            parent = await self.get_allocation(db, allocation.parent_allocation_id)
+            if parent:
+                await self._adjust_allocated_ips(
+                    db, parent, -calculate_usable_ips(allocation.cidr)
+                )
 
     async def suggest_next_block(
         self,
@@ -275,11 +430,13 @@ class IpamService:
         prefix_length: int,
         *,
         parent_allocation_id: uuid.UUID | None = None,
+        strategy: FitStrategy = "first_fit",
     ) -> str | None:
         """Suggest the next available CIDR block of the given prefix length.
 
         Searches within the parent allocation if specified, otherwise within
-        the address space itself.
+        the address space itself. ``best_fit`` prefers the smallest free region.
+        This is a preview; use ``allocate_next_block`` to pick and claim atomically.
         """
         # Determine the parent CIDR
         if parent_allocation_id:
@@ -293,17 +450,8 @@ class IpamService:
                 raise ValueError(f"Address space '{address_space_id}' not found")
             parent_cidr = space.cidr
 
-        # Get existing children CIDRs
-        result = await db.execute(
-            select(AddressAllocation.cidr).where(
-                AddressAllocation.address_space_id == address_space_id,
-                AddressAllocation.parent_allocation_id == parent_allocation_id,
-                AddressAllocation.deleted_at.is_(None),
-            )
-        )
-        existing_cidrs = list(result.scalars().all())
-
-        return next_available_block(parent_cidr, existing_cidrs, prefix_length)
+        existing_cidrs = await self._sibling_cidrs(db, address_space_id, parent_allocation_id)
+        return next_available_block(parent_cidr, existing_cidrs, prefix_length, strategy)
 
     # ------------------------------------------------------------------ #
     # IP Reservation
@@ -336,6 +484,8 @@ class IpamService:
                 f"IP address {ip_address} is not within allocation CIDR {allocation.cidr}"
             )
 
+        await _advisory_lock(db, _LOCK_ADDRESS_SPACE, allocation.address_space_id)
+
         # Check for duplicate reservation
         result = await db.execute(
             select(IpReservation).where(
@@ -359,8 +509,11 @@ class IpamService:
             status=ReservationStatus.RESERVED,
             reserved_by=reserved_by,
         )
-        db.add(reservation)
-        await db.flush()
+        await _add_or_conflict(
+            db,
+            f"IP address {ip_address} is already reserved in allocation '{allocation_id}'",
+            reservation,
+        )
         return reservation
 
     async def list_reservations(
@@ -411,30 +564,90 @@ class IpamService:
         """Calculate and update the utilization percentage for an allocation.
 
         Utilization is defined as the ratio of IP addresses consumed by child
-        allocations to the total usable IPs in the parent allocation.
+        allocations to the total usable IPs in the parent allocation. The consumed
+        count is the persisted ``allocated_ips`` counter.
         """
         allocation = await self.get_allocation(db, allocation_id)
         if not allocation:
             raise ValueError(f"Allocation '{allocation_id}' not found")
 
-        parent_usable = calculate_usable_ips(allocation.cidr)
-        if parent_usable == 0:
-            allocation.utilization_percent = 0.0
-            await db.flush()
-            return 0.0
+        allocation.utilization_percent = _utilization(
+            int(allocation.allocated_ips or 0), allocation.cidr
+        )
+        await db.flush()
+        return allocation.utilization_percent
+
+    async def recalculate_utilization(
+        self,
+        db: AsyncSession,
+        allocation_id: uuid.UUID,
+    ) -> float:
+        """Recount ``allocated_ips`` from live child allocations and refresh utilization."""
+        allocation = await self.get_allocation(db, allocation_id)
+        if not allocation:
+            raise ValueError(f"Allocation '{allocation_id}' not found")
 
-        # Sum usable IPs across all child allocations
         result = await db.execute(
             select(AddressAllocation.cidr).where(
                 AddressAllocation.parent_allocation_id == allocation_id,
                 AddressAllocation.deleted_at.is_(None),
             )
         )
-        child_cidrs = list(result.scalars().all())
-
-        used_ips = sum(calculate_usable_ips(c) for c in child_cidrs)
-        utilization = min((used_ips / parent_usable) * 100.0, 100.0)
-
-        allocation.utilization_percent = round(utilization, 2)
+        allocated = sum(calculate_usable_ips(c) for c in result.scalars().all())
+        allocation.allocated_ips = Decimal(allocated)
+        allocation.utilization_percent = _utilization(allocated, allocation.cidr)
         await db.flush()
         return allocation.utilization_percent
+
+    async def _adjust_allocated_ips(
+        self,
+        db: AsyncSession,
+        parent: AddressAllocation,
+        delta: int,
+    ) -> None:
+        """Atomically add ``delta`` to a parent's counter and refresh its utilization.
+
+        All arithmetic stays in NUMERIC: IPv6 counts overflow BIGINT, and PostgreSQL has
+        ``round(numeric, int)`` but no ``round(double precision, int)``.
+        """
+        usable = calculate_usable_ips(parent.cidr)
+        allocated = AddressAllocation.allocated_ips + literal(delta, _IP_COUNT)
+        percent = (
+            func.least(
+                func.round(
+                    allocated * literal(100, _IP_COUNT) / literal(usable, _IP_COUNT), 2
+                ),
+                literal(100, _IP_COUNT),
+            )
+            if usable
+            else 0.0
+        )
+        result = await db.execute(
+            update(AddressAllocation)
+            .where(AddressAllocation.id == parent.id)
+            .values(allocated_ips=allocated, utilization_percent=percent)
+            .returning(AddressAllocation.allocated_ips, AddressAllocation.utilization_percent)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is not None:
+            parent.allocated_ips, parent.utilization_percent = row
+
+
+async def _add_or_conflict(db: AsyncSession, message: str, *objects: Base) -> None:
+    """Add and flush in a savepoint, turning an exclusion/unique violation into the
+    service's ValueError. Only the savepoint is rolled back; the caller's transaction and
+    its advisory locks stay intact."""
+    try:
+        async with db.begin_nested():
+            db.add_all(objects)
+            await db.flush()
+    except IntegrityError as exc:
+        raise ValueError(message) from exc
+
+
+def _utilization(allocated_ips: int, cidr: str) -> float:
+    usable = calculate_usable_ips(cidr)
+    if usable == 0:
+        return 0.0
+    return round(min((allocated_ips / usable) * 100.0, 100.0), 2)
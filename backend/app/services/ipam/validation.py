@@ -1,8 +1,9 @@
 """
 Overview: IPAM validation — CIDR overlap detection, containment checking, boundary validation.
 Architecture: IPAM validation layer (Section 5)
-Dependencies: ipaddress (stdlib)
-Concepts: CIDR arithmetic, overlap detection, RFC 1918 validation, subnet boundaries
+Dependencies: ipaddress (stdlib), app.services.ipam.allocator
+Concepts: CIDR arithmetic, overlap detection, RFC 1918 validation, subnet boundaries. Overlap
+    checks and block search run on integer spans via the allocator.
 """
 
 from __future__ import annotations
@@ -10,6 +11,8 @@ from __future__ import annotations
 import ipaddress
 from typing import Union
 
+from app.services.ipam.allocator import FitStrategy, FreeBlockIndex, parse_span
+
 IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
 IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
 
@@ -44,8 +47,8 @@ def overlaps_with(cidr_a: str, cidr_b: str) -> bool:
 
 def find_overlaps(new_cidr: str, existing_cidrs: list[str]) -> list[str]:
     """Return all existing CIDRs that overlap with new_cidr."""
-    new_net = ipaddress.ip_network(new_cidr, strict=False)
-    return [c for c in existing_cidrs if ipaddress.ip_network(c, strict=False).overlaps(new_net)]
+    target = parse_span(new_cidr)
+    return [c for c in existing_cidrs if parse_span(c).overlaps(target)]
 
 
 def validate_subnet_boundary(cidr: str) -> bool:
@@ -96,28 +99,17 @@ def next_available_block(
     parent_cidr: str,
     existing_children: list[str],
     prefix_length: int,
+    strategy: FitStrategy = "first_fit",
 ) -> str | None:
-    """Find next available CIDR of given prefix_length within parent that doesn't overlap existing.
+    """Find an available CIDR of given prefix_length within parent that doesn't overlap existing.
 
-    Returns the CIDR string of the first available block, or None if no space available.
+    ``first_fit`` returns the lowest-addressed free block; ``best_fit`` carves from the
+    smallest free region that fits, keeping large regions intact. Returns None if no space.
     """
-    parent = ipaddress.ip_network(parent_cidr, strict=False)
-    if prefix_length < parent.prefixlen:
-        return None  # Requested block is larger than parent
-
-    existing_nets = [ipaddress.ip_network(c, strict=False) for c in existing_children]
-
-    # Iterate through all possible subnets of the requested size within the parent
-    for candidate in parent.subnets(new_prefix=prefix_length):
-        conflict = False
-        for existing in existing_nets:
-            if candidate.overlaps(existing):
-                conflict = True
-                break
-        if not conflict:
-            return str(candidate)
-
-    return None
+    parent = parse_span(parent_cidr)
+    index = FreeBlockIndex(parent, [parse_span(c) for c in existing_children])
+    block = index.find(prefix_length, strategy)
+    return block.to_cidr() if block else None
 
 
 def ip_in_cidr(ip: str, cidr: str) -> bool:
@@ -640,6 +640,8 @@ _BY_PROVIDER: dict[str, list[dict]] = {}
 for _bp in _ALL_BLUEPRINTS:
     _BY_PROVIDER.setdefault(_bp["providerName"], []).append(_bp)
 
+_BY_ID: dict[str, dict] = {bp["id"]: bp for bp in _ALL_BLUEPRINTS}
+
 
 def get_blueprints(provider_name: str) -> list[dict]:
     """Return all blueprints for a given provider name (case-insensitive)."""
@@ -648,7 +650,4 @@ def get_blueprints(provider_name: str) -> list[dict]:
 
 def get_blueprint(blueprint_id: str) -> dict | None:
     """Return a single blueprint by ID."""
-    for bp in _ALL_BLUEPRINTS:
-        if bp["id"] == blueprint_id:
-            return bp
-    return None
+    return _BY_ID.get(blueprint_id)
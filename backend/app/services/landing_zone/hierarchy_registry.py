@@ -31,12 +31,15 @@ class ProviderHierarchy:
     provider_name: str
     root_type: str
     levels: list[HierarchyLevelDef] = field(default_factory=list)
+    _by_type: dict[str, HierarchyLevelDef] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+
+    def __post_init__(self) -> None:
+        self._by_type = {level.type_id: level for level in self.levels}
 
     def get_level(self, type_id: str) -> HierarchyLevelDef | None:
-        for level in self.levels:
-            if level.type_id == type_id:
-                return level
-        return None
+        return self._by_type.get(type_id)
 
     def get_allowed_children(self, parent_type_id: str) -> list[HierarchyLevelDef]:
         parent = self.get_level(parent_type_id)
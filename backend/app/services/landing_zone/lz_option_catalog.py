@@ -1142,13 +1142,14 @@ _BY_PROVIDER_DOMAIN: dict[str, list[ConfigOption]] = {}
 for _opt in _ALL_OPTIONS:
     _key = f"{_opt.provider_name}:{_opt.domain}"
     _BY_PROVIDER_DOMAIN.setdefault(_key, []).append(_opt)
+for _options in _BY_PROVIDER_DOMAIN.values():
+    _options.sort(key=lambda o: o.sort_order)
 
 
 def get_lz_option_catalog(provider_name: str, domain: str) -> list[ConfigOption]:
     """Return all LZ options for a provider + domain, sorted by sort_order."""
     key = f"{provider_name}:{domain}"
-    options = _BY_PROVIDER_DOMAIN.get(key, [])
-    return sorted(options, key=lambda o: o.sort_order)
+    return list(_BY_PROVIDER_DOMAIN.get(key, ()))
 
 
 def get_lz_option_categories(provider_name: str, domain: str) -> list[CategoryInfo]:
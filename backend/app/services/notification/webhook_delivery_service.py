@@ -12,6 +12,7 @@ from datetime import UTC, datetime, timedelta
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.pagination import KeysetPage, TotalMode, paginate
 from app.models.webhook_config import WebhookConfig
 from app.models.webhook_delivery import WebhookDelivery, WebhookDeliveryStatus
 
@@ -209,13 +210,7 @@ class WebhookDeliveryService:
         limit: int = 50,
     ) -> tuple[list[WebhookDelivery], int]:
         """List deliveries with optional filters. Returns (items, total)."""
-        tid = uuid.UUID(str(tenant_id))
-
-        base = select(WebhookDelivery).where(WebhookDelivery.tenant_id == tid)
-        if config_id:
-            base = base.where(WebhookDelivery.webhook_config_id == uuid.UUID(str(config_id)))
-        if status:
-            base = base.where(WebhookDelivery.status == status)
+        base = self._deliveries_query(tenant_id, config_id, status)
 
         count_stmt = select(func.count()).select_from(base.subquery())
         total = (await self.db.execute(count_stmt)).scalar() or 0
@@ -225,3 +220,37 @@ class WebhookDeliveryService:
         items = list(result.scalars().all())
 
         return items, total
+
+    async def list_deliveries_page(
+        self,
+        tenant_id: str | uuid.UUID,
+        config_id: str | uuid.UUID | None = None,
+        status: WebhookDeliveryStatus | None = None,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        total: TotalMode | None = None,
+    ) -> KeysetPage[WebhookDelivery]:
+        """List deliveries newest first with keyset pagination."""
+        return await paginate(
+            self.db,
+            self._deliveries_query(tenant_id, config_id, status),
+            [WebhookDelivery.created_at.desc(), WebhookDelivery.id.desc()],
+            first=first, after=after, last=last, before=before, total=total,
+        )
+
+    @staticmethod
+    def _deliveries_query(
+        tenant_id: str | uuid.UUID,
+        config_id: str | uuid.UUID | None,
+        status: WebhookDeliveryStatus | None,
+    ):
+        base = select(WebhookDelivery).where(
+            WebhookDelivery.tenant_id == uuid.UUID(str(tenant_id))
+        )
+        if config_id:
+            base = base.where(WebhookDelivery.webhook_config_id == uuid.UUID(str(config_id)))
+        if status:
+            base = base.where(WebhookDelivery.status == status)
+        return base
@@ -2,15 +2,18 @@
 Overview: Central permission engine with tenant hierarchy inheritance and deny overrides.
 Architecture: Permission resolution with RBAC + ABAC + tenant inheritance (Section 5.2)
 Dependencies: sqlalchemy, app.models, app.services.permission.abac
-Concepts: Permission checking, tenant hierarchy inheritance, explicit deny, ABAC, group membership
+Concepts: Permission checking, tenant hierarchy inheritance, explicit deny, ABAC, group membership.
+    Queries are module-level statements with bound parameters, built once at import so each
+    execution reuses their cache key and compiled form.
 """
 
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 
-from sqlalchemy import select
+from sqlalchemy import and_, bindparam, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.instrumentation import track_sql
 from app.models.abac_policy import ABACPolicy, PolicyEffect
 from app.models.group import Group
 from app.models.group_membership import GroupMembership
@@ -26,6 +29,80 @@ from app.services.permission.abac.evaluator import EvaluationContext, Evaluator
 from app.services.permission.abac.parser import Parser
 from app.services.permission.abac.tokenizer import Tokenizer
 
+_DIRECT_ROLES = (
+    select(UserRole, Role)
+    .join(Role, Role.id == UserRole.role_id)
+    .where(
+        UserRole.user_id == bindparam("user_id"),
+        UserRole.tenant_id == bindparam("tenant_id"),
+        Role.deleted_at.is_(None),
+    )
+)
+_ACTIVE_ROLE = select(Role).where(Role.id == bindparam("role_id"), Role.deleted_at.is_(None))
+_USER_GROUP_IDS = select(UserGroup.group_id).where(UserGroup.user_id == bindparam("user_id"))
+_ROLE_PERMISSIONS = (
+    select(Permission)
+    .join(RolePermission, RolePermission.permission_id == Permission.id)
+    .where(RolePermission.role_id == bindparam("role_id"))
+)
+_TENANT = select(Tenant.id, Tenant.name, Tenant.parent_id).where(
+    Tenant.id == bindparam("tenant_id"), Tenant.deleted_at.is_(None)
+)
+_TENANT_GROUP_IDS = (
+    select(UserGroup.group_id)
+    .join(Group, Group.id == UserGroup.group_id)
+    .where(
+        UserGroup.user_id == bindparam("user_id"),
+        Group.tenant_id == bindparam("tenant_id"),
+        Group.deleted_at.is_(None),
+    )
+)
+_PARENT_GROUP_IDS = (
+    select(GroupMembership.parent_group_id)
+    .join(Group, Group.id == GroupMembership.parent_group_id)
+    .where(
+        GroupMembership.child_group_id == bindparam("group_id"),
+        Group.tenant_id == bindparam("tenant_id"),
+        Group.deleted_at.is_(None),
+    )
+)
+_GROUP_ROLES = (
+    select(GroupRole.role_id, Group.name)
+    .join(Group, Group.id == GroupRole.group_id)
+    .where(GroupRole.group_id == bindparam("group_id"), Group.deleted_at.is_(None))
+)
+_DENY_OVERRIDES = (
+    select(PermissionOverride, Permission)
+    .join(Permission, Permission.id == PermissionOverride.permission_id)
+    .where(
+        PermissionOverride.tenant_id.in_(bindparam("tenant_ids", expanding=True)),
+        or_(
+            and_(
+                PermissionOverride.principal_type == "user",
+                PermissionOverride.principal_id == bindparam("user_id"),
+            ),
+            and_(
+                PermissionOverride.principal_type == "group",
+                PermissionOverride.principal_id.in_(bindparam("group_ids", expanding=True)),
+            ),
+            and_(
+                PermissionOverride.principal_type == "role",
+                PermissionOverride.principal_id.in_(bindparam("role_ids", expanding=True)),
+            ),
+        ),
+    )
+)
+_ENABLED_POLICIES = (
+    select(ABACPolicy)
+    .where(
+        ABACPolicy.tenant_id.in_(bindparam("tenant_ids", expanding=True)),
+        ABACPolicy.is_enabled.is_(True),
+    )
+    .order_by(ABACPolicy.priority.desc())
+)
+_DENY_POLICIES = _ENABLED_POLICIES.where(ABACPolicy.effect == PolicyEffect.DENY)
+_PERMISSION = select(Permission).where(Permission.id == bindparam("permission_id"))
+
 
 @dataclass
 class EffectivePermissionEntry:
@@ -46,6 +123,7 @@ class PermissionEngine:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    @track_sql
     async def check_permission(
         self,
         user_id: str,
@@ -109,6 +187,7 @@ class PermissionEngine:
 
         return rbac_allowed, rbac_source
 
+    @track_sql
     async def get_effective_permissions(
         self, user_id: str, tenant_id: str
     ) -> list[EffectivePermissionEntry]:
@@ -128,13 +207,7 @@ class PermissionEngine:
 
             # Direct role assignments for this tenant
             direct_roles = await self.db.execute(
-                select(UserRole, Role)
-                .join(Role, Role.id == UserRole.role_id)
-                .where(
-                    UserRole.user_id == user_id,
-                    UserRole.tenant_id == chain_tenant_id,
-                    Role.deleted_at.is_(None),
-                )
+                _DIRECT_ROLES, {"user_id": user_id, "tenant_id": chain_tenant_id}
             )
             for ur, role in direct_roles.all():
                 if ur.expires_at and ur.expires_at < now:
@@ -156,9 +229,7 @@ class PermissionEngine:
             group_roles = await self._get_group_role_ids(user_id, chain_tenant_id)
             for role_id, group_name in group_roles:
                 all_group_ids.add(group_name)  # Track group names for deny lookup
-                result = await self.db.execute(
-                    select(Role).where(Role.id == role_id, Role.deleted_at.is_(None))
-                )
+                result = await self.db.execute(_ACTIVE_ROLE, {"role_id": role_id})
                 role = result.scalar_one_or_none()
                 if not role:
                     continue
@@ -179,9 +250,7 @@ class PermissionEngine:
         tenant_ids = [tid for tid, _ in ancestor_chain]
 
         # Get user's group IDs for deny lookup
-        user_group_result = await self.db.execute(
-            select(UserGroup.group_id).where(UserGroup.user_id == user_id)
-        )
+        user_group_result = await self.db.execute(_USER_GROUP_IDS, {"user_id": user_id})
         user_group_ids = [str(row[0]) for row in user_group_result.all()]
 
         deny_map = await self._get_deny_overrides(
@@ -222,11 +291,7 @@ class PermissionEngine:
         while current and current.id not in visited:
             visited.add(current.id)
 
-            result = await self.db.execute(
-                select(Permission)
-                .join(RolePermission, RolePermission.permission_id == Permission.id)
-                .where(RolePermission.role_id == current.id)
-            )
+            result = await self.db.execute(_ROLE_PERMISSIONS, {"role_id": current.id})
             for perm in result.scalars().all():
                 # Union semantics: first source wins, but direct > inherited
                 if perm.key not in permissions or (
@@ -244,9 +309,7 @@ class PermissionEngine:
 
             if current.parent_role_id:
                 parent_result = await self.db.execute(
-                    select(Role).where(
-                        Role.id == current.parent_role_id, Role.deleted_at.is_(None)
-                    )
+                    _ACTIVE_ROLE, {"role_id": current.parent_role_id}
                 )
                 current = parent_result.scalar_one_or_none()
             else:
@@ -260,11 +323,7 @@ class PermissionEngine:
         current_id = tenant_id
 
         while current_id:
-            result = await self.db.execute(
-                select(Tenant.id, Tenant.name, Tenant.parent_id).where(
-                    Tenant.id == current_id, Tenant.deleted_at.is_(None)
-                )
-            )
+            result = await self.db.execute(_TENANT, {"tenant_id": current_id})
             row = result.first()
             if not row:
                 break
@@ -280,13 +339,7 @@ class PermissionEngine:
         """Get all role IDs from user's group memberships in this tenant (recursive via GroupMembership)."""
         # Get direct groups filtered to this tenant
         result = await self.db.execute(
-            select(UserGroup.group_id)
-            .join(Group, Group.id == UserGroup.group_id)
-            .where(
-                UserGroup.user_id == user_id,
-                Group.tenant_id == tenant_id,
-                Group.deleted_at.is_(None),
-            )
+            _TENANT_GROUP_IDS, {"user_id": user_id, "tenant_id": tenant_id}
         )
         group_ids = {row[0] for row in result.all()}
 
@@ -296,13 +349,7 @@ class PermissionEngine:
         while to_process:
             gid = to_process.pop()
             parent_result = await self.db.execute(
-                select(GroupMembership.parent_group_id)
-                .join(Group, Group.id == GroupMembership.parent_group_id)
-                .where(
-                    GroupMembership.child_group_id == gid,
-                    Group.tenant_id == tenant_id,
-                    Group.deleted_at.is_(None),
-                )
+                _PARENT_GROUP_IDS, {"group_id": gid, "tenant_id": tenant_id}
             )
             for row in parent_result.all():
                 parent_id = row[0]
@@ -313,11 +360,7 @@ class PermissionEngine:
         # Get roles for all groups
         role_pairs = []
         for gid in all_group_ids:
-            result = await self.db.execute(
-                select(GroupRole.role_id, Group.name)
-                .join(Group, Group.id == GroupRole.group_id)
-                .where(GroupRole.group_id == gid, Group.deleted_at.is_(None))
-            )
+            result = await self.db.execute(_GROUP_ROLES, {"group_id": gid})
             for role_id, group_name in result.all():
                 role_pairs.append((role_id, group_name))
 
@@ -331,34 +374,17 @@ class PermissionEngine:
         tenant_ids: list[str],
     ) -> dict[str, str]:
         """Query PermissionOverride table for matching deny entries."""
-        from sqlalchemy import or_
-
         if not tenant_ids:
             return {}
 
-        # Build principal conditions
-        conditions = [
-            (PermissionOverride.principal_type == "user")
-            & (PermissionOverride.principal_id == user_id),
-        ]
-        for gid in group_ids:
-            conditions.append(
-                (PermissionOverride.principal_type == "group")
-                & (PermissionOverride.principal_id == gid)
-            )
-        for rid in role_ids:
-            conditions.append(
-                (PermissionOverride.principal_type == "role")
-                & (PermissionOverride.principal_id == rid)
-            )
-
         result = await self.db.execute(
-            select(PermissionOverride, Permission)
-            .join(Permission, Permission.id == PermissionOverride.permission_id)
-            .where(
-                PermissionOverride.tenant_id.in_(tenant_ids),
-                or_(*conditions),
-            )
+            _DENY_OVERRIDES,
+            {
+                "tenant_ids": tenant_ids,
+                "user_id": user_id,
+                "group_ids": group_ids,
+                "role_ids": role_ids,
+            },
         )
 
         deny_map: dict[str, str] = {}
@@ -377,15 +403,7 @@ class PermissionEngine:
         if not tenant_ids:
             return {}
 
-        result = await self.db.execute(
-            select(ABACPolicy)
-            .where(
-                ABACPolicy.tenant_id.in_(tenant_ids),
-                ABACPolicy.is_enabled.is_(True),
-                ABACPolicy.effect == PolicyEffect.DENY,
-            )
-            .order_by(ABACPolicy.priority.desc())
-        )
+        result = await self.db.execute(_DENY_POLICIES, {"tenant_ids": tenant_ids})
         policies = result.scalars().all()
 
         deny_map: dict[str, str] = {}
@@ -403,9 +421,7 @@ class PermissionEngine:
 
                 if bool(result_val) and policy.target_permission_id:
                     perm_result = await self.db.execute(
-                        select(Permission).where(
-                            Permission.id == policy.target_permission_id
-                        )
+                        _PERMISSION, {"permission_id": policy.target_permission_id}
                     )
                     perm = perm_result.scalar_one_or_none()
                     if perm:
@@ -427,14 +443,7 @@ class PermissionEngine:
         if not tenant_ids:
             return None
 
-        result = await self.db.execute(
-            select(ABACPolicy)
-            .where(
-                ABACPolicy.tenant_id.in_(tenant_ids),
-                ABACPolicy.is_enabled.is_(True),
-            )
-            .order_by(ABACPolicy.priority.desc())
-        )
+        result = await self.db.execute(_ENABLED_POLICIES, {"tenant_ids": tenant_ids})
         policies = result.scalars().all()
 
         if not policies:
@@ -449,7 +458,7 @@ class PermissionEngine:
         for policy in policies:
             if policy.target_permission_id:
                 perm_result = await self.db.execute(
-                    select(Permission).where(Permission.id == policy.target_permission_id)
+                    _PERMISSION, {"permission_id": policy.target_permission_id}
                 )
                 target_perm = perm_result.scalar_one_or_none()
                 if target_perm and target_perm.key != permission_key:
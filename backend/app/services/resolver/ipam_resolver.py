@@ -60,17 +60,15 @@ class IPAMResolver(BaseResolver):
             prefix_length = params.get("prefix_length", 24)
             ip_version = params.get("ip_version", config.get("ip_version", 4))
 
-            # Suggest next available block
-            cidr = await ipam.suggest_next_block(
-                db, address_space_uuid, prefix_length
-            )
-            if not cidr:
-                raise ValueError(
-                    f"No available /{prefix_length} block in address space '{address_space_id}'"
-                )
-
             if context.dry_run:
                 # Preview only — suggest CIDR without allocating
+                cidr = await ipam.suggest_next_block(
+                    db, address_space_uuid, prefix_length
+                )
+                if not cidr:
+                    raise ValueError(
+                        f"No available /{prefix_length} block in address space '{address_space_id}'"
+                    )
                 import ipaddress
                 network = ipaddress.ip_network(cidr)
                 hosts = list(network.hosts())
@@ -81,15 +79,17 @@ class IPAMResolver(BaseResolver):
                     "subnet_id": "(preview)",
                 }
 
-            # Allocate the block
+            # Pick and allocate the block under the address space lock
             from app.models.ipam import AllocationType
-            allocation = await ipam.allocate_block(
+            allocation = await ipam.allocate_next_block(
                 db, address_space_uuid,
-                name=f"auto-{cidr}",
-                cidr=cidr,
+                name=f"auto-/{prefix_length}",
+                prefix_length=prefix_length,
                 allocation_type=AllocationType.SUBNET,
                 purpose="Auto-allocated by IPAM resolver",
             )
+            cidr = allocation.cidr
+            allocation.name = f"auto-{cidr}"
 
             # Calculate gateway (first usable IP)
             import ipaddress
@@ -0,0 +1,299 @@
+"""
+Overview: Process-wide read cache of the semantic catalog — categories, resource types, and
+    relationship kinds — as an immutable, versioned snapshot.
+Architecture: Read path shared by the semantic service, topology validator, CMDB explorer, and
+    GraphQL resolvers (Section 5)
+Dependencies: sqlalchemy, app.models.semantic_type, app.core.config
+Concepts: The catalog is global and rarely changes, so it is loaded with three flat queries
+    and kept as frozen entries with id/name/category/children indexes. Any ORM flush touching a
+    semantic table marks the session; on commit the cached snapshot is dropped and the version
+    bumped. Other processes pick up changes within the TTL. A load that races an invalidation
+    is returned to its caller but not cached.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.semantic_type import (
+    SemanticCategory,
+    SemanticRelationshipKind,
+    SemanticResourceType,
+)
+
+logger = logging.getLogger(__name__)
+
+_CATALOG_MODELS = (SemanticCategory, SemanticResourceType, SemanticRelationshipKind)
+_DIRTY_KEY = "_semantic_catalog_dirty"
+
+
+@dataclass(frozen=True)
+class CategoryEntry:
+    id: uuid.UUID
+    name: str
+    display_name: str
+    description: str | None
+    icon: str | None
+    sort_order: int
+    is_system: bool
+    is_infrastructure: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class TypeEntry:
+    id: uuid.UUID
+    name: str
+    display_name: str
+    category_id: uuid.UUID
+    description: str | None
+    icon: str | None
+    is_abstract: bool
+    parent_type_id: uuid.UUID | None
+    properties_schema: Any
+    allowed_relationship_kinds: tuple | None
+    sort_order: int
+    is_system: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class RelationshipKindEntry:
+    id: uuid.UUID
+    name: str
+    display_name: str
+    description: str | None
+    inverse_name: str
+    is_system: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+def _frozen(mapping: dict) -> Mapping:
+    return MappingProxyType(mapping)
+
+
+def _index() -> Any:
+    """Dataclass field for an index built in ``__post_init__``."""
+    return field(init=False, repr=False, compare=False)
+
+
+@dataclass(frozen=True)
+class SemanticCatalog:
+    """Immutable catalog snapshot. Categories are in sort order, kinds in name order."""
+
+    version: int
+    categories: tuple[CategoryEntry, ...]
+    types: tuple[TypeEntry, ...]
+    relationship_kinds: tuple[RelationshipKindEntry, ...]
+    _categories_by_id: Mapping[str, CategoryEntry] = _index()
+    _types_by_id: Mapping[str, TypeEntry] = _index()
+    _types_by_name: Mapping[str, TypeEntry] = _index()
+    _types_by_category: Mapping[str, tuple[TypeEntry, ...]] = _index()
+    _children: Mapping[str, tuple[TypeEntry, ...]] = _index()
+    _kinds_by_id: Mapping[str, RelationshipKindEntry] = _index()
+
+    def __post_init__(self) -> None:
+        by_category: dict[str, list[TypeEntry]] = {}
+        children: dict[str, list[TypeEntry]] = {}
+        for t in self.types:
+            by_category.setdefault(str(t.category_id), []).append(t)
+            if t.parent_type_id:
+                children.setdefault(str(t.parent_type_id), []).append(t)
+        indexes = {
+            "_categories_by_id": {str(c.id): c for c in self.categories},
+            "_types_by_id": {str(t.id): t for t in self.types},
+            "_types_by_name": {t.name: t for t in self.types},
+            "_types_by_category": {k: tuple(v) for k, v in by_category.items()},
+            "_children": {k: tuple(v) for k, v in children.items()},
+            "_kinds_by_id": {str(k.id): k for k in self.relationship_kinds},
+        }
+        for name, index in indexes.items():
+            object.__setattr__(self, name, _frozen(index))
+
+    def category(self, category_id: uuid.UUID | str) -> CategoryEntry | None:
+        return self._categories_by_id.get(str(category_id))
+
+    def type(self, type_id: uuid.UUID | str) -> TypeEntry | None:
+        return self._types_by_id.get(str(type_id))
+
+    def type_by_name(self, name: str) -> TypeEntry | None:
+        return self._types_by_name.get(name)
+
+    def types_in(self, category_id: uuid.UUID | str) -> tuple[TypeEntry, ...]:
+        """Types of a category, in sort order."""
+        return self._types_by_category.get(str(category_id), ())
+
+    def children(self, type_id: uuid.UUID | str) -> tuple[TypeEntry, ...]:
+        return self._children.get(str(type_id), ())
+
+    def relationship_kind(self, kind_id: uuid.UUID | str) -> RelationshipKindEntry | None:
+        return self._kinds_by_id.get(str(kind_id))
+
+
+class CatalogCache:
+    """Holds the current snapshot; reloads after invalidation or once the TTL has passed."""
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._catalog: SemanticCatalog | None = None
+        self._loaded_at = 0.0
+
+    async def get(self, db: AsyncSession) -> SemanticCatalog:
+        catalog = self._catalog
+        if catalog is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+            return catalog
+
+        version = self.version
+        catalog = await _load(db, version)
+        if version == self.version:
+            self._catalog = catalog
+            self._loaded_at = time.monotonic()
+        return catalog
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._catalog = None
+
+
+async def _load(db: AsyncSession, version: int) -> SemanticCatalog:
+    categories = (
+        await db.execute(
+            select(SemanticCategory)
+            .where(SemanticCategory.deleted_at.is_(None))
+            .order_by(SemanticCategory.sort_order, SemanticCategory.name)
+        )
+    ).scalars().all()
+    types = (
+        await db.execute(
+            select(SemanticResourceType)
+            .where(SemanticResourceType.deleted_at.is_(None))
+            .order_by(SemanticResourceType.sort_order, SemanticResourceType.name)
+        )
+    ).scalars().all()
+    kinds = (
+        await db.execute(
+            select(SemanticRelationshipKind)
+            .where(SemanticRelationshipKind.deleted_at.is_(None))
+            .order_by(SemanticRelationshipKind.name)
+        )
+    ).scalars().all()
+
+    return SemanticCatalog(
+        version=version,
+        categories=tuple(
+            CategoryEntry(
+                id=c.id,
+                name=c.name,
+                display_name=c.display_name,
+                description=c.description,
+                icon=c.icon,
+                sort_order=c.sort_order,
+                is_system=c.is_system,
+                is_infrastructure=c.is_infrastructure,
+                created_at=c.created_at,
+                updated_at=c.updated_at,
+            )
+            for c in categories
+        ),
+        types=tuple(
+            TypeEntry(
+                id=t.id,
+                name=t.name,
+                display_name=t.display_name,
+                category_id=t.category_id,
+                description=t.description,
+                icon=t.icon,
+                is_abstract=t.is_abstract,
+                parent_type_id=t.parent_type_id,
+                properties_schema=t.properties_schema,
+                allowed_relationship_kinds=(
+                    tuple(t.allowed_relationship_kinds)
+                    if t.allowed_relationship_kinds is not None
+                    else None
+                ),
+                sort_order=t.sort_order,
+                is_system=t.is_system,
+                created_at=t.created_at,
+                updated_at=t.updated_at,
+            )
+            for t in types
+        ),
+        relationship_kinds=tuple(
+            RelationshipKindEntry(
+                id=k.id,
+                name=k.name,
+                display_name=k.display_name,
+                description=k.description,
+                inverse_name=k.inverse_name,
+                is_system=k.is_system,
+                created_at=k.created_at,
+                updated_at=k.updated_at,
+            )
+            for k in kinds
+        ),
+    )
+
+
+_cache: CatalogCache | None = None
+
+
+def get_catalog_cache() -> CatalogCache:
+    """The process-wide catalog cache."""
+    global _cache
+    if _cache is None:
+        from app.core.config import get_settings
+
+        _cache = CatalogCache(get_settings().semantic_catalog_ttl_seconds)
+    return _cache
+
+
+async def get_semantic_catalog(db: AsyncSession) -> SemanticCatalog:
+    """Current catalog snapshot, loading it through ``db`` if needed."""
+    return await get_catalog_cache().get(db)
+
+
+def invalidate_semantic_catalog() -> None:
+    if _cache is not None:
+        _cache.invalidate()
+
+
+# ── Invalidation on commit ─────────────────────────────────────────
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    if session.info.get(_DIRTY_KEY):
+        return
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _CATALOG_MODELS):
+            session.info[_DIRTY_KEY] = True
+            return
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop(_DIRTY_KEY, False):
+        invalidate_semantic_catalog()
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
+
+
+if not event.contains(Session, "after_flush", _after_flush):
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
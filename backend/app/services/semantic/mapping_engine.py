@@ -5,13 +5,17 @@ Architecture: Core mapping resolution layer between providers and the semantic m
 Dependencies: app.services.semantic.registry, app.services.semantic.data_classes
 Concepts: Resolution strategy: exact match → pattern match → unmapped. The engine loads
     mappings from the registry and converts raw ProviderResource objects into SemanticResource
-    objects with the correct type and normalized attributes.
+    objects with the correct type and normalized attributes. Lookup structures are built once
+    per engine: an exact index, per-provider pattern candidates, a bounded LRU of resolutions
+    (misses included), and the raw-key candidates for each semantic type's properties.
 """
 
 from __future__ import annotations
 
 import logging
 import re
+from collections import OrderedDict
+from collections.abc import Iterable
 
 from app.services.semantic.data_classes import (
     ProviderResource,
@@ -30,35 +34,52 @@ logger = logging.getLogger(__name__)
 # The fallback type name for unmapped resources
 UNMAPPED_TYPE = "UnmappedResource"
 
+# Distinct (provider, resource type) resolutions kept per engine
+RESOLVE_CACHE_SIZE = 4096
+
+# (property name, raw-key candidates, default) per property of a semantic type
+_PropertyKeys = tuple[tuple[str, tuple[str, ...], str | None], ...]
+
 
 class MappingEngine:
     """Resolves provider-specific resources to semantic types."""
 
-    def __init__(self) -> None:
+    def __init__(self, cache_size: int = RESOLVE_CACHE_SIZE) -> None:
         # Build lookup index: (provider_name, api_type) -> ProviderResourceMappingDef
         self._exact_index: dict[tuple[str, str], ProviderResourceMappingDef] = {}
+        # Pattern candidates per provider, in registry order: (lowercased api_type, mapping)
+        self._provider_index: dict[str, list[tuple[str, ProviderResourceMappingDef]]] = {}
         for mapping in PROVIDER_RESOURCE_MAPPINGS:
-            key = (mapping.provider_name.lower(), mapping.api_type.lower())
-            self._exact_index[key] = mapping
+            provider = mapping.provider_name.lower()
+            api_type = mapping.api_type.lower()
+            self._exact_index[(provider, api_type)] = mapping
+            self._provider_index.setdefault(provider, []).append((api_type, mapping))
+
+        self._cache_size = cache_size
+        self._resolved: OrderedDict[tuple[str, str], SemanticTypeDef | None] = OrderedDict()
+        self._property_keys: dict[str, _PropertyKeys] = {}
 
     def resolve(
         self, provider_name: str, provider_resource_type: str
     ) -> SemanticTypeDef | None:
         """Resolve a provider resource type to a semantic type definition.
 
-        Strategy: exact match → pattern match → None.
+        Strategy: exact match → pattern match → None. Results, including misses, are
+        memoized in a bounded LRU.
         """
-        # Exact match
-        mapping = self._exact_match(provider_name, provider_resource_type)
-        if mapping:
-            return get_type(mapping.semantic_type_name)
+        key = (provider_name.lower(), provider_resource_type.lower())
+        if key in self._resolved:
+            self._resolved.move_to_end(key)
+            return self._resolved[key]
 
-        # Pattern match (partial string matching for provider resource types)
-        mapping = self._pattern_match(provider_name, provider_resource_type)
-        if mapping:
-            return get_type(mapping.semantic_type_name)
+        # Exact match, then pattern match (partial string matching on the resource type)
+        mapping = self._exact_index.get(key) or self._pattern_match(*key)
+        type_def = get_type(mapping.semantic_type_name) if mapping else None
 
-        return None
+        self._resolved[key] = type_def
+        if len(self._resolved) > self._cache_size:
+            self._resolved.popitem(last=False)
+        return type_def
 
     def map_resource(self, provider_resource: ProviderResource) -> SemanticResource:
         """Convert a raw ProviderResource into a SemanticResource.
@@ -68,13 +89,34 @@ class MappingEngine:
         type_def = self.resolve(
             provider_resource.provider_name, provider_resource.resource_type
         )
-
         if type_def is None:
-            logger.info(
+            logger.debug(
                 "No semantic mapping for %s/%s — marking as unmapped",
                 provider_resource.provider_name,
                 provider_resource.resource_type,
             )
+        return self.map_resolved(provider_resource, type_def)
+
+    def map_resources(
+        self, provider_resources: Iterable[ProviderResource]
+    ) -> list[SemanticResource]:
+        """Map a batch of resources, resolving each distinct resource type once."""
+        resolved: dict[tuple[str, str], SemanticTypeDef | None] = {}
+        results: list[SemanticResource] = []
+        for resource in provider_resources:
+            key = (resource.provider_name, resource.resource_type)
+            if key not in resolved:
+                resolved[key] = self.resolve(*key)
+                if resolved[key] is None:
+                    logger.debug("No semantic mapping for %s/%s — marking as unmapped", *key)
+            results.append(self.map_resolved(resource, resolved[key]))
+        return results
+
+    def map_resolved(
+        self, provider_resource: ProviderResource, type_def: SemanticTypeDef | None
+    ) -> SemanticResource:
+        """Build the SemanticResource for an already-resolved type (None = unmapped)."""
+        if type_def is None:
             return SemanticResource(
                 semantic_type=UNMAPPED_TYPE,
                 provider_resource_id=provider_resource.resource_id,
@@ -96,36 +138,21 @@ class MappingEngine:
         """Get all resource mappings for a given provider."""
         return get_provider_resource_mappings(provider_name)
 
-    def _exact_match(
-        self, provider_name: str, provider_resource_type: str
-    ) -> ProviderResourceMappingDef | None:
-        """Try an exact case-insensitive match."""
-        key = (provider_name.lower(), provider_resource_type.lower())
-        return self._exact_index.get(key)
-
     def _pattern_match(
-        self, provider_name: str, provider_resource_type: str
+        self, provider_lower: str, resource_lower: str
     ) -> ProviderResourceMappingDef | None:
-        """Try partial matching on the provider resource type.
+        """Try partial matching on the (lowercased) provider resource type.
 
-        Checks if any registered mapping's resource type is a substring of the
-        given resource type (or vice versa).
+        Returns the first registered mapping of the provider whose resource type is a
+        substring of the given resource type (or vice versa).
         """
-        provider_lower = provider_name.lower()
-        resource_lower = provider_resource_type.lower()
-
-        for mapping in PROVIDER_RESOURCE_MAPPINGS:
-            if mapping.provider_name.lower() != provider_lower:
-                continue
-            registered = mapping.api_type.lower()
+        for registered, mapping in self._provider_index.get(provider_lower, ()):
             if registered in resource_lower or resource_lower in registered:
                 return mapping
-
         return None
 
-    @staticmethod
     def _extract_attributes(
-        type_def: SemanticTypeDef, raw_attributes: dict
+        self, type_def: SemanticTypeDef, raw_attributes: dict
     ) -> dict:
         """Extract attributes from raw data based on the type's property schema.
 
@@ -136,22 +163,16 @@ class MappingEngine:
         result: dict = {}
         matched_keys: set[str] = set()
 
-        for prop in type_def.properties:
-            # Try exact match first, then snake_case variations
-            candidates = [
-                prop.name,
-                prop.name.lower(),
-                _to_snake_case(prop.name),
-            ]
+        for name, candidates, default_value in self._keys_for(type_def):
             for candidate in candidates:
                 if candidate in raw_attributes:
-                    result[prop.name] = raw_attributes[candidate]
+                    result[name] = raw_attributes[candidate]
                     matched_keys.add(candidate)
                     break
             else:
                 # Property not found in raw attributes — use default if available
-                if prop.default_value is not None:
-                    result[prop.name] = prop.default_value
+                if default_value is not None:
+                    result[name] = default_value
 
         # Collect unmatched raw attributes
         extra = {k: v for k, v in raw_attributes.items() if k not in matched_keys}
@@ -160,6 +181,21 @@ class MappingEngine:
 
         return result
 
+    def _keys_for(self, type_def: SemanticTypeDef) -> _PropertyKeys:
+        """Raw-key candidates per property (exact, lowercase, snake_case), computed once."""
+        keys = self._property_keys.get(type_def.name)
+        if keys is None:
+            keys = tuple(
+                (
+                    prop.name,
+                    tuple(dict.fromkeys((prop.name, prop.name.lower(), _to_snake_case(prop.name)))),
+                    prop.default_value,
+                )
+                for prop in type_def.properties
+            )
+            self._property_keys[type_def.name] = keys
+        return keys
+
 
 def _to_snake_case(name: str) -> str:
     """Convert camelCase or PascalCase to snake_case."""
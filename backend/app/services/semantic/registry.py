@@ -1605,6 +1605,12 @@ _CATEGORY_MAP: dict[str, SemanticCategoryDef] = {c.name: c for c in CATEGORIES}
 _TYPE_MAP: dict[str, SemanticTypeDef] = {t.name: t for t in SEMANTIC_TYPES}
 _RELATIONSHIP_MAP: dict[str, RelationshipKindDef] = {r.name: r for r in RELATIONSHIP_KINDS}
 _PROVIDER_MAP: dict[str, ProviderDef] = {p.name: p for p in PROVIDERS}
+_TYPES_BY_CATEGORY: dict[str, list[SemanticTypeDef]] = {}
+for _t in SEMANTIC_TYPES:
+    _TYPES_BY_CATEGORY.setdefault(_t.category, []).append(_t)
+_MAPPINGS_BY_PROVIDER: dict[str, list[ProviderResourceMappingDef]] = {}
+for _m in PROVIDER_RESOURCE_MAPPINGS:
+    _MAPPINGS_BY_PROVIDER.setdefault(_m.provider_name, []).append(_m)
 
 
 def get_category(name: str) -> SemanticCategoryDef | None:
@@ -1624,7 +1630,7 @@ def get_relationship_kind(name: str) -> RelationshipKindDef | None:
 
 def get_types_by_category(category_name: str) -> list[SemanticTypeDef]:
     """Get all types belonging to a category."""
-    return [t for t in SEMANTIC_TYPES if t.category == category_name]
+    return list(_TYPES_BY_CATEGORY.get(category_name, ()))
 
 
 def get_provider(name: str) -> ProviderDef | None:
@@ -1634,4 +1640,4 @@ def get_provider(name: str) -> ProviderDef | None:
 
 def get_provider_resource_mappings(provider_name: str) -> list[ProviderResourceMappingDef]:
     """Get all resource mappings for a given provider."""
-    return [m for m in PROVIDER_RESOURCE_MAPPINGS if m.provider_name == provider_name]
+    return list(_MAPPINGS_BY_PROVIDER.get(provider_name, ()))
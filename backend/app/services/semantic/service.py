@@ -4,7 +4,8 @@ Overview: Semantic layer service — queries and manages semantic types, categor
 Architecture: Service layer for semantic catalog operations (Section 5)
 Dependencies: sqlalchemy, app.models.semantic_type
 Concepts: CRUD operations with is_system protection. System records cannot be deleted or renamed.
-    No tenant scoping — semantic types are global.
+    No tenant scoping — semantic types are global. Catalog reads can use the process-wide
+    snapshot (catalog_cache), which is dropped when a semantic change commits.
 """
 
 import logging
@@ -21,6 +22,7 @@ from app.models.semantic_type import (
     SemanticRelationshipKind,
     SemanticResourceType,
 )
+from app.services.semantic.catalog_cache import SemanticCatalog, get_semantic_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,12 @@ class SemanticService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    # -- Catalog snapshot --------------------------------------------------
+
+    async def get_catalog(self) -> SemanticCatalog:
+        """Cached, immutable snapshot of categories, types, and relationship kinds."""
+        return await get_semantic_catalog(self.db)
+
     # -- Categories (read) -------------------------------------------------
 
     async def list_categories(self) -> list[SemanticCategory]:
@@ -61,7 +61,7 @@ class SetupService:
         # Create admin user
         user = User(
             email=admin_email,
-            password_hash=hash_password(admin_password),
+            password_hash=await hash_password(admin_password),
             display_name="Admin",
             provider_id=provider.id,
         )
@@ -205,6 +205,13 @@ class TenantService:
         )
         return list(result.scalars().all()), total
 
+    async def list_tenant_ids(self, provider_id: str) -> set[str]:
+        """IDs of all of a provider's tenants, deleted ones included."""
+        result = await self.db.execute(
+            select(Tenant.id).where(Tenant.provider_id == provider_id)
+        )
+        return {str(tenant_id) for tenant_id in result.scalars().all()}
+
     async def get_tenant_hierarchy(self, tenant_id: str) -> Tenant | None:
         """Get a tenant with its full hierarchy (children loaded eagerly, up to 3 levels)."""
         result = await self.db.execute(
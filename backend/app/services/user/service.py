@@ -145,7 +145,7 @@ class UserService:
 
         user = User(
             email=email,
-            password_hash=hash_password(password) if password else None,
+            password_hash=await hash_password(password) if password else None,
             display_name=display_name,
             provider_id=provider_id,
             identity_provider_id=identity_provider_id,
@@ -97,11 +97,12 @@ async def find_tenants_for_archival() -> list[str]:
 @activity.defn
 async def execute_audit_export(input: ExportInput) -> ExportResult:
     """Execute an audit log export and upload to MinIO."""
-    from app.db.session import async_session_factory
+    from app.db.replica import read_session_factory
     from app.services.audit.export import AuditExportService
 
     try:
-        async with async_session_factory() as db:
+        # Exports only read: use the replica when it has replayed the tenant's last write
+        async with (await read_session_factory(input.tenant_id))() as db:
             service = AuditExportService(db)
             object_name = await service.execute_export(
                 tenant_id=input.tenant_id,
@@ -0,0 +1,87 @@
+"""
+Overview: Temporal activity for bulk estimation repricing.
+Architecture: Service delivery estimation activities (Section 8, Section 9)
+Dependencies: temporalio, app.services.cmdb.estimation_recalc_service
+Concepts: Temporal activities, heartbeat progress reporting, chunked commits
+"""
+
+from dataclasses import dataclass
+
+from temporalio import activity
+
+
+@dataclass
+class EstimationRecalcInput:
+    tenant_id: str
+    price_list_id: str | None = None
+    delivery_region_id: str | None = None
+    refresh_rates: bool = True
+    refresh_prices: bool = True
+    batch_size: int = 500
+
+
+@dataclass
+class EstimationRecalcResult:
+    tenant_id: str
+    estimations_scanned: int
+    estimations_updated: int
+    line_items_updated: int
+    prices_unresolved: int
+    success: bool
+    error: str | None = None
+
+
+@activity.defn
+async def recalculate_estimations(input: EstimationRecalcInput) -> EstimationRecalcResult:
+    """Reprice all draft estimations in scope, heartbeating progress after each chunk.
+
+    Each chunk is committed before the heartbeat; recalculation is idempotent, so a
+    retried activity simply finds fewer rows to change.
+    """
+    from app.db.session import async_session_factory
+    from app.services.cmdb.estimation_recalc_service import EstimationRecalcService
+
+    try:
+        async with async_session_factory() as db:
+            service = EstimationRecalcService(db)
+
+            async def _progress(processed: int, total: int) -> None:
+                await db.commit()
+                activity.heartbeat({"processed": processed, "total": total})
+
+            result = await service.recalculate(
+                input.tenant_id,
+                price_list_id=input.price_list_id,
+                delivery_region_id=input.delivery_region_id,
+                refresh_rates=input.refresh_rates,
+                refresh_prices=input.refresh_prices,
+                batch_size=input.batch_size,
+                progress=_progress,
+            )
+            await db.commit()
+
+            activity.logger.info(
+                f"Recalculated {result.estimations_updated}/{result.estimations_scanned} "
+                f"estimations for tenant {input.tenant_id}"
+            )
+            return EstimationRecalcResult(
+                tenant_id=input.tenant_id,
+                estimations_scanned=result.estimations_scanned,
+                estimations_updated=result.estimations_updated,
+                line_items_updated=result.line_items_updated,
+                prices_unresolved=result.prices_unresolved,
+                success=True,
+            )
+    except Exception as e:
+        activity.logger.error(
+            f"Estimation recalculation failed for tenant {input.tenant_id}: {e}"
+        )
+        return EstimationRecalcResult(
+            tenant_id=input.tenant_id,
+            estimations_scanned=0,
+            estimations_updated=0,
+            line_items_updated=0,
+            prices_unresolved=0,
+            success=False,
+            error=str(e),
+        )
@@ -0,0 +1,48 @@
+"""
+Overview: Temporal activities for the nightly CMDB explorer count rebuild.
+Architecture: CMDB explorer count maintenance activities (Section 8, Section 9)
+Dependencies: temporalio, app.services.cmdb.ci_service
+Concepts: Temporal activities, per-tenant rebuild committed independently
+"""
+
+from dataclasses import dataclass
+
+from temporalio import activity
+
+
+@dataclass
+class ExplorerCountRebuildResult:
+    tenant_id: str
+    buckets: int
+    success: bool
+    error: str | None = None
+
+
+@activity.defn
+async def find_explorer_count_tenants() -> list[str]:
+    """Find tenants whose explorer counts should be rebuilt."""
+    from app.db.session import async_session_factory
+    from app.services.cmdb.ci_service import CIService
+
+    async with async_session_factory() as db:
+        tenant_ids = await CIService(db).find_explorer_count_tenants()
+        activity.logger.info(f"Found {len(tenant_ids)} tenants for explorer count rebuild")
+        return tenant_ids
+
+
+@activity.defn
+async def rebuild_tenant_explorer_counts(tenant_id: str) -> ExplorerCountRebuildResult:
+    """Recompute one tenant's explorer count buckets from its live CIs (idempotent)."""
+    from app.db.session import async_session_factory
+    from app.services.cmdb.ci_service import CIService
+
+    try:
+        async with async_session_factory() as db:
+            buckets = await CIService(db).rebuild_explorer_counts(tenant_id)
+            await db.commit()
+            return ExplorerCountRebuildResult(tenant_id=tenant_id, buckets=buckets, success=True)
+    except Exception as e:
+        activity.logger.error(f"Explorer count rebuild failed for tenant {tenant_id}: {e}")
+        return ExplorerCountRebuildResult(
+            tenant_id=tenant_id, buckets=0, success=False, error=str(e)
+        )
@@ -0,0 +1,48 @@
+"""
+Overview: Temporal activities for the nightly profitability rollup rebuild.
+Architecture: Service delivery profitability activities (Section 8, Section 9)
+Dependencies: temporalio, app.services.cmdb.profitability_service
+Concepts: Temporal activities, per-tenant rebuild committed independently
+"""
+
+from dataclasses import dataclass
+
+from temporalio import activity
+
+
+@dataclass
+class ProfitabilityRebuildResult:
+    tenant_id: str
+    buckets: int
+    success: bool
+    error: str | None = None
+
+
+@activity.defn
+async def find_profitability_tenants() -> list[str]:
+    """Find tenants whose profitability rollups should be rebuilt."""
+    from app.db.session import async_session_factory
+    from app.services.cmdb.profitability_service import ProfitabilityService
+
+    async with async_session_factory() as db:
+        tenant_ids = await ProfitabilityService(db).find_rollup_tenants()
+        activity.logger.info(f"Found {len(tenant_ids)} tenants for profitability rebuild")
+        return tenant_ids
+
+
+@activity.defn
+async def rebuild_tenant_profitability(tenant_id: str) -> ProfitabilityRebuildResult:
+    """Recompute one tenant's rollup buckets from its approved estimations (idempotent)."""
+    from app.db.session import async_session_factory
+    from app.services.cmdb.profitability_service import ProfitabilityService
+
+    try:
+        async with async_session_factory() as db:
+            buckets = await ProfitabilityService(db).rebuild(tenant_id)
+            await db.commit()
+            return ProfitabilityRebuildResult(tenant_id=tenant_id, buckets=buckets, success=True)
+    except Exception as e:
+        activity.logger.error(f"Profitability rebuild failed for tenant {tenant_id}: {e}")
+        return ProfitabilityRebuildResult(
+            tenant_id=tenant_id, buckets=0, success=False, error=str(e)
+        )
@@ -28,11 +28,12 @@ class ExportResult:
 @activity.defn
 async def execute_tenant_export(input: ExportInput) -> ExportResult:
     """Execute a tenant data export and upload to MinIO."""
-    from app.db.session import async_session_factory
+    from app.db.replica import read_session_factory
     from app.services.tenant.export_service import ExportService
 
     try:
-        async with async_session_factory() as db:
+        # Exports only read: use the replica when it has replayed the tenant's last write
+        async with (await read_session_factory(input.tenant_id))() as db:
             service = ExportService(db)
             object_name = await service.execute_export(input.tenant_id, input.job_id)
             activity.logger.info(
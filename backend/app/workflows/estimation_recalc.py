@@ -0,0 +1,55 @@
+"""
+Overview: Temporal workflow for bulk estimation repricing after price or rate changes.
+Architecture: Durable estimation recalculation workflow (Section 8, Section 9)
+Dependencies: temporalio, app.workflows.activities.estimation
+Concepts: Temporal workflows, heartbeat-tracked long-running activity
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+from temporalio import workflow
+
+with workflow.unsafe.imports_passed_through():
+    from app.workflows.activities.estimation import (
+        EstimationRecalcInput,
+        recalculate_estimations,
+    )
+
+
+@dataclass
+class EstimationRecalcParams:
+    tenant_id: str
+    price_list_id: str | None = None
+    delivery_region_id: str | None = None
+    refresh_rates: bool = True
+    refresh_prices: bool = True
+
+
+@workflow.defn
+class EstimationRecalcWorkflow:
+    @workflow.run
+    async def run(self, params: EstimationRecalcParams) -> dict:
+        """Reprice every draft estimation matching the given scope."""
+        result = await workflow.execute_activity(
+            recalculate_estimations,
+            EstimationRecalcInput(
+                tenant_id=params.tenant_id,
+                price_list_id=params.price_list_id,
+                delivery_region_id=params.delivery_region_id,
+                refresh_rates=params.refresh_rates,
+                refresh_prices=params.refresh_prices,
+            ),
+            start_to_close_timeout=timedelta(hours=1),
+            heartbeat_timeout=timedelta(minutes=2),
+        )
+
+        return {
+            "tenant_id": result.tenant_id,
+            "estimations_scanned": result.estimations_scanned,
+            "estimations_updated": result.estimations_updated,
+            "line_items_updated": result.line_items_updated,
+            "prices_unresolved": result.prices_unresolved,
+            "success": result.success,
+            "error": result.error,
+        }
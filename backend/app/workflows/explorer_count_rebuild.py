@@ -0,0 +1,48 @@
+"""
+Overview: Temporal workflow that rebuilds CMDB explorer counts from live configuration items.
+Architecture: Durable explorer count maintenance workflow (Section 8, Section 9)
+Dependencies: temporalio, app.workflows.activities.explorer_counts
+Concepts: Temporal workflows, scheduled drift repair of trigger-maintained counts.
+    Runs nightly over every tenant, or for one tenant when started with its id.
+"""
+
+from datetime import timedelta
+
+from temporalio import workflow
+
+with workflow.unsafe.imports_passed_through():
+    from app.workflows.activities.explorer_counts import (
+        find_explorer_count_tenants,
+        rebuild_tenant_explorer_counts,
+    )
+
+
+@workflow.defn
+class ExplorerCountRebuildWorkflow:
+    @workflow.run
+    async def run(self, tenant_id: str | None = None) -> dict:
+        """Rebuild the explorer counts of one tenant, or of every tenant with CIs."""
+        if tenant_id is not None:
+            tenant_ids = [tenant_id]
+        else:
+            tenant_ids = await workflow.execute_activity(
+                find_explorer_count_tenants,
+                start_to_close_timeout=timedelta(seconds=60),
+            )
+
+        results = {"rebuilt": 0, "buckets": 0, "failed": 0, "errors": []}
+
+        for tid in tenant_ids:
+            result = await workflow.execute_activity(
+                rebuild_tenant_explorer_counts,
+                tid,
+                start_to_close_timeout=timedelta(minutes=10),
+            )
+            if result.success:
+                results["rebuilt"] += 1
+                results["buckets"] += result.buckets
+            else:
+                results["failed"] += 1
+                results["errors"].append({"tenant_id": tid, "error": result.error})
+
+        return results
@@ -0,0 +1,48 @@
+"""
+Overview: Temporal workflow that rebuilds profitability rollups from approved estimations.
+Architecture: Durable profitability rollup maintenance workflow (Section 8, Section 9)
+Dependencies: temporalio, app.workflows.activities.profitability
+Concepts: Temporal workflows, scheduled drift repair of incrementally maintained rollups.
+    Runs nightly over every tenant, or for one tenant when started with its id.
+"""
+
+from datetime import timedelta
+
+from temporalio import workflow
+
+with workflow.unsafe.imports_passed_through():
+    from app.workflows.activities.profitability import (
+        find_profitability_tenants,
+        rebuild_tenant_profitability,
+    )
+
+
+@workflow.defn
+class ProfitabilityRebuildWorkflow:
+    @workflow.run
+    async def run(self, tenant_id: str | None = None) -> dict:
+        """Rebuild the rollups of one tenant, or of every tenant with estimations."""
+        if tenant_id is not None:
+            tenant_ids = [tenant_id]
+        else:
+            tenant_ids = await workflow.execute_activity(
+                find_profitability_tenants,
+                start_to_close_timeout=timedelta(seconds=60),
+            )
+
+        results = {"rebuilt": 0, "buckets": 0, "failed": 0, "errors": []}
+
+        for tid in tenant_ids:
+            result = await workflow.execute_activity(
+                rebuild_tenant_profitability,
+                tid,
+                start_to_close_timeout=timedelta(minutes=10),
+            )
+            if result.success:
+                results["rebuilt"] += 1
+                results["buckets"] += result.buckets
+            else:
+                results["failed"] += 1
+                results["errors"].append({"tenant_id": tid, "error": result.error})
+
+        return results
@@ -1,7 +1,8 @@
 """
 Overview: Declarative registry of Temporal Schedules for recurring workflows.
 Architecture: Schedule definitions for Temporal worker registration (Section 9)
-Dependencies: temporalio, app.workflows.audit_archive, app.workflows.tenant_purge
+Dependencies: temporalio, app.workflows.audit_archive, app.workflows.tenant_purge,
+    app.workflows.profitability_rebuild, app.workflows.explorer_count_rebuild
 Concepts: Temporal Schedules, cron-based recurring workflows
 """
 
@@ -31,4 +32,16 @@ SCHEDULES: list[ScheduleDefinition] = [
         cron="0 4 * * *",
         description="Purge soft-deleted tenants past retention (daily 4 AM UTC)",
     ),
+    ScheduleDefinition(
+        schedule_id="nimbus-profitability-rebuild",
+        workflow_name="ProfitabilityRebuildWorkflow",
+        cron="0 2 * * *",
+        description="Rebuild profitability rollups from approved estimations (daily 2 AM UTC)",
+    ),
+    ScheduleDefinition(
+        schedule_id="nimbus-explorer-count-rebuild",
+        workflow_name="ExplorerCountRebuildWorkflow",
+        cron="30 2 * * *",
+        description="Rebuild CMDB explorer counts from live CIs (daily 2:30 AM UTC)",
+    ),
 ]
@@ -43,7 +43,12 @@ from app.workflows.activities.audit import (
     execute_audit_export,
     find_tenants_for_archival,
 )
+from app.workflows.activities.estimation import recalculate_estimations
 from app.workflows.activities.example import say_hello
+from app.workflows.activities.explorer_counts import (
+    find_explorer_count_tenants,
+    rebuild_tenant_explorer_counts,
+)
 from app.workflows.activities.impersonation import (
     activate_impersonation_session,
     end_impersonation_session,
@@ -56,6 +61,10 @@ from app.workflows.activities.notification import (
     send_email_activity,
     send_webhook_batch_activity,
 )
+from app.workflows.activities.profitability import (
+    find_profitability_tenants,
+    rebuild_tenant_profitability,
+)
 from app.workflows.activities.tenant_export import execute_tenant_export
 from app.workflows.activities.tenant_purge import (
     find_purgeable_tenants,
@@ -72,8 +81,11 @@ from app.workflows.approval import ApprovalChainWorkflow
 from app.workflows.deployment_workflow import DeploymentExecutionWorkflow, DeploymentSagaWorkflow
 from app.workflows.audit_archive import AuditArchiveWorkflow
 from app.workflows.audit_export import AuditExportWorkflow
+from app.workflows.estimation_recalc import EstimationRecalcWorkflow
 from app.workflows.example import ExampleWorkflow
+from app.workflows.explorer_count_rebuild import ExplorerCountRebuildWorkflow
 from app.workflows.impersonation import ImpersonationWorkflow
+from app.workflows.profitability_rebuild import ProfitabilityRebuildWorkflow
 from app.workflows.schedules import SCHEDULES
 from app.workflows.send_email import SendEmailWorkflow
 from app.workflows.send_webhook_batch import SendWebhookBatchWorkflow
@@ -113,6 +125,11 @@ async def run_worker() -> None:
     settings = get_settings()
     client = await get_temporal_client()
 
+    # Activities write through the ORM: publish their response cache invalidations
+    from app.services.cache.response_cache import register_response_cache_hooks
+
+    register_response_cache_hooks()
+
     # Register recurring schedules before starting the worker
     await register_schedules(client, settings.temporal_task_queue)
 
@@ -132,6 +149,9 @@ async def run_worker() -> None:
             DynamicWorkflowExecutor,
             DeploymentExecutionWorkflow,
             DeploymentSagaWorkflow,
+            EstimationRecalcWorkflow,
+            ProfitabilityRebuildWorkflow,
+            ExplorerCountRebuildWorkflow,
         ],
         activities=[
             create_approval_request_activity,
@@ -166,6 +186,11 @@ async def run_worker() -> None:
             delete_deployment_ci,
             finalize_deployment,
             update_deployment_status,
+            recalculate_estimations,
+            find_profitability_tenants,
+            rebuild_tenant_profitability,
+            find_explorer_count_tenants,
+            rebuild_tenant_explorer_counts,
         ],
     )
 
@@ -0,0 +1,154 @@
+"""
+Overview: CI search benchmark — latency of the legacy ILIKE scan versus indexed, ranked search.
+Architecture: Standalone benchmark against a migrated PostgreSQL database (Section 8)
+Dependencies: sqlalchemy, app.services.cmdb.search_service
+Concepts: Seeds N synthetic CIs (default 1M) into an existing tenant with one set-based
+    INSERT ... SELECT generate_series, ANALYZEs, then times each query shape: the previous
+    four-way ILIKE with an exact COUNT(*), and SearchService.search_cis (tsvector + trigram
+    indexes, capped count). Reports p50/p95/max per query. Seeded rows carry a bench tag and
+    are removed with --cleanup.
+
+    python -m benchmarks.ci_search --tenant-id <uuid> [--rows 1000000] [--repeat 20] [--cleanup]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import func, or_, select, text
+
+from app.db.session import async_session_factory
+from app.models.cmdb.ci import ConfigurationItem
+from app.models.cmdb.ci_class import CIClass
+from app.services.cmdb.search_service import SearchService
+
+BENCH_TAG = "ci-search-bench"
+
+QUERIES = [
+    "vm-0424242",          # single-row identifier
+    "i-0abc",              # cloud id prefix shared by ~1/16 of rows
+    "payments",            # word in description, ~10%
+    "eu-west-1",           # URN fragment, ~25%
+    "no-such-thing",       # empty result
+]
+
+
+async def seed(tenant_id: str, rows: int) -> None:
+    async with async_session_factory() as db:
+        existing = await db.scalar(
+            select(func.count()).where(
+                ConfigurationItem.tenant_id == tenant_id,
+                ConfigurationItem.tags["bench"].astext == BENCH_TAG,
+            )
+        )
+        if existing >= rows:
+            return
+        class_id = await db.scalar(
+            select(CIClass.id).where(CIClass.deleted_at.is_(None)).order_by(CIClass.name).limit(1)
+        )
+        await db.execute(
+            text("""
+                INSERT INTO configuration_items (
+                    id, tenant_id, ci_class_id, name, description, lifecycle_state,
+                    attributes, tags, cloud_resource_id, pulumi_urn
+                )
+                SELECT
+                    gen_random_uuid(), :tenant_id, :class_id,
+                    'vm-' || lpad(g::text, 7, '0'),
+                    (ARRAY['payments api node', 'batch worker', 'edge cache', 'ledger db',
+                           'search shard', 'auth gateway', 'metrics relay', 'queue broker',
+                           'image resizer', 'billing export'])[1 + g % 10],
+                    'active', '{}'::jsonb,
+                    jsonb_build_object('bench', :tag, 'env', (ARRAY['prod','stage','dev'])[1 + g % 3]),
+                    'i-0' || to_hex(g * 2654435761 % 4294967296),
+                    'urn:pulumi:' || (ARRAY['eu-west-1','us-east-1','ap-south-1','eu-central-1'])[1 + g % 4]
+                        || '::infra::aws:ec2/instance:Instance::vm-' || g
+                FROM generate_series(:start, :stop) AS g
+            """),
+            {"tenant_id": tenant_id, "class_id": class_id, "tag": BENCH_TAG,
+             "start": existing + 1, "stop": rows},
+        )
+        await db.commit()
+        await db.execute(text("ANALYZE configuration_items"))
+        await db.commit()
+
+
+async def legacy_search(db, tenant_id: str, query: str) -> int:
+    """The pre-index query shape: four ILIKEs, exact count, then a page."""
+    pattern = f"%{query}%"
+    stmt = select(ConfigurationItem).where(
+        ConfigurationItem.tenant_id == tenant_id,
+        ConfigurationItem.deleted_at.is_(None),
+        or_(
+            ConfigurationItem.name.ilike(pattern),
+            ConfigurationItem.description.ilike(pattern),
+            ConfigurationItem.cloud_resource_id.ilike(pattern),
+            ConfigurationItem.pulumi_urn.ilike(pattern),
+        ),
+    )
+    total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+    await db.execute(stmt.order_by(ConfigurationItem.name).limit(50))
+    return total or 0
+
+
+async def indexed_search(db, tenant_id: str, query: str) -> int:
+    _, total = await SearchService(db).search_cis(tenant_id, query=query, limit=50)
+    return total
+
+
+async def time_it(fn, tenant_id: str, query: str, repeat: int) -> tuple[list[float], int]:
+    samples = []
+    total = 0
+    async with async_session_factory() as db:
+        await fn(db, tenant_id, query)  # warm cache
+        for _ in range(repeat):
+            started = time.perf_counter()
+            total = await fn(db, tenant_id, query)
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples, total
+
+
+def _fmt(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"p50 {statistics.median(ordered):8.1f} ms  p95 {p95:8.1f} ms  max {ordered[-1]:8.1f} ms"
+
+
+async def cleanup(tenant_id: str) -> None:
+    async with async_session_factory() as db:
+        await db.execute(
+            text("DELETE FROM configuration_items WHERE tenant_id = :t AND tags->>'bench' = :tag"),
+            {"t": tenant_id, "tag": BENCH_TAG},
+        )
+        await db.commit()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1].strip())
+    parser.add_argument("--tenant-id", required=True, type=uuid.UUID)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+    tenant_id = str(args.tenant_id)
+
+    if args.cleanup:
+        await cleanup(tenant_id)
+        return
+
+    await seed(tenant_id, args.rows)
+    print(f"{args.rows:,} CIs, {args.repeat} runs per query\n")
+    for query in QUERIES:
+        legacy, legacy_total = await time_it(legacy_search, tenant_id, query, args.repeat)
+        indexed, indexed_total = await time_it(indexed_search, tenant_id, query, args.repeat)
+        print(f"{query!r}  (matches: {legacy_total:,}; reported: {indexed_total:,})")
+        print(f"  legacy   {_fmt(legacy)}")
+        print(f"  indexed  {_fmt(indexed)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+Overview: Import-time benchmark for process entry points — API app and Temporal worker.
+Architecture: Standalone startup benchmark (Sections 3, 4)
+Dependencies: stdlib only (runs each import in a fresh interpreter with -X importtime)
+Concepts: Each entry point is imported N times in a clean subprocess; the cumulative import
+    time of the top module is reported (median/min/max) with the heaviest modules by self time
+    from the median run. The large static registries (semantic types, credential schemas,
+    landing-zone catalogs, blueprints, hierarchies) are imported on first use by the services
+    and resolvers that need them; --check fails if any of them is on a startup import path.
+
+    python -m benchmarks.import_time [--repeat 5] [--top 15] [--check] [module ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ENTRY_POINTS = ["app.main", "app.workflows.worker"]
+
+LAZY_REGISTRIES = [
+    "app.services.semantic.registry",
+    "app.services.cloud.credential_schemas",
+    "app.services.landing_zone.lz_option_catalog",
+    "app.services.landing_zone.env_option_catalog",
+    "app.services.landing_zone.blueprints",
+    "app.services.landing_zone.hierarchy_registry",
+]
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def measure(module: str) -> dict[str, tuple[int, int]]:
+    """Import ``module`` in a fresh interpreter; {module: (self_us, cumulative_us)}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=False,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    timings: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def report(module: str, repeat: int, top: int) -> list[str]:
+    """Print timings for one entry point; returns the lazy registries it imported."""
+    runs = [measure(module) for _ in range(repeat)]
+    totals = [run[module][1] for run in runs]
+    median_run = sorted(runs, key=lambda run: run[module][1])[len(runs) // 2]
+
+    print(f"\n{module}: median {statistics.median(totals) / 1000:.0f} ms "
+          f"(min {min(totals) / 1000:.0f}, max {max(totals) / 1000:.0f}, n={repeat})")
+    heaviest = sorted(median_run.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    for name, (self_us, cumulative_us) in heaviest:
+        print(f"  {self_us / 1000:8.1f} ms self {cumulative_us / 1000:9.1f} ms cum  {name}")
+
+    loaded = [name for name in LAZY_REGISTRIES if name in median_run]
+    for name in loaded:
+        print(f"  ! registry imported at startup: {name}")
+    return loaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1].strip())
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--check", action="store_true",
+                        help="exit non-zero if a lazy registry is imported at startup")
+    args = parser.parse_args()
+
+    loaded = [name for module in args.modules for name in report(module, args.repeat, args.top)]
+    if args.check and loaded:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
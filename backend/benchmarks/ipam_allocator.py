@@ -0,0 +1,106 @@
+"""
+Overview: IPAM allocator benchmark — subnet enumeration versus the free-block index.
+Architecture: Standalone benchmark, no database required (Section 5)
+Dependencies: app.services.ipam.allocator, app.services.ipam.validation
+Concepts: For each (parent, request prefix) pair the parent is pre-filled with N random child
+    blocks, then the previous approach (walk parent.subnets() and test every candidate against
+    every child) is timed against next_available_block (build index + first-fit) and against
+    repeated allocations from one FreeBlockIndex. The enumeration is skipped once the candidate
+    count makes it impractical (--max-candidates).
+
+    python -m benchmarks.ipam_allocator [--children 200] [--repeat 5] [--max-candidates 2000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import random
+import statistics
+import time
+
+from app.services.ipam.allocator import FreeBlockIndex, Span, parse_span
+from app.services.ipam.validation import next_available_block
+
+CASES = [
+    ("10.0.0.0/16", 24),
+    ("10.0.0.0/16", 28),
+    ("10.0.0.0/12", 24),
+    ("10.0.0.0/8", 24),
+    ("10.0.0.0/8", 28),
+    ("fd00::/32", 48),
+    ("fd00::/32", 64),
+]
+
+
+def enumerate_first_fit(parent_cidr: str, existing: list[str], prefix: int) -> str | None:
+    """The previous next_available_block: enumerate candidates, test each against all children."""
+    parent = ipaddress.ip_network(parent_cidr, strict=False)
+    nets = [ipaddress.ip_network(c, strict=False) for c in existing]
+    for candidate in parent.subnets(new_prefix=prefix):
+        if not any(candidate.overlaps(n) for n in nets):
+            return str(candidate)
+    return None
+
+
+def fill(parent_cidr: str, prefix: int, children: int, rng: random.Random) -> list[str]:
+    """Random-sized children packed first-fit from the bottom of the parent, so the first free
+    block lies past all of them."""
+    parent = parse_span(parent_cidr)
+    index = FreeBlockIndex(parent)
+    used = []
+    for _ in range(children):
+        span = index.allocate(min(prefix, rng.randint(parent.prefix + 1, prefix)))
+        if span is None:
+            break
+        used.append(span.to_cidr())
+    return used
+
+
+def timed(repeat: int, fn, *args) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def allocate_many(parent: Span, existing: list[str], prefix: int) -> None:
+    index = FreeBlockIndex(parent, [parse_span(c) for c in existing])
+    for _ in range(100):
+        index.allocate(prefix)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1].strip())
+    parser.add_argument("--children", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-candidates", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{'parent':<14}{'/req':>5}{'candidates':>14}{'enumerate':>13}"
+          f"{'index':>11}{'alloc x100':>13}")
+    for parent_cidr, prefix in CASES:
+        existing = fill(parent_cidr, prefix, args.children, rng)
+        parent = parse_span(parent_cidr)
+        candidates = 1 << (prefix - parent.prefix)
+        expected = next_available_block(parent_cidr, existing, prefix)
+
+        if candidates <= args.max_candidates:
+            assert enumerate_first_fit(parent_cidr, existing, prefix) == expected
+            seconds = timed(args.repeat, enumerate_first_fit, parent_cidr, existing, prefix)
+            legacy = f"{seconds * 1000:10.2f}ms"
+        else:
+            legacy = f"{'skipped':>12}"
+        indexed = timed(args.repeat, next_available_block, parent_cidr, existing, prefix)
+
+        batch = timed(args.repeat, allocate_many, parent, existing, prefix)
+        print(f"{parent_cidr:<14}{prefix:>5}{candidates:>14,} {legacy}"
+              f"{indexed * 1000:9.3f}ms{batch * 1000:11.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Overview: Middleware stack benchmark — the previous four BaseHTTPMiddleware classes versus the
+    pure-ASGI request pipeline.
+Architecture: Standalone benchmark, no database or server required (Section 3.1)
+Dependencies: httpx, starlette, app.core.middleware, app.core.audit_middleware
+Concepts: Both stacks wrap the same Starlette app (a small JSON endpoint and a 64-chunk
+    streaming endpoint) and are driven in-process through httpx's ASGI transport with a fixed
+    number of concurrent clients, so the numbers isolate middleware overhead. The legacy stack
+    is reproduced here from the previous app.core.middleware / audit_middleware. Audit config
+    lookup and writes are stubbed for both. Reports p50/p99 latency and requests per second,
+    then the pipeline's per-stage timing totals.
+
+    python -m benchmarks.middleware_stack [--requests 5000] [--concurrency 32]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core import audit_middleware
+from app.core.audit_middleware import AuditStage, _detect_event_type, _should_log
+from app.core.middleware import (
+    RequestPipeline,
+    SecurityHeadersStage,
+    TenantContextStage,
+    TraceIDStage,
+    pipeline_timings,
+    reset_pipeline_timings,
+)
+from app.core.tenant_context import clear_tenant_context, set_current_tenant_id
+from app.services.auth.jwt import create_access_token, decode_token
+
+CONFIG = {"log_api_reads": True, "log_api_writes": True, "log_errors": True}
+
+
+# ── Previous middleware (BaseHTTPMiddleware) ─────────────────────────
+
+
+class LegacyTraceID(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        trace_id = request.headers.get("X-Trace-ID", str(uuid.uuid4()))
+        request.state.trace_id = trace_id
+        response = await call_next(request)
+        response.headers["X-Trace-ID"] = trace_id
+        return response
+
+
+class LegacyTenantContext(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        try:
+            auth_header = request.headers.get("Authorization", "")
+            if auth_header.startswith("Bearer "):
+                payload = decode_token(auth_header[7:])
+                tenant_id = payload.get("current_tenant_id")
+                if tenant_id:
+                    set_current_tenant_id(tenant_id)
+                    request.state.current_tenant_id = tenant_id
+                    request.state.tenant_ids = payload.get("tenant_ids", [])
+            return await call_next(request)
+        finally:
+            clear_tenant_context()
+
+
+class LegacySecurityHeaders(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        return response
+
+
+class LegacyAudit(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        tenant_id = getattr(request.state, "current_tenant_id", None)
+        if not tenant_id:
+            return response
+        header = request.headers.get("Authorization", "")
+        if header.startswith("Bearer "):
+            decode_token(header[7:])
+        event_type = _detect_event_type(request.method, request.url.path)
+        config = await audit_middleware._get_logging_config(tenant_id)
+        _should_log(config, event_type, request.method, response.status_code)
+        return response
+
+
+# ── Harness ──────────────────────────────────────────────────────────
+
+
+async def _json(request):
+    return JSONResponse({"id": str(uuid.uuid4()), "items": list(range(20))})
+
+
+async def _stream(request):
+    async def chunks():
+        for _ in range(64):
+            yield b"x" * 1024
+
+    return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+
+ROUTES = [Route("/json", _json), Route("/stream", _stream)]
+
+
+def legacy_app() -> Starlette:
+    # Same order as before: tenant context outermost, audit innermost
+    return Starlette(routes=ROUTES, middleware=[
+        Middleware(LegacyTenantContext),
+        Middleware(LegacySecurityHeaders),
+        Middleware(LegacyTraceID),
+        Middleware(LegacyAudit),
+    ])
+
+
+def pipeline_app() -> Starlette:
+    return Starlette(routes=ROUTES, middleware=[
+        Middleware(
+            RequestPipeline,
+            stages=[TenantContextStage(), SecurityHeadersStage(), TraceIDStage(), AuditStage()],
+        ),
+    ])
+
+
+async def run(app, path: str, requests: int, concurrency: int, headers: dict) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies: list[float] = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):  # warm-up
+            await client.get(path, headers=headers)
+
+        per_worker = requests // concurrency
+
+        async def worker() -> None:
+            for _ in range(per_worker):
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "rps": len(latencies) / elapsed,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1].strip())
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    async def config(tenant_id):
+        return CONFIG
+
+    async def log_request(**kwargs):
+        return None
+
+    audit_middleware._get_logging_config = config
+    audit_middleware._log_request = log_request
+
+    tenant = str(uuid.uuid4())
+    token, _, _ = create_access_token(
+        str(uuid.uuid4()), str(uuid.uuid4()), tenant_ids=[tenant], current_tenant_id=tenant
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print(f"{'stack':<10}{'path':<9}{'p50 ms':>9}{'p99 ms':>9}{'req/s':>10}")
+    for path in ("/json", "/stream"):
+        for name, factory in (("legacy", legacy_app), ("pipeline", pipeline_app)):
+            reset_pipeline_timings()
+            result = await run(factory(), path, args.requests, args.concurrency, headers)
+            print(f"{name:<10}{path:<9}{result['p50']:9.3f}{result['p99']:9.3f}"
+                  f"{result['rps']:10.0f}")
+
+    print("\npipeline stage timings (last run, mean per request)")
+    for stage, timing in pipeline_timings().items():
+        mean_us = timing.total_seconds / timing.calls * 1e6
+        print(f"  {stage:<18}{mean_us:10.1f}us  max {timing.max_seconds * 1e6:10.1f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
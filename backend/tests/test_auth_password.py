@@ -0,0 +1,110 @@
+"""
+Overview: Tests for off-loop password hashing and login throttling.
+Architecture: Unit tests for credential handling (Section 5.1)
+Dependencies: pytest, argon2-cffi, app.services.auth.password, app.services.auth.throttle,
+    app.services.auth.service
+Concepts: Bounded hashing pool, transparent re-hash on parameter change, per-account and
+    per-IP attempt limits checked before hashing
+"""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from argon2 import PasswordHasher
+
+from app.services.auth import password as password_module
+from app.services.auth import service as service_module
+from app.services.auth import throttle as throttle_module
+from app.services.auth.password import (
+    PasswordHashingBusyError,
+    hash_password,
+    password_pool_stats,
+    verify_and_rehash,
+    verify_password,
+)
+from app.services.auth.service import AuthError, AuthService
+from app.services.auth.throttle import LoginThrottle, LoginThrottledError
+
+
+@pytest.fixture(autouse=True)
+def fast_hasher(monkeypatch):
+    monkeypatch.setattr(
+        password_module, "_hasher", PasswordHasher(time_cost=1, memory_cost=8, parallelism=1)
+    )
+    monkeypatch.setattr(throttle_module, "_client", AsyncMock(return_value=None))
+
+
+class TestPasswordPool:
+    async def test_hash_and_verify_run_on_pool(self):
+        before = password_pool_stats().completed
+
+        hashed = await hash_password("s3cret")
+        assert await verify_password("s3cret", hashed)
+        assert not await verify_password("wrong", hashed)
+        assert not await verify_password("s3cret", None)
+        assert not await verify_password("s3cret", "not-a-hash")
+        assert password_pool_stats().completed - before == 4
+
+        thread = await password_module._run(lambda: threading.current_thread().name)
+        assert thread.startswith("argon2")
+
+    async def test_rehash_when_parameters_change(self, monkeypatch):
+        old = PasswordHasher(time_cost=1, memory_cost=8, parallelism=1).hash("s3cret")
+        assert await verify_and_rehash("s3cret", old) == (True, None)
+
+        monkeypatch.setattr(
+            password_module, "_hasher", PasswordHasher(time_cost=2, memory_cost=16, parallelism=1)
+        )
+        valid, new_hash = await verify_and_rehash("s3cret", old)
+        assert valid and new_hash and "t=2" in new_hash
+        assert await verify_and_rehash("wrong", old) == (False, None)
+
+    async def test_rejects_past_pending_limit(self, monkeypatch):
+        monkeypatch.setattr(password_module._settings, "password_hash_max_pending", 0)
+        with pytest.raises(PasswordHashingBusyError):
+            await hash_password("s3cret")
+
+
+class TestLoginThrottle:
+    async def test_account_limit_and_reset_on_success(self):
+        throttle = LoginThrottle(max_per_account=2, max_per_ip=100, window_seconds=60)
+        await throttle.attempt("A@example.com", "10.0.0.1")
+        await throttle.attempt("a@example.com", "10.0.0.1")
+        with pytest.raises(LoginThrottledError) as exc:
+            await throttle.attempt("a@example.com", "10.0.0.2")
+        assert 1 <= exc.value.retry_after <= 60
+
+        await throttle.succeeded("a@example.com", "10.0.0.1")
+        await throttle.attempt("a@example.com", "10.0.0.1")
+
+    async def test_ip_limit_spans_accounts(self):
+        throttle = LoginThrottle(max_per_account=100, max_per_ip=2, window_seconds=60)
+        await throttle.attempt("a@example.com", "10.0.0.1")
+        await throttle.attempt("b@example.com", "10.0.0.1")
+        with pytest.raises(LoginThrottledError):
+            await throttle.attempt("c@example.com", "10.0.0.1")
+        await throttle.attempt("c@example.com", "10.0.0.9")
+
+
+class TestLoginFlow:
+    async def test_throttled_before_hashing(self, monkeypatch):
+        throttle = LoginThrottle(max_per_account=1, max_per_ip=100, window_seconds=60)
+        monkeypatch.setattr(service_module, "get_login_throttle", lambda: throttle)
+        verify = AsyncMock(return_value=(False, None))
+        monkeypatch.setattr(service_module, "verify_and_rehash", verify)
+        svc = AuthService(db=None)
+        monkeypatch.setattr(
+            svc, "_get_user_by_email", AsyncMock(return_value=SimpleNamespace(password_hash="h"))
+        )
+
+        with pytest.raises(AuthError) as first:
+            await svc.login("a@example.com", "bad", ip_address="10.0.0.1")
+        with pytest.raises(AuthError) as second:
+            await svc.login("a@example.com", "bad", ip_address="10.0.0.1")
+
+        assert first.value.code == "INVALID_CREDENTIALS"
+        assert second.value.code == "TOO_MANY_ATTEMPTS"
+        assert second.value.retry_after
+        assert verify.await_count == 1
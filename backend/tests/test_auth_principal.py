@@ -0,0 +1,150 @@
+"""
+Overview: Tests for the request principal and the validated-session cache.
+Architecture: Unit tests for request authentication (Section 5.1)
+Dependencies: pytest, app.services.auth.principal, app.services.auth.session_cache
+Concepts: Decode-once principal in request state, TTL reuse, Valkey revocation checks,
+    commit-time invalidation from the ORM flush
+"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from starlette.requests import Request
+
+from app.models.session import Session
+from app.models.user import User
+from app.services.auth import principal as principal_module
+from app.services.auth import session_cache
+from app.services.auth.jwt import create_access_token, create_refresh_token
+from app.services.auth.principal import (
+    INVALID_TOKEN,
+    NOT_AUTHENTICATED,
+    TOKEN_EXPIRED,
+    Principal,
+    auth_error,
+    resolve_principal,
+)
+from app.services.auth.session_cache import SESSION_REVOKED, SessionValidityCache
+
+
+def _request(token: str | None = None) -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def _principal(user_id: str = "u1", jti: str = "j1") -> Principal:
+    return Principal(
+        user_id=user_id, jti=jti, provider_id=None, tenant_ids=(), current_tenant_id=None,
+        impersonating=None, email=None, expires_at=None,
+    )
+
+
+class TestResolvePrincipal:
+    def test_decodes_once_per_request(self):
+        tenant = str(uuid.uuid4())
+        token, jti, _ = create_access_token(
+            "user-1", "provider-1", tenant_ids=[tenant], current_tenant_id=tenant
+        )
+        request = _request(token)
+        with patch.object(
+            principal_module, "decode_token", wraps=principal_module.decode_token
+        ) as decode:
+            first = resolve_principal(request)
+            # A second Request over the same scope (as in the next middleware) shares state
+            second = resolve_principal(Request(request.scope))
+        assert first is second
+        assert decode.call_count == 1
+        assert (first.user_id, first.jti, first.tenant_ids) == ("user-1", jti, (tenant,))
+        assert first.current_tenant_id == tenant
+
+    def test_error_codes(self):
+        expired, _, _ = create_access_token(
+            "user-1", "p", expires_at=datetime.now(UTC) - timedelta(minutes=1)
+        )
+        refresh, _ = create_refresh_token("user-1", "jti")
+        cases = [(None, NOT_AUTHENTICATED), (expired, TOKEN_EXPIRED), (refresh, INVALID_TOKEN),
+                 ("garbage", INVALID_TOKEN)]
+        for token, code in cases:
+            request = _request(token)
+            assert resolve_principal(request) is None
+            assert auth_error(request) == code
+
+
+class TestSessionValidityCache:
+    async def test_reuses_database_check_within_ttl(self, monkeypatch):
+        validate = AsyncMock(return_value=None)
+        monkeypatch.setattr(session_cache, "_validate", validate)
+        cache = SessionValidityCache(ttl_seconds=60, revalidate_seconds=300)
+
+        assert await cache.check(object(), _principal()) is None
+        assert await cache.check(object(), _principal()) is None
+        assert validate.await_count == 1
+
+    async def test_valkey_confirms_or_revokes_after_ttl(self, monkeypatch):
+        validate = AsyncMock(return_value=None)
+        monkeypatch.setattr(session_cache, "_validate", validate)
+        remote = AsyncMock(return_value=(False, None))
+        monkeypatch.setattr(session_cache, "_remote_state", remote)
+        cache = SessionValidityCache(ttl_seconds=0, revalidate_seconds=300)
+
+        assert await cache.check(object(), _principal()) is None
+        assert await cache.check(object(), _principal()) is None
+        assert validate.await_count == 1
+
+        remote.return_value = (True, None)
+        assert await cache.check(object(), _principal()) == SESSION_REVOKED
+        assert validate.await_count == 1
+
+    async def test_user_change_or_missing_valkey_falls_back_to_database(self, monkeypatch):
+        validate = AsyncMock(return_value=None)
+        monkeypatch.setattr(session_cache, "_validate", validate)
+        remote = AsyncMock(return_value=None)
+        monkeypatch.setattr(session_cache, "_remote_state", remote)
+        cache = SessionValidityCache(ttl_seconds=0, revalidate_seconds=300)
+
+        await cache.check(object(), _principal())
+        await cache.check(object(), _principal())
+        assert validate.await_count == 2
+
+        remote.return_value = (False, float("inf"))
+        validate.return_value = session_cache.USER_INVALID
+        assert await cache.check(object(), _principal()) == session_cache.USER_INVALID
+        assert validate.await_count == 3
+
+
+class TestCommitInvalidation:
+    def test_revocation_and_user_disable_are_forgotten_on_commit(self, monkeypatch):
+        cache = SessionValidityCache(ttl_seconds=60, revalidate_seconds=300)
+        monkeypatch.setattr(session_cache, "_cache", cache)
+        cache._store(_principal("u1", "j1"), None, 0.0)
+        cache._store(_principal("u2", "j2"), None, 0.0)
+        cache._store(_principal("u3", "j3"), None, 0.0)
+
+        revoked = Session(
+            user_id=uuid.uuid4(), token_jti="j1", refresh_token_hash="h",
+            expires_at=datetime.now(UTC) + timedelta(days=1),
+        )
+        revoked.revoked_at = datetime.now(UTC)
+        disabled = User(id=uuid.UUID(int=2), email="u2@example.com", is_active=False)
+        cache._store(_principal(str(disabled.id), "j4"), None, 0.0)
+        session = SimpleNamespace(info={}, dirty=[revoked, disabled], deleted=[])
+
+        session_cache._after_flush(session, None)
+        session_cache._after_commit(session)
+        assert set(cache._entries) == {"j2", "j3"}
+        assert session.info == {}
+
+    def test_rollback_discards_pending_changes(self, monkeypatch):
+        cache = SessionValidityCache(ttl_seconds=60, revalidate_seconds=300)
+        monkeypatch.setattr(session_cache, "_cache", cache)
+        cache._store(_principal("u1", "j1"), None, 0.0)
+        revoked = Session(user_id=uuid.uuid4(), token_jti="j1", refresh_token_hash="h")
+        revoked.revoked_at = datetime.now(UTC)
+        session = SimpleNamespace(info={}, dirty=[revoked], deleted=[])
+
+        session_cache._after_flush(session, None)
+        session_cache._after_rollback(session)
+        session_cache._after_commit(session)
+        assert set(cache._entries) == {"j1"}
@@ -0,0 +1,141 @@
+"""
+Overview: Tests for the bulk CI upsert service — key handling, batch validation, upsert SQL.
+Architecture: Unit tests for CMDB bulk ingest (Section 8)
+Dependencies: pytest, app.services.cmdb.ci_bulk_service
+Concepts: Rows keyed on Pulumi URN / cloud resource ID, per-row error reporting,
+    INSERT ... ON CONFLICT on the tenant/key partial unique index.
+"""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.cmdb.ci_bulk_service import (
+    CIBulkService,
+    CIBulkServiceError,
+    _ClassInfo,
+)
+
+
+def _db(existing=None, returned=None):
+    """Mock session: first execute loads existing CIs, then the upsert, then snapshots."""
+    db = MagicMock()
+    db.flush = AsyncMock()
+    calls = []
+
+    async def execute(stmt, params=None):
+        calls.append((stmt, params))
+        result = MagicMock()
+        result.scalars.return_value.unique.return_value.all.return_value = existing or []
+        result.all.return_value = returned or []
+        return result
+
+    db.execute = AsyncMock(side_effect=execute)
+    db.calls = calls
+    return db
+
+
+class TestBulkUpsertKeys:
+    async def test_rejects_unknown_key_field(self):
+        """Only Pulumi URN and cloud resource ID are valid upsert keys."""
+        with pytest.raises(CIBulkServiceError):
+            await CIBulkService(_db()).bulk_upsert("t", [], key_field="name")
+
+    async def test_missing_key_and_duplicates_reported_per_row(self):
+        """Rows without a key fail; earlier duplicates are superseded by the last row."""
+        svc = CIBulkService(_db())
+        svc._class_cache["c"] = None
+        rows = [
+            {"name": "a"},
+            {"pulumi_urn": "urn:1", "ci_class_id": "c", "name": "a"},
+            {"pulumi_urn": "urn:1", "ci_class_id": "c", "name": "b"},
+        ]
+        report = await svc.bulk_upsert("t", rows)
+        assert [r.status for r in report.results] == ["error", "error", "error"]
+        assert "Missing pulumi_urn" in report.results[0].error
+        assert "Superseded" in report.results[1].error
+        assert report.results[2].error == "CI class not found"
+        assert report.failed == 3
+
+
+class TestBulkUpsertValidation:
+    async def test_unchanged_rows_are_not_written(self):
+        """A row matching the stored state reports 'unchanged' and issues no upsert."""
+        class_id = uuid.uuid4()
+        ci = MagicMock(
+            id=uuid.uuid4(), ci_class_id=class_id, current_version=3,
+            attributes={"cpu": 2}, tags={}, compartment_id=None, description=None,
+            lifecycle_state="active", cloud_resource_id=None, pulumi_urn="urn:1",
+        )
+        ci.name = "vm"
+        db = _db(existing=[ci])
+        svc = CIBulkService(db)
+        svc._class_cache[str(class_id)] = _ClassInfo(schema=None, attribute_definitions=None)
+
+        report = await svc.bulk_upsert("t", [{"pulumi_urn": "urn:1", "attributes": {"cpu": 2}}])
+        assert report.unchanged == 1
+        assert report.results[0].version == 3
+        assert len(db.calls) == 1  # existing-CI lookup only
+
+    async def test_schema_violation_is_row_error(self):
+        """Attribute validation failures are reported without aborting the batch."""
+        svc = CIBulkService(_db())
+        svc._class_cache["c"] = _ClassInfo(
+            schema={"type": "object", "required": ["cpu"], "properties": {"cpu": {"type": "integer"}}},
+            attribute_definitions=None,
+        )
+        report = await svc.bulk_upsert(
+            "t", [{"pulumi_urn": "urn:1", "ci_class_id": "c", "name": "vm", "attributes": {}}]
+        )
+        assert report.results[0].status == "error"
+        assert "validation failed" in report.results[0].error
+
+
+class TestBulkUpsertSql:
+    async def test_new_rows_upsert_and_keyframe(self):
+        """New rows go through ON CONFLICT on the partial index and get keyframe snapshots."""
+        ci_id = uuid.uuid4()
+        db = _db(returned=[(ci_id, "urn:1", 1)])
+        svc = CIBulkService(db)
+        svc._class_cache["c"] = _ClassInfo(schema=None, attribute_definitions=None)
+        svc._record_batch = AsyncMock()
+
+        report = await svc.bulk_upsert(
+            "t", [{"pulumi_urn": "urn:1", "ci_class_id": "c", "name": "vm"}]
+        )
+        assert report.created == 1
+        assert report.results[0].ci_id == str(ci_id)
+
+        upsert_sql = str(db.calls[1][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (tenant_id, pulumi_urn) WHERE" in upsert_sql
+        assert "current_version = (configuration_items.current_version +" in upsert_sql
+
+        snapshots = db.calls[2][1]
+        assert snapshots[0]["is_keyframe"] is True
+        assert snapshots[0]["version_number"] == 1
+        svc._record_batch.assert_awaited_once()
+
+    async def test_renames_feed_the_graph_engine(self, monkeypatch):
+        """An update that changes a CI's name is queued as a graph rename."""
+        class_id = uuid.uuid4()
+        ci = MagicMock(
+            id=uuid.uuid4(), ci_class_id=class_id, current_version=3,
+            attributes={}, tags={}, compartment_id=None, description=None,
+            lifecycle_state="active", cloud_resource_id=None, pulumi_urn="urn:1",
+        )
+        ci.name = "vm"
+        db = _db(existing=[ci], returned=[(ci.id, "urn:1", 4)])
+        svc = CIBulkService(db)
+        svc._class_cache[str(class_id)] = _ClassInfo(schema=None, attribute_definitions=None)
+        svc._record_batch = AsyncMock()
+        changes = []
+        monkeypatch.setattr(
+            "app.services.cmdb.ci_bulk_service.record_change",
+            lambda db, tenant_id, *change: changes.append(change),
+        )
+
+        report = await svc.bulk_upsert("t", [{"pulumi_urn": "urn:1", "name": "vm-renamed"}])
+        assert report.updated == 1
+        assert changes == [("rename_node", str(ci.id), "vm-renamed")]
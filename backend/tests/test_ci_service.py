@@ -2,11 +2,23 @@
 Overview: Tests for CI service — CRUD operations, lifecycle transitions, relationship management.
 Architecture: Unit tests for CMDB CI operations (Section 8)
 Dependencies: pytest, app.services.cmdb.ci_service, app.schemas.cmdb
-Concepts: CI lifecycle state machine, tenant isolation, snapshot creation, relationship constraints
+Concepts: CI lifecycle state machine, tenant isolation, snapshot creation, relationship constraints,
+    explorer summary from materialized counts
 """
 
+import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
 from app.schemas.cmdb import LIFECYCLE_TRANSITIONS
+from app.services.cmdb import ci_service
 from app.services.cmdb.ci_service import CIService, CIServiceError
+from app.services.semantic.catalog_cache import CategoryEntry, SemanticCatalog, TypeEntry
 
 
 class TestCIServiceError:
@@ -85,3 +97,140 @@ class TestLifecycleTransitions:
     def test_deleted_is_terminal(self):
         """deleted is a terminal state — not present as a key."""
         assert "deleted" not in LIFECYCLE_TRANSITIONS
+
+
+NOW = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _count_row(ci_class, backend, count):
+    class_id, class_name, semantic_type_id = ci_class
+    backend_id, backend_name = backend
+    return SimpleNamespace(
+        class_id=class_id, class_name=class_name, class_display_name=None, class_icon=None,
+        semantic_type_id=semantic_type_id, backend_id=backend_id, backend_name=backend_name,
+        ci_count=count,
+    )
+
+
+class TestExplorerSummary:
+    async def test_single_query_over_counts(self, monkeypatch):
+        compute = CategoryEntry(
+            id=uuid.uuid4(), name="compute", display_name="Compute", description=None,
+            icon="cpu", sort_order=0, is_system=True, is_infrastructure=True,
+            created_at=NOW, updated_at=NOW,
+        )
+        vm_type = TypeEntry(
+            id=uuid.uuid4(), name="VirtualMachine", display_name="Virtual Machine",
+            category_id=compute.id, description=None, icon=None, is_abstract=False,
+            parent_type_id=None, properties_schema=None, allowed_relationship_kinds=None,
+            sort_order=0, is_system=True, created_at=NOW, updated_at=NOW,
+        )
+        catalog = SemanticCatalog(
+            version=0, categories=(compute,), types=(vm_type,), relationship_kinds=()
+        )
+        monkeypatch.setattr(ci_service, "get_semantic_catalog", AsyncMock(return_value=catalog))
+
+        vm = (uuid.uuid4(), "vm", vm_type.id)
+        app = (uuid.uuid4(), "app", None)
+        aws = (uuid.uuid4(), "aws")
+        result = MagicMock()
+        result.all.return_value = [
+            _count_row(vm, aws, 3),
+            _count_row(vm, (None, None), 2),
+            _count_row(app, aws, 4),
+        ]
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+
+        summary = await CIService(db).get_explorer_summary(str(uuid.uuid4()))
+
+        assert db.execute.await_count == 1
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM ci_explorer_counts" in sql
+        assert "configuration_items" not in sql
+        assert summary.total_cis == 9
+        by_name = {c.category_name: c for c in summary.categories}
+        assert by_name["Compute"].total_count == 5
+        assert by_name["Compute"].types[0].semantic_type_name == "Virtual Machine"
+        assert by_name["Uncategorized"].types[0].count == 4
+        assert [(b.backend_id, b.ci_count) for b in summary.backends] == [(str(aws[0]), 7)]
+
+
+class _Savepoint:
+    def __init__(self):
+        self.rolled_back = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.rolled_back = exc_type is not None
+        return False
+
+
+class TestDuplicateExternalKeys:
+    def _db(self, message):
+        savepoint = _Savepoint()
+        db = MagicMock()
+        db.begin_nested = MagicMock(return_value=savepoint)
+        db.flush = AsyncMock(side_effect=IntegrityError("INSERT", {}, Exception(message)))
+        return db, savepoint
+
+    async def test_unique_violation_raises_service_error(self):
+        db, savepoint = self._db(
+            'duplicate key value violates unique constraint "uq_ci_tenant_pulumi_urn"'
+        )
+        ci = SimpleNamespace(id=uuid.uuid4(), name="vm", attributes={}, ci_class_id=None)
+        svc = CIService(db)
+        svc.get_ci = AsyncMock(return_value=ci)
+
+        with pytest.raises(CIServiceError) as err:
+            await svc.update_ci(str(ci.id), str(uuid.uuid4()), {"pulumi_urn": "urn:a"})
+
+        assert err.value.code == "DUPLICATE_EXTERNAL_KEY"
+        assert savepoint.rolled_back
+        db.rollback.assert_not_called()
+
+    async def test_other_integrity_errors_propagate(self):
+        db, _ = self._db('violates foreign key constraint "fk_ci_compartment"')
+        ci = SimpleNamespace(id=uuid.uuid4(), name="vm", attributes={}, ci_class_id=None)
+        svc = CIService(db)
+        svc.get_ci = AsyncMock(return_value=ci)
+
+        with pytest.raises(IntegrityError):
+            await svc.update_ci(str(ci.id), str(uuid.uuid4()), {"pulumi_urn": "urn:a"})
+
+
+class TestExplorerCountRebuild:
+    async def test_recomputes_live_buckets(self):
+        tenant_id = str(uuid.uuid4())
+        result = MagicMock(rowcount=4)
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+        db.flush = AsyncMock()
+
+        assert await CIService(db).rebuild_explorer_counts(tenant_id) == 4
+
+        delete_sql, insert_sql = (
+            str(call.args[0].compile(dialect=postgresql.dialect()))
+            for call in db.execute.call_args_list
+        )
+        assert delete_sql.startswith("DELETE FROM ci_explorer_counts")
+        assert insert_sql.startswith(
+            "INSERT INTO ci_explorer_counts (id, tenant_id, compartment_id, backend_id, "
+            "ci_class_id, ci_count) SELECT gen_random_uuid()"
+        )
+        assert "configuration_items.deleted_at IS NULL" in insert_sql
+        assert "GROUP BY configuration_items.tenant_id" in insert_sql
+
+    async def test_tenants_with_live_cis_or_buckets(self):
+        """Tenants whose CIs were all deleted are still rebuilt (emptied)."""
+        tenant = uuid.uuid4()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [tenant]
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+
+        assert await CIService(db).find_explorer_count_tenants() == [str(tenant)]
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "UNION" in sql and "ci_explorer_counts" in sql
@@ -0,0 +1,124 @@
+"""
+Overview: Test suite for the bulk estimation recalculation engine.
+Architecture: Test coverage for set-based estimation repricing (Section 8)
+Dependencies: pytest, app.services.cmdb.estimation_recalc_service
+Concepts: Column-wise Decimal arithmetic, specificity cascade, change detection, bulk updates.
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.cmdb.estimation_recalc_service import (
+    EstimationRecalcService,
+    RecalculationResult,
+    _changed,
+    _specificity_levels,
+    compute_estimation_totals,
+    compute_line_costs,
+)
+
+
+class TestArithmetic:
+    """Test the pure Decimal helpers."""
+
+    def test_line_costs(self):
+        """Line costs are element-wise hours x rate."""
+        costs = compute_line_costs(
+            [Decimal("2"), Decimal("1.5")], [Decimal("100"), Decimal("80")]
+        )
+        assert costs == [Decimal("200"), Decimal("120.0")]
+
+    def test_totals_with_margin(self):
+        """Totals compute margin amount and percent."""
+        totals = compute_estimation_totals(
+            Decimal("50"), Decimal("10"), [Decimal("200"), Decimal("100")]
+        )
+        assert totals["total_estimated_cost"] == Decimal("300")
+        assert totals["total_sell_price"] == Decimal("500")
+        assert totals["margin_amount"] == Decimal("200")
+        assert totals["margin_percent"] == Decimal("40")
+
+    def test_totals_zero_sell(self):
+        """Zero sell price yields zero margin percent instead of dividing by zero."""
+        totals = compute_estimation_totals(Decimal("0"), Decimal("1"), [Decimal("10")])
+        assert totals["margin_percent"] == Decimal("0")
+        assert totals["margin_amount"] == Decimal("-10")
+
+    def test_totals_no_lines(self):
+        """An estimation without line items has zero cost."""
+        totals = compute_estimation_totals(Decimal("5"), Decimal("2"), [])
+        assert totals["total_estimated_cost"] == Decimal("0")
+
+    def test_changed_ignores_sub_scale_noise(self):
+        """Differences below the Numeric(…, 4) scale are not treated as changes."""
+        assert not _changed(Decimal("1.00001"), Decimal("1.00002"))
+        assert _changed(Decimal("1.0001"), Decimal("1.0002"))
+        assert _changed(None, Decimal("0"))
+
+    def test_specificity_order(self):
+        """Specificity cascade runs region+coverage → region → coverage → base."""
+        assert _specificity_levels("r", "c") == [("r", "c"), ("r", None), (None, "c"), (None, None)]
+        assert _specificity_levels(None, None) == [(None, None)]
+
+
+class TestProcessChunk:
+    """Test that a chunk is priced in memory and written with bulk updates."""
+
+    async def test_bulk_update_only_changed_rows(self):
+        """Only rows whose values change are included in the executemany UPDATEs."""
+        est_id = uuid.uuid4()
+        profile, region = uuid.uuid4(), uuid.uuid4()
+        chunk = [
+            SimpleNamespace(
+                id=est_id,
+                client_tenant_id=uuid.uuid4(),
+                service_offering_id=uuid.uuid4(),
+                delivery_region_id=None,
+                coverage_model=None,
+                price_list_id=None,
+                quantity=Decimal("1"),
+                sell_price_per_unit=Decimal("100"),
+                sell_currency="EUR",
+                total_estimated_cost=Decimal("0"),
+                total_sell_price=Decimal("100"),
+                margin_amount=Decimal("100"),
+                margin_percent=Decimal("100"),
+            )
+        ]
+        changed_line = SimpleNamespace(
+            id=uuid.uuid4(), estimation_id=est_id, staff_profile_id=profile,
+            delivery_region_id=region, estimated_hours=Decimal("2"),
+            hourly_rate=Decimal("10"), rate_currency="EUR", rate_card_id=None,
+            line_cost=Decimal("20"),
+        )
+        card = SimpleNamespace(
+            id=uuid.uuid4(), staff_profile_id=profile, delivery_region_id=region,
+            hourly_cost=Decimal("30"), currency="EUR",
+        )
+
+        lines_result = MagicMock()
+        lines_result.all.return_value = [changed_line]
+        cards_result = MagicMock()
+        cards_result.scalars.return_value.all.return_value = [card]
+
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[lines_result, cards_result, None, None])
+        db.flush = AsyncMock()
+
+        service = EstimationRecalcService(db)
+        result = RecalculationResult()
+        await service._process_chunk(
+            str(uuid.uuid4()), chunk, True, False, date.today(), result
+        )
+
+        assert result.line_items_updated == 1
+        assert result.estimations_updated == 1
+        line_params = db.execute.call_args_list[2].args[1]
+        assert line_params[0]["line_cost"] == Decimal("60")
+        assert line_params[0]["rate_card_id"] == card.id
+        est_params = db.execute.call_args_list[3].args[1]
+        assert est_params[0]["total_estimated_cost"] == Decimal("60")
+        assert est_params[0]["margin_amount"] == Decimal("40")
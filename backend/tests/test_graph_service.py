@@ -75,3 +75,150 @@ class TestGraphServiceInit:
         mock_db = object()
         svc = GraphService(db=mock_db)
         assert svc.db is mock_db
+
+
+def _graph():
+    """a -depends_on-> b -uses-> c -depends_on-> a, plus c -contains-> d."""
+    from app.services.cmdb.graph_engine import CSRGraph
+
+    nodes = [(n, n.upper(), "Server") for n in "abcde"]
+    edges = [
+        ("r1", "a", "b", "depends_on"),
+        ("r2", "b", "c", "uses"),
+        ("r3", "c", "a", "depends_on"),
+        ("r4", "c", "d", "contains"),
+    ]
+    return CSRGraph(nodes, edges)
+
+
+class TestCSRGraph:
+    def test_traverse_outgoing_shortest_depths(self):
+        nodes = _graph().traverse("a", None, "outgoing", 3)
+        assert [(n.ci_id, n.depth) for n in nodes] == [("b", 1), ("c", 2), ("d", 3)]
+        assert nodes[-1].path == ["a", "b", "c", "d"]
+
+    def test_traverse_type_filter_and_direction(self):
+        g = _graph()
+        assert [n.ci_id for n in g.traverse("a", ["depends_on"], "outgoing", 5)] == ["b"]
+        assert [n.ci_id for n in g.traverse("a", ["depends_on"], "incoming", 5)] == ["c"]
+        assert g.traverse("a", ["unknown"], "both", 5) == []
+
+    def test_shortest_path_ignores_direction(self):
+        g = _graph()
+        assert g.shortest_path("d", "b", 10) == ["d", "c", "b"]
+        assert g.shortest_path("a", "e", 10) is None
+        assert g.shortest_path("d", "b", 2) is None
+
+    def test_cycles_from(self):
+        g = _graph()
+        cycles = g.cycles_from("d")
+        assert cycles is None
+        cycles = g.cycles_from("a")
+        assert cycles == [["a", "b", "c", "a"]]
+
+    def test_overlay_changes_and_compaction(self):
+        g = _graph()
+        g.remove_edge("r2")
+        g.add_edge("r5", ("d", "D", "Server"), ("f", "F", "Disk"), "uses")
+        g.remove_node("c")
+        assert [n.ci_id for n in g.traverse("a", None, "outgoing", 5)] == ["b"]
+        assert [n.ci_id for n in g.traverse("d", None, "outgoing", 5)] == ["f"]
+        fresh = g.compacted()
+        assert fresh.edge_count == 2
+        assert not fresh.is_live("c")
+        assert [n.ci_id for n in fresh.traverse("d", None, "outgoing", 5)] == ["f"]
+
+
+class TestBatchImpact:
+    def test_closure_reuse_matches_fresh_bfs(self):
+        """Cached sub-closures merge into later traversals without changing depths."""
+        from app.services.cmdb.graph_engine import CSRGraph
+
+        edges = [(f"r{i}", str(i), str(i + 1), "depends_on") for i in range(6)]
+        edges.append(("rx", "0", "3", "depends_on"))
+        g = CSRGraph([(str(i), str(i), "S") for i in range(7)], edges)
+        warm = g.reach(["3"], ["depends_on"], "outgoing", 4)
+        both = g.reach(["0", "3"], ["depends_on"], "outgoing", 4)
+        assert warm["3"] == {"4": 1, "5": 2, "6": 3}
+        assert both["0"] == {"1": 1, "3": 1, "2": 2, "4": 2, "5": 3, "6": 4}
+        g.remove_edge("rx")
+        assert g.reach(["0"], ["depends_on"], "outgoing", 4)["0"] == {
+            "1": 1, "2": 2, "3": 3, "4": 4,
+        }
+
+    async def test_batch_impact_uses_engine_graph(self):
+        svc = GraphService(db=None)
+        graph = _graph()
+        svc._graph = lambda tenant_id: _async(graph)
+        result = await svc.batch_impact(["a", "d"], "t", direction="both", max_depth=5)
+        # downstream = who breaks when the CI fails = CIs pointing at it
+        assert result.downstream["a"] == {"c": 1, "b": 2}
+        assert result.upstream["d"] == {}
+        assert result.downstream_union == {"c": 1, "b": 2, "a": 3}
+        assert result.nodes["c"] == ("C", "Server")
+
+    async def test_invalid_direction(self):
+        import pytest
+
+        with pytest.raises(GraphServiceError):
+            await GraphService(db=None).batch_impact(["a"], "t", direction="sideways")
+
+
+async def _async(value):
+    return value
+
+
+class _Valkey:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def incr(self, key):
+        self.values[key] = int(self.values.get(key) or 0) + 1
+        return self.values[key]
+
+
+class TestGraphEngineGenerations:
+    def _engine(self, monkeypatch, valkey):
+        from app.services.cmdb.graph_engine import GraphEngine
+
+        engine = GraphEngine(ttl_seconds=300)
+        monkeypatch.setattr(engine, "_client", lambda: _async(valkey))
+        builds = []
+
+        async def build(db, tenant_id):
+            builds.append(tenant_id)
+            return _graph()
+
+        monkeypatch.setattr(engine, "_build", build)
+        return engine, builds
+
+    async def test_other_process_writes_trigger_rebuild(self, monkeypatch):
+        valkey = _Valkey()
+        engine, builds = self._engine(monkeypatch, valkey)
+        await engine.get(None, "t")
+        await engine.get(None, "t")
+        assert builds == ["t"]
+
+        await valkey.incr("nimbus:cmdb_graph:gen:t")  # a write committed elsewhere
+        await engine.get(None, "t")
+        assert builds == ["t", "t"]
+
+    async def test_local_publish_keeps_the_updated_graph(self, monkeypatch):
+        valkey = _Valkey()
+        engine, builds = self._engine(monkeypatch, valkey)
+        await engine.get(None, "t")
+        await engine.publish({"t"})
+        await engine.get(None, "t")
+        assert builds == ["t"]
+        assert valkey.values["nimbus:cmdb_graph:gen:t"] == 1
+
+    async def test_ttl_applies_without_valkey(self, monkeypatch):
+        engine, builds = self._engine(monkeypatch, None)
+        await engine.get(None, "t")
+        await engine.get(None, "t")
+        engine.ttl_seconds = 0
+        await engine.get(None, "t")
+        assert builds == ["t", "t"]
@@ -0,0 +1,245 @@
+"""
+Overview: Tests for model-driven GraphQL dataloaders and per-query SQL statement budgets.
+Architecture: GraphQL batch loading tests (Section 7.2)
+Dependencies: pytest, strawberry, sqlalchemy, app.api.graphql.loaders, app.api.graphql.schema
+Concepts: Representative queries run through the real schema against a recording session;
+    each asserts a maximum statement count that must not grow with the number of rows.
+"""
+
+import uuid
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.api.graphql.context import NimbusContext
+from app.api.graphql.loaders import Loaders
+from app.api.graphql.queries import catalog as catalog_queries
+from app.api.graphql.queries import delivery as delivery_queries
+from app.api.graphql.schema import schema
+from app.models.cmdb.activity import ActivityDefinition, ActivityTemplate
+from app.models.cmdb.delivery_region import DeliveryRegion
+from app.models.cmdb.price_list import PriceList, PriceListItem
+from app.models.cmdb.service_offering import ServiceOffering
+from app.models.cmdb.staff_profile import InternalRateCard, OrganizationalUnit, StaffProfile
+
+TENANT = uuid.uuid4()
+
+
+class _Result:
+    def __init__(self, rows: list):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def unique(self):
+        return self
+
+    def all(self):
+        return list(self._rows)
+
+    def scalar(self):
+        return len(self._rows)
+
+
+class RecordingSession:
+    """Stands in for AsyncSession: records statements and answers from in-memory rows.
+
+    Every ``select(Model)`` returns all rows of that model; loaders key their results, so a
+    superset is harmless and the statement count is what the harness measures.
+    """
+
+    def __init__(self, *rows):
+        self.statements: list = []
+        self.info: dict = {}
+        self._rows: dict[type, list] = {}
+        for row in rows:
+            self._rows.setdefault(type(row), []).append(row)
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        entity = stmt.column_descriptions[0].get("entity")
+        return _Result(self._rows.get(entity, []))
+
+    async def close(self):
+        pass
+
+
+@contextmanager
+def max_statements(session: RecordingSession, limit: int):
+    start = len(session.statements)
+    yield
+    issued = session.statements[start:]
+    assert len(issued) <= limit, f"{len(issued)} statements (limit {limit}):\n" + "\n\n".join(
+        str(s) for s in issued
+    )
+
+
+async def run(query: str, session: RecordingSession) -> dict:
+    context = NimbusContext()
+    context._session = session
+    result = await schema.execute(query, context_value=context)
+    assert result.errors is None, result.errors
+    return result.data
+
+
+@pytest.fixture(autouse=True)
+def allow_all(monkeypatch):
+    monkeypatch.setattr(delivery_queries, "check_graphql_permission", AsyncMock())
+    monkeypatch.setattr(catalog_queries, "check_graphql_permission", AsyncMock())
+
+
+def region(name: str, parent: DeliveryRegion | None = None, sort_order: int = 0):
+    return DeliveryRegion(
+        id=uuid.uuid4(),
+        tenant_id=TENANT,
+        parent_region_id=parent.id if parent else None,
+        name=name,
+        display_name=name.upper(),
+        code=name,
+        is_system=False,
+        is_active=True,
+        sort_order=sort_order,
+    )
+
+
+def rate_card_fixture(count: int) -> list:
+    unit = OrganizationalUnit(id=uuid.uuid4(), tenant_id=TENANT, name="ops", display_name="Ops")
+    emea = region("emea")
+    rows: list = [unit, emea]
+    for i in range(count):
+        profile = StaffProfile(
+            id=uuid.uuid4(), tenant_id=TENANT, org_unit_id=unit.id,
+            name=f"p{i}", display_name=f"P{i}", is_system=False, sort_order=i,
+        )
+        country = region(f"c{i}", emea)
+        card = InternalRateCard(
+            id=uuid.uuid4(), tenant_id=TENANT, staff_profile_id=profile.id,
+            delivery_region_id=country.id, hourly_cost=Decimal("80"), currency="EUR",
+            effective_from=date(2026, 1, 1),
+        )
+        rows += [profile, country, card]
+    return rows
+
+
+RATE_CARDS = f"""
+{{ rateCards(tenantId: "{TENANT}") {{
+    staffProfile {{ name orgUnit {{ name }} }}
+    deliveryRegion {{ code parent {{ code }} }}
+}} }}
+"""
+
+
+def price_list_fixture(count: int) -> list:
+    price_list = PriceList(id=uuid.uuid4(), tenant_id=TENANT, name="standard")
+    rows: list = [price_list]
+    for i in range(count):
+        offering = ServiceOffering(id=uuid.uuid4(), tenant_id=TENANT, name=f"o{i}")
+        area = region(f"a{i}")
+        price_list.items.append(PriceListItem(
+            id=uuid.uuid4(), price_list_id=price_list.id, service_offering_id=offering.id,
+            delivery_region_id=area.id, price_per_unit=Decimal("10"), currency="EUR",
+        ))
+        rows += [offering, area]
+    return rows
+
+
+PRICE_LISTS = f"""
+{{ priceLists(tenantId: "{TENANT}") {{
+    items {{ name items {{ serviceOffering {{ name }} deliveryRegion {{ code }} }} }}
+}} }}
+"""
+
+
+class TestStatementBudgets:
+    @pytest.mark.parametrize("count", [3, 40])
+    async def test_rate_cards_with_nested_references(self, count):
+        session = RecordingSession(*rate_card_fixture(count))
+        with max_statements(session, 5):
+            data = await run(RATE_CARDS, session)
+        assert len(data["rateCards"]) == count
+        first = data["rateCards"][0]
+        assert first["staffProfile"]["orgUnit"] == {"name": "ops"}
+        assert first["deliveryRegion"]["parent"] == {"code": "emea"}
+
+    @pytest.mark.parametrize("count", [3, 40])
+    async def test_price_list_items_with_offerings_and_regions(self, count):
+        session = RecordingSession(*price_list_fixture(count))
+        with max_statements(session, 4):
+            data = await run(PRICE_LISTS, session)
+        [price_list] = data["priceLists"]["items"]
+        assert price_list["items"][1] == {
+            "serviceOffering": {"name": "o1"},
+            "deliveryRegion": {"code": "a1"},
+        }
+
+    @pytest.mark.parametrize("count", [2, 25])
+    async def test_region_tree(self, count):
+        roots = [region(f"r{i}", sort_order=i) for i in range(count)]
+        leaves = [region(f"{r.code}-{j}", r, sort_order=j) for r in roots for j in range(2)]
+        session = RecordingSession(*roots, *leaves)
+        query = f"""
+        {{ deliveryRegions(tenantId: "{TENANT}", limit: 20) {{
+            items {{ code children {{ code children {{ code }} }} }}
+        }} }}
+        """
+        with max_statements(session, 4):
+            data = await run(query, session)
+        first_root = next(i for i in data["deliveryRegions"]["items"] if i["code"] == "r0")
+        assert [c["code"] for c in first_root["children"]] == ["r0-0", "r0-1"]
+
+
+class TestLoaders:
+    async def test_by_parent_groups_children_and_filters_soft_deleted(self):
+        template = ActivityTemplate(id=uuid.uuid4(), tenant_id=TENANT, name="t")
+        other = ActivityTemplate(id=uuid.uuid4(), tenant_id=TENANT, name="u")
+        defs = [
+            ActivityDefinition(id=uuid.uuid4(), template_id=template.id, name="a", sort_order=0),
+            ActivityDefinition(id=uuid.uuid4(), template_id=template.id, name="b", sort_order=1),
+        ]
+        session = RecordingSession(*defs)
+
+        async def get_session():
+            return session
+
+        loaders = Loaders(get_session)
+        loader = loaders.by_parent(ActivityTemplate.definitions)
+        assert loader is loaders.by_parent(ActivityDefinition.template_id)
+
+        first, second = await loader.load_many([template.id, other.id])
+        assert [d.name for d in first] == ["a", "b"] and second == []
+        sql = str(session.statements[0])
+        assert "deleted_at IS NULL" in sql and "ORDER BY" in sql
+
+    async def test_by_parent_scopes_children_to_tenant(self):
+        loaders = Loaders(AsyncMock())
+        scoped = loaders.by_parent(DeliveryRegion.parent_region_id, tenant_id=TENANT)
+        assert scoped is not loaders.by_parent(DeliveryRegion.parent_region_id)
+        assert scoped is not loaders.by_parent(
+            DeliveryRegion.parent_region_id, tenant_id=uuid.uuid4()
+        )
+
+    async def test_shared_region_children_follow_the_requesting_tenant(self):
+        shared = region("global")
+        shared.tenant_id = None
+        session = RecordingSession(shared, region("emea", shared))
+        query = f"""
+        {{ deliveryRegions(tenantId: "{TENANT}") {{ items {{ code children {{ code }} }} }} }}
+        """
+        await run(query, session)
+
+        [children] = [s for s in session.statements if "parent_region_id IN" in str(s)]
+        sql = str(children)
+        assert "tenant_id = " in sql and "tenant_id IS NULL" in sql
+        assert "is_active IS true" in sql
+        assert TENANT in children.compile().params.values()
+
+    async def test_related_follows_foreign_key_metadata(self):
+        loaders = Loaders(AsyncMock())
+        assert loaders.related(InternalRateCard.staff_profile_id) is loaders.by_id(StaffProfile)
+        assert loaders.related(ActivityDefinition.template) is loaders.by_id(ActivityTemplate)
+        with pytest.raises(TypeError):
+            loaders.related(ActivityTemplate.definitions)
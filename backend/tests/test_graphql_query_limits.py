@@ -0,0 +1,255 @@
+"""
+Overview: Tests for GraphQL query cost limits, persisted queries and the document cache.
+Architecture: Unit tests for the GraphQL execution guards (Section 7.2)
+Dependencies: pytest, strawberry, app.api.graphql.query_cost, app.api.graphql.persisted_queries
+Concepts: Static cost from field weights and page sizes, depth/alias limits, per-tenant cost
+    budget, APQ hash-only requests, parse/validate reuse, the frontend's documents staying
+    within the default limits
+"""
+
+import re
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+import strawberry
+from graphql import Visitor, parse, visit
+
+from app.api.graphql import persisted_queries as pq_module
+from app.api.graphql import query_cost as cost_module
+from app.api.graphql.persisted_queries import (
+    DocumentCache,
+    PersistedQueryExtension,
+    query_hash,
+)
+from app.api.graphql.query_cost import (
+    SIZE_ARGUMENTS,
+    CostBudget,
+    QueryCostExtension,
+    analyze_query,
+)
+from app.core.config import Settings
+
+
+@strawberry.type
+class Item:
+    id: int
+
+    @strawberry.field
+    def children(self, limit: int = 5) -> list["Item"]:
+        return [Item(id=i) for i in range(limit)]
+
+    @strawberry.field
+    def parent(self) -> "Item | None":
+        return Item(id=0)
+
+    @strawberry.field
+    def related(self) -> list["Item"]:
+        return []
+
+
+@strawberry.type
+class ItemList:
+    items: list[Item]
+    total: int
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def items(self, offset: int = 0, limit: int = 50) -> ItemList:
+        return ItemList(items=[Item(id=i) for i in range(limit)], total=limit)
+
+    @strawberry.field
+    def tags(self) -> list[Item]:
+        return []
+
+    @strawberry.field
+    def version(self) -> str:
+        return "1"
+
+
+test_schema = strawberry.Schema(
+    query=Query, extensions=[PersistedQueryExtension, QueryCostExtension]
+)
+
+
+def cost_of(query: str, variables=None):
+    return analyze_query(test_schema._schema, parse(query), None, variables, 20)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(pq_module, "_cache", DocumentCache(100))
+    monkeypatch.setattr(pq_module, "_load_persisted", AsyncMock(return_value=None))
+    monkeypatch.setattr(pq_module, "_store_persisted", AsyncMock())
+    monkeypatch.setattr(cost_module, "_budget", CostBudget(1_000, 10_000))
+
+
+class TestAnalyzeQuery:
+    def test_page_size_of_connection_applies_to_items(self):
+        cost = cost_of("{ items(limit: 10) { items { id } total } version }")
+        assert cost.cost == 1 + 10
+        assert cost.depth == 3
+
+    def test_argument_default_and_variables(self):
+        assert cost_of("{ items { items { id } } }").cost == 1 + 50
+        assert cost_of("query($n: Int!) { items(limit: $n) { items { id } } }", {"n": 3}).cost == 4
+
+    def test_unbounded_list_uses_default_size_and_nests(self):
+        assert cost_of("{ tags { id } }").cost == 20
+        assert cost_of("{ tags { children(limit: 2) { id } } }").cost == 20 * (1 + 2)
+
+    def test_nested_unpaginated_lists_are_charged_once_per_item(self):
+        assert cost_of("{ tags { related { related { id } } } }").cost == 20 * (1 + 1 + 1)
+        assert cost_of("{ items(limit: 4) { items { related { id } } } }").cost == 1 + 4 * 2
+
+    def test_fields_without_an_arguments_list(self):
+        # graphql-core 3.3 leaves FieldNode.arguments as None when none are given
+        document = parse("{ items { items { id } } tags { parent { id } } version }")
+
+        class StripArguments(Visitor):
+            def enter_field(self, node, *_):
+                node.arguments = None
+
+        visit(document, StripArguments())
+        cost = analyze_query(test_schema._schema, document, None, None, 20)
+        assert cost.cost == (1 + 50) + 20 * (1 + 1)
+
+    def test_fragments_aliases_and_introspection(self):
+        cost = cost_of(
+            """
+            { a: tags { ...F } b: tags { ... on Item { parent { id } } } __typename }
+            fragment F on Item { parent { id } }
+            """
+        )
+        assert cost.aliases == 2
+        assert cost.cost == 2 * 20 * (1 + 1)
+
+
+class TestQueryCostExtension:
+    async def test_rejects_deep_and_expensive_queries(self, monkeypatch):
+        settings = cost_module.get_settings()
+        monkeypatch.setattr(settings, "graphql_max_depth", 3)
+        deep = await test_schema.execute("{ tags { parent { parent { id } } } }")
+        assert deep.errors[0].extensions["code"] == "QUERY_TOO_DEEP"
+
+        monkeypatch.setattr(settings, "graphql_max_cost", 100)
+        expensive = await test_schema.execute("{ tags { children(limit: 10) { id } } }")
+        assert expensive.errors[0].extensions["code"] == "QUERY_TOO_COMPLEX"
+
+        cheap = await test_schema.execute("{ tags { id } }")
+        assert cheap.errors is None
+
+    async def test_tenant_budget_throttles(self, monkeypatch):
+        monkeypatch.setattr(cost_module, "_budget", CostBudget(1, 60))
+        first = await test_schema.execute("{ items(limit: 40) { items { id } } }")
+        second = await test_schema.execute("{ items(limit: 40) { items { id } } }")
+        assert first.errors is None
+        assert second.errors[0].extensions["code"] == "RATE_LIMITED"
+        assert second.errors[0].extensions["retryAfter"] >= 1
+
+    def test_budget_is_per_key(self):
+        budget = CostBudget(1, 10)
+        assert budget.take("tenant:a", 10) == 0
+        assert budget.take("tenant:a", 5) > 0
+        assert budget.take("tenant:b", 10) == 0
+
+
+class TestPersistedQueries:
+    async def test_hash_only_flow(self):
+        query = "{ version }"
+        digest = query_hash(query)
+        apq = {"persistedQuery": {"version": 1, "sha256Hash": digest}}
+
+        missing = await test_schema.execute(None, operation_extensions=apq)
+        assert missing.errors[0].extensions["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+        registered = await test_schema.execute(query, operation_extensions=apq)
+        assert registered.data == {"version": "1"}
+        pq_module._store_persisted.assert_awaited_once_with(digest, query)
+
+        by_hash = await test_schema.execute(None, operation_extensions=apq)
+        assert by_hash.data == {"version": "1"}
+
+    async def test_rejects_mismatched_hash(self):
+        result = await test_schema.execute(
+            "{ version }", operation_extensions={"persistedQuery": {"sha256Hash": "0" * 64}}
+        )
+        assert result.errors[0].extensions["code"] == "PERSISTED_QUERY_INVALID"
+
+    async def test_resolves_hash_registered_by_another_worker(self):
+        pq_module._load_persisted.return_value = "{ version }"
+        apq = {"persistedQuery": {"sha256Hash": query_hash("{ version }")}}
+        result = await test_schema.execute(None, operation_extensions=apq)
+        assert result.data == {"version": "1"}
+
+    async def test_parse_and_validation_are_cached(self, monkeypatch):
+        calls = []
+        from strawberry.schema import schema as strawberry_schema
+
+        original = strawberry_schema.validate_document
+        monkeypatch.setattr(
+            strawberry_schema,
+            "validate_document",
+            lambda *args: calls.append(1) or original(*args),
+        )
+        for _ in range(3):
+            assert (await test_schema.execute("{ version }")).data == {"version": "1"}
+            invalid = await test_schema.execute("{ nope }")
+            assert invalid.errors
+        assert len(calls) == 2
+        assert len(pq_module.get_document_cache()) == 2
+
+
+FRONTEND_SRC = Path(__file__).resolve().parents[2] / "frontend" / "src"
+# Largest page size the frontend requests
+FRONTEND_MAX_PAGE = 1000
+
+_TS_CONST = re.compile(r"(?:export\s+)?const\s+([A-Za-z_]\w*)\s*=\s*`([^`]*)`")
+_TS_DOCUMENT = re.compile(r"`(\s*(?:query|mutation)\b[^`]*)`")
+_TS_INTERPOLATION = re.compile(r"\$\{\s*([A-Za-z_]\w*)\s*\}")
+
+
+def _inline(source, constants, depth=0):
+    return _TS_INTERPOLATION.sub(
+        lambda m: _inline(constants[m[1]], constants, depth + 1)
+        if m[1] in constants and depth < 5 else m[0],
+        source,
+    )
+
+
+def _frontend_documents():
+    """GraphQL documents in the frontend's template literals, with field constants inlined."""
+    for path in sorted(FRONTEND_SRC.rglob("*.ts")):
+        text = path.read_text(encoding="utf-8")
+        constants = dict(_TS_CONST.findall(text))
+        for match in _TS_DOCUMENT.finditer(text):
+            document = _inline(match[1], constants)
+            if "${" not in document:
+                yield path.relative_to(FRONTEND_SRC), document
+
+
+@pytest.mark.skipif(not FRONTEND_SRC.is_dir(), reason="frontend sources not present")
+class TestFrontendDocuments:
+    def test_within_default_limits(self):
+        from app.api.graphql.schema import schema
+
+        defaults = {name: field.default for name, field in Settings.model_fields.items()}
+        variables = dict.fromkeys(SIZE_ARGUMENTS, FRONTEND_MAX_PAGE)
+        checked = 0
+        over = []
+        for path, document in _frontend_documents():
+            cost = analyze_query(
+                schema._schema, parse(document), None, variables,
+                defaults["graphql_default_list_size"],
+            )
+            checked += 1
+            if (
+                cost.cost > defaults["graphql_max_cost"]
+                or cost.depth > defaults["graphql_max_depth"]
+                or cost.aliases > defaults["graphql_max_aliases"]
+            ):
+                over.append(f"{path}: {document.split('{')[0].strip()} -> {cost}")
+        assert checked > 100
+        assert over == []
@@ -0,0 +1,224 @@
+"""
+Overview: Tests for the tagged GraphQL response cache and REST ETags.
+Architecture: Unit tests for the response caching layer (Section 7.2, 3.1)
+Dependencies: pytest, httpx, sqlalchemy, strawberry, app.services.cache.response_cache,
+    app.api.graphql.response_cache, app.core.etag
+Concepts: Tag recording from executed selects and key lookups, commit-time invalidation,
+    sequence checks against concurrent invalidation, permission replay on hits, 304 revalidation
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+import strawberry
+from sqlalchemy import String, create_engine, select, update
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.api.graphql import auth as auth_module
+from app.api.graphql.response_cache import ResponseCacheExtension
+from app.core.config import Settings
+from app.core.etag import ETagMiddleware
+from app.services.cache import response_cache as cache_module
+from app.services.cache.response_cache import (
+    RECORDER_KEY,
+    CachedResponse,
+    MemoryResponseCache,
+    TagRecorder,
+    ValkeyResponseCache,
+    get_response_cache,
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Offering(Base):
+    __tablename__ = "offerings"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(50))
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([Offering(id=1, name="vm"), Offering(id=2, name="db")])
+        session.commit()
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch):
+    cache = MemoryResponseCache(100, 60)
+    monkeypatch.setattr(cache_module, "_cache", cache)
+    return cache
+
+
+class TestMemoryResponseCache:
+    async def test_invalidated_tag_drops_entry(self, memory_cache):
+        seq = await memory_cache.begin()
+        entry = CachedResponse({"a": 1}, frozenset({"t", "t:1"}), frozenset(), seq)
+        await memory_cache.put("k", entry)
+        assert (await memory_cache.get("k")).data == {"a": 1}
+
+        memory_cache.invalidate({"other"})
+        assert await memory_cache.get("k") is not None
+        memory_cache.invalidate({"t:1"})
+        assert await memory_cache.get("k") is None
+
+    async def test_invalidation_during_execution_is_not_stored(self, memory_cache):
+        seq = await memory_cache.begin()
+        memory_cache.invalidate({"t"})
+        await memory_cache.put("k", CachedResponse({}, frozenset({"t"}), frozenset(), seq))
+        assert await memory_cache.get("k") is None
+
+
+class TestBackend:
+    def test_defaults_to_the_shared_valkey_store(self, monkeypatch):
+        defaults = {name: f.default for name, f in Settings.model_fields.items()}
+        monkeypatch.setattr(cache_module, "_cache", None)
+        monkeypatch.setattr(cache_module, "get_settings", lambda: SimpleNamespace(**defaults))
+        assert isinstance(get_response_cache(), ValkeyResponseCache)
+
+
+class TestTagRecording:
+    def test_records_tables_and_primary_key_lookups(self, db):
+        recorder = TagRecorder()
+        db.info[RECORDER_KEY] = recorder
+        db.scalars(select(Offering).where(Offering.name == "vm")).all()
+        assert recorder.tags == {"offerings"}
+
+        recorder.tags.clear()
+        db.scalars(select(Offering).where(Offering.id.in_([1, 2]))).all()
+        db.expunge_all()
+        db.get(Offering, 3)
+        assert recorder.tags == {"offerings:1", "offerings:2", "offerings:3"}
+
+    def test_writes_make_the_operation_uncacheable(self, db):
+        recorder = TagRecorder()
+        db.info[RECORDER_KEY] = recorder
+        db.execute(update(Offering).values(name="x"))
+        assert not recorder.cacheable
+
+    def test_commit_invalidates_changed_rows(self, db, monkeypatch):
+        invalidated = []
+        monkeypatch.setattr(cache_module, "invalidate_tags", invalidated.append)
+        db.get(Offering, 1).name = "vm2"
+        db.add(Offering(id=3, name="k8s"))
+        db.commit()
+        assert invalidated == [{"offerings", "offerings:1"}]
+
+        db.get(Offering, 2).name = "db2"
+        db.rollback()
+        db.commit()
+        assert invalidated == [{"offerings", "offerings:1"}]
+
+    def test_process_without_cached_queries_still_invalidates(self, db, monkeypatch):
+        cache = MagicMock()
+        monkeypatch.setattr(cache_module, "_cache", None)
+        monkeypatch.setattr(cache_module, "ValkeyResponseCache", lambda ttl: cache)
+        db.get(Offering, 1).name = "vm2"
+        db.commit()
+        cache.invalidate.assert_called_once_with({"offerings", "offerings:1"})
+
+
+@strawberry.type
+class OfferingType:
+    id: int
+    name: str
+
+
+calls: list[str] = []
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def service_offerings(self, info: strawberry.Info) -> list[OfferingType]:
+        calls.append("serviceOfferings")
+        await auth_module.check_context_permission(info.context, "catalog:read", "t1")
+        info.context.granted_permissions = frozenset({("catalog:read", "t1")})
+        session = await info.context.session()
+        return [OfferingType(id=o.id, name=o.name) for o in session.scalars(select(Offering))]
+
+    @strawberry.field
+    def version(self) -> str:
+        calls.append("version")
+        return "1"
+
+
+test_schema = strawberry.Schema(query=Query, extensions=[ResponseCacheExtension])
+
+
+class Context:
+    request = None
+    granted_permissions: frozenset = frozenset()
+
+    def __init__(self, db: Session):
+        self._db = db
+
+    async def session(self) -> Session:
+        return self._db
+
+
+class TestResponseCacheExtension:
+    @pytest.fixture(autouse=True)
+    def permissions(self, monkeypatch):
+        calls.clear()
+        check = AsyncMock(return_value="user")
+        monkeypatch.setattr(auth_module, "check_context_permission", check)
+        return check
+
+    async def run(self, db, query="{ serviceOfferings { id name } }"):
+        return await test_schema.execute(query, context_value=Context(db))
+
+    async def test_hit_until_a_touched_row_changes(self, db):
+        first = await self.run(db)
+        assert first.errors is None
+        assert (await self.run(db)).data == first.data
+        assert calls == ["serviceOfferings"]
+
+        db.get(Offering, 2).name = "postgres"
+        db.commit()
+        data = (await self.run(db)).data
+        assert data["serviceOfferings"][1]["name"] == "postgres"
+        assert calls == ["serviceOfferings"] * 2
+
+    async def test_hit_replays_permissions(self, db, permissions):
+        await self.run(db)
+        permissions.side_effect = PermissionError("Missing permission: catalog:read")
+        denied = await self.run(db)
+        assert denied.data is None and "catalog:read" in denied.errors[0].message
+        assert calls == ["serviceOfferings"] * 2
+
+    async def test_fields_outside_allowlist_are_not_cached(self, db):
+        await self.run(db, "{ serviceOfferings { id } version }")
+        await self.run(db, "{ serviceOfferings { id } version }")
+        assert calls.count("serviceOfferings") == 2
+
+
+async def _offerings(request):
+    return JSONResponse([{"id": 1}])
+
+
+class TestETag:
+    async def test_revalidation_returns_304(self):
+        app = ETagMiddleware(Starlette(routes=[Route("/api/v1/o", _offerings)]), ["/api/v1/"])
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            first = await client.get("/api/v1/o")
+            etag = first.headers["etag"]
+            assert first.json() == [{"id": 1}] and etag.startswith('W/"')
+
+            again = await client.get("/api/v1/o", headers={"If-None-Match": etag})
+            assert again.status_code == 304 and again.content == b""
+            changed = await client.get("/api/v1/o", headers={"If-None-Match": 'W/"stale"'})
+            assert changed.status_code == 200
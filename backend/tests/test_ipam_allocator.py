@@ -0,0 +1,194 @@
+"""
+Overview: Tests for the IPAM allocator — aligned free blocks, first/best fit, buddy merging,
+    locked batch allocation.
+Architecture: Unit tests for IPAM allocation (Section 5)
+Dependencies: pytest, app.services.ipam.allocator, app.services.ipam.validation,
+    app.services.ipam.ipam_service
+Concepts: Integer CIDR spans, free-block index parity with exhaustive subnet enumeration
+"""
+
+import ipaddress
+import random
+import uuid
+from itertools import pairwise
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.exc import IntegrityError
+
+from app.models.ipam import AllocationType
+from app.services.ipam.allocator import FreeBlockIndex, aligned_blocks, parse_span
+from app.services.ipam.ipam_service import BlockRequest, IpamService
+from app.services.ipam.validation import find_overlaps, next_available_block
+
+
+def _enumerate_first_fit(parent_cidr: str, existing: list[str], prefix: int) -> str | None:
+    """Reference: first candidate subnet in address order that overlaps nothing."""
+    parent = ipaddress.ip_network(parent_cidr)
+    if prefix < parent.prefixlen:
+        return None
+    nets = [ipaddress.ip_network(c, strict=False) for c in existing]
+    for candidate in parent.subnets(new_prefix=prefix):
+        if not any(candidate.overlaps(n) for n in nets):
+            return str(candidate)
+    return None
+
+
+class TestAlignedBlocks:
+    def test_covers_range_with_maximal_blocks(self):
+        span = parse_span("10.0.0.0/24")
+        blocks = aligned_blocks(span.start + 1, span.start + 16, 32)
+        assert [p for _, p in blocks] == [32, 31, 30, 29]
+        assert sum(1 << (32 - p) for _, p in blocks) == 15
+
+
+class TestNextAvailableBlock:
+    def test_matches_enumeration(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            existing = [
+                str(ipaddress.ip_network(
+                    f"10.0.{rng.randint(0, 15)}.{rng.randint(0, 255)}/{rng.randint(21, 30)}",
+                    strict=False,
+                ))
+                for _ in range(rng.randint(0, 10))
+            ]
+            prefix = rng.randint(18, 30)
+            assert next_available_block("10.0.0.0/20", existing, prefix) == (
+                _enumerate_first_fit("10.0.0.0/20", existing, prefix)
+            )
+
+    def test_small_block_in_large_parent(self):
+        existing = ["10.0.0.0/9", "10.128.0.0/10"]
+        assert next_available_block("10.0.0.0/8", existing, 28) == "10.192.0.0/28"
+
+    def test_best_fit_prefers_smallest_hole(self):
+        existing = ["10.0.0.0/26", "10.0.0.128/26", "10.0.0.224/27"]
+        assert next_available_block("10.0.0.0/24", existing, 27) == "10.0.0.64/27"
+        assert next_available_block("10.0.0.0/24", existing, 27, "best_fit") == "10.0.0.192/27"
+
+    def test_ipv6_and_oversized_request(self):
+        assert next_available_block("fd00::/48", ["fd00::/64"], 64) == "fd00:0:0:1::/64"
+        assert next_available_block("10.0.0.0/24", [], 16) is None
+        assert next_available_block("10.0.0.0/24", ["10.0.0.0/24"], 28) is None
+
+
+class TestFreeBlockIndex:
+    @pytest.mark.parametrize("strategy", ["first_fit", "best_fit"])
+    def test_allocate_release_round_trip(self, strategy):
+        rng = random.Random(3)
+        parent = parse_span("10.0.0.0/16")
+        index = FreeBlockIndex(parent)
+        spans = [index.allocate(rng.randint(20, 28), strategy) for _ in range(300)]
+        spans = [s for s in spans if s is not None]
+        assert all(parent.contains(s) for s in spans)
+        ordered = sorted(spans, key=lambda s: s.start)
+        assert all(a.end <= b.start for a, b in pairwise(ordered))
+
+        rng.shuffle(spans)
+        for span in spans:
+            index.release(span)
+        assert index.free_addresses == parent.size
+        assert index.find(16) == parent
+
+
+class TestFindOverlaps:
+    def test_returns_overlapping_in_input_order(self):
+        existing = ["10.0.1.0/24", "10.0.0.0/16", "192.168.0.0/24", "fd00::/8"]
+        assert find_overlaps("10.0.1.128/25", existing) == ["10.0.1.0/24", "10.0.0.0/16"]
+
+
+class TestClaim:
+    def test_claim_splits_and_rejects_overlap(self):
+        parent = parse_span("10.0.0.0/24")
+        index = FreeBlockIndex(parent)
+        assert index.claim(parse_span("10.0.0.64/26"))
+        assert not index.claim(parse_span("10.0.0.96/27"))
+        assert not index.claim(parse_span("10.0.1.0/26"))
+        assert index.find(26) == parse_span("10.0.0.0/26")
+        assert index.find(25) == parse_span("10.0.0.128/25")
+        assert index.free_addresses == 192
+
+
+class TestBatchAllocation:
+    @staticmethod
+    def _service(monkeypatch, siblings):
+        svc = IpamService()
+        space = SimpleNamespace(id=uuid.uuid4(), cidr="10.0.0.0/24")
+        monkeypatch.setattr(svc, "get_address_space", AsyncMock(return_value=space))
+        monkeypatch.setattr(svc, "_sibling_cidrs", AsyncMock(return_value=list(siblings)))
+        db = MagicMock()
+        db.execute = AsyncMock()
+        db.flush = AsyncMock()
+        return svc, space, db
+
+    async def test_batch_places_blocks_after_each_other(self, monkeypatch):
+        svc, space, db = self._service(monkeypatch, ["10.0.0.0/26"])
+        requests = [
+            BlockRequest(name=f"s{i}", allocation_type=AllocationType.SUBNET, prefix_length=26)
+            for i in range(2)
+        ] + [BlockRequest(name="fixed", allocation_type=AllocationType.SUBNET,
+                          cidr="10.0.0.192/26")]
+
+        allocations = await svc.allocate_blocks(db, space.id, requests)
+
+        assert [a.cidr for a in allocations] == ["10.0.0.64/26", "10.0.0.128/26", "10.0.0.192/26"]
+        lock = db.execute.await_args_list[0].args[0]
+        assert "pg_advisory_xact_lock" in str(lock)
+        db.add_all.assert_called_once()
+        db.flush.assert_awaited_once()
+
+    async def test_batch_is_all_or_nothing(self, monkeypatch):
+        svc, space, db = self._service(monkeypatch, ["10.0.0.0/25"])
+        requests = [
+            BlockRequest(name="a", allocation_type=AllocationType.SUBNET, prefix_length=25),
+            BlockRequest(name="b", allocation_type=AllocationType.SUBNET, prefix_length=26),
+        ]
+        with pytest.raises(ValueError, match="No available /26"):
+            await svc.allocate_blocks(db, space.id, requests)
+        db.add_all.assert_not_called()
+
+    async def test_explicit_overlap_is_reported(self, monkeypatch):
+        svc, space, db = self._service(monkeypatch, ["10.0.0.0/25"])
+        with pytest.raises(ValueError, match=r"overlaps with existing allocations: 10\.0\.0\.0/25"):
+            await svc.allocate_block(
+                db, space.id, "x", "10.0.0.64/26", AllocationType.SUBNET
+            )
+
+    async def test_allocating_under_a_parent_counts_in_numeric(self, monkeypatch):
+        """The parent's counter update stays NUMERIC, so IPv6 counts neither overflow nor
+        hit the missing round(double precision, int)."""
+        svc, space, db = self._service(monkeypatch, [])
+        space.cidr = "2001:db8::/32"
+        parent = SimpleNamespace(id=uuid.uuid4(), cidr="2001:db8::/48")
+        monkeypatch.setattr(svc, "get_allocation", AsyncMock(return_value=parent))
+        db.execute.return_value = MagicMock()
+        db.execute.return_value.one_or_none.return_value = None
+
+        await svc.allocate_blocks(db, space.id, [
+            BlockRequest(name="v6", allocation_type=AllocationType.SUBNET, prefix_length=64,
+                         parent_allocation_id=parent.id),
+        ])
+
+        update = db.execute.await_args_list[-1].args[0]
+        compiled = update.compile(dialect=asyncpg.dialect())
+        sql = str(compiled)
+        assert "::FLOAT" not in sql and sql.count("::INTEGER") == 1  # round()'s digits
+        assert "round(((address_allocations.allocated_ips + $1::NUMERIC(39, 0))" in sql
+        assert 2**64 in compiled.params.values() and 2**80 in compiled.params.values()
+
+    async def test_constraint_violation_rolls_back_only_the_savepoint(self, monkeypatch):
+        svc, space, db = self._service(monkeypatch, [])
+        db.flush.side_effect = IntegrityError("INSERT", {}, Exception("excl_address_allocation"))
+
+        with pytest.raises(ValueError, match="concurrently created block"):
+            await svc.allocate_blocks(db, space.id, [
+                BlockRequest(name="a", allocation_type=AllocationType.SUBNET, prefix_length=26),
+            ])
+
+        savepoint = db.begin_nested.return_value
+        assert savepoint.__aexit__.await_args.args[0] is IntegrityError
+        db.add_all.assert_called_once()
+        db.rollback.assert_not_called()
@@ -0,0 +1,36 @@
+"""
+Overview: Tests for the static landing-zone registries — blueprint, hierarchy, and option lookups.
+Architecture: Unit tests for landing zone registries (Section 7.2)
+Dependencies: pytest, app.services.landing_zone
+Concepts: Indexed accessors return the same entries as the underlying registry lists
+"""
+
+from app.services.landing_zone import blueprints, env_option_catalog, hierarchy_registry
+
+
+class TestBlueprints:
+    def test_lookup_by_id(self):
+        for bp in blueprints._ALL_BLUEPRINTS:
+            assert blueprints.get_blueprint(bp["id"]) is bp
+        assert blueprints.get_blueprint("missing") is None
+
+
+class TestHierarchy:
+    def test_level_lookup_and_children(self):
+        h = hierarchy_registry.get_hierarchy("AWS")
+        root = h.get_level(h.root_type)
+        assert root is not None
+        children = hierarchy_registry.get_allowed_children("aws", h.root_type)
+        assert [c.type_id for c in children] == [
+            lv.type_id for lv in h.levels if lv.type_id in root.allowed_children
+        ]
+        assert h.get_level("missing") is None
+
+
+class TestOptionCatalog:
+    def test_catalog_sorted_and_copied(self):
+        options = env_option_catalog.get_option_catalog("aws", "network")
+        assert options
+        assert [o.sort_order for o in options] == sorted(o.sort_order for o in options)
+        options.clear()
+        assert env_option_catalog.get_option_catalog("aws", "network")
@@ -228,3 +228,51 @@ class TestMappingEngineLookups:
     def test_get_mappings_for_nonexistent_provider(self):
         mappings = self.engine.get_provider_resource_mappings("linode")
         assert len(mappings) == 0
+
+
+class TestMappingEngineCaching:
+    """Test memoized resolution, bounded caching, and batch mapping."""
+
+    def test_pattern_match_uses_provider_candidates(self):
+        engine = MappingEngine()
+        result = engine.resolve("aws", "ec2:instance:spot")
+        assert result is not None and result.name == "VirtualMachine"
+        assert engine.resolve("gcp", "ec2:instance:spot") is None
+
+    def test_misses_are_cached_and_cache_is_bounded(self, monkeypatch):
+        engine = MappingEngine(cache_size=2)
+        calls = []
+        original = engine._pattern_match
+
+        def counting(provider, resource_type):
+            calls.append(resource_type)
+            return original(provider, resource_type)
+
+        monkeypatch.setattr(engine, "_pattern_match", counting)
+        assert engine.resolve("aws", "custom:thing") is None
+        assert engine.resolve("AWS", "Custom:Thing") is None
+        assert calls == ["custom:thing"]
+
+        engine.resolve("aws", "custom:other")
+        engine.resolve("aws", "custom:third")
+        assert len(engine._resolved) == 2
+        assert ("aws", "custom:thing") not in engine._resolved
+
+    def test_map_resources_batch(self):
+        engine = MappingEngine()
+        resources = [
+            ProviderResource(
+                provider_name="aws", resource_type="ec2:instance", resource_id=f"i-{i}",
+                name=f"vm-{i}", raw_attributes={"cpu_count": i},
+            )
+            for i in range(3)
+        ]
+        resources.append(
+            ProviderResource(
+                provider_name="aws", resource_type="custom:unknown", resource_id="x", name="x",
+            )
+        )
+        results = engine.map_resources(resources)
+        assert [r.semantic_type for r in results] == ["VirtualMachine"] * 3 + [UNMAPPED_TYPE]
+        assert results[2].attributes["cpu_count"] == 2
+        assert results == [engine.map_resource(r) for r in resources]
@@ -0,0 +1,109 @@
+"""
+Overview: Tests for keyset pagination — cursor encoding, seek predicates, page assembly, totals.
+Architecture: Unit tests for the shared pagination helper (Section 4)
+Dependencies: pytest, app.db.pagination
+Concepts: Opaque cursors over sort-key values, row-value seek conditions, forward/backward
+    Relay paging, exact vs planner-estimated totals.
+"""
+
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.db import pagination
+from app.db.pagination import (
+    PaginationError,
+    _after,
+    _split_key,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+from app.models.cmdb.ci import ConfigurationItem
+
+
+def _sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+def _db(rows):
+    db = MagicMock()
+    result = MagicMock()
+    result.all.return_value = rows
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+class TestCursors:
+    def test_round_trip_typed_values(self):
+        values = [datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC), uuid.uuid4(), "vm", 0.25]
+        cursor = encode_cursor(values)
+        assert "=" not in cursor
+        assert decode_cursor(cursor, 4) == values
+
+    @pytest.mark.parametrize("cursor", ["not-base64!!", encode_cursor(["a"])])
+    def test_invalid_or_mismatched_cursor(self, cursor):
+        with pytest.raises(PaginationError):
+            decode_cursor(cursor, 2)
+
+
+class TestSeekCondition:
+    def test_uniform_direction_uses_row_comparison(self):
+        keys = [_split_key(ConfigurationItem.name), _split_key(ConfigurationItem.id)]
+        sql = _sql(_after(keys, ["vm", uuid.uuid4()]))
+        assert "(configuration_items.name, configuration_items.id) >" in sql
+
+    def test_mixed_direction_expands(self):
+        keys = [_split_key(ConfigurationItem.name.desc()), _split_key(ConfigurationItem.id)]
+        sql = _sql(_after(keys, ["vm", uuid.uuid4()]))
+        assert "configuration_items.name < " in sql
+        assert "configuration_items.id > " in sql
+
+
+class TestPaginate:
+    async def test_forward_page_detects_more(self):
+        db = _db([("a", "a", 1), ("b", "b", 2), ("c", "c", 3)])
+        stmt = select(ConfigurationItem)
+        page = await paginate(db, stmt, [ConfigurationItem.name, ConfigurationItem.id], first=2)
+        assert page.items == ["a", "b"]
+        assert page.has_next_page and not page.has_previous_page
+        assert decode_cursor(page.end_cursor, 2) == ["b", 2]
+        sql = _sql(db.execute.call_args.args[0])
+        assert "LIMIT" in sql and "OFFSET" not in sql
+
+    async def test_backward_page_is_reordered(self):
+        """last/before fetches in reverse order and returns rows in the requested order."""
+        db = _db([("c", "c", 3), ("b", "b", 2)])
+        page = await paginate(
+            db, select(ConfigurationItem), [ConfigurationItem.name, ConfigurationItem.id],
+            last=2, before=encode_cursor(["d", 4]),
+        )
+        assert page.items == ["b", "c"]
+        assert page.has_next_page and not page.has_previous_page
+        sql = _sql(db.execute.call_args.args[0])
+        assert "ORDER BY configuration_items.name DESC, configuration_items.id DESC" in sql
+
+    async def test_first_and_last_rejected(self):
+        with pytest.raises(PaginationError):
+            await paginate(
+                _db([]), select(ConfigurationItem), [ConfigurationItem.id], first=1, last=1
+            )
+
+    async def test_small_estimate_falls_back_to_exact(self, monkeypatch):
+        monkeypatch.setattr(pagination, "estimate_rows", AsyncMock(return_value=12))
+        monkeypatch.setattr(pagination, "count_rows", AsyncMock(return_value=10))
+        page = await paginate(
+            _db([]), select(ConfigurationItem), [ConfigurationItem.id], total="estimate"
+        )
+        assert page.total == 10 and not page.total_is_estimate
+
+    async def test_large_estimate_is_reported(self, monkeypatch):
+        monkeypatch.setattr(pagination, "estimate_rows", AsyncMock(return_value=250_000))
+        page = await paginate(
+            _db([]), select(ConfigurationItem), [ConfigurationItem.id], total="estimate"
+        )
+        assert page.total == 250_000 and page.total_is_estimate
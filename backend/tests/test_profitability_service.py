@@ -0,0 +1,145 @@
+"""
+Overview: Test suite for the profitability service rollup maintenance and helpers.
+Architecture: Test coverage for precomputed profitability reporting (Section 8)
+Dependencies: pytest, app.services.cmdb.profitability_service
+Concepts: Monthly rollup buckets, upsert increments, retraction, margin percentage, edits to
+    approved estimations re-folded into their bucket.
+"""
+
+import uuid
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.cmdb.estimation import EstimationLineItem, ServiceEstimation
+from app.services.cmdb.estimation_service import EstimationService
+from app.services.cmdb.profitability_service import (
+    ProfitabilityService,
+    _margin_percent,
+    _period_start,
+)
+
+
+class TestHelpers:
+    """Test pure helper functions."""
+
+    def test_margin_percent(self):
+        """Margin percent is margin over revenue."""
+        assert _margin_percent(Decimal("200"), Decimal("50")) == Decimal("25")
+
+    def test_margin_percent_zero_revenue(self):
+        """Zero revenue yields zero margin percent."""
+        assert _margin_percent(Decimal("0"), Decimal("10")) == Decimal("0")
+
+    def test_period_start_truncates_to_month(self):
+        """Buckets start on the first day of the month."""
+        assert _period_start(datetime(2026, 3, 17, 9, 30, tzinfo=UTC)) == date(2026, 3, 1)
+        assert _period_start(date(2026, 12, 31)) == date(2026, 12, 1)
+
+
+class TestApplyEstimation:
+    """Test incremental rollup upserts."""
+
+    def _estimation(self) -> ServiceEstimation:
+        return ServiceEstimation(
+            tenant_id=uuid.uuid4(),
+            client_tenant_id=uuid.uuid4(),
+            service_offering_id=uuid.uuid4(),
+            total_sell_price=Decimal("100"),
+            total_estimated_cost=Decimal("60"),
+            margin_amount=Decimal("40"),
+            approved_at=datetime(2026, 5, 4, tzinfo=UTC),
+        )
+
+    async def test_upsert_increments_bucket(self):
+        """Approving an estimation upserts into its monthly bucket with additive SET."""
+        db = MagicMock()
+        db.execute = AsyncMock()
+        await ProfitabilityService(db).apply_estimation(self._estimation())
+
+        stmt = db.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT ON CONSTRAINT uq_profitability_rollup_bucket" in sql
+        assert "profitability_rollups.total_revenue + excluded.total_revenue" in sql
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        assert params["period_start"] == date(2026, 5, 1)
+        assert params["total_revenue"] == Decimal("100")
+        assert params["estimation_count"] == 1
+
+    async def test_retract_negates_contribution(self):
+        """sign=-1 subtracts the estimation from its bucket."""
+        db = MagicMock()
+        db.execute = AsyncMock()
+        await ProfitabilityService(db).apply_estimation(self._estimation(), sign=-1)
+
+        params = db.execute.call_args.args[0].compile(dialect=postgresql.dialect()).params
+        assert params["total_margin"] == Decimal("-40")
+        assert params["estimation_count"] == -1
+
+
+class TestRebuildScope:
+    """Test the nightly rebuild's tenant discovery."""
+
+    async def test_tenants_with_approved_estimations_or_rollups(self):
+        """Tenants whose estimations were all retracted are still rebuilt (emptied)."""
+        tenant = uuid.uuid4()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [tenant]
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+
+        assert await ProfitabilityService(db).find_rollup_tenants() == [str(tenant)]
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "UNION" in sql and "profitability_rollups" in sql
+        assert "service_estimations.status = " in sql
+
+
+def _scalar(value) -> MagicMock:
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    result.scalars.return_value.all.return_value = [value]
+    return result
+
+
+class TestApprovedEstimationEdits:
+    """Test that line-item edits keep an approved estimation's bucket current."""
+
+    async def test_line_item_edit_moves_the_overview(self, monkeypatch):
+        """The old totals are retracted and the new ones folded in."""
+        ledger = {"revenue": Decimal("0"), "cost": Decimal("0"), "margin": Decimal("0"), "n": 0}
+
+        async def apply(self, estimation, sign=1):
+            ledger["revenue"] += estimation.total_sell_price * sign
+            ledger["cost"] += estimation.total_estimated_cost * sign
+            ledger["margin"] += estimation.margin_amount * sign
+            ledger["n"] += sign
+
+        monkeypatch.setattr(ProfitabilityService, "apply_estimation", apply)
+        estimation = ServiceEstimation(
+            id=uuid.uuid4(), tenant_id=uuid.uuid4(), status="approved",
+            sell_price_per_unit=Decimal("100"), quantity=Decimal("1"),
+            total_sell_price=Decimal("100"), total_estimated_cost=Decimal("60"),
+            margin_amount=Decimal("40"), approved_at=datetime(2026, 5, 4, tzinfo=UTC),
+        )
+        item = EstimationLineItem(
+            id=uuid.uuid4(), estimation_id=estimation.id,
+            estimated_hours=Decimal("6"), hourly_rate=Decimal("10"), line_cost=Decimal("60"),
+        )
+        await apply(None, estimation)
+
+        db = MagicMock()
+        db.flush = AsyncMock()
+        db.execute = AsyncMock(side_effect=[_scalar(item), _scalar(estimation), _scalar(item)])
+        service = EstimationService(db)
+        await service.update_line_item(str(item.id), {"estimated_hours": Decimal("8")})
+
+        totals = MagicMock()
+        totals.one.return_value = tuple(ledger.values())
+        overview_db = MagicMock()
+        overview_db.execute = AsyncMock(return_value=totals)
+        overview = await ProfitabilityService(overview_db).get_overview(str(estimation.tenant_id))
+        assert overview["total_cost"] == Decimal("80")
+        assert overview["total_margin"] == Decimal("20")
+        assert overview["estimation_count"] == 1
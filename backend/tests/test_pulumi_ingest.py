@@ -0,0 +1,172 @@
+"""
+Overview: Tests for streaming Pulumi ingestion — stream readers, type resolution, batching.
+Architecture: Unit tests for the Pulumi → CMDB sync pipeline (Sections 5, 8)
+Dependencies: pytest, app.services.cmdb.pulumi_ingest
+Concepts: Incremental stack-export parsing, event-log deletes, memoized type resolution,
+    per-batch checkpoints
+"""
+
+import io
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.cmdb.ci_bulk_service import BulkUpsertReport
+from app.services.cmdb.pulumi_ingest import (
+    PulumiIngestService,
+    _iter_array,
+    iter_pulumi_records,
+    split_pulumi_type,
+)
+
+STACK = "urn:pulumi:dev::proj::"
+
+
+def _export(n: int) -> str:
+    resources = [{"urn": f"{STACK}pulumi:pulumi:Stack::proj-dev", "type": "pulumi:pulumi:Stack"}]
+    resources += [
+        {
+            "urn": f"{STACK}aws:ec2/instance:Instance::vm-{i}",
+            "type": "aws:ec2/instance:Instance",
+            "id": f"i-{i}",
+            "outputs": {"instanceType": "t3.micro", "tags": {"n": str(i)}},
+        }
+        for i in range(n)
+    ]
+    return json.dumps(
+        {"version": 3, "deployment": {"manifest": {}, "resources": resources}}, indent=2
+    )
+
+
+class TestStreamReaders:
+    def test_array_elements_across_small_chunks(self):
+        """Elements are decoded even when they straddle read boundaries."""
+        items = list(_iter_array(io.StringIO(_export(5)), "resources", chunk_size=7))
+        assert len(items) == 6
+        assert items[-1]["id"] == "i-4"
+
+    def test_state_mode_detected(self):
+        mode, records = iter_pulumi_records(io.StringIO(_export(2)))
+        assert mode == "state"
+        assert [r.resource_id for r in records] == [None, "i-0", "i-1"]
+
+    def test_event_log_with_delete(self):
+        """Event logs are read line by line; delete ops become deletion records."""
+        lines = [
+            {"sequence": 1, "preludeEvent": {}},
+            {"sequence": 2, "resOutputsEvent": {"metadata": {
+                "op": "create", "urn": f"{STACK}aws:s3/bucket:Bucket::b", "type": "aws:s3/bucket:Bucket",
+                "new": {"id": "b-1", "outputs": {"bucket": "b"}},
+            }}},
+            {"sequence": 3, "resOutputsEvent": {"metadata": {
+                "op": "delete", "urn": f"{STACK}aws:s3/bucket:Bucket::old", "type": "aws:s3/bucket:Bucket",
+            }}},
+        ]
+        stream = io.StringIO("\n".join(json.dumps(line) for line in lines) + "\n")
+        mode, records = iter_pulumi_records(stream)
+        records = list(records)
+        assert mode == "events"
+        assert [(r.resource_id, r.deleted) for r in records] == [("b-1", False), (None, True)]
+
+    def test_bad_event_lines_become_error_records(self):
+        stream = io.StringIO('{"sequence": 1}\n{"sequence": 2, oops\n[1, 2]\n')
+        _, records = iter_pulumi_records(stream)
+        errors = [r.error for r in records]
+        assert errors[0].startswith("Line 2: invalid JSON")
+        assert errors[1] == "Line 3: not a JSON object"
+
+
+class TestTypeResolution:
+    def test_split_pulumi_type(self):
+        assert split_pulumi_type("aws:ec2/instance:Instance") == ("aws", "ec2:instance")
+        assert split_pulumi_type("azure-native:network:VirtualNetwork") == (
+            "azure", "network:virtual-network",
+        )
+
+    def test_resolution_is_memoized(self):
+        engine = MagicMock()
+        engine.resolve.return_value = MagicMock()
+        engine.resolve.return_value.name = "VirtualMachine"
+        svc = PulumiIngestService(MagicMock(), engine=engine)
+        svc._class_ids = {"VirtualMachine": "class-1"}
+        for _ in range(3):
+            assert svc._resolve("aws:ec2/instance:Instance")[1] == "class-1"
+        engine.resolve.assert_called_once_with("aws", "ec2:instance")
+
+
+class TestIngest:
+    async def test_batches_and_checkpoints(self, monkeypatch):
+        """Resources are upserted in batches; the stack resource is skipped; checkpoints advance."""
+        upserts = []
+
+        async def bulk_upsert(tenant_id, rows, **kwargs):
+            upserts.append(rows)
+            return BulkUpsertReport(created=len(rows))
+
+        bulk = MagicMock(bulk_upsert=AsyncMock(side_effect=bulk_upsert), bulk_delete=AsyncMock())
+        monkeypatch.setattr("app.services.cmdb.pulumi_ingest.CIBulkService", lambda db: bulk)
+
+        svc = PulumiIngestService(MagicMock())
+        svc._class_ids = {"VirtualMachine": "class-1"}
+        checkpoints = []
+
+        async def on_checkpoint(position):
+            checkpoints.append(position)
+
+        report = await svc.ingest(
+            "t", io.StringIO(_export(5)), batch_size=2, on_checkpoint=on_checkpoint, sweep=False,
+        )
+        assert [len(rows) for rows in upserts] == [1, 2, 2]
+        assert checkpoints == [2, 4, 6]
+        assert report.created == 5 and report.skipped == 1
+        assert upserts[0][0]["ci_class_id"] == "class-1"
+        assert upserts[0][0]["name"] == "vm-0"
+
+    async def test_bad_lines_are_reported_and_ingest_continues(self, monkeypatch):
+        bulk = MagicMock(
+            bulk_upsert=AsyncMock(return_value=BulkUpsertReport(created=1)),
+            bulk_delete=AsyncMock(),
+        )
+        monkeypatch.setattr("app.services.cmdb.pulumi_ingest.CIBulkService", lambda db: bulk)
+        svc = PulumiIngestService(MagicMock())
+        svc._class_ids = {"ObjectStorage": "class-1"}
+        event = {"sequence": 2, "resOutputsEvent": {"metadata": {
+            "op": "create", "urn": f"{STACK}aws:s3/bucket:Bucket::b",
+            "type": "aws:s3/bucket:Bucket", "new": {"id": "b-1"},
+        }}}
+        stream = io.StringIO('{"sequence": 1}\nnot json\n' + json.dumps(event) + "\n")
+
+        report = await svc.ingest("t", stream)
+
+        assert report.failed == 1 and report.created == 1
+        assert report.errors[0]["error"].startswith("Line 2: invalid JSON")
+
+    async def test_sweep_deletes_unseen_urns_page_by_page(self, monkeypatch):
+        deleted = []
+
+        async def bulk_delete(tenant_id, urns, **kwargs):
+            deleted.append(urns)
+            return MagicMock(deleted=len(urns))
+
+        bulk = MagicMock(
+            bulk_upsert=AsyncMock(return_value=BulkUpsertReport()),
+            bulk_delete=AsyncMock(side_effect=bulk_delete),
+        )
+        monkeypatch.setattr("app.services.cmdb.pulumi_ingest.CIBulkService", lambda db: bulk)
+        live = sorted(
+            [f"{STACK}aws:ec2/instance:Instance::vm-{i}" for i in range(2)]
+            + [f"{STACK}aws:ec2/instance:Instance::gone-{i}" for i in range(3)]
+        )
+        pages = [live[i:i + 2] for i in range(0, len(live), 2)] + [[]]
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[
+            MagicMock(scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=p))))
+            for p in pages
+        ])
+        svc = PulumiIngestService(db)
+        svc._class_ids = {}
+
+        report = await svc.ingest("t", io.StringIO(_export(2)), batch_size=2)
+
+        assert report.deleted == 3
+        assert all(len(urns) <= 2 for urns in deleted)
+        assert sorted(u for urns in deleted for u in urns) == [u for u in live if "gone" in u]
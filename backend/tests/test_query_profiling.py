@@ -0,0 +1,81 @@
+"""
+Overview: Tests for the query profiling hook and the prebuilt hot-path statements.
+Architecture: Database layer tests (Section 3.1, 4)
+Dependencies: pytest, sqlalchemy, app.db.profiling, app.db.session, app.services
+Concepts: Compile vs execute timing, compiled-cache hits, statements built once per process,
+    asyncpg prepared-statement cache sizing
+"""
+
+import pytest
+from sqlalchemy import bindparam, create_engine, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.db.profiling import QueryProfiler, disable_query_profiling, enable_query_profiling
+from app.db.session import engine_options, settings
+from app.services.cmdb.catalog_service import _price_item_query
+from app.services.cmdb.graph_service import _traverse_query
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Note(Base):
+    __tablename__ = "notes"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+
+_NOTE_BY_ID = select(Note).where(Note.id == bindparam("id"))
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    profiler = QueryProfiler()
+    monkeypatch.setattr("app.db.profiling._profiler", profiler)
+    enable_query_profiling()
+    yield profiler
+    disable_query_profiling()
+
+
+class TestQueryProfiler:
+    def test_records_compile_and_execute_time_per_statement(self, profiler):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        profiler.reset()
+        with Session(engine) as session:
+            for note_id in (1, 2, 3):
+                session.execute(_NOTE_BY_ID, {"id": note_id}).all()
+
+        [stats] = profiler.snapshot()
+        assert "FROM notes" in stats["statement"]
+        assert stats["count"] == 3
+        assert stats["cache_hit_ratio"] == pytest.approx(2 / 3, abs=0.001)
+        assert stats["compile_ms"] >= 0 and stats["execute_ms"] > 0
+
+    def test_bounded_to_max_statements(self):
+        profiler = QueryProfiler(max_statements=1)
+        profiler.record("SELECT 1", 0.0, 0.001, False)
+        profiler.record("SELECT 2", 0.0, 0.001, False)
+        assert [s["statement"] for s in profiler.snapshot()] == ["SELECT 1"]
+
+    def test_nothing_recorded_when_disabled(self, profiler):
+        disable_query_profiling()
+        engine = create_engine("sqlite://")
+        with Session(engine) as session:
+            session.execute(select(1))
+        assert profiler.snapshot() == []
+
+
+class TestPrebuiltStatements:
+    def test_variable_queries_are_built_once(self):
+        assert _price_item_query("client", True, False) is _price_item_query("client", True, False)
+        assert _traverse_query("outgoing", True) is _traverse_query("outgoing", True)
+        assert _traverse_query("outgoing", True) is not _traverse_query("incoming", True)
+
+    def test_engines_size_the_prepared_statement_cache(self):
+        options = engine_options(5)
+        assert options["pool_size"] == 5
+        assert options["connect_args"] == {
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size
+        }
@@ -0,0 +1,167 @@
+"""
+Overview: Tests for read-replica routing, lag fallback and read-your-writes pinning.
+Architecture: Database layer tests (Section 3.1, 4)
+Dependencies: pytest, sqlalchemy, strawberry, temporalio, app.db.replica, app.api.graphql.schema,
+    app.workflows.activities.tenant_export
+Concepts: Lag threshold, per-tenant write pinning (in process and by WAL position in Valkey),
+    commit-time write tracking, GraphQL query operations routed to the replica and mutations
+    kept on the primary, exports pinned by the tenant they run for
+"""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import strawberry
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from temporalio.testing import ActivityEnvironment
+
+from app.api.graphql.schema import ReadReplicaExtension
+from app.core.tenant_context import clear_tenant_context, set_current_tenant_id
+from app.db import replica
+from app.db.replica import ReplicaRouter
+from app.services.tenant.export_service import ExportService
+from app.workflows.activities.tenant_export import ExportInput, execute_tenant_export
+
+TENANT = str(uuid.uuid4())
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Note(Base):
+    __tablename__ = "notes"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+
+class FakeValkey:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def eval(self, script, numkeys, key, value, ttl):
+        if value > int(self.data.get(key, 0)):
+            self.data[key] = str(value)
+
+
+def router_with_lag(
+    lag: float | None, replayed: int = 0, valkey: FakeValkey | None = None
+) -> ReplicaRouter:
+    router = ReplicaRouter(max_lag=5, check_interval=0)
+    router.measure = AsyncMock(return_value=None if lag is None else (lag, replayed))
+    router._client = AsyncMock(return_value=valkey or FakeValkey())
+    return router
+
+
+class TestReplicaRouter:
+    async def test_falls_back_when_lagging_or_unreachable(self):
+        assert await router_with_lag(0.2).use_replica(TENANT)
+        assert not await router_with_lag(30).use_replica(TENANT)
+        assert not await router_with_lag(None).use_replica(TENANT)
+
+    async def test_shared_pin_holds_tenant_until_replica_replays_its_lsn(self):
+        valkey = FakeValkey()
+        valkey.data[replica._VALKEY_PREFIX + TENANT] = "2000"
+        assert not await router_with_lag(0.0, replayed=1999, valkey=valkey).use_replica(TENANT)
+        assert await router_with_lag(0.0, replayed=1999, valkey=valkey).use_replica("other")
+        assert await router_with_lag(0.0, replayed=2000, valkey=valkey).use_replica(TENANT)
+
+    async def test_pin_keeps_the_highest_primary_lsn(self, monkeypatch):
+        valkey = FakeValkey()
+        router = router_with_lag(0.0, valkey=valkey)
+        for lsn in (500, 300):
+            conn = AsyncMock()
+            conn.execute.return_value.scalar = lambda lsn=lsn: lsn
+            primary = MagicMock()
+            primary.connect.return_value.__aenter__.return_value = conn
+            monkeypatch.setattr(replica, "engine", primary)
+            await router.pin_write(TENANT)
+        assert valkey.data == {replica._VALKEY_PREFIX + TENANT: "500"}
+
+    async def test_primary_without_valkey(self):
+        router = router_with_lag(0.0)
+        router._client = AsyncMock(return_value=None)
+        assert not await router.use_replica(TENANT)
+
+    async def test_pins_tenant_to_primary_until_replica_replays_its_write(self):
+        router = router_with_lag(0.0)
+        router.check_interval = 60
+        assert await router.use_replica(TENANT)
+
+        router.note_write(TENANT)
+        assert not await router.use_replica(TENANT)
+        assert await router.use_replica("other-tenant")
+
+        router._checked_at = 0  # next read re-measures: replica has caught up
+        assert await router.use_replica(TENANT)
+
+    async def test_commit_with_changes_notes_write_for_tenant(self, monkeypatch):
+        router = ReplicaRouter(5, 1)
+        monkeypatch.setattr(replica, "_router", router)
+        monkeypatch.setattr(replica, "async_replica_session_factory", object())
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        set_current_tenant_id(TENANT)
+        try:
+            with Session(engine) as session:
+                session.execute(select(Note)).all()
+                session.commit()
+                assert router._writes == {}
+                session.add(Note(id=1))
+                session.commit()
+        finally:
+            clear_tenant_context()
+        assert set(router._writes) == {TENANT}
+
+
+class TestExportActivities:
+    async def test_pinned_tenant_export_reads_from_the_primary(self, monkeypatch):
+        valkey = FakeValkey()
+        valkey.data[replica._VALKEY_PREFIX + TENANT] = "2000"
+        monkeypatch.setattr(replica, "_router", router_with_lag(0.0, 1999, valkey))
+        monkeypatch.setattr(replica, "async_replica_session_factory", MagicMock())
+        primary = MagicMock()
+        monkeypatch.setattr(replica, "async_session_factory", primary)
+        export = AsyncMock(return_value="exports/t.json")
+        monkeypatch.setattr(ExportService, "execute_export", export)
+
+        result = await ActivityEnvironment().run(
+            execute_tenant_export, ExportInput(tenant_id=TENANT, job_id="j-1")
+        )
+
+        assert result.success
+        primary.assert_called_once()
+        replica.async_replica_session_factory.assert_not_called()
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def routed(self, info: strawberry.Info) -> bool:
+        return info.context.read_replica
+
+
+@strawberry.type
+class Mutation:
+    @strawberry.mutation
+    def routed(self, info: strawberry.Info) -> bool:
+        return info.context.read_replica
+
+
+class Context:
+    read_replica = False
+
+
+test_schema = strawberry.Schema(query=Query, mutation=Mutation, extensions=[ReadReplicaExtension])
+
+
+class TestReadReplicaExtension:
+    @pytest.mark.parametrize(("operation", "expected"), [("query", True), ("mutation", False)])
+    async def test_only_queries_use_the_replica(self, operation, expected):
+        result = await test_schema.execute(f"{operation} {{ routed }}", context_value=Context())
+        assert result.data == {"routed": expected}
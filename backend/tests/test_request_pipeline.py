@@ -0,0 +1,114 @@
+"""
+Overview: Tests for the pure-ASGI request pipeline and its stages.
+Architecture: Unit tests for the middleware layer (Section 3.1, 5.5)
+Dependencies: pytest, httpx, starlette, app.core.middleware, app.core.audit_middleware
+Concepts: Stage ordering, header injection, tenant context lifetime, streaming passthrough,
+    post-response audit logging, per-stage timings
+"""
+
+import uuid
+from unittest.mock import AsyncMock
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core import audit_middleware
+from app.core.audit_middleware import AuditStage
+from app.core.middleware import (
+    RequestPipeline,
+    SecurityHeadersStage,
+    TenantContextStage,
+    TraceIDStage,
+    pipeline_timings,
+    reset_pipeline_timings,
+)
+from app.core.tenant_context import get_current_tenant_id
+from app.services.auth.jwt import create_access_token
+
+TENANT = str(uuid.uuid4())
+
+
+async def _whoami(request):
+    return JSONResponse({
+        "tenant": get_current_tenant_id(),
+        "trace_id": request.state.trace_id,
+    })
+
+
+async def _stream(request):
+    async def chunks():
+        for i in range(3):
+            yield f"chunk{i};".encode()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+def _client(**pipeline) -> httpx.AsyncClient:
+    app = Starlette(routes=[Route("/whoami", _whoami), Route("/stream", _stream)])
+    wrapped = RequestPipeline(
+        app,
+        stages=[TenantContextStage(), SecurityHeadersStage(), TraceIDStage(), AuditStage()],
+        **pipeline,
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=wrapped), base_url="http://t")
+
+
+def _auth() -> dict[str, str]:
+    token, _, _ = create_access_token(
+        str(uuid.uuid4()), "p", tenant_ids=[TENANT], current_tenant_id=TENANT
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestRequestPipeline:
+    async def test_headers_trace_and_tenant_context(self, monkeypatch):
+        monkeypatch.setattr(
+            audit_middleware, "_get_logging_config", AsyncMock(return_value={})
+        )
+        monkeypatch.setattr(audit_middleware, "_log_request", AsyncMock())
+        async with _client() as client:
+            response = await client.get("/whoami", headers={**_auth(), "X-Trace-ID": "t-1"})
+
+        assert response.json() == {"tenant": TENANT, "trace_id": "t-1"}
+        assert response.headers["X-Trace-ID"] == "t-1"
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert response.headers["X-Content-Type-Options"] == "nosniff"
+        assert "Server-Timing" not in response.headers
+        assert get_current_tenant_id() is None
+
+    async def test_streaming_body_passes_through(self):
+        async with _client() as client:
+            response = await client.get("/stream")
+        assert response.text == "chunk0;chunk1;chunk2;"
+        assert response.headers["Referrer-Policy"] == "strict-origin-when-cross-origin"
+        assert uuid.UUID(response.headers["X-Trace-ID"])
+
+    async def test_audit_runs_after_response_with_actor(self, monkeypatch):
+        monkeypatch.setattr(
+            audit_middleware, "_get_logging_config", AsyncMock(return_value={"log_api_reads": True})
+        )
+        log = AsyncMock()
+        monkeypatch.setattr(audit_middleware, "_log_request", log)
+        async with _client() as client:
+            await client.get("/whoami", headers=_auth())
+            await client.get("/whoami")  # no tenant: not audited
+        for task in list(audit_middleware._LOG_TASKS):
+            await task
+
+        log.assert_awaited_once()
+        kwargs = log.await_args.kwargs
+        assert (kwargs["tenant_id"], kwargs["actor_type"]) == (TENANT, "USER")
+        assert (kwargs["request_method"], kwargs["response_status"]) == ("GET", 200)
+        assert kwargs["event_type"] == "api.request"
+
+    async def test_stage_timings_and_server_timing_header(self):
+        reset_pipeline_timings()
+        async with _client(server_timing=True) as client:
+            response = await client.get("/whoami")
+
+        assert "tenant_context;dur=" in response.headers["Server-Timing"]
+        timings = pipeline_timings()
+        assert {"tenant_context", "security_headers", "trace_id", "audit", "app"} <= set(timings)
+        assert timings["app"].calls == 1
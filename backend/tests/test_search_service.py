@@ -42,3 +42,35 @@ class TestSearchServiceInit:
         mock_db = object()
         service = SearchService(db=mock_db)
         assert service.db is mock_db
+
+
+class TestIndexedSearch:
+    """Search statements use the indexed predicates and a capped count."""
+
+    async def _run(self, **kwargs):
+        from unittest.mock import AsyncMock, MagicMock
+
+        from sqlalchemy.dialects import postgresql
+
+        db = MagicMock()
+        result = MagicMock()
+        result.scalar.return_value = 3
+        result.scalars.return_value.unique.return_value.all.return_value = []
+        db.execute = AsyncMock(return_value=result)
+        total = (await SearchService(db).search_cis("t", **kwargs))[1]
+        sql = [str(c.args[0].compile(dialect=postgresql.dialect())) for c in db.execute.call_args_list]
+        return total, sql
+
+    async def test_query_uses_tsvector_trigram_and_rank(self):
+        total, (count_sql, page_sql) = await self._run(query="web_01%")
+        assert total == 3
+        assert "search_vector @@ websearch_to_tsquery" in page_sql
+        assert "ILIKE" in page_sql and "ESCAPE '/'" in page_sql
+        assert page_sql.index("ts_rank_cd") < page_sql.index("similarity")
+        assert "LIMIT" in count_sql
+
+    async def test_string_tags_use_containment(self):
+        _, (count_sql, _) = await self._run(tags={"env": "prod", "tier": 2}, count_cap=None)
+        assert "tags @>" in count_sql
+        assert "->>" in count_sql
+        assert "LIMIT" not in count_sql
@@ -0,0 +1,125 @@
+"""
+Overview: Tests for the semantic catalog read cache — snapshot indexes, TTL reuse, invalidation.
+Architecture: Unit tests for semantic catalog caching (Section 5)
+Dependencies: pytest, app.services.semantic.catalog_cache
+Concepts: Versioned immutable snapshots, commit-time invalidation from session flush flags
+"""
+
+import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from app.models.semantic_type import SemanticRelationshipKind
+from app.services.semantic import catalog_cache
+from app.services.semantic.catalog_cache import (
+    CatalogCache,
+    CategoryEntry,
+    SemanticCatalog,
+    TypeEntry,
+)
+
+NOW = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _category(name: str) -> CategoryEntry:
+    return CategoryEntry(
+        id=uuid.uuid4(), name=name, display_name=name.title(), description=None, icon=None,
+        sort_order=0, is_system=True, is_infrastructure=True, created_at=NOW, updated_at=NOW,
+    )
+
+
+def _type(name: str, category_id: uuid.UUID, parent_id: uuid.UUID | None = None) -> TypeEntry:
+    return TypeEntry(
+        id=uuid.uuid4(), name=name, display_name=name, category_id=category_id,
+        description=None, icon=None, is_abstract=False, parent_type_id=parent_id,
+        properties_schema=None, allowed_relationship_kinds=None, sort_order=0,
+        is_system=True, created_at=NOW, updated_at=NOW,
+    )
+
+
+def _catalog(version: int = 0) -> SemanticCatalog:
+    compute = _category("compute")
+    vm = _type("VirtualMachine", compute.id)
+    gpu = _type("GpuVirtualMachine", compute.id, parent_id=vm.id)
+    return SemanticCatalog(
+        version=version, categories=(compute,), types=(vm, gpu), relationship_kinds=()
+    )
+
+
+class TestSemanticCatalog:
+    def test_indexes(self):
+        catalog = _catalog()
+        compute = catalog.categories[0]
+        vm, gpu = catalog.types
+        assert catalog.category(str(compute.id)) is compute
+        assert catalog.type(vm.id) is vm
+        assert catalog.type_by_name("GpuVirtualMachine") is gpu
+        assert catalog.types_in(compute.id) == (vm, gpu)
+        assert catalog.children(vm.id) == (gpu,)
+        assert catalog.children(gpu.id) == ()
+        assert catalog.relationship_kind(uuid.uuid4()) is None
+
+
+class TestCatalogCache:
+    async def test_snapshot_reused_within_ttl(self, monkeypatch):
+        load = AsyncMock(side_effect=lambda db, version: _catalog(version))
+        monkeypatch.setattr(catalog_cache, "_load", load)
+        cache = CatalogCache(ttl_seconds=60)
+
+        first = await cache.get(object())
+        assert await cache.get(object()) is first
+        assert load.await_count == 1
+
+    async def test_invalidate_bumps_version_and_reloads(self, monkeypatch):
+        load = AsyncMock(side_effect=lambda db, version: _catalog(version))
+        monkeypatch.setattr(catalog_cache, "_load", load)
+        cache = CatalogCache(ttl_seconds=60)
+
+        first = await cache.get(object())
+        cache.invalidate()
+        second = await cache.get(object())
+        assert second is not first
+        assert (first.version, second.version) == (0, 1)
+        assert load.await_count == 2
+
+    async def test_load_racing_invalidation_is_not_cached(self, monkeypatch):
+        cache = CatalogCache(ttl_seconds=60)
+
+        async def load(db, version):
+            cache.invalidate()
+            return _catalog(version)
+
+        monkeypatch.setattr(catalog_cache, "_load", load)
+        stale = await cache.get(object())
+        assert stale.version == 0
+        assert cache._catalog is None
+
+
+class TestCommitInvalidation:
+    def test_flush_of_catalog_model_invalidates_on_commit(self, monkeypatch):
+        cache = CatalogCache(ttl_seconds=60)
+        monkeypatch.setattr(catalog_cache, "_cache", cache)
+        session = SimpleNamespace(
+            info={}, new=[SemanticRelationshipKind()], dirty=[], deleted=[]
+        )
+
+        catalog_cache._after_flush(session, None)
+        catalog_cache._after_commit(session)
+        assert cache.version == 1
+        assert session.info == {}
+
+    def test_unrelated_flush_and_rollback_keep_cache(self, monkeypatch):
+        cache = CatalogCache(ttl_seconds=60)
+        monkeypatch.setattr(catalog_cache, "_cache", cache)
+        unrelated = SimpleNamespace(info={}, new=[object()], dirty=[], deleted=[])
+        catalog_cache._after_flush(unrelated, None)
+        catalog_cache._after_commit(unrelated)
+
+        rolled_back = SimpleNamespace(
+            info={}, new=[SemanticRelationshipKind()], dirty=[], deleted=[]
+        )
+        catalog_cache._after_flush(rolled_back, None)
+        catalog_cache._after_rollback(rolled_back)
+        catalog_cache._after_commit(rolled_back)
+        assert cache.version == 0
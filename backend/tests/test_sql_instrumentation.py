@@ -0,0 +1,182 @@
+"""
+Overview: Tests for request-level SQL instrumentation, N+1 detection and the metrics export.
+Architecture: Database layer and request pipeline tests (Section 3.1, 4, 7.2)
+Dependencies: pytest, httpx, fastapi, strawberry, sqlalchemy, app.db.instrumentation,
+    app.core.middleware, app.api.graphql.sql_instrumentation
+Concepts: Per-request, per-field and per-service attribution, repeated statement shapes,
+    sampling, Server-Timing and GraphQL extension summaries, Prometheus text format
+"""
+
+import httpx
+import pytest
+import strawberry
+from fastapi import FastAPI
+from sqlalchemy import bindparam, create_engine, select, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.api.graphql.sql_instrumentation import SqlInstrumentationExtension
+from app.core.config import get_settings
+from app.core.middleware import RequestPipeline, SqlInstrumentationStage, TraceIDStage
+from app.db.instrumentation import (
+    SqlMetrics,
+    current_sql_trace,
+    end_sql_trace,
+    get_sql_metrics,
+    sql_field,
+    start_sql_trace,
+    track_sql,
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Note(Base):
+    __tablename__ = "notes"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+
+_NOTE_BY_ID = select(Note).where(Note.id == bindparam("id"))
+
+engine = create_engine("sqlite://")
+Base.metadata.create_all(engine)
+with Session(engine) as _seed:
+    _seed.add_all([Note(id=i) for i in range(1, 4)])
+    _seed.commit()
+
+
+class NoteService:
+    @track_sql
+    async def load(self, note_ids: list[int]) -> int:
+        with Session(engine) as session:
+            for note_id in note_ids:
+                session.execute(_NOTE_BY_ID, {"id": note_id}).all()
+        return len(note_ids)
+
+
+class TestSqlTrace:
+    async def test_attributes_statements_and_rows(self):
+        token = start_sql_trace("t-1")
+        try:
+            with sql_field("Query.notes"):
+                await NoteService().load([1, 2])
+            with Session(engine) as session:
+                session.execute(select(Note)).all()
+        finally:
+            trace = end_sql_trace(token)
+
+        assert trace.trace_id == "t-1"
+        assert trace.total.statements == 3
+        assert trace.fields["Query.notes"].statements == 2
+        assert trace.services["NoteService.load"].statements == 2
+        assert current_sql_trace() is None
+
+    async def test_flags_repeated_statement_shapes(self):
+        token = start_sql_trace(None)
+        try:
+            with sql_field("Note.owner"):
+                await NoteService().load([1, 2, 3, 1])
+        finally:
+            trace = end_sql_trace(token)
+
+        [shape] = trace.n_plus_one(threshold=3)
+        assert shape["count"] == 4
+        assert (shape["field"], shape["service"]) == ("Note.owner", "NoteService.load")
+        assert trace.n_plus_one(threshold=4) == []
+
+    async def test_unsampled_requests_record_nothing(self):
+        assert await NoteService().load([1]) == 1
+        assert current_sql_trace() is None
+
+
+class TestSqlMetrics:
+    def test_prometheus_text_format(self):
+        metrics = SqlMetrics()
+        token = start_sql_trace(None)
+        with sql_field("Query.notes"), Session(engine) as session:
+            session.execute(text("UPDATE notes SET id = id WHERE id = 1"))  # DML: rows affected
+            session.rollback()
+        metrics.observe('GET /say"hi"', end_sql_trace(token), n_plus_one=1)
+
+        exported = metrics.render(0.05)
+        assert "nimbus_sql_sample_rate 0.05" in exported
+        assert 'nimbus_sql_sampled_requests_total{endpoint="GET /say\\"hi\\""} 1' in exported
+        assert 'nimbus_sql_n_plus_one_total{endpoint="GET /say\\"hi\\""} 1' in exported
+        assert 'nimbus_sql_statements_total{scope="field",name="Query.notes"} 1' in exported
+        assert 'nimbus_sql_rows_total{scope="endpoint",name="GET /say\\"hi\\""} 1' in exported
+
+
+def _client(sample_rate: float, report: bool) -> httpx.AsyncClient:
+    app = FastAPI()
+
+    @app.get("/notes/{note_id}")
+    async def note(note_id: int) -> dict:
+        await NoteService().load([note_id] * 3)
+        return {"id": note_id}
+
+    wrapped = RequestPipeline(
+        app,
+        stages=[TraceIDStage(), SqlInstrumentationStage(sample_rate, 2, 10_000, report=report)],
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=wrapped), base_url="http://t")
+
+
+class TestSqlInstrumentationStage:
+    @pytest.fixture(autouse=True)
+    def fresh_metrics(self):
+        get_sql_metrics().reset()
+        yield
+        get_sql_metrics().reset()
+
+    async def test_reports_and_flags_n_plus_one_per_route(self, caplog):
+        async with _client(sample_rate=0.0, report=True) as client:
+            response = await client.get("/notes/2", headers={"X-Trace-ID": "t-9"})
+
+        assert "sql;dur=" in response.headers["Server-Timing"]
+        assert 'desc="3 statements"' in response.headers["Server-Timing"]
+        assert "N+1 query pattern on GET /notes/{note_id} (trace t-9)" in caplog.text
+        exported = get_sql_metrics().render(1.0)
+        assert 'nimbus_sql_sampled_requests_total{endpoint="GET /notes/{note_id}"} 1' in exported
+        assert 'nimbus_sql_statements_total{scope="service",name="NoteService.load"} 3' in exported
+
+    async def test_unsampled_requests_are_not_traced(self):
+        async with _client(sample_rate=0.0, report=False) as client:
+            response = await client.get("/notes/1")
+
+        assert "Server-Timing" not in response.headers
+        assert "nimbus_sql_sampled_requests_total{" not in get_sql_metrics().render(0.0)
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def notes(self) -> int:
+        return await NoteService().load([1, 2])
+
+
+test_schema = strawberry.Schema(query=Query, extensions=[SqlInstrumentationExtension])
+
+
+class TestSqlInstrumentationExtension:
+    async def test_debug_summary_per_field(self, monkeypatch):
+        monkeypatch.setattr(get_settings(), "debug", True)
+        token = start_sql_trace(None)
+        try:
+            result = await test_schema.execute("{ notes }")
+        finally:
+            end_sql_trace(token)
+
+        summary = result.extensions["sql"]
+        assert summary["statements"] == 2
+        assert summary["fields"]["Query.notes"]["statements"] == 2
+        assert summary["services"]["NoteService.load"]["statements"] == 2
+
+    async def test_no_summary_outside_debug(self):
+        token = start_sql_trace(None)
+        try:
+            result = await test_schema.execute("{ notes }")
+        finally:
+            end_sql_trace(token)
+        assert "sql" not in (result.extensions or {})
@@ -0,0 +1,85 @@
+"""
+Overview: Tests for tenant-scoped sessions, dedicated tenant pools and per-tenant pool stats.
+Architecture: Database layer tests (Section 3.1, 4.2)
+Dependencies: pytest, sqlalchemy, app.db.session, app.db.tenant_session
+Concepts: Transaction-local scope applied once per transaction, hot-tenant pool routing,
+    per-tenant stats kept off the public readiness payload
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from app.db import session as db_session
+from app.db.tenant_session import SCOPE_KEY, tenant_scope
+
+TENANT = str(uuid.uuid4())
+
+
+@pytest.fixture
+def scoped_calls():
+    """A SQLite session whose ``set_config`` calls are recorded as (name, value, is_local)."""
+    calls: list[tuple] = []
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def _register(dbapi_connection, _record):
+        dbapi_connection.create_function(
+            "set_config", 3, lambda *args: calls.append(args) or args[1]
+        )
+
+    with Session(engine) as session:
+        yield session, calls
+
+
+class TestTenantScope:
+    def test_applied_once_per_transaction_and_transaction_local(self, scoped_calls):
+        session, calls = scoped_calls
+        session.info[SCOPE_KEY] = tenant_scope(TENANT)
+        session.execute(text("SELECT 1"))
+        session.execute(text("SELECT 2"))
+        schema = f'"nimbus_tenant_{TENANT.replace("-", "_")}", public'
+        assert sorted(calls) == [("app.current_tenant_id", TENANT, 1), ("search_path", schema, 1)]
+
+        session.commit()
+        session.execute(text("SELECT 3"))
+        assert len(calls) == 4
+
+    def test_unscoped_sessions_send_nothing(self, scoped_calls):
+        session, calls = scoped_calls
+        session.execute(text("SELECT 1"))
+        assert calls == []
+
+
+class TestTenantPools:
+    @pytest.fixture(autouse=True)
+    def dedicated(self, monkeypatch):
+        monkeypatch.setattr(db_session.settings, "db_dedicated_tenant_pools", {TENANT: 3})
+        yield
+        db_session._tenant_engines.clear()
+        db_session._tenant_factories.clear()
+
+    def test_hot_tenant_gets_its_own_pool(self):
+        factory = db_session.session_factory_for(TENANT.upper())
+        assert factory is db_session.session_factory_for(TENANT)
+        assert factory is not db_session.async_session_factory
+        assert db_session.session_factory_for(str(uuid.uuid4())) is db_session.async_session_factory
+
+    def test_pool_stats_per_tenant(self):
+        db_session.session_factory_for(TENANT)
+        other = str(uuid.uuid4())
+        with db_session.track_tenant_session(other), db_session.track_tenant_session(other):
+            tenants = db_session.get_tenant_pool_stats()
+            assert tenants[other] == {"sessions": 2, "dedicated": False}
+            assert tenants[TENANT]["dedicated"] and tenants[TENANT]["pool_size"] == 3
+            assert list(db_session.get_tenant_pool_stats({TENANT})) == [TENANT]
+        assert other not in db_session.get_tenant_pool_stats()
+
+    def test_readiness_stats_do_not_identify_tenants(self):
+        db_session.session_factory_for(TENANT)
+        with db_session.track_tenant_session(str(uuid.uuid4())):
+            stats = db_session.get_pool_stats()
+        assert stats["tenant_sessions"] == 1 and stats["dedicated_pools"] == 1
+        assert TENANT not in str(stats)
@@ -6,11 +6,20 @@ Concepts: Graph validation rules, semantic type verification, relationship kind
 """
 
 import uuid
-from unittest.mock import AsyncMock, MagicMock
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
 
 import pytest
 
 from app.services.architecture.topology_validator import TopologyValidator, ValidationResult
+from app.services.semantic.catalog_cache import (
+    RelationshipKindEntry,
+    SemanticCatalog,
+    TypeEntry,
+)
+
+CATEGORY_ID = uuid.uuid4()
+NOW = datetime(2025, 1, 1, tzinfo=UTC)
 
 
 def _mock_type(
@@ -18,23 +27,40 @@ def _mock_type(
     display_name: str = "Test Type",
     allowed_rk: list | None = None,
     properties_schema: dict | None = None,
-):
-    """Create a mock SemanticResourceType."""
-    t = MagicMock()
-    t.id = uuid.UUID(type_id) if len(type_id) > 8 else type_id
-    t.display_name = display_name
-    t.allowed_relationship_kinds = allowed_rk
-    t.properties_schema = properties_schema
-    return t
+) -> TypeEntry:
+    """Create a catalog entry for a semantic resource type."""
+    return TypeEntry(
+        id=uuid.UUID(type_id), name=display_name, display_name=display_name,
+        category_id=CATEGORY_ID, description=None, icon=None, is_abstract=False,
+        parent_type_id=None, properties_schema=properties_schema,
+        allowed_relationship_kinds=tuple(allowed_rk) if allowed_rk is not None else None,
+        sort_order=0, is_system=False, created_at=NOW, updated_at=NOW,
+    )
 
 
 def _mock_rk(rk_id: str, name: str = "contains", display_name: str = "Contains"):
-    """Create a mock SemanticRelationshipKind."""
-    rk = MagicMock()
-    rk.id = uuid.UUID(rk_id) if len(rk_id) > 8 else rk_id
-    rk.name = name
-    rk.display_name = display_name
-    return rk
+    """Create a catalog entry for a semantic relationship kind."""
+    return RelationshipKindEntry(
+        id=uuid.UUID(rk_id), name=name, display_name=display_name, description=None,
+        inverse_name=name, is_system=False, created_at=NOW, updated_at=NOW,
+    )
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    """Serve the validator a catalog built from the given types and relationship kinds."""
+    entries: dict[str, list] = {"types": [], "kinds": []}
+
+    async def get_catalog(db):
+        return SemanticCatalog(
+            version=0, categories=(), types=tuple(entries["types"]),
+            relationship_kinds=tuple(entries["kinds"]),
+        )
+
+    monkeypatch.setattr(
+        "app.services.architecture.topology_validator.get_semantic_catalog", get_catalog
+    )
+    return entries
 
 
 TYPE_ID_1 = str(uuid.uuid4())
@@ -44,7 +70,7 @@ RK_ID_1 = str(uuid.uuid4())
 
 class TestEmptyGraph:
     @pytest.mark.asyncio
-    async def test_empty_nodes_warns(self):
+    async def test_empty_nodes_warns(self, catalog):
         db = AsyncMock()
         validator = TopologyValidator(db)
         result = await validator.validate({"nodes": [], "connections": []})
@@ -55,7 +81,7 @@ class TestEmptyGraph:
 
 class TestNodeValidation:
     @pytest.mark.asyncio
-    async def test_missing_node_id(self):
+    async def test_missing_node_id(self, catalog):
         db = AsyncMock()
         validator = TopologyValidator(db)
         result = await validator.validate({
@@ -66,7 +92,7 @@ class TestNodeValidation:
         assert any("missing 'id'" in e.message.lower() for e in result.errors)
 
     @pytest.mark.asyncio
-    async def test_duplicate_node_id(self):
+    async def test_duplicate_node_id(self, catalog):
         db = AsyncMock()
         validator = TopologyValidator(db)
         result = await validator.validate({
@@ -80,7 +106,7 @@ class TestNodeValidation:
         assert any("duplicate" in e.message.lower() for e in result.errors)
 
     @pytest.mark.asyncio
-    async def test_missing_semantic_type(self):
+    async def test_missing_semantic_type(self, catalog):
         db = AsyncMock()
         validator = TopologyValidator(db)
         result = await validator.validate({
@@ -93,12 +119,9 @@ class TestNodeValidation:
 
 class TestConnectionValidation:
     @pytest.mark.asyncio
-    async def test_self_connection_fails(self):
+    async def test_self_connection_fails(self, catalog):
         db = AsyncMock()
-        # Mock type lookup
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [_mock_type(TYPE_ID_1)]
-        db.execute = AsyncMock(return_value=mock_result)
+        catalog["types"] = [_mock_type(TYPE_ID_1)]
 
         validator = TopologyValidator(db)
         result = await validator.validate({
@@ -113,11 +136,9 @@ class TestConnectionValidation:
         assert any("self-connection" in e.message.lower() for e in result.errors)
 
     @pytest.mark.asyncio
-    async def test_unknown_source_fails(self):
+    async def test_unknown_source_fails(self, catalog):
         db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [_mock_type(TYPE_ID_1)]
-        db.execute = AsyncMock(return_value=mock_result)
+        catalog["types"] = [_mock_type(TYPE_ID_1)]
 
         validator = TopologyValidator(db)
         result = await validator.validate({
@@ -134,11 +155,9 @@ class TestConnectionValidation:
 
 class TestOrphanWarning:
     @pytest.mark.asyncio
-    async def test_orphan_node_warns(self):
+    async def test_orphan_node_warns(self, catalog):
         db = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [_mock_type(TYPE_ID_1)]
-        db.execute = AsyncMock(return_value=mock_result)
+        catalog["types"] = [_mock_type(TYPE_ID_1)]
 
         validator = TopologyValidator(db)
         result = await validator.validate({
@@ -154,7 +173,7 @@ class TestOrphanWarning:
 
 class TestPropertyValidation:
     @pytest.mark.asyncio
-    async def test_required_property_missing(self):
+    async def test_required_property_missing(self, catalog):
         schema = {
             "type": "object",
             "required": ["cpu_count"],
@@ -165,12 +184,7 @@ class TestPropertyValidation:
         mock_type = _mock_type(TYPE_ID_1, properties_schema=schema)
 
         db = AsyncMock()
-        # First call: types, second call: relationship kinds
-        type_result = MagicMock()
-        type_result.scalars.return_value.all.return_value = [mock_type]
-        rk_result = MagicMock()
-        rk_result.scalars.return_value.all.return_value = []
-        db.execute = AsyncMock(side_effect=[type_result, rk_result])
+        catalog["types"] = [mock_type]
 
         validator = TopologyValidator(db)
         result = await validator.validate({
@@ -184,7 +198,7 @@ class TestPropertyValidation:
                     for e in result.errors)
 
     @pytest.mark.asyncio
-    async def test_type_mismatch_detected(self):
+    async def test_type_mismatch_detected(self, catalog):
         schema = {
             "type": "object",
             "properties": {
@@ -194,11 +208,7 @@ class TestPropertyValidation:
         mock_type = _mock_type(TYPE_ID_1, properties_schema=schema)
 
         db = AsyncMock()
-        type_result = MagicMock()
-        type_result.scalars.return_value.all.return_value = [mock_type]
-        rk_result = MagicMock()
-        rk_result.scalars.return_value.all.return_value = []
-        db.execute = AsyncMock(side_effect=[type_result, rk_result])
+        catalog["types"] = [mock_type]
 
         validator = TopologyValidator(db)
         result = await validator.validate({
@@ -22,3 +22,83 @@ class TestVersioningServiceInit:
     def test_service_exists(self):
         """VersioningService should be importable and instantiable."""
         assert VersioningService is not None
+
+
+class TestSnapshotPatches:
+    """Delta encoding round-trips through make_patch/apply_patch."""
+
+    def test_round_trip_nested(self):
+        from app.services.cmdb.snapshot_store import apply_patch, make_patch
+
+        old = {"name": "vm", "attributes": {"cpu": 2, "disk": {"size": 10}}, "tags": {"a": "1"}}
+        new = {"name": "vm", "attributes": {"cpu": 4, "disk": {"size": 10, "iops": 3}}, "tags": {}}
+        patch = make_patch(old, new)
+        assert apply_patch(old, patch) == new
+        assert old["attributes"]["cpu"] == 2  # source document untouched
+
+    def test_identical_documents_produce_empty_patch(self):
+        from app.services.cmdb.snapshot_store import make_patch
+
+        assert make_patch({"a": [1, 2]}, {"a": [1, 2]}) == []
+
+    def test_pointer_escaping(self):
+        from app.services.cmdb.snapshot_store import apply_patch, make_patch
+
+        old = {"tags": {"k8s.io/name": "x", "a~b": 1}}
+        new = {"tags": {"k8s.io/name": "y"}}
+        assert apply_patch(old, make_patch(old, new)) == new
+
+    def test_empty_keys_in_pointers(self):
+        from app.services.cmdb.snapshot_store import _split_pointer, apply_patch, make_patch
+
+        assert _split_pointer("/") == [""]
+        assert _split_pointer("//x") == ["", "x"]
+        old = {"": {"x": 1}, "a": 1}
+        new = {"": {"x": 2}, "a": 1}
+        assert apply_patch(old, make_patch(old, new)) == new
+
+
+class TestDeepDiff:
+    """Path-level diff reports leaf changes with JSON pointer paths."""
+
+    def test_nested_paths(self):
+        from app.services.cmdb.snapshot_store import deep_diff
+
+        changes = deep_diff(
+            {"attributes": {"cpu": 2, "ports": [80, 443]}},
+            {"attributes": {"cpu": 4, "ports": [80], "ram": 8}},
+        )
+        by_path = {c["path"]: c for c in changes}
+        assert by_path["/attributes/cpu"] == {"path": "/attributes/cpu", "op": "replace", "from": 2, "to": 4}
+        assert by_path["/attributes/ports/1"]["op"] == "remove"
+        assert by_path["/attributes/ram"]["op"] == "add"
+        assert len(changes) == 3
+
+    def test_replay_keyframe_then_deltas(self):
+        from types import SimpleNamespace
+
+        from app.services.cmdb.snapshot_store import SnapshotStore, make_patch
+
+        v1 = {"name": "a", "attributes": {}}
+        v2 = {"name": "b", "attributes": {}}
+        v3 = {"name": "b", "attributes": {"x": 1}}
+        rows = [
+            SimpleNamespace(version_number=1, is_keyframe=True, snapshot_data=v1, delta=None),
+            SimpleNamespace(version_number=2, is_keyframe=False, snapshot_data=None, delta=make_patch(v1, v2)),
+            SimpleNamespace(version_number=3, is_keyframe=False, snapshot_data=None, delta=make_patch(v2, v3)),
+        ]
+        states = SnapshotStore._replay(rows)
+        assert states[1] == v1
+        assert states[2] == v2
+        assert states[3] == v3
+
+    def test_replay_without_keyframe_raises(self):
+        from types import SimpleNamespace
+
+        import pytest
+
+        from app.services.cmdb.snapshot_store import SnapshotChainError, SnapshotStore
+
+        rows = [SimpleNamespace(version_number=2, is_keyframe=False, snapshot_data=None, delta=[])]
+        with pytest.raises(SnapshotChainError):
+            SnapshotStore._replay(rows)
@@ -0,0 +1,86 @@
+/**
+ * Overview: HTTP interceptor that sends GraphQL operations as automatic persisted queries.
+ * Architecture: GraphQL transport layer for HTTP client (Section 3.2)
+ * Dependencies: @angular/common/http, rxjs
+ * Concepts: APQ — the first request for a document carries its text and SHA-256 hash so the
+ *     server registers it; later requests send only the hash. If the server has forgotten a
+ *     hash it answers PERSISTED_QUERY_NOT_FOUND and the request is retried once with the text.
+ */
+import { HttpEvent, HttpInterceptorFn, HttpRequest, HttpResponse } from '@angular/common/http';
+import { Observable, from, of, switchMap } from 'rxjs';
+import { environment } from '@env/environment';
+
+interface GraphQLBody {
+  query?: string;
+  variables?: Record<string, unknown>;
+  extensions?: Record<string, unknown>;
+  [key: string]: unknown;
+}
+
+const hashes = new Map<string, Promise<string>>();
+const registered = new Set<string>();
+
+export const persistedQueryInterceptor: HttpInterceptorFn = (req, next) => {
+  const body = req.body as GraphQLBody | null;
+  if (
+    req.method !== 'POST' ||
+    !req.url.endsWith(environment.graphqlUrl) ||
+    typeof body?.query !== 'string' ||
+    !globalThis.crypto?.subtle
+  ) {
+    return next(req);
+  }
+  const query = body.query;
+
+  return from(sha256(query)).pipe(
+    switchMap((hash) => {
+      const withText = withHash(req, body, hash, query);
+      if (!registered.has(hash)) {
+        return next(withText).pipe(
+          switchMap((event) => {
+            if (event instanceof HttpResponse && !hasErrorCode(event, 'PERSISTED_QUERY_INVALID')) {
+              registered.add(hash);
+            }
+            return of(event);
+          }),
+        );
+      }
+      return next(withHash(req, body, hash)).pipe(
+        switchMap((event): Observable<HttpEvent<unknown>> => {
+          if (event instanceof HttpResponse && hasErrorCode(event, 'PERSISTED_QUERY_NOT_FOUND')) {
+            return next(withText);
+          }
+          return of(event);
+        }),
+      );
+    }),
+  );
+};
+
+function withHash(
+  req: HttpRequest<unknown>,
+  body: GraphQLBody,
+  hash: string,
+  query?: string,
+): HttpRequest<unknown> {
+  const { query: _omitted, ...rest } = body;
+  const extensions = { ...body.extensions, persistedQuery: { version: 1, sha256Hash: hash } };
+  return req.clone({ body: query ? { ...rest, query, extensions } : { ...rest, extensions } });
+}
+
+function hasErrorCode(response: HttpResponse<unknown>, code: string): boolean {
+  const errors = (response.body as { errors?: { extensions?: { code?: string } }[] } | null)
+    ?.errors;
+  return !!errors?.some((e) => e.extensions?.code === code);
+}
+
+function sha256(text: string): Promise<string> {
+  let hash = hashes.get(text);
+  if (!hash) {
+    hash = crypto.subtle.digest('SHA-256', new TextEncoder().encode(text)).then((buffer) =>
+      Array.from(new Uint8Array(buffer), (b) => b.toString(16).padStart(2, '0')).join(''),
+    );
+    hashes.set(text, hash);
+  }
+  return hash;
+}
@@ -12,11 +12,12 @@ import { provideAnimations } from '@angular/platform-browser/animations';
 import { AppComponent } from './app/app.component';
 import { routes } from './app/app.routes';
 import { authInterceptor } from './app/core/auth/auth.interceptor';
+import { persistedQueryInterceptor } from './app/core/services/persisted-query.interceptor';
 
 bootstrapApplication(AppComponent, {
   providers: [
     provideRouter(routes, withHashLocation()),
-    provideHttpClient(withInterceptors([authInterceptor])),
+    provideHttpClient(withInterceptors([authInterceptor, persistedQueryInterceptor])),
     provideAnimations(),
   ],
 }).catch((err) => console.error(err));